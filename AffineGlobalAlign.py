@@ -0,0 +1,112 @@
+import numpy
+
+# Flags of the traceback matrix: the source of each cell's best score (diagonal, vertical or horizontal
+# gap, in that order of preference), and whether each gap score extends a gap rather than opening one
+MATCH, VERTICAL, HORIZONTAL = 1, 2, 4
+VERTICAL_EXTEND, HORIZONTAL_EXTEND = 8, 16
+
+# Maps the aligned two bases against a user-selected substitution matrix; in-built (MatrixInfo)
+# matrices only hold one of each pair, so the reversed pair is tried next
+def get_score(cA, cB, submatrix):
+	if (cA, cB) in submatrix:
+		return submatrix[(cA, cB)]
+	else:
+		return submatrix[(cB, cA)] # returns score
+
+# Substitution scores of a target sequence against each residue, built once per target and shared by
+# every query aligned to it; column(c) is the vector of scores of c against each target position
+class TargetProfile():
+	def __init__(self, seq, submat):
+		self.seq = str(seq)
+		self.submat = submat
+		residues = sorted(set(self.seq))
+		self.residues = {residue: index for index, residue in enumerate(residues)}
+		self.codes = numpy.array([self.residues[c] for c in self.seq], dtype=numpy.intp)
+		self.columns = {}
+
+	# Scores of one residue against every target position
+	def column(self, c):
+		if c not in self.columns:
+			scores = numpy.array([get_score(a, c, self.submat) for a in self.residues], dtype=numpy.float64)
+			self.columns[c] = scores[self.codes]
+		return self.columns[c]
+
+# Global alignment with affine gaps (Gotoh): a gap of length L scores gapopen + L*gap. The matrix is
+# filled one query position (column) at a time, with every target position of a column computed as a
+# single vector: diagonal and horizontal moves only depend on the previous column, and vertical gaps
+# are resolved by a running maximum down the column (exact as opening a gap never scores > 0).
+# With gapopen = 0 the scores are those of the linear-gap needle; costs are summed in the same order,
+# so integer costs (and in-built matrices) give identical scores
+# Returns the score and, if traceback is requested, the two aligned sequences
+def align(profile, query, gap, gapopen=0, traceback=False):
+	if gapopen > 0:
+		raise IOError('Gap open penalty must be <= 0')
+	query = str(query)
+	l1, l2 = len(profile.seq), len(query)
+	rows = numpy.arange(l1 + 1, dtype=numpy.float64)
+	gapRamp = gap * rows # vertical gap costs from the top of a column
+	score = gapopen + gapRamp # column 0, gaps over the target
+	score[0] = 0
+	horizontal = numpy.full(l1 + 1, -numpy.inf) # best scores ending in a gap over the query
+	F = numpy.full(l1 + 1, -numpy.inf) # best scores ending in a gap over the target
+	directions = None
+	if traceback:
+		directions = numpy.zeros((l1 + 1, l2 + 1), dtype=numpy.uint8)
+	for j in range(1, l2 + 1):
+		diagonal = score[:-1] + profile.column(query[j-1])
+		openH = score + (gapopen + gap)
+		extendH = horizontal + gap
+		horizontal = numpy.maximum(openH, extendH) # ties open
+		column = numpy.empty(l1 + 1)
+		column[0] = gapopen + gap * j
+		column[1:] = numpy.maximum(diagonal, horizontal[1:])
+		horizontal[0] = column[0]
+		# F[i] = max over k < i of column[k] + gapopen + gap*(i-k)
+		F[1:] = numpy.maximum.accumulate(column - gapRamp)[:-1] + gapRamp[1:] + gapopen
+		column[1:] = numpy.maximum(column[1:], F[1:])
+		if traceback:
+			flags = numpy.where(column[1:] == diagonal, MATCH,
+					numpy.where(column[1:] == F[1:], VERTICAL, HORIZONTAL))
+			flags |= numpy.where(extendH[1:] > openH[1:], HORIZONTAL_EXTEND, 0)
+			flags |= numpy.where(F[1:] > column[:-1] + (gapopen + gap), VERTICAL_EXTEND, 0)
+			directions[1:, j] = flags
+		score = column
+	if traceback:
+		return score[-1], trace(directions, profile.seq, query)
+	return score[-1], None
+
+# Walk back through the traceback matrix, following each gap to where it was opened
+def trace(directions, seq1, seq2):
+	a1, a2 = [], []
+	i, j = len(seq1), len(seq2)
+	state = MATCH
+	while i > 0 and j > 0:
+		flags = directions[i, j]
+		if state == MATCH:
+			if flags & MATCH:
+				a1.append(seq1[i-1])
+				a2.append(seq2[j-1])
+				i -= 1
+				j -= 1
+				continue
+			state = VERTICAL if flags & VERTICAL else HORIZONTAL
+		if state == VERTICAL: # gap in sequence 2, only walk back on i
+			a1.append(seq1[i-1])
+			a2.append('-')
+			state = VERTICAL if flags & VERTICAL_EXTEND else MATCH
+			i -= 1
+		else: # gap in sequence 1, only walk back on j
+			a1.append('-')
+			a2.append(seq2[j-1])
+			state = HORIZONTAL if flags & HORIZONTAL_EXTEND else MATCH
+			j -= 1
+	# walk-back to index 0 for both i and j; either could be reached first
+	while i > 0:
+		a1.append(seq1[i-1])
+		a2.append('-')
+		i -= 1
+	while j > 0:
+		a1.append('-')
+		a2.append(seq2[j-1])
+		j -= 1
+	return ''.join(reversed(a1)), ''.join(reversed(a2))
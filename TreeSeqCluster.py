@@ -0,0 +1,233 @@
+import os
+import numpy
+
+# Post-processing of the contrasters' N x N score matrices: conversion to distances and hierarchical
+# clustering, out of core. The score matrix and the working distance matrix are memory-mapped (.npy)
+# and visited a block of rows at a time, so memory holds a few rows and vectors of length N rather
+# than the matrices. Distances are also written as a condensed vector and the clustering as a linkage
+# matrix, both in SciPy's layouts (scipy.spatial.distance.squareform, scipy.cluster.hierarchy.linkage)
+
+NORMALIZATIONS = ('none', 'short', 'long')
+LINKAGES = ('average', 'complete')
+
+# Read the query names of a text score matrix, i.e. its header
+def read_header(fname):
+	with open(fname) as handle:
+		header = handle.readline().rstrip('\n').split('\t')
+	if len(header) < 2 or header[0] != '':
+		raise IOError(fname+' has no header of query names')
+	return header[1:]
+
+# Stream a text score matrix (as written by the contrasters) into a square memory-mapped array of
+# floats, its rows in the order of the header's columns. Rows are parsed and written a block at a time;
+# 'None' scores (queries which had already been aligned as targets) are read as NaN. Returns the names
+def stream_score_matrix(fname, outname, blockRows=256):
+	names = read_header(fname)
+	index = {name: k for k, name in enumerate(names)}
+	if len(index) != len(names):
+		raise IOError(fname+' has duplicate query names')
+	scores = numpy.lib.format.open_memmap(outname, mode='w+', dtype=numpy.float64, shape=(len(names), len(names)))
+	seen = numpy.zeros(len(names), dtype=bool)
+	rows, block = [], []
+
+	def write_block():
+		values = numpy.array(block)
+		values[values == 'None'] = 'nan'
+		scores[numpy.array(rows)] = values.astype(numpy.float64)
+
+	with open(fname) as handle:
+		handle.readline()
+		for line in handle:
+			fields = line.rstrip('\n').split('\t')
+			if len(fields) < 2 or len(fields[0]) == 0: # a header written again by a resumed run
+				continue
+			if fields[0] not in index or len(fields) != len(names) + 1:
+				raise IOError('Row '+fields[0]+' of '+fname+' is not a sequence of the header; clustering needs '+
+					'a square matrix of the sequences against themselves')
+			if index[fields[0]] in rows: # rewritten by a later run; the last row wins
+				write_block()
+				rows, block = [], []
+			seen[index[fields[0]]] = True
+			rows.append(index[fields[0]])
+			block.append(fields[1:])
+			if len(rows) == blockRows:
+				write_block()
+				rows, block = [], []
+	if len(rows) > 0:
+		write_block()
+	if not seen.all():
+		raise IOError(str(int((~seen).sum()))+' sequences of '+fname+' have no row (is the run complete?)')
+	scores.flush()
+	return names
+
+# Read the names of a memory-mapped score matrix, one per line
+def read_names(fname):
+	return [line.rstrip('\n') for line in open(fname) if len(line.strip()) > 0]
+
+# Names file of a memory-mapped matrix, as written next to it (<root>.names.txt, of <root>[.scores].npy)
+def default_names_file(matrix):
+	fname = os.path.splitext(matrix)[0]
+	if fname.endswith('.scores'):
+		fname = fname[:-len('.scores')]
+	return fname + '.names.txt'
+
+def write_names(fname, names):
+	outhandle = open(fname, 'w')
+	for name in names:
+		outhandle.write(name+'\n')
+	outhandle.close()
+
+# Symmetric scores of the rows [start, stop): the score of the pair as the smaller index's row (the
+# one which was aligned, for a matrix with 'None' scores), or else as the other's. If index is given,
+# of the submatrix of the sequences at those positions of the matrix, in that order
+def symmetric_rows(scores, start, stop, index=None):
+	if index is None:
+		n = scores.shape[0]
+		upper = numpy.array(scores[start:stop]) # the rows
+		lower = numpy.array(scores[:, start:stop]).T # the columns, as rows
+	else:
+		n = len(index)
+		upper = numpy.array(scores[index[start:stop]])[:, index]
+		lower = numpy.array(scores[:, index[start:stop]])[index].T
+	before = numpy.arange(n)[numpy.newaxis, :] < numpy.arange(start, stop)[:, numpy.newaxis]
+	rows = numpy.where(before, lower, upper)
+	rows = numpy.where(numpy.isnan(rows), numpy.where(before, upper, lower), rows)
+	if numpy.isnan(rows).any():
+		i, j = numpy.argwhere(numpy.isnan(rows))[0]
+		raise IOError('No score for sequences '+str(start + i)+' and '+str(j)+' in either order')
+	return rows
+
+# Distances of the rows [start, stop): scores are normalized by the shorter or longer sequence length
+# (as calc_score's short/long normalizations) or not, then d(i,j) = (n(i,i) + n(j,j)) / 2 - n(i,j),
+# which is 0 for a sequence against itself and grows as a pair scores below its members' self-scores
+def distance_rows(scores, start, stop, selfScores, lengths=None, normalization='none'):
+	rows = symmetric_rows(scores, start, stop)
+	selfNormalized = selfScores
+	if normalization != 'none':
+		if normalization == 'short':
+			scale = numpy.minimum(lengths[start:stop, numpy.newaxis], lengths[numpy.newaxis, :])
+		else:
+			scale = numpy.maximum(lengths[start:stop, numpy.newaxis], lengths[numpy.newaxis, :])
+		rows = rows / scale
+		selfNormalized = selfScores / lengths
+	rows = (selfNormalized[start:stop, numpy.newaxis] + selfNormalized[numpy.newaxis, :]) / 2.0 - rows
+	rows = numpy.maximum(rows, 0.0)
+	rows[numpy.arange(stop - start), numpy.arange(start, stop)] = 0.0
+	return rows
+
+# Position of the pair (i, j > i) in a condensed distance vector of n sequences
+def condensed_index(n, i, j):
+	return n * i - i * (i + 1) // 2 + (j - i - 1)
+
+# Convert a square score matrix to distances, a block of rows at a time: the condensed vector (.npy) is
+# written to condensedName and, if workName is given, the square distance matrix to work on while
+# clustering. Returns them, memory-mapped
+def write_distances(scores, condensedName, workName=None, lengths=None, normalization='none', blockRows=256):
+	if normalization not in NORMALIZATIONS:
+		raise IOError('Unknown normalization '+normalization+'; one of '+', '.join(NORMALIZATIONS))
+	if normalization != 'none' and lengths is None:
+		raise IOError('The '+normalization+' normalization needs the sequence lengths')
+	n = scores.shape[0]
+	if scores.ndim != 2 or scores.shape[1] != n:
+		raise IOError('Clustering needs a square matrix of the sequences against themselves')
+	selfScores = numpy.array(numpy.diagonal(scores), dtype=numpy.float64)
+	if numpy.isnan(selfScores).any():
+		raise IOError('The score matrix has no self-score for '+str(int(numpy.isnan(selfScores).sum()))+' sequences')
+	if lengths is not None:
+		lengths = numpy.asarray(lengths, dtype=numpy.float64)
+		if normalization != 'none' and (lengths <= 0).any():
+			raise IOError('Empty sequences have no '+normalization+' normalization')
+	condensed = numpy.lib.format.open_memmap(condensedName, mode='w+', dtype=numpy.float64, shape=(n * (n - 1) // 2,))
+	work = None
+	if workName is not None:
+		work = numpy.lib.format.open_memmap(workName, mode='w+', dtype=numpy.float64, shape=(n, n))
+	for start in range(0, n, blockRows):
+		stop = min(start + blockRows, n)
+		rows = distance_rows(scores, start, stop, selfScores, lengths, normalization)
+		for i in range(start, stop):
+			if i < n - 1:
+				condensed[condensed_index(n, i, i + 1):condensed_index(n, i, n - 1) + 1] = rows[i - start, i + 1:]
+		if work is not None:
+			work[start:stop] = rows
+	condensed.flush()
+	if work is not None:
+		work.flush()
+	return condensed, work
+
+# Agglomerative clustering of a square distance matrix (memory-mapped; overwritten) by the nearest-
+# neighbour chain algorithm, with average or complete linkage. Rows are read one at a time, and a merge
+# updates the row and column of the merged cluster (Lance-Williams). Returns the linkage matrix as
+# SciPy's: row k merges clusters Z[k,0] < Z[k,1] at distance Z[k,2] into cluster n + k of Z[k,3] sequences
+def linkage(work, method='average'):
+	if method not in LINKAGES:
+		raise IOError('Unknown linkage '+method+'; one of '+', '.join(LINKAGES))
+	n = work.shape[0]
+	size = numpy.ones(n, dtype=numpy.int64) # 0 once merged into another cluster
+	merges = numpy.zeros((max(n - 1, 0), 4))
+	chain = []
+	for k in range(n - 1):
+		if len(chain) == 0:
+			chain.append(int(numpy.argmax(size > 0)))
+		while True: # extend the chain to a pair of reciprocal nearest neighbours
+			x = chain[-1]
+			row = numpy.where(size > 0, work[x], numpy.inf)
+			row[x] = numpy.inf
+			if len(chain) > 1:
+				y = chain[-2]
+				nearest = row[y]
+			else:
+				y, nearest = None, numpy.inf
+			candidate = int(numpy.argmin(row))
+			if row[candidate] < nearest:
+				y, nearest = candidate, row[candidate]
+			if len(chain) > 1 and y == chain[-2]:
+				break
+			chain.append(y)
+		chain = chain[:-2]
+		if x > y:
+			x, y = y, x
+		merges[k] = x, y, nearest, size[x] + size[y]
+		# the merged cluster takes y's row and column
+		if method == 'average':
+			new = (size[x] * numpy.array(work[x]) + size[y] * numpy.array(work[y])) / float(size[x] + size[y])
+		else:
+			new = numpy.maximum(work[x], work[y])
+		new[y] = 0.0
+		work[y] = new
+		work[:, y] = new
+		size[y] += size[x]
+		size[x] = 0
+	# order by distance, as SciPy does, then label the clusters
+	merges = merges[numpy.argsort(merges[:, 2], kind='mergesort')]
+	return label_merges(merges, n)
+
+# Replace the sequence indices of each merge by the labels of the clusters they belong to at that point
+def label_merges(merges, n):
+	parent = numpy.arange(2 * n - 1)
+	sizes = numpy.concatenate([numpy.ones(n), numpy.zeros(n - 1)])
+
+	def find(x):
+		root = x
+		while parent[root] != root:
+			root = parent[root]
+		while parent[x] != root: # path compression
+			parent[x], x = root, parent[x]
+		return root
+
+	for k in range(len(merges)):
+		a, b = find(int(merges[k, 0])), find(int(merges[k, 1]))
+		merges[k, 0], merges[k, 1] = min(a, b), max(a, b)
+		parent[a] = parent[b] = n + k
+		sizes[n + k] = sizes[a] + sizes[b]
+		merges[k, 3] = sizes[n + k]
+	return merges
+
+# Write a linkage matrix as a table, with the sequence names of the singleton clusters
+def write_linkage(fname, Z, names):
+	n = len(names)
+	label = lambda c: names[int(c)] if c < n else str(int(c))
+	outhandle = open(fname, 'w')
+	outhandle.write('Cluster\tChild1\tChild2\tDistance\tSize\n')
+	for k in range(len(Z)):
+		outhandle.write('\t'.join([str(n + k), label(Z[k, 0]), label(Z[k, 1]), str(Z[k, 2]), str(int(Z[k, 3]))]) + '\n')
+	outhandle.close()
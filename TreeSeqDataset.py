@@ -0,0 +1,178 @@
+import hashlib, json, mmap, os
+import numpy
+import TreeSeqGlobalAlign
+
+# A dataset compiled from a fasta file (treesequence_compile.py) into one binary file which is
+# memory-mapped on load: the encoded sequences and their offsets, the names, the T-A partner of each
+# T node and the gap cost of the subtree it closes (create_ta_dictionary's, under the substitution
+# matrix and node types compiled with) and, optionally, the neurites' metadata columns.
+# Layout: MAGIC, the length of the header (8 bytes, little-endian), the header (JSON) and the arrays,
+# each aligned to ALIGNMENT bytes. The header records the format version, the offset, type and shape
+# of each array and a SHA-256 content hash of the arrays and settings
+
+MAGIC = b'TSQDATA\n'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Test whether a file is a compiled dataset (rather than, e.g., a fasta file)
+def is_dataset(fname):
+	if not os.path.isfile(fname):
+		return False
+	with open(fname, 'rb') as handle:
+		return handle.read(len(MAGIC)) == MAGIC
+
+# Key of the settings the T-A dictionaries depend on: the node types and the completed substitution
+# matrix (its residue gap costs)
+def ta_key(nodeTypes, submat):
+	return hashlib.sha1((repr(sorted(nodeTypes.items())) + repr(sorted(submat.items()))).encode()).hexdigest()
+
+# A completed copy of a substitution matrix, as the aligner completes it (a gap cost for every residue)
+def completed_matrix(submat, gapDefault):
+	completed = dict(submat)
+	TreeSeqGlobalAlign.create_residue_specific_gapcost(completed, gapDefault)
+	return completed
+
+# A sequence record of a dataset; partners and gapCosts are the views of its residues in the
+# dataset's arrays, or None if the dataset was compiled under other settings than those aligned with
+class DatasetSequence():
+	def __init__(self, name, seq, partners=None, gapCosts=None):
+		self.name = name
+		self.seq = seq
+		self.partners = partners # A-node index of each T node, -1 for an unpaired T, -2 for other nodes
+		self.gapCosts = gapCosts # gap cost of the subtree closed by each T node
+		self._taDict = None
+
+	# The T-A dictionary create_ta_dictionary would create, or None if not compiled for the settings
+	@property
+	def taDict(self):
+		if self._taDict is None and self.partners is not None:
+			tIndex = numpy.flatnonzero(numpy.asarray(self.partners) != -2).tolist()
+			self._taDict = dict(zip(tIndex, numpy.asarray(self.partners)[tIndex].tolist()))
+			self._taDict.update(zip([str(t) for t in tIndex], numpy.asarray(self.gapCosts)[tIndex].tolist()))
+		return self._taDict
+
+	# Copy the views for pickling (e.g. to the workers), as plain arrays, and drop the dictionary
+	def __getstate__(self):
+		state = dict(self.__dict__)
+		state['_taDict'] = None
+		if self.partners is not None:
+			state['partners'] = numpy.array(self.partners)
+			state['gapCosts'] = numpy.array(self.gapCosts)
+		return state
+
+# Compile sequence records into a dataset file. taDicts are the records' T-A dictionaries (None to
+# leave them out) under the settings of key; metadata is a dictionary of name to attributes, as
+# TreeSeqMetadata.parse_metadata's, of which the records' rows are kept. Returns the content hash
+def write_dataset(fname, records, taDicts=None, key=None, metadata=None, source=None):
+	names = [record.name for record in records]
+	if len(set(names)) != len(names):
+		raise IOError('Sequence names must be unique to compile a dataset')
+	seqs = [str(record.seq) for record in records]
+	try:
+		residues = numpy.frombuffer(''.join(seqs).encode('ascii'), dtype=numpy.uint8)
+	except UnicodeEncodeError:
+		raise IOError('Sequences must be ASCII to compile a dataset')
+	offsets = numpy.zeros(len(seqs) + 1, dtype=numpy.int64)
+	offsets[1:] = numpy.cumsum([len(seq) for seq in seqs])
+	encodedNames = [name.encode('utf-8') for name in names]
+	nameOffsets = numpy.zeros(len(names) + 1, dtype=numpy.int64)
+	nameOffsets[1:] = numpy.cumsum([len(name) for name in encodedNames])
+	arrays = [('residues', residues), ('offsets', offsets),
+		('names', numpy.frombuffer(b''.join(encodedNames), dtype=numpy.uint8)), ('nameOffsets', nameOffsets)]
+	if taDicts is not None:
+		partners = numpy.full(len(residues), -2, dtype=numpy.int32)
+		costs = [taDict[k] for taDict in taDicts for k in taDict if isinstance(k, str)]
+		integral = all([isinstance(cost, int) for cost in costs]) # keeps integer scores integers
+		gapCosts = numpy.zeros(len(residues), dtype=numpy.int64 if integral else numpy.float64)
+		for k, taDict in enumerate(taDicts):
+			for t in taDict:
+				if not isinstance(t, str):
+					partners[offsets[k] + t] = taDict[t]
+					gapCosts[offsets[k] + t] = taDict[str(t)]
+		arrays += [('partners', partners), ('gapCosts', gapCosts)]
+	if metadata is not None:
+		columns = sorted(set([c for name in names if name in metadata for c in metadata[name]]))
+		rows = {name: [metadata[name].get(c, '') for c in columns] for name in names if name in metadata}
+		blob = json.dumps({'columns': columns, 'rows': rows}).encode('utf-8')
+		arrays.append(('metadata', numpy.frombuffer(blob, dtype=numpy.uint8)))
+
+	digest = hashlib.sha256()
+	layout, position = {}, 0
+	for name, values in arrays:
+		position = -(-position // ALIGNMENT) * ALIGNMENT
+		layout[name] = [position, values.dtype.str, list(values.shape)]
+		position += values.nbytes
+		digest.update(name.encode() + values.dtype.str.encode() + values.tobytes())
+	digest.update(str(key).encode())
+	header = {'version': FORMAT_VERSION, 'hash': digest.hexdigest(), 'count': len(records), 'taKey': key,
+		'source': source, 'arrays': layout}
+	encoded = json.dumps(header).encode('utf-8')
+	start = -(-(len(MAGIC) + 8 + len(encoded)) // ALIGNMENT) * ALIGNMENT
+	encoded += b' ' * (start - len(MAGIC) - 8 - len(encoded)) # pad the header to the first array
+	with open(fname, 'wb') as handle:
+		handle.write(MAGIC + len(encoded).to_bytes(8, 'little') + encoded)
+		for name, values in arrays:
+			handle.seek(start + layout[name][0])
+			handle.write(values.tobytes())
+	return header['hash']
+
+# A compiled dataset, memory-mapped: arrays are views of the file, read as they're used
+class Dataset():
+	def __init__(self, fname):
+		self.fname = fname
+		with open(fname, 'rb') as handle:
+			if handle.read(len(MAGIC)) != MAGIC:
+				raise IOError(fname+' is not a compiled dataset')
+			length = int.from_bytes(handle.read(8), 'little')
+			self.header = json.loads(handle.read(length).decode('utf-8'))
+			if self.header.get('version') != FORMAT_VERSION:
+				raise IOError(fname+' is a dataset of format version '+str(self.header.get('version'))+
+					', this version reads '+str(FORMAT_VERSION)+'; compile it again')
+			start = len(MAGIC) + 8 + length
+			self.buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+		self.arrays = {}
+		for name, (offset, dtype, shape) in self.header['arrays'].items():
+			self.arrays[name] = numpy.frombuffer(self.buffer, dtype=numpy.dtype(dtype),
+								count=int(numpy.prod(shape)), offset=start + offset).reshape(shape)
+
+	def get_hash(self):
+		return self.header['hash']
+
+	def __len__(self):
+		return self.header['count']
+
+	# Test whether the T-A data was compiled under the given settings (see ta_key)
+	def has_ta_data(self, key):
+		return 'partners' in self.arrays and self.header['taKey'] == key
+
+	# Get the sequence records; with their T-A data if compiled under the settings of key
+	def get_records(self, key=None):
+		offsets = self.arrays['offsets'].tolist()
+		nameOffsets = self.arrays['nameOffsets'].tolist()
+		residues = self.arrays['residues'].tobytes().decode('ascii')
+		names = self.arrays['names'].tobytes()
+		withTA = self.has_ta_data(key)
+		records = []
+		for k in range(len(offsets) - 1):
+			a, b = offsets[k], offsets[k+1]
+			record = DatasetSequence(names[nameOffsets[k]:nameOffsets[k+1]].decode('utf-8'), residues[a:b])
+			if withTA:
+				record.partners, record.gapCosts = self.arrays['partners'][a:b], self.arrays['gapCosts'][a:b]
+			records.append(record)
+		return records
+
+	# Get the metadata compiled with the dataset, as TreeSeqMetadata.parse_metadata's, or None
+	def get_metadata(self):
+		if 'metadata' not in self.arrays:
+			return None
+		blob = json.loads(self.arrays['metadata'].tobytes().decode('utf-8'))
+		return {name: dict(zip(blob['columns'], row)) for name, row in blob['rows'].items()}
+
+	# Recompute the content hash, and test it is the one recorded
+	def verify(self):
+		digest = hashlib.sha256()
+		for name in sorted(self.arrays, key=lambda name: self.header['arrays'][name][0]):
+			values = self.arrays[name]
+			digest.update(name.encode() + values.dtype.str.encode() + values.tobytes())
+		digest.update(str(self.header['taKey']).encode())
+		return digest.hexdigest() == self.header['hash']
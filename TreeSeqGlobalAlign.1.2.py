@@ -1,5 +1,5 @@
 
-import numpy, sys, math
+import array, collections, concurrent.futures, mmap, numpy, os, pickle, sys, math, tempfile, time
 
 # Creates a dictionary for a given tree sequence linking each T node to an associated A node
 def create_ta_dictionary(seq,nodeTypes,submatrix,gap_cost):
@@ -38,17 +38,37 @@ def create_ta_dictionary(seq,nodeTypes,submatrix,gap_cost):
 				
 	return taDict
 
+# Get the T-A dictionary of a sequence record: that of a compiled dataset's record (TreeSeqDataset),
+# whose T-A data is only given if compiled under the same node types and substitution matrix, else a
+# new one
+def get_ta_dictionary(record, nodeTypes, submatrix, gap_cost):
+	taDict = getattr(record, 'taDict', None)
+	if taDict is None:
+		taDict = create_ta_dictionary(record.seq, nodeTypes, submatrix, gap_cost)
+	return taDict
+
 # Implementation of global alignment - Needleman-Wunsch
+# If given an AlignmentWorkspace, the setup and matrices are shared with the prior alignments of the
+# workspace, so the matrices are only valid until its next alignment
 class NeedlemanWunsch():
-	def __init__(self, s1, s2, costs, submat, nodeTypes):
+	def __init__(self, s1, s2, costs, submat, nodeTypes, workspace=None):
+		if workspace is not None: # plain string sequences are much faster to index
+			s1, s2 = workspace.get_sequence(s1), workspace.get_sequence(s2)
 		self.seq1 = s1 # sequence 1
 		self.seq2 = s2 # sequence 2
 		self.costs = costs # dictionary of all costs (i.e. penalties)
-		self.submat = submat # substitution matrix
-		self.create_node_types(nodeTypes)
-		self.create_residue_specific_gapcost()
-		self.TADict1 = create_ta_dictionary(s1.seq, nodeTypes, submat, costs['gap'])
-		self.TADict2 = create_ta_dictionary(s2.seq, nodeTypes, submat, costs['gap'])
+		self.workspace = workspace # reusable buffers and setup, if any
+		if workspace is None:
+			self.submat = submat # substitution matrix
+			self.create_node_types(nodeTypes)
+			self.create_residue_specific_gapcost()
+			self.TADict1 = get_ta_dictionary(s1, nodeTypes, submat, costs['gap'])
+			self.TADict2 = get_ta_dictionary(s2, nodeTypes, submat, costs['gap'])
+		else:
+			self.submat = workspace.get_submatrix(submat, costs['gap'])
+			self.nodeTypes = workspace.get_node_types(nodeTypes)
+			self.TADict1 = workspace.get_ta_dictionary(s1.seq, nodeTypes, self.submat, costs['gap'])
+			self.TADict2 = workspace.get_ta_dictionary(s2.seq, nodeTypes, self.submat, costs['gap'])
 		self.scoreMat = None # references score matrix
 		self.directionMat = None # references diag(0),left(1),up(2) matrix
 		self.leftMat = None # references diag(0),left(1),up(2) matrix
@@ -59,37 +79,12 @@ class NeedlemanWunsch():
 		self._aligner()
 	
 	def create_node_types(self,nodeTypes):
-		self.nodeTypes = {}
-		for nodeType in nodeTypes.keys():
-			for residue in nodeTypes[nodeType]:
-				self.nodeTypes[residue] = nodeType
+		self.nodeTypes = create_node_types(nodeTypes)
 	
 	# Fills in all gap-residue pairs either with flipped order entry if it exists, else with the default gap cost
 	# Also fills in flipped residue-residue scores
 	def create_residue_specific_gapcost(self):
-		newToSubmat = {}
-		for pair in self.submat.keys():
-			if pair[0] == '-' and pair[1] == '-':
-				# do nothing, this is useless and shouldn't happen
-				pass
-			elif pair[0] == '-' or pair[1] == '-':
-				# Note that the given residue has an associated gap cost
-				if pair[0] == '-' and (pair[1],'-') not in self.submat.keys():
-					newToSubmat[pair[1],'-'] = self.submat[pair]
-				elif pair[1] == '-' and (pair[1],'-') not in self.submat.keys():
-					newToSubmat[pair[1],'-'] = self.submat[pair]
-			else:
-				# Fill the residueDict so none are missed
-				if (pair[0],'-') not in self.submat.keys() and ('-',pair[0]) not in self.submat.keys():
-					newToSubmat[pair[0],'-'] = self.costs['gap']
-					newToSubmat['-',pair[0]] = self.costs['gap']
-				if (pair[1],'-') not in self.submat.keys() and ('-',pair[1]) not in self.submat.keys():
-					newToSubmat[pair[1],'-'] = self.costs['gap']
-					newToSubmat['-',pair[1]] = self.costs['gap']
-				if (pair[1],pair[0]) not in self.submat.keys():
-					newToSubmat[pair[1],pair[0]] = self.submat[pair]
-		for pair in newToSubmat.keys():
-			self.submat[pair] = newToSubmat[pair]
+		create_residue_specific_gapcost(self.submat, self.costs['gap'])
 	
 	# return top (highest) alignment score given sequence 1 and 2
 	def get_top_score(self):
@@ -137,7 +132,7 @@ class NeedlemanWunsch():
 			# The prior position assuming a gap (index based on m)
 			gapPosi = TADict[i-1]
 			# Case where this is the last T; handle sentinal and get cost of front-gap
-			if TADict[i-1] is -1:
+			if TADict[i-1] == -1:
 				gapPosi = 0
 			gapCostMajor = TADict[str(i-1)] # Cost of the gap from the T-node up to the A-node
 			gapCostStart = get_gapcost(seq1[gapPosi],self.submat) # Cost of the A-node that starts the gap
@@ -146,8 +141,8 @@ class NeedlemanWunsch():
 			gapScoreGapFinish,isExtend = self.determine_open_extend(gapPosi,j,m,directionM,dirScoreM,gapCostMajor+gapCostStart,gapDirection)
 
 			# If seq2 character is C-type, determine whether to match T-paired A and C, or to just gap the A
-			# This will not happen if this is the last T (TADict[i-1] is -1), as the whole sequence must be gapped
-			if self.nodeTypes[seq2[j-1]] == 'C' and TADict[i-1] is not -1:
+			# This will not happen if this is the last T (TADict[i-1] == -1), as the whole sequence must be gapped
+			if self.nodeTypes[seq2[j-1]] == 'C' and TADict[i-1] != -1:
 				# Calculate the total gap cost assuming the associated A-node matches a C-node
 				ACScore = get_score(seq1[gapPosi],seq2[j-1],self.submat)
 				gapScoreACFinish = m[gapPosi][j-1] + gapCostMajor + ACScore + self.costs['gapopen']
@@ -172,12 +167,20 @@ class NeedlemanWunsch():
 
 	# Execute alignment
 	def _aligner(self):
+		self._fill()
+		self._traceback()
+
+	# Fill in the score, direction and gap matrices
+	def _fill(self):
 		l1, l2 = len(self.seq1.seq), len(self.seq2.seq)	
-		self.scoreMat = numpy.zeros((l1+1, l2+1)) # create matrix for storing counts
-		self.directionMat = numpy.zeros((l1+1, l2+1))
-		# Each position contains a 2-tuple of the respective gap score and True if the gap is a continuation, False if it is new
-		self.leftMat = numpy.zeros((l1+1, l2+1), dtype=('f16,b1')) 
-		self.upMat = numpy.zeros((l1+1, l2+1), dtype=('f16,b1'))
+		if self.workspace is None:
+			self.scoreMat = numpy.zeros((l1+1, l2+1)) # create matrix for storing counts
+			self.directionMat = numpy.zeros((l1+1, l2+1))
+			# Each position contains a 2-tuple of the respective gap score and True if the gap is a continuation, False if it is new
+			self.leftMat = numpy.zeros((l1+1, l2+1), dtype=('f16,b1')) 
+			self.upMat = numpy.zeros((l1+1, l2+1), dtype=('f16,b1'))
+		else: # views on the workspace buffers, with a zeroed first row and column
+			self.scoreMat, self.directionMat, self.leftMat, self.upMat, self.backPos = self.workspace.get_matrices(l1, l2)
 		self.scoreMat[0][0] = 0
 		for i in range(1, l1 + 1): # set each row by the desired gap
 			self.scoreMat[i][0] = self.costs['gap'] * i + self.costs['gapopen']
@@ -221,22 +224,37 @@ class NeedlemanWunsch():
 					self.directionMat[i][j] = 2
 					self.backPos[i,j] = upi,upj
 					#out('UP')
-		
-		i, j = l1, l2 # for trace-back process 
+
+	# Direction chosen at a cell: diag(0), left(1) or up(2)
+	def get_direction(self, i, j):
+		return self.directionMat[i][j]
+
+	# Whether the gap of a cell in a direction, left(1) or up(2), continues the gap of its prior position
+	def is_extension(self, i, j, gapDirection):
+		if gapDirection == 1:
+			return self.leftMat[i,j][1]
+		return self.upMat[i,j][1]
+
+	# The backtrace position of a cell
+	def get_back_position(self, i, j):
+		return self.backPos[i,j]
+
+	# Walk back from the last cell to assemble the alignment strings
+	def _traceback(self):
+		i, j = len(self.seq1.seq), len(self.seq2.seq) # for trace-back process 
 		keepGapping = 0
 		while i > 0 and j > 0: # walk-back to the index [0][0] of the m
 			# if score is a gap in sequence 2 (direction is 1), only walk back on i
-			if keepGapping == 1 or keepGapping == 0 and self.directionMat[i][j] == 1:
+			if keepGapping == 1 or keepGapping == 0 and self.get_direction(i, j) == 1:
 				# Check whether the choice of gapping left requires the leftward position to also gap left
-				if self.leftMat[i,j][1]:
+				if self.is_extension(i, j, 1):
 					keepGapping = 1
 				else:
 					keepGapping = 0
 					
 				# If the node being gapped is a T-node, appropriately gap the entire subtree
 				if self.nodeTypes[self.seq1.seq[i-1]] == 'T':
-					previ = self.backPos[i,j][0]
-					prevj = self.backPos[i,j][1]
+					previ, prevj = self.get_back_position(i, j)
 					while i > previ+1: # Walk back with gaps until the one position greater than the final position
 						self.align1 += self.seq1.seq[i-1]
 						self.align2 += '-'
@@ -256,16 +274,15 @@ class NeedlemanWunsch():
 					self.align2 += '-'
 					i -= 1
 			# if score is a gap in sequence 1 (direction is 2), only walk back on j
-			elif keepGapping == 2 or keepGapping == 0 and self.directionMat[i][j] == 2:
+			elif keepGapping == 2 or keepGapping == 0 and self.get_direction(i, j) == 2:
 				# Check whether the choice of gapping up requires the leftward position to also gap up
-				if self.upMat[i,j][1]:
+				if self.is_extension(i, j, 2):
 					keepGapping = 2
 				else:
 					keepGapping = 0
 					
 				if self.nodeTypes[self.seq2.seq[j-1]] == 'T':
-					previ = self.backPos[i,j][0]
-					prevj = self.backPos[i,j][1]
+					previ, prevj = self.get_back_position(i, j)
 					while j > prevj+1:
 						self.align1 += '-'
 						self.align2 += self.seq2.seq[j-1]
@@ -284,7 +301,7 @@ class NeedlemanWunsch():
 					self.align2 += self.seq2.seq[j-1]
 					j -= 1
 			# if the score is a match, walk-back one index in both i and j
-			elif self.directionMat[i][j] == 0:
+			elif self.get_direction(i, j) == 0:
 				keepGapping = 0
 				self.align1 += self.seq1.seq[i-1]
 				self.align2 += self.seq2.seq[j-1]
@@ -304,6 +321,908 @@ class NeedlemanWunsch():
 		self.align1 = self.align1[::-1]
 		self.align2 = self.align2[::-1]
 
+# Counters and phase timings (seconds) of the instrumented alignments of this process, summed over
+# alignments until collected by get_dp_stats
+DP_COUNTERS = ('alignments', 'cells', 'cellsMatch', 'cellsLeft', 'cellsUp', 'gapOpens', 'gapExtends',
+		'cGaps', 'subtreeJumps', 'subtreeJumpNodes', 'acEvaluations', 'acMatches', 'tracebackSteps',
+		'tracebackGaps', 'setupTime', 'fillTime', 'tracebackTime')
+_dpStats = dict.fromkeys(DP_COUNTERS, 0)
+
+# Get the summed statistics of the instrumented alignments, optionally resetting them
+def get_dp_stats(reset=False):
+	stats = dict(_dpStats)
+	if reset:
+		for k in _dpStats:
+			_dpStats[k] = 0
+	return stats
+
+# NeedlemanWunsch counting the branches taken by the dynamic programming and timing its phases (setup,
+# fill and traceback). The counting lives in this subclass only, so NeedlemanWunsch itself is unaffected
+# Gap opens and extends, C-node gaps, subtree jumps and A-C evaluations count every evaluation made
+# during the fill; cells count the branch chosen at each cell
+class InstrumentedNeedlemanWunsch(NeedlemanWunsch):
+	def __init__(self, s1, s2, costs, submat, nodeTypes, workspace=None):
+		self.counts = dict.fromkeys(DP_COUNTERS, 0)
+		started = time.perf_counter()
+		NeedlemanWunsch.__init__(self, s1, s2, costs, submat, nodeTypes, workspace)
+		total = time.perf_counter() - started
+		self.counts['alignments'] = 1
+		self.counts['setupTime'] = total - self.counts['fillTime'] - self.counts['tracebackTime']
+		for k in DP_COUNTERS:
+			_dpStats[k] += self.counts[k]
+
+	def determine_open_extend(self,i,j,m,directionM,dirScoreM,currentGapCost,gapDirection):
+		scoreExtendPair = NeedlemanWunsch.determine_open_extend(self,i,j,m,directionM,dirScoreM,currentGapCost,gapDirection)
+		if scoreExtendPair[1]:
+			self.counts['gapExtends'] += 1
+		else:
+			self.counts['gapOpens'] += 1
+		return scoreExtendPair
+
+	def calculate_gap(self,i,j,seq1,seq2,m,directionM,dirScoreM,TADict,gapDirection):
+		gap = NeedlemanWunsch.calculate_gap(self,i,j,seq1,seq2,m,directionM,dirScoreM,TADict,gapDirection)
+		nodeType = self.nodeTypes[seq1[i-1]]
+		if nodeType == 'C':
+			self.counts['cGaps'] += 1
+		elif nodeType == 'T':
+			self.counts['subtreeJumps'] += 1
+			self.counts['subtreeJumpNodes'] += i - gap[1] # nodes gapped by the jump
+			if self.nodeTypes[seq2[j-1]] == 'C' and TADict[i-1] != -1:
+				self.counts['acEvaluations'] += 1
+				if gap[2] == j - 1: # the A-C match was chosen
+					self.counts['acMatches'] += 1
+		return gap
+
+	def _aligner(self):
+		started = time.perf_counter()
+		self._fill()
+		filled = time.perf_counter()
+		self._traceback()
+		self.counts['fillTime'] = filled - started
+		self.counts['tracebackTime'] = time.perf_counter() - filled
+		l1, l2 = len(self.seq1.seq), len(self.seq2.seq)
+		directions = self.directionMat[1:l1+1, 1:l2+1]
+		self.counts['cells'] = l1 * l2
+		self.counts['cellsMatch'] = int(numpy.count_nonzero(directions == 0))
+		self.counts['cellsLeft'] = int(numpy.count_nonzero(directions == 1))
+		self.counts['cellsUp'] = int(numpy.count_nonzero(directions == 2))
+		self.counts['tracebackSteps'] = len(self.align1)
+		self.counts['tracebackGaps'] = self.align1.count('-') + self.align2.count('-')
+
+# Flags of a cell of the compact layout, packed into one byte: the direction chosen (2 bits), whether
+# the left and up gaps continue the gap of their prior position, and whether the left and up gaps of a
+# T-node end with its A-node matched to a C-node (the prior position is then one back on the other sequence)
+DIRECTION_MASK = 3
+LEFT_EXTEND = 4
+UP_EXTEND = 8
+LEFT_AC = 16
+UP_AC = 32
+
+# Get the array typecode of the compact layout for a pair of the given lengths: 'h' (int16) or 'i'
+# (int32), whichever holds every score. A score sums at most one cost per node of either sequence plus
+# a gap open per step, so bounding it needs no pass over the matrix. None if the costs or matrix
+# aren't integers, or the bound overflows int32; such pairs are aligned in floating point
+def compact_layout(l1, l2, costs, submat):
+	values = [costs['gap'], costs['gapopen']] + list(submat.values())
+	if not all([float(v).is_integer() for v in values]):
+		return None
+	bound = (l1 + l2 + 1) * (max([abs(v) for v in values]) + abs(costs['gapopen']))
+	for typecode in ('h', 'i'):
+		if bound < 2 ** (8 * array.array(typecode).itemsize - 1) - 1:
+			return typecode
+	return None
+
+# The setup of a pair for the compact fill, as plain lists and integers: per node of either sequence its
+# type and gap cost and, per T-node, the position its gap returns to (0 for the last T), whether it is
+# the last T and the cost of the gap up to its A. noGap stands for a gap score of NaN (can't gap)
+def compact_setup(s1, s2, costs, submat, nodeTypes, TADict1, TADict2, typecode):
+	submat = {pair: int(v) for pair, v in submat.items()}
+	setup = {'s1': s1, 's2': s2, 'submat': submat, 'gap': int(costs['gap']), 'gapopen': int(costs['gapopen']),
+		'noGap': -2 ** (8 * array.array(typecode).itemsize - 1)}
+	for k, seq, TADict in (('1', s1, TADict1), ('2', s2, TADict2)):
+		types = [nodeTypes[c] for c in seq]
+		setup['types'+k] = types
+		setup['gaps'+k] = [submat[c, '-'] for c in seq]
+		setup['partners'+k] = [max(TADict[i], 0) if types[i] == 'T' else None for i in range(len(seq))]
+		setup['lasts'+k] = [TADict[i] == -1 if types[i] == 'T' else None for i in range(len(seq))]
+		setup['majors'+k] = [int(TADict[str(i)]) if types[i] == 'T' else None for i in range(len(seq))]
+	return setup
+
+# Set the first row and column of the compact scores
+def init_compact_scores(setup, score, l1, l2):
+	width = l2 + 1
+	for i in range(1, l1 + 1):
+		score[i * width] = setup['gap'] * i + setup['gapopen']
+	for j in range(1, l2 + 1):
+		score[j] = setup['gap'] * j + setup['gapopen']
+
+# Allocate a pair's compact arrays, with the first row and column of scores set; the up gap scores are
+# only kept for the current row
+def new_compact_arrays(setup, l1, l2, typecode):
+	width = l2 + 1
+	score = array.array(typecode, bytes(array.array(typecode).itemsize * width * (l1 + 1)))
+	left = array.array(typecode, [setup['noGap']]) * (width * (l1 + 1))
+	flags = array.array('B', bytes(width * (l1 + 1)))
+	init_compact_scores(setup, score, l1, l2)
+	up = [setup['noGap']] * width
+	return score, left, flags, up
+
+# Fill a pair's compact arrays row by row
+def fill_compact(setup, l1, l2, typecode):
+	score, left, flags, up = new_compact_arrays(setup, l1, l2, typecode)
+	fill_region(setup, score, left, up, flags, l2 + 1, 1, l1 + 1, 1, l2 + 1, False)
+	return score, left, flags
+
+# Fill the cells [i0, i1) x [j0, j1) of the compact arrays (flat, rows of the given width): the recurrence
+# of NeedlemanWunsch._fill, calculate_gap and determine_open_extend on integers. A cell only reads cells
+# of rows and columns up to its own, i.e. of the region or of regions above and to the left of it.
+# The up gap scores are a full matrix if fullUp, else one row
+def fill_region(setup, score, left, up, flags, width, i0, i1, j0, j1, fullUp):
+	s1, s2, submat, gapopen, noGap = setup['s1'], setup['s2'], setup['submat'], setup['gapopen'], setup['noGap']
+	types1, gaps1, types2, gaps2 = setup['types1'], setup['gaps1'], setup['types2'], setup['gaps2']
+	partners2, lasts2, majors2 = setup['partners2'], setup['lasts2'], setup['majors2']
+	for i in range(i0, i1):
+		t1, c1 = types1[i-1], s1[i-1]
+		row, prior = i * width, (i - 1) * width
+		urow = row if fullUp else 0 # up gap scores of this row
+		if t1 == 'T':
+			p1, last1, major1 = setup['partners1'][i-1], setup['lasts1'][i-1], setup['majors1'][i-1]
+			jump1 = p1 * width
+		for j in range(j0, j1):
+			t2, c2 = types2[j-1], s2[j-1]
+			cell = 0
+			if (t1 == 'T') != (t2 == 'T') or (t1 == 'C' and t2 == 'A') or (t1 == 'A' and t2 == 'C'):
+				match = None
+			else:
+				match = score[prior + j - 1] + submat[c1, c2]
+
+			# Gapping left (over sequence 1)
+			if t1 == 'C':
+				cost = gaps1[i-1]
+				leftScore = score[prior + j] + cost + gapopen
+				if left[prior + j] != noGap and left[prior + j] + cost > leftScore:
+					leftScore = left[prior + j] + cost
+					cell |= LEFT_EXTEND
+				left[row + j] = leftScore
+			elif t1 == 'T':
+				cost = major1 + gaps1[p1]
+				leftScore = score[jump1 + j] + cost + gapopen
+				if left[jump1 + j] != noGap and left[jump1 + j] + cost > leftScore:
+					leftScore = left[jump1 + j] + cost
+					cell |= LEFT_EXTEND
+				if t2 == 'C' and not last1:
+					acScore = score[jump1 + j - 1] + major1 + submat[s1[p1], c2] + gapopen
+					if acScore >= leftScore:
+						leftScore = acScore
+						cell = (cell & ~LEFT_EXTEND) | LEFT_AC
+				left[row + j] = leftScore
+			else:
+				leftScore = None
+
+			# Gapping up (over sequence 2)
+			if t2 == 'C':
+				cost = gaps2[j-1]
+				upScore = score[row + j - 1] + cost + gapopen
+				if up[urow + j - 1] != noGap and up[urow + j - 1] + cost > upScore:
+					upScore = up[urow + j - 1] + cost
+					cell |= UP_EXTEND
+				up[urow + j] = upScore
+			elif t2 == 'T':
+				p2 = partners2[j-1]
+				cost = majors2[j-1] + gaps2[p2]
+				upScore = score[row + p2] + cost + gapopen
+				if up[urow + p2] != noGap and up[urow + p2] + cost > upScore:
+					upScore = up[urow + p2] + cost
+					cell |= UP_EXTEND
+				if t1 == 'C' and not lasts2[j-1]:
+					acScore = score[prior + p2] + majors2[j-1] + submat[s2[p2], c1] + gapopen
+					if acScore >= upScore:
+						upScore = acScore
+						cell = (cell & ~UP_EXTEND) | UP_AC
+				up[urow + j] = upScore
+			else:
+				upScore = None
+				up[urow + j] = noGap
+
+			if match is not None and (leftScore is None or match >= leftScore) and (upScore is None or match >= upScore):
+				score[row + j] = match
+			elif leftScore is not None and (upScore is None or leftScore >= upScore):
+				score[row + j] = leftScore
+				cell |= 1
+			else:
+				score[row + j] = upScore
+				cell |= 2
+			flags[row + j] = cell
+
+# Tiling of the compact fill of large pairs (intra-pair parallelism): the most processes of a pair,
+# the minimum cells of a pair to tile, and the rows and columns of a tile
+_tiling = {'workers': 1, 'minCells': 4000000, 'tileSize': 256}
+_tilePool = None
+_tileSerial = 0 # alignments tiled by this process
+
+# CPUs of a run shared by the processes of its pool (set_cpu_budget): a shared count of the CPUs in use,
+# and their total. Busy workers hold one each, and a tiled pair runs as many tiles at once as it holds
+# CPUs, its worker's own (idle while the tiles run) and those it claims of idle workers. None outside
+# such a pool, where a tiled pair runs as many tiles at once as the tiling has processes
+_cpuBudget = None
+
+# Share a run's CPU budget with this (pool) process: a multiprocessing Value counting the CPUs in use
+def set_cpu_budget(inUse, total):
+	global _cpuBudget
+	_cpuBudget = (inUse, total)
+
+# Claim up to wanted CPUs of the budget, at least least however many are in use; returns the number claimed
+def claim_cpus(wanted, least=0):
+	if _cpuBudget is None:
+		return wanted
+	inUse, total = _cpuBudget
+	with inUse.get_lock():
+		granted = max(least, min(wanted, total - inUse.value))
+		inUse.value += granted
+	return granted
+
+def release_cpus(count):
+	if _cpuBudget is not None and count > 0:
+		inUse, total = _cpuBudget
+		with inUse.get_lock():
+			inUse.value -= count
+
+# Set the tiling of this process's compact alignments; 1 worker doesn't tile
+def set_tiling(workers, minCells=4000000, tileSize=256):
+	if workers != _tiling['workers']:
+		close_tile_pool()
+	_tiling.update({'workers': workers, 'minCells': minCells, 'tileSize': tileSize})
+
+def get_tile_pool():
+	global _tilePool
+	if _tilePool is None:
+		_tilePool = concurrent.futures.ProcessPoolExecutor(_tiling['workers'])
+	return _tilePool
+
+# Shut the tile pool down. A pool process (e.g. a contraster worker) must do so before it exits, as
+# it would otherwise wait on the tile pool's processes at exit
+def close_tile_pool():
+	global _tilePool
+	if _tilePool is not None:
+		_tilePool.shutdown()
+		_tilePool = None
+
+# Byte offsets of the score, left, up and flag arrays of a pair in its shared file, and its size
+def tile_offsets(cells, typecode):
+	itemsize = array.array(typecode).itemsize
+	return [0, cells * itemsize, 2 * cells * itemsize, 3 * cells * itemsize], cells * (3 * itemsize + 1)
+
+# Fill a pair's compact arrays over the tile pool. The arrays (with a full matrix of up gap scores,
+# as a tile reads those of tiles to its left) are in a file shared with the workers, on /dev/shm where
+# available. A tile depends on the tiles above and to its left (the diagonal, left and up moves and the
+# T-node jumps only read earlier rows and columns), so the tiles run as a wavefront: a tile is
+# submitted once the tiles above and left of it are complete, and a CPU of the budget is held for it
+def fill_tiled(setup, l1, l2, typecode):
+	width = l2 + 1
+	cells = width * (l1 + 1)
+	offsets, size = tile_offsets(cells, typecode)
+	handle, fname = tempfile.mkstemp(prefix='tsga-', suffix='.tiles', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+	try:
+		os.ftruncate(handle, size)
+		dtype = numpy.int16 if typecode == 'h' else numpy.int32
+		shared = numpy.memmap(fname, dtype=numpy.uint8, mode='r+', shape=(size,))
+		score = shared[offsets[0]:offsets[1]].view(dtype) # zeros, as the file was extended
+		init_compact_scores(setup, score, l1, l2)
+		shared[offsets[1]:offsets[3]].view(dtype)[:] = setup['noGap'] # left and up
+		shared.flush()
+		del score
+
+		global _tileSerial
+		_tileSerial += 1
+		key = (os.getpid(), _tileSerial)
+		pickled = pickle.dumps(setup, pickle.HIGHEST_PROTOCOL)
+		tileSize = _tiling['tileSize']
+		rows = [(i, min(i + tileSize, l1 + 1)) for i in range(1, l1 + 1, tileSize)]
+		cols = [(j, min(j + tileSize, l2 + 1)) for j in range(1, l2 + 1, tileSize)]
+		pool = get_tile_pool()
+		done = set()
+		running = {}
+		ready = [(0, 0)] if len(rows) > 0 and len(cols) > 0 else []
+		claimed = 0 # CPUs claimed besides the worker's own
+		try:
+			while len(running) + len(ready) > 0:
+				wanted = min(len(running) + len(ready), _tiling['workers']) - 1 - claimed
+				if wanted > 0: # CPUs freed by workers since, up to the tiles which could run
+					claimed += claim_cpus(wanted)
+				while len(ready) > 0 and len(running) < 1 + claimed:
+					I, J = ready.pop(0)
+					running[pool.submit(fill_tile, key, fname, typecode, pickled, width, cells, rows[I], cols[J])] = (I, J)
+				finished, pending = concurrent.futures.wait(list(running), return_when=concurrent.futures.FIRST_COMPLETED)
+				for future in finished:
+					I, J = running.pop(future)
+					future.result() # raises a tile's error, e.g. OverflowError
+					done.add((I, J))
+					if I + 1 < len(rows) and (J == 0 or (I + 1, J - 1) in done):
+						ready.append((I + 1, J))
+					if J + 1 < len(cols) and (I == 0 or (I - 1, J + 1) in done):
+						ready.append((I, J + 1))
+		finally:
+			concurrent.futures.wait(list(running)) # before the file is removed
+			release_cpus(claimed)
+		shared = numpy.memmap(fname, dtype=numpy.uint8, mode='r', shape=(size,))
+		arrays = bytearray(shared[offsets[0]:offsets[1]]), bytearray(shared[offsets[1]:offsets[2]]), \
+			bytearray(shared[offsets[3]:size])
+		del shared
+		return arrays
+	finally:
+		os.close(handle)
+		os.remove(fname)
+
+# The setup of the pair last filled by this (tile worker) process, by its key (the process tiling it
+# and its alignment number there)
+_tileSetup = (None, None)
+
+# Fill a tile of a pair's shared compact arrays
+def fill_tile(key, fname, typecode, pickled, width, cells, rows, cols):
+	global _tileSetup
+	if _tileSetup[0] != key:
+		_tileSetup = (key, pickle.loads(pickled))
+	setup = _tileSetup[1]
+	offsets, size = tile_offsets(cells, typecode)
+	with open(fname, 'r+b') as handle:
+		shared = mmap.mmap(handle.fileno(), size)
+	view = memoryview(shared)
+	arrays = [view[offsets[0]:offsets[1]].cast(typecode), view[offsets[1]:offsets[2]].cast(typecode),
+		view[offsets[2]:offsets[3]].cast(typecode), view[offsets[3]:size]]
+	try:
+		fill_region(setup, arrays[0], arrays[1], arrays[2], arrays[3], width, rows[0], rows[1], cols[0], cols[1], True)
+	except ValueError: # a score out of the layout's range
+		raise OverflowError('Score out of range of the compact layout')
+	finally:
+		for a in arrays:
+			a.release()
+		view.release()
+		shared.close()
+
+# NeedlemanWunsch storing integer scores (int16 or int32) and one byte of flags per cell: about 5 or 9
+# bytes per cell rather than about 50. Only the left gap scores are kept per cell, as a T-node's gap
+# reads those of rows above; an up gap only reads gaps of the current row. The backtrace positions
+# are derived from the flags and T-A dictionaries. Scores and alignments equal those of
+# NeedlemanWunsch; pairs without a compact layout, or overflowing it, are aligned by NeedlemanWunsch.
+# self.layout records which ('int16', 'int32' or 'float')
+class CompactNeedlemanWunsch(NeedlemanWunsch):
+	def _aligner(self):
+		self.tiled = False
+		typecode = compact_layout(len(self.seq1.seq), len(self.seq2.seq), self.costs, self.submat)
+		if typecode is not None:
+			try:
+				self._fill_compact(typecode)
+			except OverflowError: # a score out of the layout's range; the bound should prevent it
+				typecode = None
+		if typecode is None:
+			self.layout = 'float'
+			NeedlemanWunsch._aligner(self)
+		else:
+			self.layout = 'int' + str(8 * array.array(typecode).itemsize)
+			self._traceback()
+
+	def get_top_score(self):
+		if self.layout == 'float':
+			return NeedlemanWunsch.get_top_score(self)
+		return numpy.float64(self.scoreMat[-1][-1]) # as NeedlemanWunsch reports it
+
+	# Fill in the scores, left gap scores and flags; over a pool of processes, tile by tile, for a pair of
+	# at least the tiling's minimum cells (see set_tiling)
+	def _fill_compact(self, typecode):
+		l1, l2 = len(self.seq1.seq), len(self.seq2.seq)
+		setup = compact_setup(self.seq1.seq, self.seq2.seq, self.costs, self.submat, self.nodeTypes, self.TADict1,
+					self.TADict2, typecode)
+		self.tiled = _tiling['workers'] > 1 and (l1+1) * (l2+1) >= _tiling['minCells']
+		if self.tiled:
+			score, left, flags = fill_tiled(setup, l1, l2, typecode)
+		else:
+			score, left, flags = fill_compact(setup, l1, l2, typecode)
+		dtype = numpy.int16 if typecode == 'h' else numpy.int32
+		self.scoreMat = numpy.frombuffer(score, dtype=dtype).reshape((l1+1, l2+1))
+		self.leftMat = numpy.frombuffer(left, dtype=dtype).reshape((l1+1, l2+1))
+		self.flagMat = numpy.frombuffer(flags, dtype=numpy.uint8).reshape((l1+1, l2+1))
+
+	def get_direction(self, i, j):
+		if self.layout == 'float':
+			return NeedlemanWunsch.get_direction(self, i, j)
+		return self.flagMat[i][j] & DIRECTION_MASK
+
+	def is_extension(self, i, j, gapDirection):
+		if self.layout == 'float':
+			return NeedlemanWunsch.is_extension(self, i, j, gapDirection)
+		return (self.flagMat[i][j] & (LEFT_EXTEND if gapDirection == 1 else UP_EXTEND)) != 0
+
+	# The position NeedlemanWunsch._fill records for the direction chosen at a cell
+	def get_back_position(self, i, j):
+		if self.layout == 'float':
+			return NeedlemanWunsch.get_back_position(self, i, j)
+		cell = self.flagMat[i][j]
+		direction = cell & DIRECTION_MASK
+		if direction == 0:
+			return i-1, j-1
+		if direction == 1:
+			if self.nodeTypes[self.seq1.seq[i-1]] == 'T':
+				return max(self.TADict1[i-1], 0), (j-1 if cell & LEFT_AC else j)
+			return i-1, j
+		if self.nodeTypes[self.seq2.seq[j-1]] == 'T':
+			return (i-1 if cell & UP_AC else i), max(self.TADict2[j-1], 0)
+		return i, j-1
+
+# Whether a pair can be aligned run-length compressed (RunNeedlemanWunsch): without a gap open cost a
+# gap never continues the gap of its prior position, so the scores alone determine the alignment, and
+# with integer costs the closed forms below sum exactly as the cell-by-cell fill does
+def runs_apply(costs, submat):
+	values = [costs['gap'], costs['gapopen']] + list(submat.values())
+	return costs['gapopen'] == 0 and all([float(v).is_integer() for v in values])
+
+# Split a sequence into its segments: the maximal runs of one C-node character, and each other node on
+# its own. Returns the (start, end) positions of the segments, end exclusive
+def run_segments(seq, nodeTypes):
+	segments = []
+	start = 0
+	for k in range(1, len(seq) + 1):
+		if k == len(seq) or seq[k] != seq[start] or nodeTypes[seq[k]] != 'C':
+			segments.append((start, k))
+			start = k
+	return segments
+
+# The last row, M(p,b) for b = 1..q, of a block of two C-runs (p rows of gap cost gx against q columns
+# of gap cost gy, substitution score s) given its first row T[0..q] and first column L[0..p], T[0] and
+# L[0] being the corner. Inside the block a path of da rows and db columns scores at best
+# f(da,db) = da*gx + db*gy + e*min(da,db), e the gain of a substitution over two gaps, so M(p,b) is the
+# best of the paths from the first row, T[b'] + f(p,b-b'), from the first column, L[a'] + f(p-a',b),
+# and from the corner, T[0] + s + f(p-1,b-1). Splitting each where min(da,db) switches leaves running
+# maxima: O(p+q) rather than the O(p*q) of the cells. The last column is that of the transposed block
+def run_block_row(T, L, p, q, gx, gy, s):
+	e = max(0, s - gx - gy)
+	none = float('-inf')
+	# From the first column: a' >= p-b (da <= b) is a suffix of 1..p, a' < p-b a prefix
+	suffix = [none] * (p + 2)
+	for a in range(p, 0, -1):
+		suffix[a] = max(suffix[a+1], L[a] + (p - a) * (gx + e))
+	prefix = [none] * (p + 1)
+	for a in range(1, p + 1):
+		prefix[a] = max(prefix[a-1], L[a] + (p - a) * gx)
+	# From the first row: b' <= b-p (db >= p) is a prefix of 1..b, b' > b-p a window of p columns
+	rowPrefix = [none] * (q + 1)
+	for b in range(1, q + 1):
+		rowPrefix[b] = max(rowPrefix[b-1], T[b] - b * gy)
+	window = collections.deque() # columns of the window, by decreasing T[b'] - b'*(gy+e)
+	last = []
+	for b in range(1, q + 1):
+		value = T[b] - b * (gy + e)
+		while window and T[window[-1]] - window[-1] * (gy + e) <= value:
+			window.pop()
+		window.append(b)
+		while window[0] <= b - p:
+			window.popleft()
+		best = T[0] + s + (p - 1) * gx + (b - 1) * gy + e * min(p - 1, b - 1)
+		best = max(best, T[window[0]] - window[0] * (gy + e) + p * gx + b * (gy + e))
+		if b > p:
+			best = max(best, rowPrefix[b-p] + p * gx + b * gy + e * p)
+		best = max(best, suffix[max(1, p - b)] + b * gy)
+		if p - b > 1:
+			best = max(best, prefix[p-b-1] + b * (gy + e))
+		last.append(best)
+	return last
+
+# NeedlemanWunsch over run-length compressed sequences: each maximal run of one C-node character is a
+# segment, as is each other node, and the matrix is filled block by block (segment against segment).
+# Only the scores of the rows and columns ending a segment are stored; a block of two C-runs has a
+# uniform recurrence and is filled in closed form (run_block_row), the other blocks are a single row or
+# column and filled cell by cell. The traceback evaluates the cells it visits, refilling the blocks of
+# two C-runs it passes through. Scores and alignments equal those of NeedlemanWunsch; pairs to which
+# runs_apply doesn't apply are aligned by NeedlemanWunsch. self.cells and self.blocks record the size
+# of the matrix and of the compressed one
+class RunNeedlemanWunsch(NeedlemanWunsch):
+	def _aligner(self):
+		l1, l2 = len(self.seq1.seq), len(self.seq2.seq)
+		self.cells = l1 * l2
+		self.runs = runs_apply(self.costs, self.submat)
+		if not self.runs:
+			self.blocks = self.cells
+			NeedlemanWunsch._aligner(self)
+			return
+		self._fill_runs()
+		self._traceback()
+
+	def get_top_score(self):
+		if not self.runs:
+			return NeedlemanWunsch.get_top_score(self)
+		return numpy.float64(self.rows[-1][-1]) # as NeedlemanWunsch reports it
+
+	def _fill_runs(self):
+		s1, s2 = self.seq1.seq, self.seq2.seq
+		l1, l2 = len(s1), len(s2)
+		self.setup = compact_setup(s1, s2, self.costs, self.submat, self.nodeTypes, self.TADict1, self.TADict2, 'i')
+		self.segments1, self.segments2 = run_segments(s1, self.nodeTypes), run_segments(s2, self.nodeTypes)
+		self.blocks = len(self.segments1) * len(self.segments2)
+		# The segment of each row and column
+		self.segmentOf1, self.segmentOf2 = [None] * (l1 + 1), [None] * (l2 + 1)
+		for segments, segmentOf in ((self.segments1, self.segmentOf1), (self.segments2, self.segmentOf2)):
+			for k, (start, end) in enumerate(segments):
+				segmentOf[start+1:end+1] = [k] * (end - start)
+		# Scores of the rows and columns ending a segment, the first row and column set by the gap
+		gap = self.setup['gap']
+		self.rows, self.columns = [None] * (l1 + 1), [None] * (l2 + 1)
+		self.rows[0] = [gap * j for j in range(l2 + 1)]
+		self.columns[0] = [gap * i for i in range(l1 + 1)]
+		for start, end in self.segments1:
+			self.rows[end] = [gap * end] + [None] * l2
+		for start, end in self.segments2:
+			self.columns[end] = [gap * end] + [None] * l1
+		self.refilled = {} # blocks of two C-runs refilled by the traceback
+		self.evaluated = None # the cell last evaluated by the traceback, and its evaluation
+		for r0, r1 in self.segments1:
+			for c0, c1 in self.segments2:
+				self._fill_block(r0, r1, c0, c1)
+
+	# Fill the last row and column of a block from its first row and column, which precede it
+	def _fill_block(self, r0, r1, c0, c1):
+		setup = self.setup
+		t1, t2 = setup['types1'][r0], setup['types2'][c0]
+		if t1 == 'C' and t2 == 'C' and (r1 - r0) * (c1 - c0) > 1:
+			T, L = self.rows[r0][c0:c1+1], self.columns[c0][r0:r1+1]
+			s, gx, gy = setup['submat'][setup['s1'][r0], setup['s2'][c0]], setup['gaps1'][r0], setup['gaps2'][c0]
+			self.rows[r1][c0+1:c1+1] = run_block_row(T, L, r1 - r0, c1 - c0, gx, gy, s)
+			self.columns[c1][r0+1:r1+1] = run_block_row(L, T, c1 - c0, r1 - r0, gy, gx, s)
+			return
+		for i in range(r0 + 1, r1 + 1): # a single row or column
+			for j in range(c0 + 1, c1 + 1):
+				score = self._evaluate(i, j)[0]
+				if self.rows[i] is not None:
+					self.rows[i][j] = score
+				if self.columns[j] is not None:
+					self.columns[j][i] = score
+
+	# The score of a cell: stored if it ends a segment of either sequence, else inside a block of two
+	# C-runs, which is refilled
+	def _value(self, i, j):
+		if self.rows[i] is not None:
+			return self.rows[i][j]
+		if self.columns[j] is not None:
+			return self.columns[j][i]
+		u, v = self.segmentOf1[i], self.segmentOf2[j]
+		(r0, r1), (c0, c1) = self.segments1[u], self.segments2[v]
+		if (u, v) not in self.refilled:
+			setup = self.setup
+			s, gx, gy = setup['submat'][setup['s1'][r0], setup['s2'][c0]], setup['gaps1'][r0], setup['gaps2'][c0]
+			block = [self.rows[r0][c0:c1+1]]
+			for a in range(r0 + 1, r1 + 1):
+				row = [self.columns[c0][a]]
+				for b in range(1, c1 - c0 + 1):
+					row.append(max(block[-1][b-1] + s, block[-1][b] + gx, row[-1] + gy))
+				block.append(row)
+			self.refilled[u, v] = block
+		return self.refilled[u, v][i-r0][j-c0]
+
+	# The recurrence of NeedlemanWunsch._fill and calculate_gap at a cell, without a gap open cost:
+	# its score, direction and backtrace position
+	def _evaluate(self, i, j):
+		setup, value = self.setup, self._value
+		t1, t2, c1, c2 = setup['types1'][i-1], setup['types2'][j-1], setup['s1'][i-1], setup['s2'][j-1]
+		if (t1 == 'T') != (t2 == 'T') or (t1 == 'C' and t2 == 'A') or (t1 == 'A' and t2 == 'C'):
+			match = None
+		else:
+			match = value(i-1, j-1) + setup['submat'][c1, c2]
+		# Gapping left (over sequence 1)
+		if t1 == 'C':
+			left, leftBack = value(i-1, j) + setup['gaps1'][i-1], (i-1, j)
+		elif t1 == 'T':
+			p1, major = setup['partners1'][i-1], setup['majors1'][i-1]
+			left, leftBack = value(p1, j) + major + setup['gaps1'][p1], (p1, j)
+			if t2 == 'C' and not setup['lasts1'][i-1]:
+				acScore = value(p1, j-1) + major + setup['submat'][setup['s1'][p1], c2]
+				if acScore >= left:
+					left, leftBack = acScore, (p1, j-1)
+		else:
+			left = None
+		# Gapping up (over sequence 2)
+		if t2 == 'C':
+			up, upBack = value(i, j-1) + setup['gaps2'][j-1], (i, j-1)
+		elif t2 == 'T':
+			p2, major = setup['partners2'][j-1], setup['majors2'][j-1]
+			up, upBack = value(i, p2) + major + setup['gaps2'][p2], (i, p2)
+			if t1 == 'C' and not setup['lasts2'][j-1]:
+				acScore = value(i-1, p2) + major + setup['submat'][setup['s2'][p2], c1]
+				if acScore >= up:
+					up, upBack = acScore, (i-1, p2)
+		else:
+			up = None
+		if match is not None and (left is None or match >= left) and (up is None or match >= up):
+			return match, 0, (i-1, j-1)
+		elif left is not None and (up is None or left >= up):
+			return left, 1, leftBack
+		return up, 2, upBack
+
+	# The traceback's evaluation of a cell, kept as it asks for the direction and then the position
+	def _traceback_cell(self, i, j):
+		if self.evaluated is None or self.evaluated[0] != (i, j):
+			self.evaluated = (i, j), self._evaluate(i, j)
+		return self.evaluated[1]
+
+	def get_direction(self, i, j):
+		if not self.runs:
+			return NeedlemanWunsch.get_direction(self, i, j)
+		return self._traceback_cell(i, j)[1]
+
+	def is_extension(self, i, j, gapDirection):
+		if not self.runs:
+			return NeedlemanWunsch.is_extension(self, i, j, gapDirection)
+		return False # no gap open cost: a new gap always scores at least the continued one
+
+	def get_back_position(self, i, j):
+		if not self.runs:
+			return NeedlemanWunsch.get_back_position(self, i, j)
+		return self._traceback_cell(i, j)[2]
+
+# Bounds of what the nodes left to align can add to a score (ThresholdNeedlemanWunsch). A score sums a
+# substitution score per matched pair and a gap cost (and at most one gap open) per gapped node, so
+# a node adds at most its credit, the larger of its gap cost and half its best substitution score. A
+# node gapped along the first row or column costs the flat gap cost instead of its own, so its gap cost
+# is taken as the larger of the two. Apart, n1 and n2 nodes left match at most min(n1,n2) pairs and gap
+# the others
+class ScoreBounds():
+	def __init__(self, s1, s2, submat, gapopen, gap):
+		best = {}
+		for (a, b), v in submat.items():
+			if a != '-' and b != '-':
+				best[a] = max(best.get(a, v), v)
+		self.credits = {}
+		for (a, b), v in submat.items():
+			if a != '-' and b == '-':
+				self.credits[a] = max(max(v, gap) + max(gapopen, 0), best.get(a, v) / 2.0)
+		self.best = best # best substitution score of each node
+		self.pairMax = max(best.values())
+		self.gapMax = max([max(v, gap) for (a, b), v in submat.items() if a != '-' and b == '-']) + max(gapopen, 0)
+		self.rowsLeft, self.columnsLeft = self.suffix_credits(s1), self.suffix_credits(s2)
+		self.l1, self.l2 = len(s1), len(s2)
+		self.columnNodes = self.l2 - numpy.arange(self.l2 + 1) # nodes of sequence 2 left after each column
+
+	# The credits of the nodes of a sequence from each position on
+	def suffix_credits(self, seq):
+		bounds = numpy.zeros(len(seq) + 1)
+		bounds[:-1] = numpy.cumsum([self.credits[c] for c in seq][::-1])[::-1]
+		return bounds
+
+	# Bound of what the nodes after row r and each column can add
+	def remaining(self, r):
+		n1, n2 = self.l1 - r, self.columnNodes
+		pairs = numpy.minimum(n1, n2)
+		apart = numpy.maximum(pairs * self.pairMax + numpy.abs(n1 - n2) * self.gapMax, (n1 + n2) * self.gapMax)
+		return numpy.minimum(self.rowsLeft[r] + self.columnsLeft, apart)
+
+# CompactNeedlemanWunsch abandoning a pair as soon as its score can't reach a threshold. After each row
+# of the fill the best score a path can still reach is bounded: it leaves the rows filled either from
+# the last one, or by the gap of a T-node below them from the row before its A-node (a subtree open
+# across the rows), whose cost is known. From a cell, the bound is its score plus ScoreBounds.remaining.
+# An abandoned pair has no score or alignment (prettify gives None); the others are aligned as
+# CompactNeedlemanWunsch aligns them, and their scores are exact, reaching the threshold or not. Pairs
+# without a compact layout are filled in full. self.filledRows records the rows filled, and
+# self.lowestBound the lowest bound taken: a pair filled in full would have been abandoned under a
+# threshold of its exact score if that is below it (is_sound), which never happens if the bounds hold
+class ThresholdNeedlemanWunsch(CompactNeedlemanWunsch):
+	def __init__(self, s1, s2, costs, submat, nodeTypes, workspace=None, threshold=None):
+		self.threshold = threshold
+		self.abandoned = False
+		self.filledRows = len(s1.seq)
+		self.lowestBound = float('inf')
+		CompactNeedlemanWunsch.__init__(self, s1, s2, costs, submat, nodeTypes, workspace)
+
+	def get_top_score(self):
+		if self.abandoned:
+			return None
+		return CompactNeedlemanWunsch.get_top_score(self)
+
+	def prettify(self):
+		if self.abandoned:
+			return [None, None, self.seq2.name]
+		return CompactNeedlemanWunsch.prettify(self)
+
+	# Whether a threshold of the exact score would have kept the pair; abandoned pairs have no score to check
+	def is_sound(self):
+		return self.abandoned or self.get_top_score() <= self.lowestBound
+
+	def _traceback(self):
+		if not self.abandoned:
+			CompactNeedlemanWunsch._traceback(self)
+
+	# Fill in the scores, left gap scores and flags row by row, bounding the score after each row
+	def _fill_compact(self, typecode):
+		l1, l2 = len(self.seq1.seq), len(self.seq2.seq)
+		self.tiled = False
+		setup = compact_setup(self.seq1.seq, self.seq2.seq, self.costs, self.submat, self.nodeTypes, self.TADict1,
+					self.TADict2, typecode)
+		score, left, flags, up = new_compact_arrays(setup, l1, l2, typecode)
+		dtype = numpy.int16 if typecode == 'h' else numpy.int32
+		self.scoreMat = numpy.frombuffer(score, dtype=dtype).reshape((l1+1, l2+1))
+		self.leftMat = numpy.frombuffer(left, dtype=dtype).reshape((l1+1, l2+1))
+		self.flagMat = numpy.frombuffer(flags, dtype=numpy.uint8).reshape((l1+1, l2+1))
+		bounds = ScoreBounds(self.seq1.seq, self.seq2.seq, self.submat, setup['gapopen'], self.costs['gap'])
+		# The T-nodes of sequence 1 by the row before their A-node, the outer subtrees first
+		jumps = sorted([(setup['partners1'][i-1], i) for i in range(1, l1 + 1) if setup['types1'][i-1] == 'T'],
+				key=lambda jump: (jump[0], -jump[1]))
+		opened = [] # the subtrees open across the rows filled: (row of the T-node, best bound of those open)
+		nextJump = 0
+		for i in range(l1 + 1):
+			if i > 0:
+				fill_region(setup, score, left, up, flags, l2 + 1, i, i + 1, 1, l2 + 1, False)
+			while len(opened) > 0 and opened[-1][0] <= i:
+				opened.pop()
+			bound = numpy.max(self.scoreMat[i] + bounds.remaining(i))
+			if len(opened) > 0:
+				bound = max(bound, opened[-1][1])
+			if i < l1:
+				self.lowestBound = min(self.lowestBound, bound)
+			if i < l1 and bound < self.threshold:
+				self.abandoned = True
+				self.filledRows = i
+				return
+			while nextJump < len(jumps) and jumps[nextJump][0] == i:
+				opened.append((jumps[nextJump][1], max(self._gap_bound(setup, bounds, jumps[nextJump]),
+										opened[-1][1] if len(opened) > 0 else float('-inf'))))
+				nextJump += 1
+
+	# Bound of the paths gapping a T-node of sequence 1 from the row before its A-node (p, filled), the
+	# A-node gapped or, unless the last T-node, matched to a C-node
+	def _gap_bound(self, setup, bounds, jump):
+		p, t = jump
+		cost = setup['majors1'][t-1] + max(setup['gapopen'], 0)
+		after = bounds.remaining(t)
+		gapFinish = numpy.max(self.scoreMat[p] + setup['gaps1'][p] + after)
+		if setup['lasts1'][t-1] or len(after) == 1:
+			return cost + gapFinish
+		acFinish = numpy.max(self.scoreMat[p][:-1] + bounds.best[setup['s1'][p]] + after[1:])
+		return cost + max(gapFinish, acFinish)
+
+# A minimal sequence record, holding a name and the tree sequence as a string
+class TreeSequence():
+	def __init__(self, name, seq):
+		self.name = name
+		self.seq = seq
+
+# Predicted peak memory (bytes) of aligning sequences of the given lengths; per cell, scoreMat and
+# directionMat take 8 bytes each, leftMat and upMat 17 each ('f16,b1') and the backPos dictionary
+# entry about 270 (two 2-tuples, their integers and the hash table slot, measured as resident memory)
+# In a workspace, backPos is an array of 2 integers per cell instead
+# With a compact layout (typecode), per cell the scores and left gap scores take 2 or 4 bytes each and
+# the flags 1; tiled, the shared file adds a full matrix of up gap scores to a copy of these
+def predict_memory(l1, l2, workspace=False, layout=None, tiled=False):
+	if layout is not None:
+		itemsize = array.array(layout).itemsize
+		if tiled:
+			return (l1+1) * (l2+1) * (5 * itemsize + 2)
+		return (l1+1) * (l2+1) * (2 * itemsize + 1)
+	if workspace:
+		return (l1+1) * (l2+1) * (8 + 8 + 17 + 17 + 16)
+	return (l1+1) * (l2+1) * 320
+
+# Reusable state for the alignments of one worker: matrix buffers which are grown geometrically to
+# the largest pair seen, and the setup which doesn't depend on the pair (node types, the completed
+# substitution matrix and the T-A dictionary of each sequence)
+class AlignmentWorkspace():
+	def __init__(self):
+		self.capacity = 0 # number of cells each buffer can hold
+		self.buffers = None # flat score, direction, left, up and backtrace buffers
+		self.nodeTypes = {} # residue to node-type dictionaries, per node type specification
+		self.submat = None # the completed substitution matrix
+		self.submatSource = None # the last substitution matrix given, i.e. the one completed
+		self.submatKey = None # the contents of the substitution matrix before completion, and the gap cost
+		self.taDicts = {} # T-A dictionaries per sequence, for the current substitution matrix
+		self.sequences = {} # plain string copies of the sequence records
+		self.counters = {'alignments': 0, 'bufferAllocations': 0, 'allocationsAvoided': 0,
+				'nodeTypesReused': 0, 'submatReused': 0, 'taDictsBuilt': 0, 'taDictsReused': 0,
+				'sequencesReused': 0}
+
+	# Get a copy of a sequence record whose sequence is a plain string
+	def get_sequence(self, record):
+		key = (record.name, str(record.seq))
+		if key in self.sequences:
+			self.counters['sequencesReused'] += 1
+		else:
+			self.sequences[key] = TreeSequence(record.name, key[1])
+		return self.sequences[key]
+
+	# Get the score, direction, left, up and backtrace matrices for a pair of the given lengths
+	def get_matrices(self, l1, l2):
+		self.counters['alignments'] += 1
+		cells = (l1+1) * (l2+1)
+		if cells > self.capacity: # grow geometrically so that allocations are rare
+			self.capacity = max(cells, 2 * self.capacity)
+			self.buffers = (numpy.zeros(self.capacity), numpy.zeros(self.capacity),
+					numpy.zeros(self.capacity, dtype=('f16,b1')), numpy.zeros(self.capacity, dtype=('f16,b1')),
+					numpy.zeros((self.capacity, 2), dtype=numpy.int64))
+			self.counters['bufferAllocations'] += len(self.buffers)
+		else:
+			self.counters['allocationsAvoided'] += len(self.buffers)
+		matrices = []
+		for buf in self.buffers: # contiguous views on the front of each buffer
+			m = buf[:cells].reshape((l1+1, l2+1) + buf.shape[1:])
+			m[0] = 0
+			m[:, 0] = 0
+			matrices.append(m)
+		return matrices
+
+	# Get the residue to node-type dictionary of a node type specification
+	def get_node_types(self, nodeTypes):
+		key = tuple(sorted(nodeTypes.items()))
+		if key in self.nodeTypes:
+			self.counters['nodeTypesReused'] += 1
+		else:
+			self.nodeTypes[key] = create_node_types(nodeTypes)
+		return self.nodeTypes[key]
+
+	# Get the completed form of a substitution matrix; completed once per distinct matrix and gap cost
+	def get_submatrix(self, submat, gapDefault):
+		if submat is self.submatSource and gapDefault == self.submatKey[1]:
+			self.counters['submatReused'] += 1
+			return self.submat
+		key = (tuple(sorted(submat.items())), gapDefault)
+		if key == self.submatKey: # equal to the completed one (e.g. unpickled again for a new job)
+			self.counters['submatReused'] += 1
+		else:
+			create_residue_specific_gapcost(submat, gapDefault)
+			self.submat = submat
+			self.submatKey = key
+			self.taDicts = {} # gap costs changed
+		self.submatSource = submat
+		return self.submat
+
+	# Get the T-A dictionary of a sequence under the current substitution matrix
+	def get_ta_dictionary(self, seq, nodeTypes, submat, gapDefault):
+		key = (str(seq), tuple(sorted(nodeTypes.items())))
+		if key in self.taDicts:
+			self.counters['taDictsReused'] += 1
+		else:
+			self.taDicts[key] = create_ta_dictionary(seq, nodeTypes, submat, gapDefault)
+			self.counters['taDictsBuilt'] += 1
+		return self.taDicts[key]
+
+# The workspace of this process
+_workspace = None
+
+# Get the workspace of this (worker) process
+def get_workspace():
+	global _workspace
+	if _workspace is None:
+		_workspace = AlignmentWorkspace()
+	return _workspace
+
+# Inverts a node type specification (node-type to residues) into a residue to node-type dictionary
+def create_node_types(nodeTypes):
+	residueTypes = {}
+	for nodeType in nodeTypes.keys():
+		for residue in nodeTypes[nodeType]:
+			residueTypes[residue] = nodeType
+	return residueTypes
+
+# Fills in all gap-residue pairs of a substitution matrix either with flipped order entry if it exists,
+# else with the default gap cost. Also fills in flipped residue-residue scores
+def create_residue_specific_gapcost(submat, gapDefault):
+	newToSubmat = {}
+	for pair in submat.keys():
+		if pair[0] == '-' and pair[1] == '-':
+			# do nothing, this is useless and shouldn't happen
+			pass
+		elif pair[0] == '-' or pair[1] == '-':
+			# Note that the given residue has an associated gap cost
+			if pair[0] == '-' and (pair[1],'-') not in submat.keys():
+				newToSubmat[pair[1],'-'] = submat[pair]
+			elif pair[1] == '-' and (pair[1],'-') not in submat.keys():
+				newToSubmat[pair[1],'-'] = submat[pair]
+		else:
+			# Fill the residueDict so none are missed
+			if (pair[0],'-') not in submat.keys() and ('-',pair[0]) not in submat.keys():
+				newToSubmat[pair[0],'-'] = gapDefault
+				newToSubmat['-',pair[0]] = gapDefault
+			if (pair[1],'-') not in submat.keys() and ('-',pair[1]) not in submat.keys():
+				newToSubmat[pair[1],'-'] = gapDefault
+				newToSubmat['-',pair[1]] = gapDefault
+			if (pair[1],pair[0]) not in submat.keys():
+				newToSubmat[pair[1],pair[0]] = submat[pair]
+	for pair in newToSubmat.keys():
+		submat[pair] = newToSubmat[pair]
+
 # Helper-function to write a string
 def out(s):
 	sys.stdout.write(s+'\n')
@@ -0,0 +1,274 @@
+import concurrent.futures, numpy
+import TreeSeqGlobalAlign, TreeSeqMatrices, TreeSeqStore
+
+# In-process interface to the tree-sequence aligner, for use from notebooks and pipelines: sequences
+# in, NumPy score arrays out, without argument parsing or files. For example,
+#
+#	with AlignmentPool(workers=4) as pool:
+#		scores = pool.align_all(targets, queries, costs={'gap': -8, 'gapopen': 0}, submat=submat)
+#		names = pool.names(targets)
+#
+# or align_all(targets, queries, ...) for a one-off call. ScoreMatrix aligns only the cells it is asked
+# for, e.g. the rows of one brain region:
+#
+#	matrix = ScoreMatrix(sequences, submat=submat, store='scores.db', pool=pool)
+#	cortex = matrix[matrix.mask(metadata, BrainRegion='Cortex'), :]
+
+# Default costs, as of the contrasters' command lines
+def default_costs():
+	return {'gap': -8, 'gapopen': 0}
+
+# Convert a collection of sequences to TreeSequence records. Accepts a dictionary of name to sequence,
+# or a list of strings, character arrays, (name, sequence) pairs or records with name and seq (e.g.
+# as parsed by SeqIO); unnamed sequences are named by their index
+def as_sequences(sequences):
+	if isinstance(sequences, dict):
+		sequences = list(sequences.items())
+	records = []
+	for index, sequence in enumerate(sequences):
+		if isinstance(sequence, tuple):
+			name, seq = sequence
+		elif hasattr(sequence, 'seq'):
+			name, seq = sequence.name, sequence.seq
+		else:
+			name, seq = str(index), sequence
+		if isinstance(seq, numpy.ndarray):
+			seq = numpy.char.decode(seq) if seq.dtype.kind == 'S' else seq
+			seq = ''.join(seq.tolist())
+		records.append(TreeSeqGlobalAlign.TreeSequence(name, str(seq)))
+	return records
+
+# Get the substitution matrix: a dictionary of residue pairs to scores, or the name of a BioPython
+# in-built matrix. A copy is returned, as the aligner completes the matrix in place
+def as_submatrix(submat):
+	if isinstance(submat, str):
+		if submat not in TreeSeqMatrices.available_matrices():
+			raise IOError('Unknown in-built matrix '+submat)
+		submat = TreeSeqMatrices.get_matrix(submat)
+	return dict(submat)
+
+# Align a block of targets against every query, returning a row of scores (and of alignments, if
+# requested) per target. Runs in the worker processes, so the worker's workspace stays warm between
+# blocks and calls
+def align_rows(targets, queries, costs, submat, nodeTypes, alignments=False, useWorkspace=True):
+	workspace = None
+	if useWorkspace:
+		workspace = TreeSeqGlobalAlign.get_workspace()
+	scoreRows, alignmentRows = [], []
+	for target in targets:
+		scores, aligned = [], []
+		for query in queries:
+			NW = TreeSeqGlobalAlign.NeedlemanWunsch(target, query, costs, submat, nodeTypes, workspace)
+			scores.append(NW.get_top_score())
+			if alignments:
+				aligned.append(NW.get_alignment())
+			del NW # free the matrices before the next pair is allocated
+		scoreRows.append(scores)
+		alignmentRows.append(aligned)
+	return scoreRows, alignmentRows
+
+# Align each (target, query) pair of a list, returning the scores in order
+def align_pairs(pairs, costs, submat, nodeTypes, useWorkspace=True):
+	workspace = None
+	if useWorkspace:
+		workspace = TreeSeqGlobalAlign.get_workspace()
+	scores = []
+	for target, query in pairs:
+		NW = TreeSeqGlobalAlign.NeedlemanWunsch(target, query, costs, submat, nodeTypes, workspace)
+		scores.append(float(NW.get_top_score()))
+		del NW
+	return scores
+
+# A no-op job, used to start the workers of a pool ahead of the first call
+def _warm_up():
+	TreeSeqGlobalAlign.get_workspace()
+	return True
+
+# A pool of worker processes which stays up (and warm) between calls; use as a context manager, or
+# call close(). With workers=0 the alignments run in the calling process
+class AlignmentPool():
+	def __init__(self, workers=2, useWorkspace=True, blocksPerWorker=4):
+		self.num_workers = workers
+		self.useWorkspace = useWorkspace
+		self.blocksPerWorker = blocksPerWorker # blocks of targets per worker and call, for load balance
+		self.executor = None
+		if workers > 0:
+			self.executor = concurrent.futures.ProcessPoolExecutor(workers)
+			for future in [self.executor.submit(_warm_up) for k in range(workers)]:
+				future.result()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, excType, excValue, traceback):
+		self.close()
+		return False
+
+	# Shut the workers down
+	def close(self):
+		if self.executor is not None:
+			self.executor.shutdown()
+			self.executor = None
+
+	# Get the names of a collection of sequences, in the order of the rows (or columns) of align_all
+	def names(self, sequences):
+		return [record.name for record in as_sequences(sequences)]
+
+	# Align every target against every query (queries default to the targets). Returns a
+	# (targets x queries) float array of alignment scores and, if alignments is set, also an object
+	# array of (aligned target, aligned query) pairs
+	def align_all(self, targets, queries=None, costs=None, submat=None, nodeTypes=None, alignments=False):
+		targets = as_sequences(targets)
+		queries = targets if queries is None else as_sequences(queries)
+		if submat is None:
+			raise IOError('A substitution matrix must be provided')
+		submat = as_submatrix(submat)
+		costs = default_costs() if costs is None else dict(default_costs(), **costs)
+		if nodeTypes is None:
+			nodeTypes = TreeSeqGlobalAlign.default_nodetypes()
+		scores = numpy.zeros((len(targets), len(queries)))
+		aligned = numpy.empty((len(targets), len(queries)), dtype=object) if alignments else None
+		if self.executor is None:
+			blocks = [(0, targets)]
+			results = [align_rows(targets, queries, costs, submat, nodeTypes, alignments, self.useWorkspace)]
+		else:
+			size = max(1, -(-len(targets) // (self.num_workers * self.blocksPerWorker)))
+			blocks = [(start, targets[start:start+size]) for start in range(0, len(targets), size)]
+			futures = [self.executor.submit(align_rows, block, queries, costs, submat, nodeTypes, alignments,
+							self.useWorkspace) for start, block in blocks]
+			results = [future.result() for future in futures]
+		for (start, block), (scoreRows, alignmentRows) in zip(blocks, results):
+			scores[start:start+len(block)] = scoreRows
+			if alignments:
+				for offset, row in enumerate(alignmentRows):
+					for column, pair in enumerate(row):
+						aligned[start+offset, column] = pair
+		if alignments:
+			return scores, aligned
+		return scores
+
+	# Align each (target, query) pair of a list of TreeSequence records, returning an array of the scores
+	def align_pairs(self, pairs, costs, submat, nodeTypes):
+		if self.executor is None:
+			return numpy.array(align_pairs(pairs, costs, submat, nodeTypes, self.useWorkspace), dtype=numpy.float64)
+		size = max(1, -(-len(pairs) // (self.num_workers * self.blocksPerWorker)))
+		futures = [self.executor.submit(align_pairs, pairs[start:start+size], costs, submat, nodeTypes, self.useWorkspace)
+				for start in range(0, len(pairs), size)]
+		return numpy.array([score for future in futures for score in future.result()], dtype=numpy.float64)
+
+# Align every target against every query with a pool that lasts for this call only; see
+# AlignmentPool.align_all
+def align_all(targets, queries=None, costs=None, submat=None, nodeTypes=None, workers=0, alignments=False,
+		useWorkspace=True):
+	with AlignmentPool(workers, useWorkspace) as pool:
+		return pool.align_all(targets, queries, costs, submat, nodeTypes, alignments)
+
+# A targets x queries score matrix whose cells are only aligned when indexed, and memoized: in memory
+# and, given a store (a file name or TreeSeqStore.ScoreStore), persistently, so that later sessions and
+# contraster runs with -store (and the same settings) only align the cells still missing. Rows and
+# columns are indexed by name, list of names, position, slice or boolean mask (see mask), e.g.
+# matrix['cZI_1-Dendrite', :] or matrix[rows, ['cZI_2-Dendrite', 'cZI_3-Dendrite']]. Aligned with the
+# pool given, or in the calling process
+class ScoreMatrix():
+	def __init__(self, targets, queries=None, costs=None, submat=None, nodeTypes=None, store=None, pool=None):
+		self.targets = as_sequences(targets)
+		self.queries = self.targets if queries is None else as_sequences(queries)
+		if submat is None:
+			raise IOError('A substitution matrix must be provided')
+		self.submat = as_submatrix(submat)
+		self.costs = default_costs() if costs is None else dict(default_costs(), **costs)
+		self.nodeTypes = TreeSeqGlobalAlign.default_nodetypes() if nodeTypes is None else nodeTypes
+		self.pool = pool
+		self.store = store
+		if isinstance(store, str):
+			self.store = TreeSeqStore.ScoreStore(store, TreeSeqStore.params_key(self.costs, self.submat, self.nodeTypes))
+		self.targetIndex = {record.name: k for k, record in enumerate(self.targets)}
+		self.queryIndex = {record.name: k for k, record in enumerate(self.queries)}
+		self.targetHashes = [TreeSeqStore.sequence_hash(record) for record in self.targets]
+		self.queryHashes = [TreeSeqStore.sequence_hash(record) for record in self.queries]
+		self.scores = {} # K => (target index, query index), V => score
+		self.storedRows = set() # targets whose stored scores have been read
+		self.counters = {'aligned': 0, 'stored': 0, 'memoized': 0}
+
+	@property
+	def shape(self):
+		return (len(self.targets), len(self.queries))
+
+	# Get the names of the rows and columns
+	def names(self):
+		return [record.name for record in self.targets], [record.name for record in self.queries]
+
+	# Boolean mask of the rows (axis 0) or columns (axis 1) whose metadata (a dictionary of name to
+	# attributes, as TreeSeqMetadata.parse_metadata's) has the given attribute values; a list of values
+	# accepts any of them, e.g. mask(metadata, ArborType='Axon', BrainRegion=['Cortex', 'Hippocampus'])
+	def mask(self, metadata, axis=0, **attributes):
+		records = self.targets if axis == 0 else self.queries
+		accepted = {a: set(v) if isinstance(v, (list, tuple, set)) else set([v]) for a, v in attributes.items()}
+		return numpy.array([record.name in metadata and
+				all([metadata[record.name].get(a) in values for a, values in accepted.items()]) for record in records])
+
+	# Positions selected on an axis by a name, list of names, position, slice or boolean mask
+	def _positions(self, key, index, size):
+		if isinstance(key, str):
+			if key not in index:
+				raise KeyError(key)
+			return [index[key]]
+		if isinstance(key, slice):
+			return list(range(size))[key]
+		if isinstance(key, (int, numpy.integer)):
+			return [range(size)[key]]
+		key = list(key)
+		if len(key) == size and all([isinstance(k, (bool, numpy.bool_)) for k in key]):
+			return [k for k in range(size) if key[k]]
+		return [index[k] if isinstance(k, str) else range(size)[k] for k in key]
+
+	def __getitem__(self, key):
+		rowKey, colKey = key if isinstance(key, tuple) else (key, slice(None))
+		rows = self._positions(rowKey, self.targetIndex, len(self.targets))
+		cols = self._positions(colKey, self.queryIndex, len(self.queries))
+		self.compute([(i, j) for i in rows for j in cols])
+		values = numpy.array([[self.scores[i, j] for j in cols] for i in rows], dtype=numpy.float64).reshape(len(rows), len(cols))
+		scalar = lambda k: isinstance(k, (str, int, numpy.integer))
+		if scalar(rowKey) and scalar(colKey):
+			return values[0, 0]
+		if scalar(rowKey):
+			return values[0]
+		if scalar(colKey):
+			return values[:, 0]
+		return values
+
+	# Make sure the cells (target index, query index) are known: read from the store, else aligned
+	def compute(self, cells):
+		missing = [cell for cell in set(cells) if cell not in self.scores]
+		self.counters['memoized'] += len(cells) - len(missing)
+		if self.store is not None:
+			for i in set([i for i, j in missing]) - self.storedRows:
+				row = self.store.get_row(self.targetHashes[i])
+				for j in range(len(self.queries)):
+					if self.queryHashes[j] in row:
+						self.scores[i, j] = row[self.queryHashes[j]]
+				self.storedRows.add(i)
+			stored = len(missing)
+			missing = [cell for cell in missing if cell not in self.scores]
+			self.counters['stored'] += stored - len(missing)
+		if len(missing) == 0:
+			return
+		missing.sort()
+		pairs = [(self.targets[i], self.queries[j]) for i, j in missing]
+		if self.pool is None:
+			scores = align_pairs(pairs, self.costs, self.submat, self.nodeTypes)
+		else:
+			scores = self.pool.align_pairs(pairs, self.costs, self.submat, self.nodeTypes)
+		for cell, score in zip(missing, scores):
+			self.scores[cell] = float(score)
+		self.counters['aligned'] += len(missing)
+		if self.store is not None:
+			self.store.add([(self.targetHashes[i], self.queryHashes[j], self.scores[i, j]) for i, j in missing])
+
+	# Fraction of the cells known, in memory
+	def density(self):
+		return len(self.scores) / float(max(1, len(self.targets) * len(self.queries)))
+
+	def close(self):
+		if self.store is not None:
+			self.store.close()
@@ -0,0 +1,147 @@
+import numpy
+import TreeSeqCluster
+
+# Comparison of two N x N score matrices of the same sequences (e.g. runs over the LTS and STL
+# encodings, with and without breaks, or under two gap settings): Pearson and Spearman correlations of
+# their upper triangles, and a Mantel permutation test of one. Matrices are memory-mapped (.npy) and
+# visited a block of rows at a time; the rows and columns of the second are aligned to the first's by
+# name. A permutation relabels the sequences of the second matrix, so its correlation only changes in
+# the sum of products: the means and sums of squares of the triangles are those of the unpermuted ones.
+# With both matrices centered (and a zero diagonal), a permutation p gives
+#	r(p) = sum_{i<j} c1[i,j] * c2[p[i],p[j]] / sqrt(ss1 * ss2)
+# which is summed over blocks of the first's rows against the second's rows at p, their columns taken
+# at p, without building the permuted matrix. Workers share the matrices through the page cache
+
+CORRELATIONS = ('pearson', 'spearman')
+
+# The names of the first matrix which are also in the second, in the first's order, and their positions
+# in each
+def common_names(names1, names2):
+	index1 = {name: k for k, name in enumerate(names1)}
+	index2 = {name: k for k, name in enumerate(names2)}
+	common = [name for name in names1 if name in index2]
+	return common, numpy.array([index1[name] for name in common]), numpy.array([index2[name] for name in common])
+
+# Mask of the upper triangle of the rows [start, stop) of an n x n matrix
+def upper_mask(n, start, stop):
+	return numpy.arange(n)[numpy.newaxis, :] > numpy.arange(start, stop)[:, numpy.newaxis]
+
+# Write the symmetric scores (TreeSeqCluster.symmetric_rows) of the sequences at the positions of the
+# index, in its order, to a square memory-mapped matrix
+def write_aligned(scores, index, outname, blockRows=256):
+	n = len(index)
+	aligned = numpy.lib.format.open_memmap(outname, mode='w+', dtype=numpy.float64, shape=(n, n))
+	for start in range(0, n, blockRows):
+		stop = min(start + blockRows, n)
+		aligned[start:stop] = TreeSeqCluster.symmetric_rows(scores, start, stop, index)
+	aligned.flush()
+	return aligned
+
+# Mean of the upper triangle of a square matrix
+def triangle_mean(matrix, blockRows=256):
+	n = matrix.shape[0]
+	total = 0.0
+	for start in range(0, n, blockRows):
+		stop = min(start + blockRows, n)
+		total += numpy.array(matrix[start:stop])[upper_mask(n, start, stop)].sum()
+	return total / (n * (n - 1) // 2)
+
+# Write a symmetric matrix centered on the mean of its upper triangle, with a zero diagonal. Returns it
+# and the sum of squares of its upper triangle
+def write_centered(matrix, outname, blockRows=256):
+	n = matrix.shape[0]
+	mean = triangle_mean(matrix, blockRows)
+	centered = numpy.lib.format.open_memmap(outname, mode='w+', dtype=numpy.float64, shape=(n, n))
+	squares = 0.0
+	for start in range(0, n, blockRows):
+		stop = min(start + blockRows, n)
+		rows = numpy.array(matrix[start:stop]) - mean
+		rows[numpy.arange(stop - start), numpy.arange(start, stop)] = 0.0
+		centered[start:stop] = rows
+		squares += (rows[upper_mask(n, start, stop)] ** 2).sum()
+	centered.flush()
+	return centered, squares
+
+# Sum of the products of the upper triangles of two square matrices
+def triangle_products(matrix1, matrix2, blockRows=256):
+	n = matrix1.shape[0]
+	total = 0.0
+	for start in range(0, n, blockRows):
+		stop = min(start + blockRows, n)
+		mask = upper_mask(n, start, stop)
+		total += numpy.dot(numpy.array(matrix1[start:stop])[mask], numpy.array(matrix2[start:stop])[mask])
+	return total
+
+# Correlation of two centered matrices, given their sums of squares
+def centered_correlation(centered1, centered2, squares1, squares2, blockRows=256):
+	if squares1 == 0 or squares2 == 0:
+		raise IOError('A matrix with the same score for every pair has no correlation')
+	return triangle_products(centered1, centered2, blockRows) / numpy.sqrt(squares1 * squares2)
+
+# The upper triangle of a square matrix as a condensed vector (TreeSeqCluster.condensed_index), in memory
+def condensed_values(matrix, blockRows=256):
+	n = matrix.shape[0]
+	values = numpy.empty(n * (n - 1) // 2)
+	offset = 0
+	for start in range(0, n, blockRows):
+		stop = min(start + blockRows, n)
+		rows = numpy.array(matrix[start:stop])[upper_mask(n, start, stop)] # row-major, as condensed
+		values[offset:offset + len(rows)] = rows
+		offset += len(rows)
+	return values
+
+# Ranks (from 1) of values, ties given the average of their ranks
+def average_ranks(values):
+	order = numpy.argsort(values, kind='mergesort')
+	ordered = values[order]
+	starts = numpy.flatnonzero(numpy.concatenate([[True], ordered[1:] != ordered[:-1]]))
+	stops = numpy.append(starts[1:], len(values))
+	ranks = numpy.empty(len(values))
+	ranks[order] = numpy.repeat((starts + 1 + stops) / 2.0, stops - starts)
+	return ranks
+
+# Spearman correlation of the upper triangles, given as ranks
+def rank_correlation(ranks1, ranks2):
+	centered1, centered2 = ranks1 - ranks1.mean(), ranks2 - ranks2.mean()
+	squares1, squares2 = numpy.dot(centered1, centered1), numpy.dot(centered2, centered2)
+	if squares1 == 0 or squares2 == 0:
+		raise IOError('A matrix with the same score for every pair has no correlation')
+	return numpy.dot(centered1, centered2) / numpy.sqrt(squares1 * squares2)
+
+# Write the condensed ranks of a matrix back to a square, symmetric, memory-mapped one with a zero diagonal
+def write_ranks(ranks, n, outname, blockRows=256):
+	ranked = numpy.lib.format.open_memmap(outname, mode='w+', dtype=numpy.float64, shape=(n, n))
+	for start in range(0, n, blockRows):
+		stop = min(start + blockRows, n)
+		i = numpy.arange(start, stop)[:, numpy.newaxis]
+		j = numpy.arange(n)[numpy.newaxis, :]
+		positions = TreeSeqCluster.condensed_index(n, numpy.minimum(i, j), numpy.maximum(i, j))
+		ranked[start:stop] = numpy.where(i == j, 0.0, ranks[numpy.maximum(positions, 0)])
+	ranked.flush()
+	return ranked
+
+# Seeds of the permutations, one each, so the test doesn't depend on how they are split over workers
+def permutation_seeds(seed, count):
+	return numpy.random.SeedSequence(seed).spawn(count)
+
+# Sums over the upper triangles of the products of two centered matrices (.npy), the second's sequences
+# permuted, for one permutation per seed. Each block of the first's rows is read once for all of them
+def permuted_products(centeredName1, centeredName2, seeds, blockRows=256):
+	centered1 = numpy.load(centeredName1, mmap_mode='r')
+	centered2 = numpy.load(centeredName2, mmap_mode='r')
+	n = centered1.shape[0]
+	permutations = [numpy.random.default_rng(seed).permutation(n) for seed in seeds]
+	sums = numpy.zeros(len(permutations))
+	for start in range(0, n, blockRows):
+		stop = min(start + blockRows, n)
+		rows = numpy.array(centered1[start:stop]).ravel()
+		for k, permutation in enumerate(permutations):
+			permuted = numpy.take(centered2[permutation[start:stop]], permutation, axis=1)
+			sums[k] += numpy.dot(rows, permuted.ravel())
+	return sums / 2.0 # over both triangles, the diagonal being 0
+
+# p-value of a Mantel test: the share of the permutations (and the observed labelling) whose sum of
+# products is at least the observed one
+def mantel_p(observed, null):
+	tolerance = 1e-10 * abs(observed) # of the order the products are summed in
+	return (1.0 + (numpy.asarray(null) >= observed - tolerance).sum()) / (1.0 + len(null))
@@ -0,0 +1,915 @@
+import sys
+
+# The in-built substitution matrices (BioPython's Bio.SubsMat.MatrixInfo), precompiled into dense
+# tables so that using one needs neither BioPython nor its import time. Each table is the matrix's
+# alphabet and its rows, an entry per column: the score of the pair in the orientation MatrixInfo
+# gives it, and '.' for the other orientation, so get_matrix returns a dictionary equal to MatrixInfo's
+# The tables below are generated by running this module (python TreeSeqMatrices.py), with BioPython
+
+TABLES_MARKER = '# Generated tables; do not edit'
+
+# Names of the in-built matrices
+def available_matrices():
+	return tuple(sorted(TABLES))
+
+# Get an in-built matrix as a dictionary of residue pair to score, as MatrixInfo's
+def get_matrix(name):
+	if name not in TABLES:
+		raise IOError('No in-built matrix '+str(name))
+	alphabet, rows = TABLES[name]
+	submat = {}
+	for a, row in zip(alphabet, rows.split('\n')):
+		for b, value in zip(alphabet, row.split()):
+			if value != '.':
+				submat[a, b] = float(value) if '.' in value else int(value)
+	return submat
+
+# Write the tables of BioPython's in-built matrices into this module, in place of the current ones
+def compile_tables(fname):
+	from Bio.SubsMat import MatrixInfo
+	lines = []
+	for name in sorted(MatrixInfo.available_matrices):
+		submat = getattr(MatrixInfo, name)
+		alphabet = ''.join(sorted(set([residue for pair in submat for residue in pair])))
+		rows = [' '.join([repr(submat[a, b]) if (a, b) in submat else '.' for b in alphabet]) for a in alphabet]
+		lines.append('\t' + repr(name) + ': (' + repr(alphabet) + ', \'\'\'' + '\n'.join(rows) + '\'\'\'),')
+	code = open(fname).read().split('\n' + TABLES_MARKER + '\n')[0]
+	outhandle = open(fname, 'w')
+	outhandle.write(code + '\n' + TABLES_MARKER + '\nTABLES = {\n' + '\n'.join(lines) + '\n}\n')
+	outhandle.close()
+	return len(lines)
+
+if __name__ == '__main__':
+	sys.stdout.write(str(compile_tables(__file__))+' matrices compiled\n')
+
+# Generated tables; do not edit
+TABLES = {
+	'benner22': ('ACDEFGHIKLMNPQRSTVWY', '''2.5 -1.2 . . . . . . . . . . 0.8 . . 1.3 1.4 . . .
+. 12.6 . . . . . . . . . . . . . . . . . .
+-0.2 -3.7 4.8 . . 0.7 . . . . . 2.4 -1.8 . . 0.1 -0.7 . . .
+-0.3 -4.3 3.9 4.6 . 0.5 . . . . . 1.2 -1.7 . . -0.5 -0.9 . . .
+-3.1 -0.1 -5.4 -5.7 7.7 -5.8 0.3 0.5 -5.1 2.2 0.7 -3.5 -3.4 -3.6 -4.3 -2.2 -2.6 -0.1 . .
+0.8 -1.7 . . . 6.2 . . . . . . -1.8 . . 0.6 -0.7 . . .
+-1.6 -1.5 0.3 -0.2 . -2.0 6.1 . . . . 1.4 -0.4 2.4 . -0.5 -1.1 . . .
+-0.4 -2.4 -4.0 -3.6 . -3.8 -3.2 4.2 -3.0 . 3.1 -2.7 -2.3 -2.7 -3.2 -1.4 0.3 . . .
+-1.0 -3.3 0.2 1.0 . -1.0 0.8 . 4.4 . . 1.0 -1.6 2.2 3.9 -0.4 -0.4 . . .
+-1.7 -2.6 -4.9 -4.4 . -4.9 -2.1 2.7 -3.3 4.6 3.2 -3.5 -1.3 -2.0 -2.9 -2.1 -1.0 . . .
+-0.8 -2.5 -3.9 -3.4 . -3.8 -2.4 . -2.0 . 4.9 -2.6 -2.0 -1.7 -2.1 -1.5 0.1 . . .
+0.0 -1.9 . . . 0.4 . . . . . 3.3 -1.1 . . 1.1 0.5 . . .
+. -3.1 . . . . . . . . . . 7.0 . . 1.1 0.4 . . .
+-0.9 -3.3 0.6 1.7 . -1.4 . . . . . 0.5 -0.1 4.2 . -0.6 -0.7 . . .
+-1.2 -1.6 -1.0 -0.1 . -0.7 1.5 . . . . 0.4 -1.2 2.2 5.0 -0.5 -0.7 . . .
+. 0.3 . . . . . . . . . . . . . 2.0 . . . .
+. -1.1 . . . . . . . . . . . . . 1.5 2.5 . . .
+0.4 -1.7 -3.0 -2.7 . -2.5 -3.0 3.6 -2.7 2.0 2.5 -2.3 -1.7 -2.4 -2.9 -0.9 0.4 3.7 . .
+-5.5 0.5 -6.4 -6.3 0.5 -4.5 -2.7 -4.4 -3.7 -1.8 -2.8 -5.2 -5.8 -3.3 -1.1 -3.9 -4.5 -4.5 15.7 1.5
+-3.5 0.6 -3.0 -4.0 5.9 -4.8 3.7 -2.2 -3.6 -0.7 -1.8 -1.2 -3.5 -1.9 -2.7 -1.9 -3.0 -2.6 . 9.0'''),
+	'benner6': ('ACDEFGHIKLMNPQRSTVWY', '''2.5 -1.7 . . . . . . . . . . 1.1 . . 1.4 1.7 . . .
+. 12.1 . . . . . . . . . . . . . . . . . .
+-0.6 -3.7 5.2 . . 0.8 . . . . . 2.5 -2.8 . . -0.4 -1.2 . . .
+-0.7 -4.7 4.4 5.2 . 0.5 . . . . . 1.1 -2.6 . . -1.2 -1.6 . . .
+-3.2 -0.1 -5.7 -6.7 8.3 -5.7 0.1 0.0 -6.3 2.4 -0.1 -3.5 -3.2 -4.4 -4.9 -1.8 -2.4 -0.5 . .
+0.8 -1.3 . . . 5.8 . . . . . . -1.7 . . 0.8 -0.5 . . .
+-2.1 -1.2 0.1 -0.2 . -2.1 6.1 . . . . 1.4 -0.4 3.2 . -0.9 -1.7 . . .
+0.1 -3.6 -4.2 -4.1 . -3.4 -3.7 4.4 -3.8 . 4.0 -2.5 -2.0 -3.8 -3.8 -1.2 0.7 . . .
+-1.9 -2.8 -0.2 0.9 . -1.4 0.9 . 5.6 . . 1.0 -2.3 2.5 4.3 -1.2 -1.1 . . .
+-1.3 -3.8 -5.3 -5.0 . -4.6 -2.2 2.4 -4.1 4.8 -2.9 -3.4 -0.2 -2.4 -3.2 -1.5 -0.4 . . .
+-0.2 -3.7 -4.3 -4.1 . -3.7 -3.4 . -2.9 . 4.8 -2.5 -1.8 -3.1 -3.0 -1.3 0.6 . . .
+0.0 -1.6 . . . -0.1 . . . . . 3.6 -1.1 . . 1.2 0.5 . . .
+. -2.7 . . . . . . . . . . 6.5 . . 1.4 0.6 . . .
+-1.7 -3.2 0.6 2.1 . -1.6 . . . . . 0.1 0.1 5.3 . -1.4 -1.7 . . .
+-1.7 -0.4 -1.5 -0.4 . -0.1 1.8 . . . . -0.1 -1.3 2.5 5.1 -0.9 -1.3 . . .
+. 0.9 . . . . . . . . . . . . . 2.1 . . . .
+. -1.5 . . . . . . . . . . . . . 1.5 2.4 . . .
+0.7 -3.1 -3.3 -3.0 . -2.3 -3.8 3.9 -3.8 1.9 3.3 -2.4 -1.6 -3.5 -3.7 -0.9 0.6 4.0 . .
+-4.3 1.6 -6.3 -5.6 -1.6 -1.7 -2.8 -5.0 -1.4 -3.0 -4.4 -4.4 -4.8 -2.6 2.0 -2.9 -2.6 -4.8 14.7 -0.3
+-4.0 2.6 -2.3 -4.1 5.6 -4.9 4.4 -3.3 -4.0 -1.6 -3.6 -0.9 -3.8 -1.4 -2.6 -1.8 -3.4 -3.8 . 9.5'''),
+	'benner74': ('ACDEFGHIKLMNPQRSTVWY', '''2.4 0.3 . . . . . . . . . . 0.4 . . 1.1 0.7 . . .
+. 11.8 . . . . . . . . . . . . . . . . . .
+-0.3 -3.2 4.8 . . 0.2 . . . . . 2.2 -1.0 . . 0.4 -0.2 . . .
+-0.1 -3.2 2.9 3.7 . -0.5 . . . . . 1.0 -0.7 . . 0.1 -0.2 . . .
+-2.6 -0.7 -4.7 -4.3 7.2 -5.4 0.0 0.9 -3.6 2.1 1.3 -3.2 -3.8 -2.8 -3.5 -2.6 -2.2 0.1 . .
+0.6 -2.0 . . . 6.6 . . . . . . -1.7 . . 0.4 -1.0 . . .
+-1.0 -1.3 0.4 0.2 . -1.6 6.1 . . . . 1.2 -1.0 1.4 . -0.3 -0.5 . . .
+-0.8 -1.2 -3.9 -2.9 . -4.3 -2.3 4.0 -2.3 . 2.6 -2.8 -2.6 -2.0 -2.6 -1.8 -0.3 . . .
+-0.4 -2.9 0.4 1.2 . -1.1 0.6 . 3.4 . . 0.9 -0.8 1.7 2.9 0.0 0.1 . . .
+-1.4 -1.6 -4.2 -3.1 . -4.6 -1.9 2.8 -2.4 4.2 2.9 -3.1 -2.2 -1.7 -2.4 -2.2 -1.1 . . .
+-0.8 -1.2 -3.2 -2.2 . -3.5 -1.5 . -1.5 . 4.5 -2.2 -2.4 -1.0 -1.8 -1.4 -0.4 . . .
+-0.2 -1.8 . . . 0.4 . . . . . 3.6 -1.0 . . 0.9 0.4 . . .
+. -3.1 . . . . . . . . . . 7.5 . . 0.5 0.1 . . .
+-0.3 -2.6 0.8 1.7 . -1.1 . . . . . 0.7 -0.2 3.0 . 0.1 -0.1 . . .
+-0.8 -2.2 -0.5 0.3 . -1.0 1.0 . . . . 0.3 -0.1 1.6 4.8 -0.2 -0.3 . . .
+. 0.1 . . . . . . . . . . . . . 2.1 . . . .
+. -0.6 . . . . . . . . . . . . . 1.4 2.5 . . .
+0.1 -0.2 -2.9 -2.1 . -3.1 -2.1 3.2 -1.9 1.9 1.8 -2.2 -1.9 -1.7 -2.2 -1.0 0.2 3.4 . .
+-4.1 -0.9 -5.5 -4.7 3.0 -4.1 -1.0 -2.3 -3.6 -0.9 -1.3 -4.0 -5.2 -2.8 -1.6 -3.4 -3.7 -2.9 14.7 3.6
+-2.6 -0.4 -2.8 -3.0 5.3 -4.3 2.5 -1.0 -2.4 -0.1 -0.5 -1.4 -3.4 -1.8 -2.0 -1.9 -2.1 -1.4 . 8.1'''),
+	'blosum100': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''5 . . . . . . . . . . . . . . . . . . . . . .
+-3 4 -5 4 0 -5 -2 -1 -5 -1 -5 -4 4 -3 -1 -2 -1 -2 -5 -6 . -4 .
+-1 . 9 -5 . . . . . . . . -4 . . -5 . . . . . . .
+-3 . . 7 . . . . . . . . 1 . . -3 . . . . . . .
+-2 . -6 1 6 . . . . . . . -1 . 1 -2 . . . . . . .
+-4 . -3 -5 -5 7 -5 -2 -1 -4 0 -1 -5 . -4 -4 . . . . . . .
+-1 . -5 -3 -4 . 6 . . . . . -2 . -3 -4 . . . . . . .
+-3 . -5 -2 -1 . -4 9 . . . . 0 . 0 -1 . . . . . . .
+-3 . -2 -6 -5 . -6 -5 5 . . . -5 . -4 -4 . . . . . . .
+-2 . -5 -2 0 . -3 -2 -4 6 -4 . -1 . 1 2 . . . . . . .
+-3 . -3 -6 -5 . -5 -4 1 . 5 . -5 . -3 -4 . . . . . . .
+-2 . -3 -5 -4 . -5 -3 1 -2 2 8 -4 . -1 -2 . . . . . . .
+-2 . . . . . . . . . . . 7 . . -1 . . . . . . .
+-1 . -5 -3 -3 -5 -4 -3 -4 -2 -4 -4 -4 8 -2 -3 . . . . . . .
+-1 . -5 -2 . . . . . . . . -1 . 7 0 . . . . . . .
+-2 . . . . . . . . . . . . . . 7 . . . . . . .
+1 . -2 -1 -1 -3 -1 -2 -4 -1 -4 -3 0 -2 -1 -2 6 . . . . . .
+-1 . -2 -2 -2 -3 -3 -3 -2 -2 -3 -2 -1 -3 -2 -2 1 6 . . . . .
+-1 . -2 -5 -3 -2 -5 -5 2 -4 0 0 -4 -4 -3 -4 -3 -1 5 -4 . -3 .
+-4 . -5 -7 -5 0 -5 -3 -4 -5 -4 -3 -6 -6 -3 -4 -4 -5 . 11 . . .
+-1 -2 -3 -3 -2 -3 -3 -2 -2 -2 -2 -2 -2 -3 -2 -2 -1 -1 -2 -4 -2 -3 -2
+-4 . -4 -5 -4 3 -6 1 -3 -4 -3 -3 -3 -5 -3 -3 -3 -3 . 1 . 8 .
+-2 1 -6 0 5 -5 -4 -1 -4 0 -4 -3 -1 -3 3 -1 -1 -2 -3 -4 . -4 4'''),
+	'blosum30': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''4 . . . . . . . . . . . . . . . . . . . . . .
+0 5 -2 5 0 -3 0 -2 -2 0 -1 -2 4 -2 -1 -2 0 0 -2 -5 . -3 .
+-3 . 17 -3 . . . . . . . . -1 . . -2 . . . . . . .
+0 . . 9 . . . . . . . . 1 . . -1 . . . . . . .
+0 . 1 1 6 . . . . . . . -1 . 2 -1 . . . . . . .
+-2 . -3 -5 -4 10 -3 -3 0 -1 2 -2 -1 . -3 -1 . . . . . . .
+0 . -4 -1 -2 . 8 . . . . . 0 . -2 -2 . . . . . . .
+-2 . -5 -2 0 . -3 14 . . . . -1 . 0 -1 . . . . . . .
+0 . -2 -4 -3 . -1 -2 6 . . . 0 . -2 -3 . . . . . . .
+0 . -3 0 2 . -1 -2 -2 4 -2 . 0 . 0 1 . . . . . . .
+-1 . 0 -1 -1 . -2 -1 2 . 4 . -2 . -2 -2 . . . . . . .
+1 . -2 -3 -1 . -2 2 1 2 2 6 0 . -1 0 . . . . . . .
+0 . . . . . . . . . . . 8 . . -2 . . . . . . .
+-1 . -3 -1 1 -4 -1 1 -3 1 -3 -4 -3 11 0 -1 . . . . . . .
+1 . -2 -1 . . . . . . . . -1 . 8 3 . . . . . . .
+-1 . . . . . . . . . . . . . . 8 . . . . . . .
+1 . -2 0 0 -1 0 -1 -1 0 -2 -2 0 -1 -1 -1 4 . . . . . .
+1 . -2 -1 -2 -2 -2 -2 0 -1 0 0 1 0 0 -3 2 5 . . . . .
+1 . -2 -2 -3 1 -3 -3 4 -2 1 0 -2 -4 -3 -1 -1 1 5 -3 . 1 .
+-5 . -2 -4 -1 1 1 -5 -3 -2 -2 -3 -7 -3 -1 0 -3 -5 . 20 . . .
+0 -1 -2 -1 -1 -1 -1 -1 0 0 0 0 0 -1 0 -1 0 0 0 -2 -1 -1 0
+-4 . -6 -1 -2 3 -3 0 -1 -1 3 -1 -4 -2 -1 0 -2 -1 . 5 . 9 .
+0 0 0 0 5 -4 -2 0 -3 1 -1 -1 -1 0 4 0 -1 -1 -3 -1 . -2 4'''),
+	'blosum35': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''5 . . . . . . . . . . . . . . . . . . . . . .
+-1 5 -2 5 0 -2 0 0 -2 0 -2 -2 4 -1 0 -1 0 -1 -2 -3 . -2 .
+-2 . 15 -3 . . . . . . . . -1 . . -3 . . . . . . .
+-1 . . 8 . . . . . . . . 1 . . -1 . . . . . . .
+-1 . -1 2 6 . . . . . . . -1 . 2 -1 . . . . . . .
+-2 . -4 -3 -3 8 -3 -3 1 -1 2 0 -1 . -4 -1 . . . . . . .
+0 . -3 -2 -2 . 7 . . . . . 1 . -2 -2 . . . . . . .
+-2 . -4 0 -1 . -2 12 . . . . 1 . -1 -1 . . . . . . .
+-1 . -4 -3 -3 . -3 -3 5 . . . -1 . -2 -3 . . . . . . .
+0 . -2 -1 1 . -1 -2 -2 5 -2 . 0 . 0 2 . . . . . . .
+-2 . -2 -2 -1 . -3 -2 2 . 5 . -2 . -2 -2 . . . . . . .
+0 . -4 -3 -2 . -1 1 1 0 3 6 -1 . -1 0 . . . . . . .
+-1 . . . . . . . . . . . 7 . . -1 . . . . . . .
+-2 . -4 -1 0 -4 -2 -1 -1 0 -3 -3 -2 10 0 -2 . . . . . . .
+0 . -3 -1 . . . . . . . . 1 . 7 2 . . . . . . .
+-1 . . . . . . . . . . . . . . 8 . . . . . . .
+1 . -3 -1 0 -1 1 -1 -2 0 -2 -1 0 -2 0 -1 4 . . . . . .
+0 . -1 -1 -1 -1 -2 -2 -1 0 0 0 0 0 0 -2 2 5 . . . . .
+0 . -2 -2 -2 1 -3 -4 4 -2 2 1 -2 -3 -3 -1 -1 1 5 -2 . 0 .
+-2 . -5 -3 -1 1 -1 -4 -1 0 0 1 -2 -4 -1 0 -2 -2 . 16 . . .
+0 -1 -2 -1 -1 -1 -1 -1 0 0 0 0 0 -1 -1 -1 0 0 0 -1 -1 -1 0
+-1 . -5 -2 -1 3 -2 0 0 -1 0 0 -2 -3 0 0 -1 -2 . 3 . 8 .
+-1 0 -2 1 5 -3 -2 -1 -3 1 -2 -2 0 0 4 0 0 -1 -2 -1 . -1 4'''),
+	'blosum40': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''5 . . . . . . . . . . . . . . . . . . . . . .
+-1 5 -2 6 1 -3 -1 0 -3 0 -3 -3 4 -2 0 -1 0 0 -3 -4 . -3 .
+-2 . 16 -2 . . . . . . . . -2 . . -3 . . . . . . .
+-1 . . 9 . . . . . . . . 2 . . -1 . . . . . . .
+-1 . -2 2 7 . . . . . . . -1 . 2 -1 . . . . . . .
+-3 . -2 -4 -3 9 -3 -2 1 -3 2 0 -3 . -4 -2 . . . . . . .
+1 . -3 -2 -3 . 8 . . . . . 0 . -2 -3 . . . . . . .
+-2 . -4 0 0 . -2 13 . . . . 1 . 0 0 . . . . . . .
+-1 . -4 -4 -4 . -4 -3 6 . . . -2 . -3 -3 . . . . . . .
+-1 . -3 0 1 . -2 -1 -3 6 -2 . 0 . 1 3 . . . . . . .
+-2 . -2 -3 -2 . -4 -2 2 . 6 . -3 . -2 -2 . . . . . . .
+-1 . -3 -3 -2 . -2 1 1 -1 3 7 -2 . -1 -1 . . . . . . .
+-1 . . . . . . . . . . . 8 . . 0 . . . . . . .
+-2 . -5 -2 0 -4 -1 -2 -2 -1 -4 -2 -2 11 -2 -3 . . . . . . .
+0 . -4 -1 . . . . . . . . 1 . 8 2 . . . . . . .
+-2 . . . . . . . . . . . . . . 9 . . . . . . .
+1 . -1 0 0 -2 0 -1 -2 0 -3 -2 1 -1 1 -1 5 . . . . . .
+0 . -1 -1 -1 -1 -2 -2 -1 0 -1 -1 0 0 -1 -2 2 6 . . . . .
+0 . -2 -3 -3 0 -4 -4 4 -2 2 1 -3 -3 -3 -2 -1 1 5 -3 . -1 .
+-3 . -6 -5 -2 1 -2 -5 -3 -2 -1 -2 -4 -4 -1 -2 -5 -4 . 19 . . .
+0 -1 -2 -1 -1 -1 -1 -1 -1 -1 -1 0 -1 -2 -1 -1 0 0 -1 -2 -1 -1 -1
+-2 . -4 -3 -2 4 -3 2 0 -1 0 1 -2 -3 -1 -1 -2 -1 . 3 . 9 .
+-1 2 -3 1 5 -4 -2 0 -4 1 -2 -2 0 -1 4 0 0 -1 -3 -2 . -2 5'''),
+	'blosum45': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''5 . . . . . . . . . . . . . . . . . . . . . .
+-1 4 -2 5 1 -3 -1 0 -3 0 -3 -2 4 -2 0 -1 0 0 -3 -4 . -2 .
+-1 . 12 -3 . . . . . . . . -2 . . -3 . . . . . . .
+-2 . . 7 . . . . . . . . 2 . . -1 . . . . . . .
+-1 . -3 2 6 . . . . . . . 0 . 2 0 . . . . . . .
+-2 . -2 -4 -3 8 -3 -2 0 -3 1 0 -2 . -4 -2 . . . . . . .
+0 . -3 -1 -2 . 7 . . . . . 0 . -2 -2 . . . . . . .
+-2 . -3 0 0 . -2 10 . . . . 1 . 1 0 . . . . . . .
+-1 . -3 -4 -3 . -4 -3 5 . . . -2 . -2 -3 . . . . . . .
+-1 . -3 0 1 . -2 -1 -3 5 -3 . 0 . 1 3 . . . . . . .
+-1 . -2 -3 -2 . -3 -2 2 . 5 . -3 . -2 -2 . . . . . . .
+-1 . -2 -3 -2 . -2 0 2 -1 2 6 -2 . 0 -1 . . . . . . .
+-1 . . . . . . . . . . . 6 . . 0 . . . . . . .
+-1 . -4 -1 0 -3 -2 -2 -2 -1 -3 -2 -2 9 -1 -2 . . . . . . .
+-1 . -3 0 . . . . . . . . 0 . 6 1 . . . . . . .
+-2 . . . . . . . . . . . . . . 7 . . . . . . .
+1 . -1 0 0 -2 0 -1 -2 -1 -3 -2 1 -1 0 -1 4 . . . . . .
+0 . -1 -1 -1 -1 -2 -2 -1 -1 -1 -1 0 -1 -1 -1 2 5 . . . . .
+0 . -1 -3 -3 0 -3 -3 3 -2 1 1 -3 -3 -3 -2 -1 0 5 -3 . -1 .
+-2 . -5 -4 -3 1 -2 -3 -2 -2 -2 -2 -4 -3 -2 -2 -4 -3 . 15 . . .
+0 -1 -2 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 0 0 -1 -2 -1 -1 -1
+-2 . -3 -2 -2 3 -3 2 0 -1 0 0 -2 -3 -1 -1 -2 -1 . 3 . 8 .
+-1 2 -3 1 4 -3 -2 0 -3 1 -2 -1 0 -1 4 0 0 -1 -3 -2 . -2 4'''),
+	'blosum50': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''5 . . . . . . . . . . . . . . . . . . . . . .
+-2 5 -3 5 1 -4 -1 0 -4 0 -4 -3 4 -2 0 -1 0 0 -4 -5 . -3 .
+-1 . 13 -4 . . . . . . . . -2 . . -4 . . . . . . .
+-2 . . 8 . . . . . . . . 2 . . -2 . . . . . . .
+-1 . -3 2 6 . . . . . . . 0 . 2 0 . . . . . . .
+-3 . -2 -5 -3 8 -4 -1 0 -4 1 0 -4 . -4 -3 . . . . . . .
+0 . -3 -1 -3 . 8 . . . . . 0 . -2 -3 . . . . . . .
+-2 . -3 -1 0 . -2 10 . . . . 1 . 1 0 . . . . . . .
+-1 . -2 -4 -4 . -4 -4 5 . . . -3 . -3 -4 . . . . . . .
+-1 . -3 -1 1 . -2 0 -3 6 -3 . 0 . 2 3 . . . . . . .
+-2 . -2 -4 -3 . -4 -3 2 . 5 . -4 . -2 -3 . . . . . . .
+-1 . -2 -4 -2 . -3 -1 2 -2 3 7 -2 . 0 -2 . . . . . . .
+-1 . . . . . . . . . . . 7 . . -1 . . . . . . .
+-1 . -4 -1 -1 -4 -2 -2 -3 -1 -4 -3 -2 10 -1 -3 . . . . . . .
+-1 . -3 0 . . . . . . . . 0 . 7 1 . . . . . . .
+-2 . . . . . . . . . . . . . . 7 . . . . . . .
+1 . -1 0 -1 -3 0 -1 -3 0 -3 -2 1 -1 0 -1 5 . . . . . .
+0 . -1 -1 -1 -2 -2 -2 -1 -1 -1 -1 0 -1 -1 -1 2 5 . . . . .
+0 . -1 -4 -3 -1 -4 -4 4 -3 1 1 -3 -3 -3 -3 -2 0 5 -3 . -1 .
+-3 . -5 -5 -3 1 -3 -3 -3 -3 -2 -1 -4 -4 -1 -3 -4 -3 . 15 . . .
+-1 -1 -2 -1 -1 -2 -2 -1 -1 -1 -1 -1 -1 -2 -1 -1 -1 0 -1 -3 -1 -1 -1
+-2 . -3 -3 -2 4 -3 2 -1 -2 -1 0 -2 -3 -1 -1 -2 -2 . 2 . 8 .
+-1 2 -3 1 5 -4 -2 0 -3 1 -3 -1 0 -1 4 0 0 -1 -3 -2 . -2 5'''),
+	'blosum55': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''5 . . . . . . . . . . . . . . . . . . . . . .
+-2 5 -3 5 1 -4 -1 0 -4 0 -4 -3 4 -2 0 -1 0 0 -4 -5 . -3 .
+-1 . 13 -4 . . . . . . . . -2 . . -4 . . . . . . .
+-2 . . 8 . . . . . . . . 2 . . -2 . . . . . . .
+-1 . -3 2 6 . . . . . . . 0 . 2 0 . . . . . . .
+-3 . -2 -5 -3 8 -4 -1 0 -4 1 0 -4 . -4 -3 . . . . . . .
+0 . -3 -1 -3 . 8 . . . . . 0 . -2 -3 . . . . . . .
+-2 . -3 -1 0 . -2 10 . . . . 1 . 1 0 . . . . . . .
+-1 . -2 -4 -4 . -4 -4 5 . . . -3 . -3 -4 . . . . . . .
+-1 . -3 -1 1 . -2 0 -3 6 -3 . 0 . 2 3 . . . . . . .
+-2 . -2 -4 -3 . -4 -3 2 . 5 . -4 . -2 -3 . . . . . . .
+-1 . -2 -4 -2 . -3 -1 2 -2 3 7 -2 . 0 -2 . . . . . . .
+-1 . . . . . . . . . . . 7 . . -1 . . . . . . .
+-1 . -4 -1 -1 -4 -2 -2 -3 -1 -4 -3 -2 10 -1 -3 . . . . . . .
+-1 . -3 0 . . . . . . . . 0 . 7 1 . . . . . . .
+-2 . . . . . . . . . . . . . . 7 . . . . . . .
+1 . -1 0 -1 -3 0 -1 -3 0 -3 -2 1 -1 0 -1 5 . . . . . .
+0 . -1 -1 -1 -2 -2 -2 -1 -1 -1 -1 0 -1 -1 -1 2 5 . . . . .
+0 . -1 -4 -3 -1 -4 -4 4 -3 1 1 -3 -3 -3 -3 -2 0 5 -3 . -1 .
+-3 . -5 -5 -3 1 -3 -3 -3 -3 -2 -1 -4 -4 -1 -3 -4 -3 . 15 . . .
+-1 -1 -2 -1 -1 -2 -2 -1 -1 -1 -1 -1 -1 -2 -1 -1 -1 0 -1 -3 -1 -1 -1
+-2 . -3 -3 -2 4 -3 2 -1 -2 -1 0 -2 -3 -1 -1 -2 -2 . 2 . 8 .
+-1 2 -3 1 5 -4 -2 0 -3 1 -3 -1 0 -1 4 0 0 -1 -3 -2 . -2 5'''),
+	'blosum60': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''4 . . . . . . . . . . . . . . . . . . . . . .
+-2 4 -3 4 1 -3 -1 0 -3 0 -3 -3 3 -2 0 -1 0 0 -3 -4 . -2 .
+0 . 9 -3 . . . . . . . . -2 . . -3 . . . . . . .
+-2 . . 6 . . . . . . . . 1 . . -1 . . . . . . .
+-1 . -3 2 5 . . . . . . . 0 . 2 0 . . . . . . .
+-2 . -2 -3 -3 6 -3 -1 0 -3 0 0 -3 . -3 -3 . . . . . . .
+0 . -2 -1 -2 . 6 . . . . . 0 . -2 -2 . . . . . . .
+-2 . -3 -1 0 . -2 7 . . . . 1 . 1 0 . . . . . . .
+-1 . -1 -3 -3 . -3 -3 4 . . . -3 . -3 -3 . . . . . . .
+-1 . -3 -1 1 . -1 -1 -3 4 -2 . 0 . 1 2 . . . . . . .
+-1 . -1 -3 -3 . -4 -3 2 . 4 . -3 . -2 -2 . . . . . . .
+-1 . -1 -3 -2 . -2 -1 1 -1 2 5 -2 . 0 -1 . . . . . . .
+-1 . . . . . . . . . . . 6 . . 0 . . . . . . .
+-1 . -3 -1 -1 -4 -2 -2 -3 -1 -3 -2 -2 7 -1 -2 . . . . . . .
+-1 . -3 0 . . . . . . . . 0 . 5 1 . . . . . . .
+-1 . . . . . . . . . . . . . . 5 . . . . . . .
+1 . -1 0 0 -2 0 -1 -2 0 -2 -1 1 -1 0 -1 4 . . . . . .
+0 . -1 -1 -1 -2 -2 -2 -1 -1 -1 -1 0 -1 -1 -1 1 4 . . . . .
+0 . -1 -3 -2 -1 -3 -3 3 -2 1 1 -3 -2 -2 -2 -2 0 4 -3 . -1 .
+-3 . -2 -4 -3 1 -2 -2 -2 -3 -2 -1 -4 -4 -2 -3 -3 -2 . 10 . . .
+0 -1 -2 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -2 -1 -1 0 0 -1 -2 -1 -1 -1
+-2 . -2 -3 -2 3 -3 2 -1 -2 -1 -1 -2 -3 -1 -2 -2 -2 . 2 . 6 .
+-1 1 -3 1 4 -3 -2 0 -3 1 -2 -1 0 -1 3 0 0 -1 -2 -2 . -2 3'''),
+	'blosum62': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''4 . . . . . . . . . . . . . . . . . . . . . .
+-2 4 -3 4 1 -3 -1 0 -3 0 -4 -3 3 -2 0 -1 0 -1 -3 -4 . -3 .
+0 . 9 -3 . . . . . . . . -3 . . -3 . . . . . . .
+-2 . . 6 . . . . . . . . 1 . . -2 . . . . . . .
+-1 . -4 2 5 . . . . . . . 0 . 2 0 . . . . . . .
+-2 . -2 -3 -3 6 -3 -1 0 -3 0 0 -3 . -3 -3 . . . . . . .
+0 . -3 -1 -2 . 6 . . . . . 0 . -2 -2 . . . . . . .
+-2 . -3 -1 0 . -2 8 . . . . 1 . 0 0 . . . . . . .
+-1 . -1 -3 -3 . -4 -3 4 . . . -3 . -3 -3 . . . . . . .
+-1 . -3 -1 1 . -2 -1 -3 5 -2 . 0 . 1 2 . . . . . . .
+-1 . -1 -4 -3 . -4 -3 2 . 4 . -3 . -2 -2 . . . . . . .
+-1 . -1 -3 -2 . -3 -2 1 -1 2 5 -2 . 0 -1 . . . . . . .
+-2 . . . . . . . . . . . 6 . . 0 . . . . . . .
+-1 . -3 -1 -1 -4 -2 -2 -3 -1 -3 -2 -2 7 -1 -2 . . . . . . .
+-1 . -3 0 . . . . . . . . 0 . 5 1 . . . . . . .
+-1 . . . . . . . . . . . . . . 5 . . . . . . .
+1 . -1 0 0 -2 0 -1 -2 0 -2 -1 1 -1 0 -1 4 . . . . . .
+0 . -1 -1 -1 -2 -2 -2 -1 -1 -1 -1 0 -1 -1 -1 1 5 . . . . .
+0 . -1 -3 -2 -1 -3 -3 3 -2 1 1 -3 -2 -2 -3 -2 0 4 -3 . -1 .
+-3 . -2 -4 -3 1 -2 -2 -3 -3 -2 -1 -4 -4 -2 -3 -3 -2 . 11 . . .
+0 -1 -2 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -2 -1 -1 0 0 -1 -2 -1 -1 -1
+-2 . -2 -3 -2 3 -3 2 -1 -2 -1 -1 -2 -3 -1 -2 -2 -2 . 2 . 7 .
+-1 1 -3 1 4 -3 -2 0 -3 1 -3 -1 0 -1 3 0 0 -1 -2 -3 . -2 4'''),
+	'blosum65': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''4 . . . . . . . . . . . . . . . . . . . . . .
+-2 4 -3 4 1 -3 -1 0 -3 0 -4 -3 3 -2 0 -1 0 -1 -3 -4 . -3 .
+0 . 9 -4 . . . . . . . . -3 . . -4 . . . . . . .
+-2 . . 6 . . . . . . . . 1 . . -2 . . . . . . .
+-1 . -4 2 5 . . . . . . . 0 . 2 0 . . . . . . .
+-2 . -2 -4 -3 6 -3 -1 0 -3 0 0 -3 . -3 -3 . . . . . . .
+0 . -3 -1 -2 . 6 . . . . . -1 . -2 -2 . . . . . . .
+-2 . -3 -1 0 . -2 8 . . . . 1 . 1 0 . . . . . . .
+-1 . -1 -3 -3 . -4 -3 4 . . . -3 . -3 -3 . . . . . . .
+-1 . -3 -1 1 . -2 -1 -3 5 -3 . 0 . 1 2 . . . . . . .
+-2 . -1 -4 -3 . -4 -3 2 . 4 . -4 . -2 -2 . . . . . . .
+-1 . -2 -3 -2 . -3 -2 1 -2 2 6 -2 . 0 -2 . . . . . . .
+-2 . . . . . . . . . . . 6 . . 0 . . . . . . .
+-1 . -3 -2 -1 -4 -2 -2 -3 -1 -3 -3 -2 8 -1 -2 . . . . . . .
+-1 . -3 0 . . . . . . . . 0 . 6 1 . . . . . . .
+-1 . . . . . . . . . . . . . . 6 . . . . . . .
+1 . -1 0 0 -2 0 -1 -2 0 -3 -2 1 -1 0 -1 4 . . . . . .
+0 . -1 -1 -1 -2 -2 -2 -1 -1 -1 -1 0 -1 -1 -1 1 5 . . . . .
+0 . -1 -3 -3 -1 -3 -3 3 -2 1 1 -3 -2 -2 -3 -2 0 4 -3 . -1 .
+-3 . -2 -5 -3 1 -3 -2 -2 -3 -2 -2 -4 -4 -2 -3 -3 -3 . 10 . . .
+-1 -1 -2 -1 -1 -2 -2 -1 -1 -1 -1 -1 -1 -2 -1 -1 -1 -1 -1 -2 -1 -1 -1
+-2 . -2 -3 -2 3 -3 2 -1 -2 -1 -1 -2 -3 -2 -2 -2 -2 . 2 . 7 .
+-1 1 -4 1 4 -3 -2 0 -3 1 -3 -2 0 -1 3 0 0 -1 -2 -3 . -2 4'''),
+	'blosum70': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''4 . . . . . . . . . . . . . . . . . . . . . .
+-2 4 -4 4 1 -4 -1 -1 -4 -1 -4 -3 3 -2 0 -1 0 -1 -3 -4 . -3 .
+-1 . 9 -4 . . . . . . . . -3 . . -4 . . . . . . .
+-2 . . 6 . . . . . . . . 1 . . -2 . . . . . . .
+-1 . -4 1 5 . . . . . . . 0 . 2 0 . . . . . . .
+-2 . -2 -4 -4 6 -4 -1 0 -3 0 0 -3 . -3 -3 . . . . . . .
+0 . -3 -2 -2 . 6 . . . . . -1 . -2 -3 . . . . . . .
+-2 . -4 -1 0 . -2 8 . . . . 0 . 1 0 . . . . . . .
+-2 . -1 -4 -4 . -4 -4 4 . . . -4 . -3 -3 . . . . . . .
+-1 . -4 -1 1 . -2 -1 -3 5 -3 . 0 . 1 2 . . . . . . .
+-2 . -2 -4 -3 . -4 -3 2 . 4 . -4 . -2 -3 . . . . . . .
+-1 . -2 -3 -2 . -3 -2 1 -2 2 6 -2 . 0 -2 . . . . . . .
+-2 . . . . . . . . . . . 6 . . -1 . . . . . . .
+-1 . -3 -2 -1 -4 -3 -2 -3 -1 -3 -3 -2 8 -2 -2 . . . . . . .
+-1 . -3 -1 . . . . . . . . 0 . 6 1 . . . . . . .
+-2 . . . . . . . . . . . . . . 6 . . . . . . .
+1 . -1 0 0 -3 -1 -1 -3 0 -3 -2 0 -1 0 -1 4 . . . . . .
+0 . -1 -1 -1 -2 -2 -2 -1 -1 -2 -1 0 -1 -1 -1 1 5 . . . . .
+0 . -1 -4 -3 -1 -4 -3 3 -3 1 1 -3 -3 -2 -3 -2 0 4 -3 . -2 .
+-3 . -3 -5 -4 1 -3 -2 -3 -3 -2 -2 -4 -4 -2 -3 -3 -3 . 11 . . .
+-1 -1 -2 -2 -1 -2 -2 -1 -1 -1 -1 -1 -1 -2 -1 -1 -1 -1 -1 -3 -1 -2 -1
+-2 . -3 -4 -3 3 -4 2 -1 -2 -1 -1 -2 -3 -2 -2 -2 -2 . 2 . 7 .
+-1 0 -4 1 4 -4 -2 0 -3 1 -3 -2 0 -1 3 0 0 -1 -3 -3 . -2 4'''),
+	'blosum75': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''4 . . . . . . . . . . . . . . . . . . . . . .
+-2 4 -4 4 1 -4 -1 -1 -4 -1 -4 -3 3 -2 0 -1 0 -1 -4 -5 . -3 .
+-1 . 9 -4 . . . . . . . . -3 . . -4 . . . . . . .
+-2 . . 6 . . . . . . . . 1 . . -2 . . . . . . .
+-1 . -5 1 5 . . . . . . . -1 . 2 0 . . . . . . .
+-3 . -2 -4 -4 6 -4 -2 0 -4 0 0 -4 . -4 -3 . . . . . . .
+0 . -3 -2 -3 . 6 . . . . . -1 . -2 -3 . . . . . . .
+-2 . -4 -1 0 . -2 8 . . . . 0 . 1 0 . . . . . . .
+-2 . -1 -4 -4 . -5 -4 4 . . . -4 . -3 -3 . . . . . . .
+-1 . -4 -1 1 . -2 -1 -3 5 -3 . 0 . 1 2 . . . . . . .
+-2 . -2 -4 -4 . -4 -3 1 . 4 . -4 . -3 -3 . . . . . . .
+-1 . -2 -4 -2 . -3 -2 1 -2 2 6 -3 . 0 -2 . . . . . . .
+-2 . . . . . . . . . . . 6 . . -1 . . . . . . .
+-1 . -4 -2 -1 -4 -3 -2 -3 -1 -3 -3 -3 8 -2 -2 . . . . . . .
+-1 . -3 -1 . . . . . . . . 0 . 6 1 . . . . . . .
+-2 . . . . . . . . . . . . . . 6 . . . . . . .
+1 . -1 -1 0 -3 -1 -1 -3 0 -3 -2 0 -1 0 -1 5 . . . . . .
+0 . -1 -1 -1 -2 -2 -2 -1 -1 -2 -1 0 -1 -1 -1 1 5 . . . . .
+0 . -1 -4 -3 -1 -4 -4 3 -3 1 1 -3 -3 -2 -3 -2 0 4 -3 . -2 .
+-3 . -3 -5 -4 1 -3 -2 -3 -4 -2 -2 -4 -5 -2 -3 -3 -3 . 11 . . .
+-1 -2 -2 -2 -1 -2 -2 -1 -2 -1 -1 -1 -1 -2 -1 -1 -1 -1 -1 -3 -1 -2 -1
+-2 . -3 -4 -3 3 -4 2 -2 -2 -1 -2 -3 -4 -2 -2 -2 -2 . 2 . 7 .
+-1 0 -4 1 4 -4 -2 0 -4 1 -3 -2 0 -2 3 0 0 -1 -3 -3 . -3 4'''),
+	'blosum80': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''5 . . . . . . . . . . . . . . . . . . . . . .
+-2 4 -4 4 1 -4 -1 -1 -4 -1 -4 -3 4 -2 0 -2 0 -1 -4 -5 . -3 .
+-1 . 9 -4 . . . . . . . . -3 . . -4 . . . . . . .
+-2 . . 6 . . . . . . . . 1 . . -2 . . . . . . .
+-1 . -5 1 6 . . . . . . . -1 . 2 -1 . . . . . . .
+-3 . -3 -4 -4 6 -4 -2 -1 -4 0 0 -4 . -4 -4 . . . . . . .
+0 . -4 -2 -3 . 6 . . . . . -1 . -2 -3 . . . . . . .
+-2 . -4 -2 0 . -3 8 . . . . 0 . 1 0 . . . . . . .
+-2 . -2 -4 -4 . -5 -4 5 . . . -4 . -3 -3 . . . . . . .
+-1 . -4 -1 1 . -2 -1 -3 5 -3 . 0 . 1 2 . . . . . . .
+-2 . -2 -5 -4 . -4 -3 1 . 4 . -4 . -3 -3 . . . . . . .
+-1 . -2 -4 -2 . -4 -2 1 -2 2 6 -3 . 0 -2 . . . . . . .
+-2 . . . . . . . . . . . 6 . . -1 . . . . . . .
+-1 . -4 -2 -2 -4 -3 -3 -4 -1 -3 -3 -3 8 -2 -2 . . . . . . .
+-1 . -4 -1 . . . . . . . . 0 . 6 1 . . . . . . .
+-2 . . . . . . . . . . . . . . 6 . . . . . . .
+1 . -2 -1 0 -3 -1 -1 -3 -1 -3 -2 0 -1 0 -1 5 . . . . . .
+0 . -1 -1 -1 -2 -2 -2 -1 -1 -2 -1 0 -2 -1 -1 1 5 . . . . .
+0 . -1 -4 -3 -1 -4 -4 3 -3 1 1 -4 -3 -3 -3 -2 0 4 -3 . -2 .
+-3 . -3 -6 -4 0 -4 -3 -3 -4 -2 -2 -4 -5 -3 -4 -4 -4 . 11 . . .
+-1 -2 -3 -2 -1 -2 -2 -2 -2 -1 -2 -1 -1 -2 -1 -1 -1 -1 -1 -3 -1 -2 -1
+-2 . -3 -4 -3 3 -4 2 -2 -3 -2 -2 -3 -4 -2 -3 -2 -2 . 2 . 7 .
+-1 0 -4 1 4 -4 -3 0 -4 1 -3 -2 0 -2 3 0 0 -1 -3 -4 . -3 4'''),
+	'blosum85': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''5 . . . . . . . . . . . . . . . . . . . . . .
+-2 4 -4 4 0 -4 -1 -1 -5 -1 -5 -4 4 -3 -1 -2 0 -1 -4 -5 . -4 .
+-1 . 9 -5 . . . . . . . . -4 . . -4 . . . . . . .
+-2 . . 7 . . . . . . . . 1 . . -2 . . . . . . .
+-1 . -5 1 6 . . . . . . . -1 . 2 -1 . . . . . . .
+-3 . -3 -4 -4 7 -4 -2 -1 -4 0 -1 -4 . -4 -4 . . . . . . .
+0 . -4 -2 -3 . 6 . . . . . -1 . -3 -3 . . . . . . .
+-2 . -5 -2 -1 . -3 8 . . . . 0 . 1 0 . . . . . . .
+-2 . -2 -5 -4 . -5 -4 5 . . . -4 . -4 -4 . . . . . . .
+-1 . -4 -1 0 . -2 -1 -3 6 -3 . 0 . 1 2 . . . . . . .
+-2 . -2 -5 -4 . -5 -3 1 . 4 . -4 . -3 -3 . . . . . . .
+-2 . -2 -4 -3 . -4 -3 1 -2 2 7 -3 . 0 -2 . . . . . . .
+-2 . . . . . . . . . . . 7 . . -1 . . . . . . .
+-1 . -4 -2 -2 -4 -3 -3 -4 -2 -4 -3 -3 8 -2 -2 . . . . . . .
+-1 . -4 -1 . . . . . . . . 0 . 6 1 . . . . . . .
+-2 . . . . . . . . . . . . . . 6 . . . . . . .
+1 . -2 -1 -1 -3 -1 -1 -3 -1 -3 -2 0 -1 -1 -1 5 . . . . . .
+0 . -2 -2 -1 -3 -2 -2 -1 -1 -2 -1 0 -2 -1 -2 1 5 . . . . .
+-1 . -1 -4 -3 -1 -4 -4 3 -3 0 0 -4 -3 -3 -3 -2 0 5 -3 . -2 .
+-3 . -4 -6 -4 0 -4 -3 -3 -5 -3 -2 -5 -5 -3 -4 -4 -4 . 11 . . .
+-1 -2 -3 -2 -1 -2 -2 -2 -2 -1 -2 -1 -2 -2 -1 -2 -1 -1 -1 -3 -2 -2 -1
+-3 . -3 -4 -4 3 -5 2 -2 -3 -2 -2 -3 -4 -2 -3 -2 -2 . 2 . 7 .
+-1 0 -5 1 4 -4 -3 0 -4 1 -4 -2 -1 -2 4 0 -1 -1 -3 -4 . -3 4'''),
+	'blosum90': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''5 . . . . . . . . . . . . . . . . . . . . . .
+-2 4 -4 4 0 -4 -2 -1 -5 -1 -5 -4 4 -3 -1 -2 0 -1 -4 -6 . -4 .
+-1 . 9 -5 . . . . . . . . -4 . . -5 . . . . . . .
+-3 . . 7 . . . . . . . . 1 . . -3 . . . . . . .
+-1 . -6 1 6 . . . . . . . -1 . 2 -1 . . . . . . .
+-3 . -3 -5 -5 7 -5 -2 -1 -4 0 -1 -4 . -4 -4 . . . . . . .
+0 . -4 -2 -3 . 6 . . . . . -1 . -3 -3 . . . . . . .
+-2 . -5 -2 -1 . -3 8 . . . . 0 . 1 0 . . . . . . .
+-2 . -2 -5 -4 . -5 -4 5 . . . -4 . -4 -4 . . . . . . .
+-1 . -4 -1 0 . -2 -1 -4 6 -3 . 0 . 1 2 . . . . . . .
+-2 . -2 -5 -4 . -5 -4 1 . 5 . -4 . -3 -3 . . . . . . .
+-2 . -2 -4 -3 . -4 -3 1 -2 2 7 -3 . 0 -2 . . . . . . .
+-2 . . . . . . . . . . . 7 . . -1 . . . . . . .
+-1 . -4 -3 -2 -4 -3 -3 -4 -2 -4 -3 -3 8 -2 -3 . . . . . . .
+-1 . -4 -1 . . . . . . . . 0 . 7 1 . . . . . . .
+-2 . . . . . . . . . . . . . . 6 . . . . . . .
+1 . -2 -1 -1 -3 -1 -2 -3 -1 -3 -2 0 -2 -1 -1 5 . . . . . .
+0 . -2 -2 -1 -3 -3 -2 -1 -1 -2 -1 0 -2 -1 -2 1 6 . . . . .
+-1 . -2 -5 -3 -2 -5 -4 3 -3 0 0 -4 -3 -3 -3 -2 -1 5 -3 . -3 .
+-4 . -4 -6 -5 0 -4 -3 -4 -5 -3 -2 -5 -5 -3 -4 -4 -4 . 11 . . .
+-1 -2 -3 -2 -2 -2 -2 -2 -2 -1 -2 -1 -2 -2 -1 -2 -1 -1 -2 -3 -2 -2 -1
+-3 . -4 -4 -4 3 -5 1 -2 -3 -2 -2 -3 -4 -3 -3 -3 -2 . 2 . 8 .
+-1 0 -5 0 4 -4 -3 0 -4 1 -4 -2 -1 -2 4 0 -1 -1 -3 -4 . -3 4'''),
+	'blosum95': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''5 . . . . . . . . . . . . . . . . . . . . . .
+-3 4 -4 4 0 -5 -2 -1 -5 -1 -5 -4 4 -3 -1 -2 -1 -1 -5 -6 . -4 .
+-1 . 9 -5 . . . . . . . . -4 . . -5 . . . . . . .
+-3 . . 7 . . . . . . . . 1 . . -3 . . . . . . .
+-1 . -6 1 6 . . . . . . . -1 . 2 -1 . . . . . . .
+-3 . -3 -5 -5 7 -5 -2 -1 -4 0 -1 -4 . -4 -4 . . . . . . .
+-1 . -5 -2 -3 . 6 . . . . . -1 . -3 -4 . . . . . . .
+-3 . -5 -2 -1 . -3 9 . . . . 0 . 1 -1 . . . . . . .
+-2 . -2 -5 -4 . -6 -4 5 . . . -4 . -4 -4 . . . . . . .
+-1 . -5 -2 0 . -3 -1 -4 6 -3 . 0 . 1 2 . . . . . . .
+-2 . -3 -5 -4 . -5 -4 1 . 5 . -5 . -3 -3 . . . . . . .
+-2 . -3 -5 -3 . -4 -3 1 -2 2 7 -3 . -1 -2 . . . . . . .
+-2 . . . . . . . . . . . 7 . . -1 . . . . . . .
+-1 . -5 -3 -2 -5 -4 -3 -4 -2 -4 -3 -3 8 -2 -3 . . . . . . .
+-1 . -4 -1 . . . . . . . . 0 . 7 0 . . . . . . .
+-2 . . . . . . . . . . . . . . 7 . . . . . . .
+1 . -2 -1 -1 -3 -1 -2 -3 -1 -3 -3 0 -2 -1 -2 5 . . . . . .
+0 . -2 -2 -2 -3 -3 -2 -2 -1 -2 -1 -1 -2 -1 -2 1 6 . . . . .
+-1 . -2 -5 -3 -2 -5 -4 3 -3 0 0 -4 -4 -3 -4 -3 -1 5 -3 . -3 .
+-4 . -4 -6 -5 0 -5 -3 -4 -5 -3 -2 -5 -5 -3 -4 -4 -4 . 11 . . .
+-1 -2 -3 -2 -2 -2 -3 -2 -2 -1 -2 -2 -2 -3 -1 -2 -1 -1 -2 -4 -2 -2 -1
+-3 . -4 -5 -4 3 -5 1 -2 -3 -2 -3 -3 -5 -3 -3 -3 -3 . 2 . 8 .
+-1 0 -5 0 4 -4 -3 0 -4 0 -4 -2 -1 -2 4 -1 -1 -2 -3 -4 . -4 4'''),
+	'feng': ('ACDEFGHIKLMNPQRSTVWY', '''6 2 . . . . . . . . . . 5 . . 5 5 . . .
+. 6 . . . . . . . . . . . . . . . . . .
+4 1 6 . . 4 . . . . . 5 2 . . 3 2 . . .
+4 0 5 6 . 4 . . . . . 3 3 . . 3 3 . . .
+2 3 1 0 6 1 2 4 0 4 2 1 2 1 1 3 1 4 . .
+5 3 . . . 6 . . . . . . 3 . . 5 2 . . .
+2 2 3 2 . 1 6 . . . . 4 3 4 . 3 2 . . .
+2 2 1 1 . 2 1 6 2 . 4 2 2 1 2 2 3 . . .
+3 0 3 4 . 2 3 . 6 . . 4 2 4 5 3 4 . . .
+2 2 1 1 . 2 3 5 2 6 5 1 3 2 2 2 2 . . .
+2 2 0 1 . 1 1 . 2 . 6 1 2 2 2 1 3 . . .
+3 2 . . . 3 . . . . . 6 2 . . 5 4 . . .
+. 2 . . . . . . . . . . 6 . . 4 4 . . .
+3 1 4 4 . 2 . . . . . 3 3 6 . 3 3 . . .
+2 2 2 2 . 3 4 . . . . 2 3 3 6 3 3 . . .
+. 4 . . . . . . . . . . . . . 6 . . . .
+. 2 . . . . . . . . . . . . . 5 6 . . .
+5 2 3 4 . 4 1 5 3 5 4 2 3 2 2 2 3 6 . .
+2 3 0 1 3 3 1 2 1 4 3 0 2 1 2 2 1 3 6 3
+2 3 2 1 5 2 3 3 1 3 2 3 2 2 1 3 2 3 . 6'''),
+	'fitch': ('ACEFHILMNOQRSTUVWY', '''3 . . . . . . . . . . . . . . . . .
+1 3 . . . . . . . . . . . . . . . .
+1 1 3 . . . . . . . . . . . . . . .
+1 2 1 3 . . . . . . . . . . . . . .
+2 1 1 1 3 . . . . . . . . . . . . .
+1 0 2 0 1 3 . . . . . . . . . . . .
+2 1 2 1 1 1 3 . . . . . . . . . . .
+0 0 2 1 0 2 1 3 . . . . . . . . . .
+2 1 2 1 2 2 1 1 3 . . . . . . . . .
+2 2 1 2 2 1 1 0 2 3 . . . . . . . .
+1 1 1 1 2 2 1 1 1 2 3 . . . . . . .
+1 2 2 1 2 2 1 2 1 1 2 3 . . . . . .
+1 2 2 2 1 1 2 1 2 2 2 2 3 . . . . .
+0 2 1 1 0 1 1 1 0 1 2 2 2 3 . . . .
+1 1 1 2 2 1 1 2 1 1 2 2 2 2 3 . . .
+2 2 1 2 1 1 2 2 1 1 1 1 1 1 2 3 . .
+1 1 2 2 1 1 1 2 2 1 0 1 2 0 2 2 3 .
+2 2 1 1 1 1 2 1 1 1 1 2 2 2 2 2 1 3'''),
+	'genetic': ('ACDEFGHIKLMNPQRSTVWY', '''4.0 -1.9 . . . . . . . . . . 0.8 . . 0.1 0.9 . . .
+. 5.5 . . . . . . . . . . . . . . . . . .
+1.0 -1.6 4.8 . . 1.1 . . . . . 1.7 -2.2 . . -2.1 -2.1 . . .
+1.3 -3.0 3.8 5.7 . 1.4 . . . . . 0.3 -2.1 . . -2.8 -2.1 . . .
+-2.4 1.8 -1.7 -2.9 4.5 -1.9 -1.1 1.3 -2.8 2.2 0.5 -1.3 -1.8 -2.1 -1.5 0.0 -2.1 1.0 . .
+1.2 1.0 . . . 4.2 . . . . . . -1.8 . . -0.6 -2.1 . . .
+-2.1 -1.6 1.7 0.3 . -2.2 4.7 . . . . 1.8 0.7 3.6 . -1.6 -1.8 . . .
+-1.8 -1.9 -2.1 -2.3 . -2.5 -1.8 4.1 0.7 . 3.3 0.9 -1.6 -1.9 -1.2 -0.5 0.8 . . .
+-1.9 -3.2 0.3 2.0 . -2.2 0.6 . 5.6 . . 3.5 -1.5 2.2 -0.2 -1.5 1.0 . . .
+-2.3 -1.3 -2.4 -2.5 . -2.2 -0.1 1.2 -2.0 3.4 1.5 -2.2 0.0 0.1 -0.4 -1.2 -1.9 . . .
+-2.0 -2.7 -2.5 -1.8 . -2.3 -1.8 . 1.6 . 5.4 0.1 -1.4 -1.2 -0.4 -1.3 0.7 . . .
+-1.7 -1.5 . . . -2.6 . . . . . 4.7 -1.6 . . -0.3 0.9 . . .
+. -1.9 . . . . . . . . . . 3.8 . . 0.4 1.1 . . .
+-2.1 -3.1 0.3 2.0 . -2.1 . . . . . 0.4 1.0 5.5 . -2.3 -1.7 . . .
+-1.6 0.7 -2.3 -2.0 . 0.8 3.6 . . . . -1.5 0.3 0.3 2.9 0.3 -0.6 . . .
+. 1.5 . . . . . . . . . . . . . 2.6 . . . .
+. -1.9 . . . . . . . . . . . . . 1.0 4.0 . . .
+1.0 -2.2 1.0 1.3 . 1.1 -2.1 1.0 -2.1 1.1 1.0 -2.2 -2.1 -2.0 -2.1 -2.2 -2.2 4.1 . .
+-2.2 4.1 -2.9 -3.2 0.0 1.4 -2.1 -2.2 -3.0 -0.3 -2.0 -3.0 -1.6 -2.3 1.8 0.8 -2.2 -2.1 7.5 -0.5
+-2.4 2.6 2.3 -0.9 2.0 -1.8 2.3 -1.6 -0.8 -1.6 -2.9 2.5 -2.3 -0.8 -1.9 0.3 -2.1 -2.2 . 6.5'''),
+	'gonnet': ('ACDEFGHIKLMNPQRSTVWY', '''2.4 0.5 . . . . . . . . . . 0.3 . . 1.1 0.6 . . .
+. 11.5 . . . . . . . . . . . . . . . . . .
+-0.3 -3.2 4.7 . . 0.1 . . . . . 2.2 -0.7 . . 0.5 0.0 . . .
+0.0 -3.0 2.7 3.6 . -0.8 . . . . . 0.9 -0.5 . . 0.2 -0.1 . . .
+-2.3 -0.8 -4.5 -3.9 7.0 -5.2 -0.1 1.0 -3.3 2.0 1.6 -3.1 -3.8 -2.6 -3.2 -2.8 -2.2 0.1 . .
+0.5 -2.0 . . . 6.6 . . . . . . -1.6 . . 0.4 -1.1 . . .
+-0.8 -1.3 0.4 0.4 . -1.4 6.0 . . . . 1.2 -1.1 1.2 . -0.2 -0.3 . . .
+-0.8 -1.1 -3.8 -2.7 . -4.5 -2.2 4.0 -2.1 . 2.5 -2.8 -2.6 -1.9 -2.4 -1.8 -0.6 . . .
+-0.4 -2.8 0.5 1.2 . -1.1 0.6 . 3.2 . . 0.8 -0.6 1.5 2.7 0.1 0.1 . . .
+-1.2 -1.5 -4.0 -2.8 . -4.4 -1.9 2.8 -2.1 4.0 2.8 -3.0 -2.3 -1.6 -2.2 -2.1 -1.3 . . .
+-0.7 -0.9 -3.0 -2.0 . -3.5 -1.3 . -1.4 . 4.3 -2.2 -2.4 -1.0 -1.7 -1.4 -0.6 . . .
+-0.3 -1.8 . . . 0.4 . . . . . 3.8 -0.9 . . 0.9 0.5 . . .
+. -3.1 . . . . . . . . . . 7.6 . . 0.4 0.1 . . .
+-0.2 -2.4 0.9 1.7 . -1.0 . . . . . 0.7 -0.2 2.7 . 0.2 0.0 . . .
+-0.6 -2.2 -0.3 0.4 . -1.0 0.6 . . . . 0.3 -0.9 1.5 4.7 -0.2 -0.2 . . .
+. 0.1 . . . . . . . . . . . . . 2.2 . . . .
+. -0.5 . . . . . . . . . . . . . 1.5 2.5 . . .
+0.1 0.0 -2.9 -1.9 . -3.3 -2.0 3.1 -1.7 1.8 1.6 -2.2 -1.8 -1.5 -2.0 -1.0 0.0 3.4 . .
+-3.6 -1.0 -5.2 -4.3 3.6 -4.0 -0.8 -1.8 -3.5 -0.7 -1.0 -3.6 -5.0 -2.7 -1.6 -3.3 -3.5 -2.6 14.2 4.1
+-2.2 -0.5 -2.8 -2.7 5.1 -4.0 2.2 -0.7 -2.1 0.0 -0.2 -1.4 -3.1 -1.7 -1.8 -1.9 -1.9 -1.1 . 7.8'''),
+	'grant': ('ACDEFGHIKLMNPQRSTVWY', '''215 . . . . . . . . . . . . . . . . . . .
+20 215 61 . . . . . . . . 76 . . 35 . . . . .
+89 . 215 . . . . . . . . 192 . . 119 . . . . .
+108 45 170 215 . . . . . . . 173 . 186 161 . . . . .
+102 10 38 75 215 62 115 194 113 193 187 57 . 99 118 . . . . .
+155 56 121 117 . 215 . . . . . 135 . 128 90 . . . . .
+129 41 134 175 . 117 215 . . . . 147 . 191 186 . . . . .
+121 17 47 81 . 80 121 215 . . . 66 . 106 118 . . . . .
+109 13 114 159 . 88 183 113 215 108 . 121 . 162 189 . . . . .
+119 17 43 77 . 77 116 210 . 215 . 62 . 102 113 . . . . .
+131 19 55 89 . 88 128 205 120 200 215 73 . 114 124 . . . . .
+104 . . . . . . . . . . 215 . . 129 . . . . .
+188 46 107 122 101 173 138 120 112 117 128 124 215 139 112 . . . . .
+124 61 154 . . . . . . . . 169 . 215 172 . . . . .
+103 . . . . . . . . . . . . . 215 . . . . .
+116 103 150 135 60 159 126 73 94 70 80 169 141 147 105 215 . . . .
+157 66 130 150 112 156 168 126 137 123 134 150 177 173 144 157 215 . . .
+151 23 63 94 165 106 131 186 118 183 194 82 147 119 119 91 146 215 127 160
+67 0 34 63 175 31 100 154 105 154 148 41 68 85 114 38 87 . 215 .
+103 21 55 93 193 68 132 182 130 179 179 72 105 116 138 71 123 . 178 215'''),
+	'ident': ('ACDEFGHIKLMNPQRSTVWY', '''6 -1 . . . . . . . . . . -1 . . -1 -1 . . .
+. 6 . . . . . . . . . . . . . . . . . .
+-1 -1 6 . . -1 . . . . . -1 -1 . . -1 -1 . . .
+-1 -1 -1 6 . -1 . . . . . -1 -1 . . -1 -1 . . .
+-1 -1 -1 -1 6 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 . .
+-1 -1 . . . 6 . . . . . . -1 . . -1 -1 . . .
+-1 -1 -1 -1 . -1 6 . . . . -1 -1 -1 . -1 -1 . . .
+-1 -1 -1 -1 . -1 -1 6 -1 . -1 -1 -1 -1 -1 -1 -1 . . .
+-1 -1 -1 -1 . -1 -1 . 6 . . -1 -1 -1 -1 -1 -1 . . .
+-1 -1 -1 -1 . -1 -1 -1 -1 6 -1 -1 -1 -1 -1 -1 -1 . . .
+-1 -1 -1 -1 . -1 -1 . -1 . 6 -1 -1 -1 -1 -1 -1 . . .
+-1 -1 . . . -1 . . . . . 6 -1 . . -1 -1 . . .
+. -1 . . . . . . . . . . 6 . . -1 -1 . . .
+-1 -1 -1 -1 . -1 . . . . . -1 -1 6 . -1 -1 . . .
+-1 -1 -1 -1 . -1 -1 . . . . -1 -1 -1 6 -1 -1 . . .
+. -1 . . . . . . . . . . . . . 6 . . . .
+. -1 . . . . . . . . . . . . . -1 6 . . .
+-1 -1 -1 -1 . -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 6 . .
+-1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 6 -1
+-1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 -1 . 6'''),
+	'johnson': ('ACDEFGHIKLMNPQRSTVWY', '''6.0 . . . . . . . . . . . . . . . . . . .
+-3.4 16.1 . . . . . . . . . . . . . . . . . .
+-1.6 -9.7 8.5 . . . . . . . . . . . . . . . . .
+-0.7 -6.9 2.4 8.6 . . . . . . . . . . . . . . . .
+-3.2 -4.4 -7.0 -6.4 10.4 . . . . . . . . . . . . . . .
+-0.5 -8.2 -2.1 -2.5 -8.6 8.0 . . . . . . . . . . . . . .
+-3.1 -8.2 -0.7 -2.3 -1.7 -3.2 12.7 . . . . . . . . . . . . .
+-2.2 -7.7 -4.8 -4.8 0.5 -5.5 -5.1 8.1 . . . . . . . . . . . .
+-0.9 -8.7 -1.5 1.1 -5.6 -3.5 0.1 -4.7 7.6 . . . . . . . . . . .
+-3.3 -8.7 -8.0 -5.6 1.8 -7.2 -4.2 2.6 -3.4 7.3 . . . . . . . . . .
+-1.5 -4.4 -5.9 -2.8 -0.6 -5.2 -2.3 2.6 -1.9 4.4 11.2 . . . . . . . . .
+-1.4 -7.6 2.6 -0.7 -3.8 -1.4 1.7 -4.7 0.1 -4.8 -3.7 8.0 . . . . . . . .
+-1.0 -8.9 -1.0 -1.5 -5.0 -2.5 -4.3 -5.7 -0.6 -2.8 -9.8 -2.4 10.3 . . . . . . .
+-0.6 -6.9 -1.1 2.4 -6.4 -2.8 1.4 -7.0 1.1 -4.4 -0.6 -0.8 -3.6 9.0 . . . . . .
+-1.6 -5.6 -3.4 -0.2 -6.0 -2.8 0.1 -5.4 3.2 -3.7 -4.2 -1.5 -3.6 2.1 10.0 . . . . .
+0.0 -7.7 -0.2 -2.2 -4.8 -1.3 -2.6 -4.7 -1.5 -5.2 -4.8 1.0 -1.0 -1.2 -0.6 5.8 . . . .
+-0.8 -6.0 -1.8 -0.5 -5.0 -3.8 -3.0 -3.2 -0.2 -4.6 -3.2 0.1 -2.0 -0.4 -1.4 2.0 6.8 . . .
+-0.5 -4.8 -5.2 -4.2 -1.3 -5.6 -3.9 3.9 -3.7 1.8 0.7 -5.7 -5.2 -3.6 -4.9 -4.3 -1.9 7.0 . .
+-5.8 -9.1 -6.0 -7.6 3.4 -6.3 -4.0 -3.3 -5.4 -1.0 -0.9 -6.1 -7.4 -8.2 -3.8 -6.2 -9.3 -4.9 15.2 .
+-4.0 -7.7 -3.8 -3.7 3.4 -5.4 -0.4 -2.5 -3.7 -2.4 -1.3 -1.3 -7.0 -5.1 -2.1 -3.4 -2.7 -1.8 2.3 10.5'''),
+	'levin': ('ACDEFGHIKLMNPQRSTVWY', '''2 . 0 1 . 0 . . . . . . -1 . . . . . . .
+0 2 0 0 . 0 0 0 0 . 0 0 0 0 0 0 0 0 . .
+. . 2 . . 0 . . . . . . 0 . . . . . . .
+. . 1 2 . 0 . . . . . . -1 . . . . . . .
+-1 -1 -1 -1 2 -1 -1 1 -1 0 0 -1 -1 -1 -1 -1 -1 0 . .
+. . . . . 2 . . . . . . . . . . . . . .
+0 . 0 0 . 0 2 . 0 . . 0 0 0 0 0 0 . . .
+0 . -1 -1 . -1 -1 2 -1 . . -1 -1 -1 -1 -1 0 1 . .
+0 . 0 0 . 0 . . 2 . . 1 0 0 . 0 0 . . .
+0 0 -1 -1 . -1 -1 0 -1 2 2 -1 -1 -1 -1 -1 0 1 . .
+0 . -1 -1 . -1 -1 0 -1 . 2 -1 -1 -1 -1 -1 0 0 . .
+0 . 1 0 . 0 . . . . . 3 0 . . . . . . .
+. . . . . 0 . . . . . . 3 . . . . . . .
+0 . 0 1 . 0 . . . . . 1 0 2 . . . . . .
+0 . 0 0 . 0 . . 1 . . 0 0 0 2 0 0 . . .
+1 . 0 0 . 0 . . . . . 0 0 0 . 2 . . . .
+0 . 0 0 . 0 . . . . . 0 0 0 . 0 2 . . .
+0 . -1 -1 . -1 -1 . -1 . . -1 -1 -1 -1 -1 0 2 . .
+-1 -1 -1 -1 0 -1 -1 0 -1 0 0 -1 -1 -1 0 -1 -1 0 2 0
+-1 -1 -1 -1 1 -1 0 0 -1 0 0 -1 -1 -1 -1 -1 -1 0 . 2'''),
+	'mclach': ('ACDEFGHIKLMNPQRSTVWY', '''8 . . . 1 3 . 2 . 2 3 . . . . . . 3 1 1
+1 9 . . 0 1 . 1 . 0 3 . 0 . . 2 2 1 2 1
+3 1 8 5 1 3 4 1 3 1 2 5 3 4 1 3 3 1 0 1
+4 0 . 8 0 3 2 1 4 1 1 . 4 5 3 4 4 2 1 2
+. . . . 9 . . 3 . 5 5 . . . . . . 3 . .
+. . . . 0 8 . 1 . 1 1 . . . . . . 2 1 0
+3 3 . . 4 2 8 2 . 2 3 . 3 . . 3 4 2 3 4
+. . . . . . . 8 . 5 . . . . . . . 5 . .
+3 0 . . 0 3 4 1 8 2 1 . 3 . 5 3 3 2 1 1
+. . . . . . . . . 8 . . . . . . . 5 . .
+. . . . . . . 5 . 6 8 . . . . . . 4 . .
+3 1 . 4 0 3 4 1 4 1 2 8 1 4 3 5 3 1 0 2
+4 . . . 1 3 . 1 . 1 1 . 8 . . . . 2 0 0
+3 0 . . 0 2 4 0 4 3 3 . 3 8 5 4 3 2 2 1
+2 1 . . 1 3 5 1 . 2 1 . 3 . 8 4 3 2 3 2
+4 . . . 2 3 . 2 . 2 2 . 3 . . 8 . 2 3 3
+3 . . . 1 2 . 3 . 3 3 . 3 . . 5 8 3 2 1
+. . . . . . . . . . . . . . . . . 8 . .
+. . . . 6 . . 3 . 3 1 . . . . . . 2 9 .
+. . . . 6 . . 3 . 3 2 . . . . . . 3 6 9'''),
+	'miyata': ('ACDEFGHIKLMNPQRSTVWY', '''1.25 -0.14 . . . . . . . . . . 1.19 . . . . . . .
+. 1.25 . . . . . . . . . . . . . . . . . .
+-1.12 -2.23 1.25 0.35 . -1.12 . . . . . 0.6 -1.15 -0.22 . -0.62 -0.8 . . .
+-1.21 -2.01 . 1.25 . -1.53 . . . . . . -1.23 0.41 . -0.81 -0.58 . . .
+-1.98 -0.99 -3.02 -2.34 1.25 -2.89 -1.38 0.64 -1.6 0.62 0.43 -2.45 -1.92 -1.56 -1.22 -2.2 -1.35 -0.18 . .
+0.34 -0.97 . . . 1.25 . . . . . . 0.28 . . . . . . .
+-0.92 -1.31 -0.47 0.29 . -1.53 1.25 . . . . -0.04 -0.9 0.93 . -0.69 -0.07 . . .
+-1.44 -0.38 -2.73 -2.14 . -2.35 -1.2 1.25 -1.59 1.11 . -2.12 -1.37 -1.32 -1.24 -1.7 -0.89 0.4 . .
+-1.71 -2.02 -0.8 0.11 . -2.29 0.46 . 1.25 . . -0.59 -1.69 0.19 . -1.46 -0.85 . . .
+-1.51 -0.4 -2.85 -2.28 . -2.42 -1.34 . -1.73 1.25 . -2.24 -1.45 -1.45 -1.37 -1.79 -1.0 0.34 . .
+-1.17 -0.21 -2.44 -1.88 . -2.09 -0.94 0.96 -1.38 0.84 1.25 -1.83 -1.11 -1.05 -1.04 -1.42 -0.61 0.63 . .
+-0.53 -1.58 . 0.4 . -0.71 . . . . . 1.25 -0.55 0.26 . -0.06 -0.15 . . .
+. -0.08 . . . . . . . . . . 1.25 . . . . . . .
+-0.67 -1.23 . . . -1.23 . . . . . . -0.67 1.25 . -0.4 0.13 . . .
+-1.67 -1.81 -1.09 -0.2 . -2.33 0.43 . 0.85 . . -0.79 -1.65 0.12 1.25 -1.49 -0.78 . . .
+0.74 -0.59 . . . 0.4 . . . . . . 0.69 . . 1.25 . . . .
+0.35 -0.2 . . . -0.45 . . . . . . 0.38 . . 0.36 1.25 . . .
+-0.6 0.39 -2.15 -1.72 . -1.51 -0.86 . -1.45 . . -1.51 -0.54 -0.88 -1.18 -0.9 -0.17 1.25 . .
+-2.98 -2.09 -3.63 -2.83 0.14 -3.88 -1.91 -0.47 -1.86 -0.48 -0.64 -3.14 -2.92 -2.17 -1.47 -3.13 -2.25 -1.26 1.25 0.19
+-1.93 -1.13 -2.7 -1.97 0.77 -2.83 -1.02 0.39 -1.17 0.31 0.32 -2.17 -1.87 -1.23 -0.77 -2.08 -1.2 -0.27 . 1.25'''),
+	'nwsgappep': ('ABCDEFGHIKLMNPQRSTVWYZ', '''1.5 . . . . . . . . . . . . . . . . . . . . .
+0.2 1.1 . . . . . . . . . . . . . . . . . . . .
+0.3 -0.4 1.5 . . . . . . . . . . . . . . . . . . .
+0.3 1.1 -0.5 1.5 . . . . . . . . . . . . . . . . . .
+0.3 0.7 -0.6 1.0 1.5 . . . . . . . . . . . . . . . . .
+-0.5 -0.7 -0.1 -1.0 -0.7 1.5 . . . . . . . . . . . . . . . .
+0.7 0.6 0.2 0.7 0.5 -0.6 1.5 . . . . . . . . . . . . . . .
+-0.1 0.4 -0.1 0.4 0.4 -0.1 -0.2 1.5 . . . . . . . . . . . . . .
+0.0 -0.2 0.2 -0.2 -0.2 0.7 -0.3 -0.3 1.5 . . . . . . . . . . . . .
+0.0 0.4 -0.6 0.3 0.3 -0.7 -0.1 0.1 -0.2 1.5 . . . . . . . . . . . .
+-0.1 -0.5 -0.8 -0.5 -0.3 1.2 -0.5 -0.2 0.8 -0.3 1.5 . . . . . . . . . . .
+0.0 -0.3 -0.6 -0.4 -0.2 0.5 -0.3 -0.3 0.6 0.2 1.3 1.5 . . . . . . . . . .
+0.2 1.1 -0.3 0.7 0.5 -0.5 0.4 0.5 -0.3 0.4 -0.4 -0.3 1.5 . . . . . . . . .
+0.5 0.1 0.1 0.1 0.1 -0.7 0.3 0.2 -0.2 0.1 -0.3 -0.2 0.0 1.5 . . . . . . . .
+0.2 0.5 -0.6 0.7 0.7 -0.8 0.2 0.7 -0.3 0.4 -0.1 0.0 0.4 0.3 1.5 . . . . . . .
+-0.3 0.1 -0.3 0.0 0.0 -0.5 -0.3 0.5 -0.3 0.8 -0.4 0.2 0.1 0.3 0.4 1.5 . . . . . .
+0.4 0.3 0.7 0.2 0.2 -0.3 0.6 -0.2 -0.1 0.2 -0.4 -0.3 0.3 0.4 -0.1 0.1 1.5 . . . . .
+0.4 0.2 0.2 0.2 0.2 -0.3 0.4 -0.1 0.2 0.2 -0.1 0.0 0.2 0.3 -0.1 -0.1 0.3 1.5 . . . .
+0.2 -0.2 0.2 -0.2 -0.2 0.2 0.2 -0.3 1.1 -0.2 0.8 0.6 -0.3 0.1 -0.2 -0.3 -0.1 0.2 1.5 . . .
+-0.8 -0.7 -1.2 -1.1 -1.1 1.3 -1.0 -0.1 -0.5 0.1 0.5 -0.3 -0.3 -0.8 -0.5 1.4 0.3 -0.6 -0.8 1.5 . .
+-0.3 -0.3 1.0 -0.5 -0.5 1.4 -0.7 0.3 0.1 -0.6 0.3 -0.1 -0.1 -0.8 -0.6 -0.6 -0.4 -0.3 -0.1 1.1 1.5 .
+0.2 0.6 -0.6 0.9 1.1 -0.7 0.3 0.5 -0.2 0.4 -0.2 -0.1 0.4 0.2 1.1 0.2 0.0 0.1 -0.2 -0.8 -0.6 1.1'''),
+	'pam120': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''3 . . . . . . . . . . . . . . . . . . . . . .
+0 4 -6 4 3 -5 0 1 -3 0 -4 -4 3 -2 0 -2 0 0 -3 -6 . -3 .
+-3 . 9 -7 . . . . . . . . -5 . . -4 . . . . . . .
+0 . . 5 . . . . . . . . 2 . . -3 . . . . . . .
+0 . -7 3 5 . . . . . . . 1 . 2 -3 . . . . . . .
+-4 . -6 -7 -7 8 -5 -3 0 -7 0 -1 -4 . -6 -5 . . . . . . .
+1 . -4 0 -1 . 5 . . . . . 0 . -3 -4 . . . . . . .
+-3 . -4 0 -1 . -4 7 . . . . 2 . 3 1 . . . . . . .
+-1 . -3 -3 -3 . -4 -4 6 . . . -2 . -3 -2 . . . . . . .
+-2 . -7 -1 -1 . -3 -2 -3 5 -4 . 1 . 0 2 . . . . . . .
+-3 . -7 -5 -4 . -5 -3 1 . 5 . -4 . -2 -4 . . . . . . .
+-2 . -6 -4 -3 . -4 -4 1 0 3 8 -3 . -1 -1 . . . . . . .
+-1 . . . . . . . . . . . 4 . . -1 . . . . . . .
+1 . -4 -3 -2 -5 -2 -1 -3 -2 -3 -3 -2 6 0 -1 . . . . . . .
+-1 . -7 1 . . . . . . . . 0 . 6 1 . . . . . . .
+-3 . . . . . . . . . . . . . . 6 . . . . . . .
+1 . 0 0 -1 -3 1 -2 -2 -1 -4 -2 1 1 -2 -1 3 . . . . . .
+1 . -3 -1 -2 -4 -1 -3 0 -1 -3 -1 0 -1 -2 -2 2 4 . . . . .
+0 . -3 -3 -3 -3 -2 -3 3 -4 1 1 -3 -2 -3 -3 -2 0 5 -8 . -3 .
+-7 . -8 -8 -8 -1 -8 -3 -6 -5 -3 -6 -4 -7 -6 1 -2 -6 . 12 . . .
+-1 -1 -4 -2 -1 -3 -2 -2 -1 -2 -2 -2 -1 -2 -1 -2 -1 -1 -1 -5 -2 -3 -1
+-4 . -1 -5 -5 4 -6 -1 -2 -5 -2 -4 -2 -6 -5 -5 -3 -3 . -2 . 8 .
+-1 2 -7 3 4 -6 -2 1 -3 -1 -3 -2 0 -1 4 -1 -1 -2 -3 -7 . -5 4'''),
+	'pam180': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''3 . . . . . . . . . . . . . . . . . . . . . .
+0 4 -6 4 3 -6 0 1 -3 0 -5 -3 3 -2 1 -2 1 0 -3 -7 . -4 .
+-3 . 13 -7 . . . . . . . . -5 . . -5 . . . . . . .
+0 . . 5 . . . . . . . . 3 . . -3 . . . . . . .
+0 . -7 4 5 . . . . . . . 2 . 3 -2 . . . . . . .
+-5 . -6 -8 -7 10 -6 -3 1 -7 1 0 -5 . -6 -6 . . . . . . .
+1 . -5 0 0 . 6 . . . . . 0 . -2 -4 . . . . . . .
+-2 . -4 0 0 . -3 8 . . . . 2 . 4 2 . . . . . . .
+-1 . -3 -3 -3 . -4 -4 6 . . . -3 . -3 -3 . . . . . . .
+-2 . -7 0 -1 . -3 -1 -3 6 -4 . 1 . 0 4 . . . . . . .
+-3 . -8 -6 -5 . -6 -3 2 . 7 . -4 . -2 -4 . . . . . . .
+-2 . -7 -4 -3 . -4 -3 2 1 4 9 -3 . -1 -1 . . . . . . .
+0 . . . . . . . . . . . 4 . . -1 . . . . . . .
+1 . -4 -2 -1 -6 -1 -1 -3 -2 -4 -3 -1 8 0 -1 . . . . . . .
+-1 . -7 2 . . . . . . . . 0 . 6 1 . . . . . . .
+-3 . . . . . . . . . . . . . . 8 . . . . . . .
+1 . 0 0 -1 -4 1 -2 -2 -1 -4 -2 1 1 -1 -1 3 . . . . . .
+2 . -3 -1 -1 -4 -1 -2 0 0 -3 -1 0 0 -2 -2 2 4 . . . . .
+0 . -3 -3 -3 -2 -2 -3 5 -4 2 2 -3 -2 -3 -4 -2 0 6 -8 . -4 .
+-8 . -10 -9 -9 0 -9 -4 -7 -5 -3 -6 -5 -7 -6 2 -3 -7 . 18 . . .
+-1 -1 -4 -1 -1 -3 -2 -1 -1 -1 -2 -1 -1 -1 -1 -2 0 -1 -1 -6 -1 -3 -1
+-5 . 0 -6 -6 7 -7 0 -2 -6 -2 -4 -2 -7 -6 -6 -4 -4 . -1 . 11 .
+0 3 -7 3 5 -7 -1 2 -3 0 -3 -2 1 -1 5 0 -1 -1 -3 -8 . -6 5'''),
+	'pam250': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''2 . . . . . . . . . . . . . . . . . . . . . .
+0 3 -4 3 3 -4 0 1 -2 1 -3 -2 2 -1 1 -1 0 0 -2 -5 . -3 .
+-2 . 12 -5 . . . . . . . . -4 . . -4 . . . . . . .
+0 . . 4 . . . . . . . . 2 . . -1 . . . . . . .
+0 . -5 3 4 . . . . . . . 1 . 2 -1 . . . . . . .
+-3 . -4 -6 -5 9 -5 -2 1 -5 2 0 -3 . -5 -4 . . . . . . .
+1 . -3 1 0 . 5 . . . . . 0 . -1 -3 . . . . . . .
+-1 . -3 1 1 . -2 6 . . . . 2 . 3 2 . . . . . . .
+-1 . -2 -2 -2 . -3 -2 5 . . . -2 . -2 -2 . . . . . . .
+-1 . -5 0 0 . -2 0 -2 5 -3 . 1 . 1 3 . . . . . . .
+-2 . -6 -4 -3 . -4 -2 2 . 6 . -3 . -2 -3 . . . . . . .
+-1 . -5 -3 -2 . -3 -2 2 0 4 6 -2 . -1 0 . . . . . . .
+0 . . . . . . . . . . . 2 . . 0 . . . . . . .
+1 . -3 -1 -1 -5 0 0 -2 -1 -3 -2 0 6 0 0 . . . . . . .
+0 . -5 2 . . . . . . . . 1 . 4 1 . . . . . . .
+-2 . . . . . . . . . . . . . . 6 . . . . . . .
+1 . 0 0 0 -3 1 -1 -1 0 -3 -2 1 1 -1 0 2 . . . . . .
+1 . -2 0 0 -3 0 -1 0 0 -2 -1 0 0 -1 -1 1 3 . . . . .
+0 . -2 -2 -2 -1 -1 -2 4 -2 2 2 -2 -1 -2 -2 -1 0 4 -6 . -2 .
+-6 . -8 -7 -7 0 -7 -3 -5 -3 -2 -4 -4 -6 -5 2 -2 -5 . 17 . . .
+0 -1 -3 -1 -1 -2 -1 -1 -1 -1 -1 -1 0 -1 -1 -1 0 0 -1 -4 -1 -2 -1
+-3 . 0 -4 -4 7 -5 0 -1 -4 -1 -2 -2 -5 -4 -4 -3 -3 . 0 . 10 .
+0 2 -5 3 3 -5 0 2 -2 0 -3 -2 1 0 3 0 0 -1 -2 -6 . -4 3'''),
+	'pam30': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''6 . . . . . . . . . . . . . . . . . . . . . .
+-3 6 -12 6 1 -10 -3 -1 -6 -2 -9 -10 6 -7 -3 -7 -1 -3 -8 -10 . -6 .
+-6 . 10 -14 . . . . . . . . -11 . . -8 . . . . . . .
+-3 . . 8 . . . . . . . . 2 . . -10 . . . . . . .
+-2 . -14 2 8 . . . . . . . -2 . 1 -9 . . . . . . .
+-8 . -13 -15 -14 9 -9 -6 -2 -14 -3 -4 -9 . -13 -9 . . . . . . .
+-2 . -9 -3 -4 . 6 . . . . . -3 . -7 -9 . . . . . . .
+-7 . -7 -4 -5 . -9 9 . . . . 0 . 1 -2 . . . . . . .
+-5 . -6 -7 -5 . -11 -9 8 . . . -5 . -8 -5 . . . . . . .
+-7 . -14 -4 -4 . -7 -6 -6 7 -8 . -1 . -3 0 . . . . . . .
+-6 . -15 -12 -9 . -10 -6 -1 . 7 . -7 . -5 -8 . . . . . . .
+-5 . -13 -11 -7 . -8 -10 -1 -2 1 11 -9 . -4 -4 . . . . . . .
+-4 . . . . . . . . . . . 8 . . -6 . . . . . . .
+-2 . -8 -8 -5 -10 -6 -4 -8 -6 -7 -8 -6 8 -3 -4 . . . . . . .
+-4 . -14 -2 . . . . . . . . -3 . 8 -2 . . . . . . .
+-7 . . . . . . . . . . . . . . 8 . . . . . . .
+0 . -3 -4 -4 -6 -2 -6 -7 -4 -8 -5 0 -2 -5 -3 6 . . . . . .
+-1 . -8 -5 -6 -9 -6 -7 -2 -3 -7 -4 -2 -4 -5 -6 0 7 . . . . .
+-2 . -6 -8 -6 -8 -5 -6 2 -9 -2 -1 -8 -6 -7 -8 -6 -3 7 -15 . -7 .
+-13 . -15 -15 -17 -4 -15 -7 -14 -12 -6 -13 -8 -14 -13 -2 -5 -13 . 13 . . .
+-3 -5 -9 -5 -5 -8 -5 -5 -5 -5 -6 -5 -3 -5 -5 -6 -3 -4 -5 -11 -5 -7 -5
+-8 . -4 -11 -8 2 -14 -3 -6 -9 -7 -11 -4 -13 -12 -10 -7 -6 . -5 . 10 .
+-3 0 -14 1 6 -13 -5 -1 -6 -4 -7 -5 -3 -4 6 -4 -5 -6 -6 -14 . -9 6'''),
+	'pam300': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''2 . . . . . . . . . . . . . . . . . . . . . .
+0 3 -5 3 3 -5 1 1 -2 1 -4 -2 2 0 2 0 1 0 -2 -6 . -4 .
+-2 . 15 -6 . . . . . . . . -4 . . -4 . . . . . . .
+0 . . 4 . . . . . . . . 2 . . -1 . . . . . . .
+0 . -6 4 4 . . . . . . . 2 . 3 -1 . . . . . . .
+-4 . -5 -6 -6 11 -5 -2 1 -6 3 1 -4 . -5 -5 . . . . . . .
+2 . -4 1 0 . 5 . . . . . 1 . -1 -2 . . . . . . .
+-1 . -4 1 1 . -2 7 . . . . 2 . 3 2 . . . . . . .
+0 . -3 -2 -2 . -3 -2 5 . . . -2 . -2 -2 . . . . . . .
+-1 . -6 0 0 . -2 0 -2 5 -3 . 1 . 1 4 . . . . . . .
+-2 . -7 -4 -4 . -4 -2 3 . 7 . -3 . -2 -3 . . . . . . .
+-1 . -6 -3 -2 . -3 -2 3 0 4 6 -2 . -1 0 . . . . . . .
+0 . . . . . . . . . . . 2 . . 0 . . . . . . .
+1 . -3 -1 0 -5 0 0 -2 -1 -3 -2 0 6 0 0 . . . . . . .
+0 . -6 2 . . . . . . . . 1 . 4 2 . . . . . . .
+-1 . . . . . . . . . . . . . . 7 . . . . . . .
+1 . 0 0 0 -4 1 -1 -1 0 -3 -2 1 1 0 0 1 . . . . . .
+1 . -2 0 0 -3 0 -1 0 0 -2 -1 0 1 -1 -1 1 2 . . . . .
+0 . -2 -2 -2 -1 -1 -2 4 -2 2 2 -2 -1 -2 -3 -1 0 5 -7 . -3 .
+-6 . -9 -7 -8 1 -8 -3 -6 -4 -2 -5 -5 -6 -5 3 -3 -6 . 22 . . .
+0 0 -3 -1 -1 -2 -1 0 -1 -1 -1 -1 0 -1 0 -1 0 0 0 -4 -1 -2 -1
+-4 . 1 -5 -5 9 -6 0 -1 -5 0 -2 -2 -5 -4 -5 -3 -3 . 0 . 12 .
+0 2 -6 3 3 -5 0 2 -2 1 -3 -2 1 0 3 0 0 0 -2 -6 . -5 3'''),
+	'pam60': ('ABCDEFGHIKLMNPQRSTVWXYZ', '''5 . . . . . . . . . . . . . . . . . . . . . .
+-2 5 -9 5 2 -8 -2 0 -4 -1 -7 -6 5 -4 -1 -5 0 -2 -5 -8 . -5 .
+-5 . 9 -10 . . . . . . . . -7 . . -6 . . . . . . .
+-2 . . 7 . . . . . . . . 2 . . -6 . . . . . . .
+-1 . -10 3 7 . . . . . . . 0 . 2 -6 . . . . . . .
+-6 . -9 -11 -10 8 -7 -4 -1 -10 -1 -2 -6 . -9 -7 . . . . . . .
+0 . -7 -2 -2 . 6 . . . . . -1 . -5 -7 . . . . . . .
+-5 . -6 -2 -3 . -6 8 . . . . 1 . 2 0 . . . . . . .
+-3 . -4 -5 -4 . -7 -6 7 . . . -4 . -5 -4 . . . . . . .
+-5 . -10 -2 -3 . -5 -4 -4 6 -6 . 0 . -1 2 . . . . . . .
+-4 . -11 -9 -7 . -8 -4 0 . 6 . -5 . -3 -6 . . . . . . .
+-3 . -10 -7 -5 . -6 -7 1 0 2 10 -6 . -2 -2 . . . . . . .
+-2 . . . . . . . . . . . 6 . . -3 . . . . . . .
+0 . -6 -5 -3 -7 -4 -2 -6 -4 -5 -6 -4 7 -1 -2 . . . . . . .
+-3 . -10 -1 . . . . . . . . -2 . 7 0 . . . . . . .
+-5 . . . . . . . . . . . . . . 8 . . . . . . .
+1 . -1 -2 -2 -5 0 -4 -4 -2 -6 -4 1 0 -3 -2 5 . . . . . .
+1 . -5 -3 -4 -6 -3 -5 -1 -2 -5 -2 -1 -2 -4 -4 1 6 . . . . .
+-1 . -4 -6 -4 -5 -4 -5 3 -6 -1 0 -5 -4 -5 -5 -4 -1 6 -11 . -5 .
+-10 . -12 -11 -12 -3 -11 -5 -10 -8 -4 -9 -6 -10 -9 0 -4 -9 . 13 . . .
+-2 -3 -6 -3 -3 -5 -3 -3 -3 -3 -4 -3 -2 -3 -3 -4 -2 -2 -3 -8 -3 -5 -3
+-6 . -2 -8 -7 3 -10 -2 -4 -7 -5 -7 -3 -10 -8 -8 -5 -5 . -3 . 9 .
+-2 1 -10 2 5 -10 -3 0 -4 -2 -5 -4 -1 -2 6 -2 -3 -4 -5 -11 . -7 5'''),
+	'pam90': ('ABCDEFGHIKLMNPQRSTVWYZ', '''4 . . . . . . . . . . . . . . . . . . . . .
+-1 4 -7 5 2 -6 -1 1 -3 0 -5 -5 4 -3 0 -3 0 -1 -4 -7 -4 .
+-3 . 9 -8 . . . . . . . . -6 . . -5 . . . . . .
+-1 . . 6 . . . . . . . . 3 . . -5 . . . . . .
+0 . -8 4 6 . . . . . . . 0 . 2 -4 . . . . . .
+-5 . -7 -8 -8 8 -6 -3 0 -8 0 -1 -5 . -7 -6 . . . . . .
+0 . -5 -1 -1 . 5 . . . . . -1 . -3 -5 . . . . . .
+-4 . -5 -1 -1 . -5 8 . . . . 2 . 2 1 . . . . . .
+-2 . -3 -4 -3 . -5 -5 6 . . . -3 . -4 -3 . . . . . .
+-3 . -8 -2 -2 . -4 -2 -3 5 -5 . 1 . -1 2 . . . . . .
+-3 . -9 -7 -5 . -6 -3 1 . 6 . -4 . -3 -5 . . . . . .
+-2 . -8 -5 -4 . -5 -5 1 0 2 9 -4 . -2 -2 . . . . . .
+-1 . . . . . . . . . . . 5 . . -2 . . . . . .
+0 . -5 -4 -2 -6 -3 -2 -4 -3 -4 -4 -2 7 -1 -1 . . . . . .
+-2 . -8 0 . . . . . . . . -1 . 6 0 . . . . . .
+-4 . . . . . . . . . . . . . . 7 . . . . . .
+1 . -1 -1 -2 -4 0 -3 -3 -1 -5 -3 1 0 -2 -1 4 . . . . .
+1 . -4 -2 -2 -5 -2 -3 0 -1 -3 -2 0 -1 -3 -3 2 5 . . . .
+0 . -3 -4 -3 -4 -3 -4 3 -5 0 1 -4 -3 -4 -4 -3 -1 6 -9 -4 .
+-8 . -10 -9 -10 -2 -9 -4 -8 -6 -3 -7 -5 -8 -7 0 -3 -7 . 13 . .
+-5 . -1 -6 -6 4 -8 -1 -3 -6 -3 -6 -2 -8 -6 -6 -4 -4 . -2 9 .
+-1 2 -8 3 5 -8 -2 1 -3 -1 -4 -3 0 -2 5 -1 -2 -2 -3 -8 -6 5'''),
+	'rao': ('ACDEFGHIKLMNPQRSTVWY', '''16 . . . . . . . . . . . . . . . . . . .
+11 16 . . . . . . . . . . . . . . . . . .
+9 8 16 . . . . . . . . . . . . . . . . .
+10 9 11 16 . . . . . . . . . . . . . . . .
+10 10 4 6 16 . . . . . . . . . . . . . . .
+8 8 9 6 7 16 . . . . . . . . . . . . . .
+11 10 9 11 9 7 16 . . . . . . . . . . . . .
+9 8 3 4 12 6 8 16 . . . . . . . . . . . .
+10 9 11 11 6 7 11 4 16 . . . . . . . . . . .
+11 11 6 7 11 6 10 10 7 16 . . . . . . . . . .
+11 10 5 8 10 4 10 9 8 11 16 . . . . . . . . .
+9 9 11 10 6 10 10 5 11 7 6 16 . . . . . . . .
+6 7 8 5 4 11 5 3 6 4 2 9 16 . . . . . . .
+11 10 11 11 7 8 11 6 12 9 9 11 7 16 . . . . . .
+8 8 10 9 5 7 10 4 11 6 6 10 6 10 16 . . . . .
+10 10 10 9 8 11 10 8 10 8 7 11 10 10 9 16 . . . .
+10 10 9 8 10 10 10 10 9 9 8 10 8 10 9 11 16 . . .
+9 8 3 4 11 6 9 12 5 10 9 5 3 6 5 8 10 16 . .
+11 11 6 7 11 8 10 11 7 11 10 8 6 9 7 10 11 11 16 .
+9 10 7 6 10 10 9 10 7 9 8 8 8 8 7 11 11 10 11 16'''),
+	'risler': ('ACDEFGHIKLMNPQRSTVWY', '''2.2 . . . . . . . . . . . . . . . . . . .
+-1.5 2.2 . . . . . . . . . . . . . . . . . .
+0.2 -1.7 2.2 . . . . . . . . . . . . . . . . .
+1.7 -1.5 1.0 2.2 . . . . . . . . . . . . . . . .
+0.6 -1.6 -0.3 0.6 2.2 . . . . . . . . . . . . . . .
+0.6 -1.7 -0.4 0.3 -0.4 2.2 . . . . . . . . . . . . . .
+-0.6 -1.8 -1.3 -0.6 -1.1 -1.2 2.2 . . . . . . . . . . . . .
+1.7 -1.6 0.0 1.5 1.0 0.0 -0.8 2.2 . . . . . . . . . . . .
+1.4 -1.6 0.1 1.4 0.1 -0.1 -1.0 1.0 2.2 . . . . . . . . . . .
+1.3 -1.5 -0.2 0.9 1.0 -0.2 -0.9 2.1 0.7 2.2 . . . . . . . . . .
+1.0 -1.6 -0.5 0.6 -0.2 -0.4 -1.2 0.9 0.4 1.8 2.2 . . . . . . . . .
+1.3 -1.6 0.8 1.4 0.4 0.2 -0.3 0.9 1.0 0.8 0.0 2.2 . . . . . . . .
+-0.2 -1.8 -1.2 -0.1 -1.1 -1.2 -1.6 -0.6 -0.7 -0.8 -1.2 -1.0 2.2 . . . . . . .
+1.8 -1.4 0.6 2.1 0.7 0.2 -0.5 1.4 1.7 1.1 1.2 1.6 -0.6 2.2 . . . . . .
+1.5 -1.5 -0.1 1.9 0.4 0.1 -0.4 1.4 2.1 1.2 1.1 1.2 -0.3 2.0 2.2 . . . . .
+2.0 -1.3 0.7 1.8 0.5 0.7 -0.4 1.6 1.4 1.3 0.6 1.9 -0.3 1.8 2.0 2.2 . . . .
+1.9 -1.4 0.0 1.6 0.3 0.2 -0.9 1.6 1.2 1.2 0.8 1.1 -0.5 1.7 1.9 2.1 2.2 . . .
+2.0 -1.4 0.0 1.6 0.8 0.1 -0.7 2.2 1.2 2.0 0.8 1.1 -0.6 1.5 1.5 1.8 1.6 2.2 . .
+-0.9 -1.8 -1.4 -1.0 -0.9 -1.3 -1.7 -0.7 -1.1 -0.8 -1.3 -1.1 -1.6 -1.0 -0.8 -0.8 -1.0 -0.7 2.2 .
+0.2 -1.1 -0.4 0.2 2.0 -0.2 -0.8 0.4 0.5 0.5 -0.2 -0.1 -1.2 0.5 0.8 0.4 0.3 0.3 -0.6 2.2'''),
+	'structure': ('ACDEFGHIKLMNPQRSTVWY', '''4 -2 . . . . . . . . . . -1 . . 0 -1 . . .
+. 11 . . . . . . . . . . . . . . . . . .
+-1 -7 6 . . -1 . . . . . 2 -1 . . 0 -1 . . .
+0 -3 2 5 . -2 . . . . . 0 -1 . . -1 0 . . .
+-3 -2 -5 -4 7 -6 -2 1 -3 2 0 -3 -5 -4 -4 -3 -3 -1 . .
+0 -6 . . . 5 . . . . . . -2 . . -1 -3 . . .
+-2 -6 0 -2 . -3 8 . . . . 2 -3 0 . -2 -2 . . .
+-2 -4 -3 -3 . -5 -5 6 -3 . 1 -3 -4 -5 -3 -3 -2 . . .
+-1 -4 -1 1 . -3 0 . 5 . . 0 -1 1 2 -1 0 . . .
+-2 -6 -6 -4 . -5 -3 2 -2 5 3 -3 -3 -3 -3 -4 -3 . . .
+0 -5 -4 -2 . -4 -2 . -1 . 8 -2 -6 1 -4 -4 -2 . . .
+-1 -6 . . . -1 . . . . . 5 -2 . . 0 0 . . .
+. -8 . . . . . . . . . . 7 . . -1 -1 . . .
+0 -3 0 2 . -2 . . . . . 0 -2 6 . -1 0 . . .
+-1 -2 -2 0 . -2 0 . . . . -1 -2 1 7 0 -1 . . .
+. -4 . . . . . . . . . . . . . 4 . . . .
+. -5 . . . . . . . . . . . . . 1 5 . . .
+0 -4 -4 -2 . -4 -2 2 -3 1 0 -4 -4 -2 -3 -3 -1 5 . .
+-3 -6 -6 -6 2 -4 -3 -2 -3 -1 -2 -5 -4 -5 -2 -5 -5 -4 10 2
+-3 -6 -3 -2 3 -3 0 -1 -2 -2 -1 -1 -6 -3 -1 -2 -2 -1 . 7'''),
+}
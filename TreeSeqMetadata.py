@@ -0,0 +1,150 @@
+import csv, re
+
+# Reads the neurite metadata table (e.g. demo/NeuriteMetaData.csv): one row per neurite, the first
+# column naming it. Returns a dictionary of neurite name to a dictionary of attribute to value
+def parse_metadata(fname):
+	metadata = {}
+	with open(fname, newline='') as handle:
+		reader = csv.reader(handle)
+		header = [h.strip() for h in next(reader)]
+		for row in reader:
+			if len(row) == 0:
+				continue
+			metadata[row[0].strip()] = {header[k]: row[k].strip() for k in range(1, min(len(header), len(row)))}
+	return metadata
+
+# A comparison between groups of neurites which share a base set of attribute values, e.g.
+#	ArborType:Axon/Order:Rodent/Class2:Pyramidal cell
+#	>BrainRegion:Cortex,Hippocampus
+# compares the rodent pyramidal cell axons of the cortex with those of the hippocampus. Within a group,
+# '&' joins several values (e.g. Basket cell&Martinotti cell)
+class Comparison():
+	def __init__(self, filters, attribute, groups):
+		self.filters = filters # list of (attribute, value)
+		self.attribute = attribute # the attribute the groups differ by
+		self.groups = groups # list of lists of values, one per group
+
+	# Label of the comparison, as in the comparisons file
+	def get_label(self):
+		return '/'.join([a+':'+v for a, v in self.filters]) + ' > ' + self.attribute
+
+	# Label of each group
+	def get_group_labels(self):
+		return ['&'.join(values) for values in self.groups]
+
+	# Test whether a neurite's attributes pass the base filters
+	def passes(self, attributes):
+		return all([attributes.get(a) == v for a, v in self.filters])
+
+	# Get the neurite names of each group, among the given names
+	def select(self, metadata, names):
+		groups = [[] for values in self.groups]
+		for name in names:
+			attributes = metadata.get(name)
+			if attributes is None or not self.passes(attributes):
+				continue
+			for index, values in enumerate(self.groups):
+				if attributes.get(self.attribute) in values:
+					groups[index].append(name)
+		return groups
+
+# Reads a comparisons file (e.g. demo/ClassComparisonTypes.txt): blank-line separated blocks of a base
+# filter line, '/'-separated attribute:value filters, and a '>attribute:group,group,...' line. As '/'
+# separates the filters, a '/' within a filter value is written as ',' (Layer:Layer 2,3 is Layer 2/3)
+def parse_comparisons(fname):
+	comparisons = []
+	filters = None
+	for line in open(fname):
+		line = line.strip()
+		if len(line) == 0:
+			continue
+		if line.startswith('>'):
+			if filters is None:
+				raise IOError('Comparison '+line+' has no base filter line')
+			attribute, values = line[1:].split(':', 1)
+			groups = [[v.strip() for v in group.split('&')] for group in values.split(',') if len(group.strip()) > 0]
+			comparisons.append(Comparison(filters, attribute.strip(), groups))
+			filters = None
+		else:
+			filters = []
+			for part in re.split('/(?=[^/:]+:)', line):
+				attribute, value = part.split(':', 1)
+				filters.append((attribute.strip(), value.strip().replace(',', '/')))
+	return comparisons
+
+# A condition on the metadata of the pairs to align:
+#	same:ArborType	the target and query have the same ArborType
+#	differ:Archive	the target and query have different Archives
+#	target:Species=Rat&Mouse	the target's Species is Rat or Mouse ('query:' tests the query's)
+# A neurite without the attribute (or with it empty) meets none of them
+class PairPredicate():
+	def __init__(self, kind, attribute, values=None):
+		self.kind = kind # same, differ, target or query
+		self.attribute = attribute
+		self.values = values # the values allowed of a target or query condition
+
+	# Label of the condition, as given
+	def get_label(self):
+		if self.values is None:
+			return self.kind+':'+self.attribute
+		return self.kind+':'+self.attribute+'='+'&'.join(self.values)
+
+	# Test whether a neurite's attributes meet a target or query condition
+	def admits(self, attributes):
+		return attributes.get(self.attribute, '') in self.values
+
+	# Test whether a target's and query's attributes meet the condition
+	def test(self, targetAttributes, queryAttributes):
+		if self.kind == 'target':
+			return self.admits(targetAttributes)
+		if self.kind == 'query':
+			return self.admits(queryAttributes)
+		a, b = targetAttributes.get(self.attribute, ''), queryAttributes.get(self.attribute, '')
+		if len(a) == 0 or len(b) == 0:
+			return False
+		return (a == b) == (self.kind == 'same')
+
+# Parse a pair condition, e.g. 'same:ArborType' or 'target:Species=Rat&Mouse' (see PairPredicate)
+def parse_pair_predicate(text):
+	kind, sep, condition = text.partition(':')
+	kind = kind.strip()
+	if kind in ('same', 'differ') and len(condition.strip()) > 0 and '=' not in condition:
+		return PairPredicate(kind, condition.strip())
+	if kind in ('target', 'query') and '=' in condition:
+		attribute, values = condition.split('=', 1)
+		values = [v.strip() for v in values.split('&') if len(v.strip()) > 0]
+		if len(attribute.strip()) > 0 and len(values) > 0:
+			return PairPredicate(kind, attribute.strip(), values)
+	raise IOError('Pair condition '+text+' is not one of same:ATTR, differ:ATTR, target:ATTR=V[&V] or query:ATTR=V[&V]')
+
+# The pairs of targets and queries meeting all of a list of conditions. Queries are indexed by the
+# values of the attributes they must share with the target ('same' conditions) once they pass the
+# query conditions, so a target is only tested against the queries of its block rather than all
+class PairSelection():
+	def __init__(self, predicates, metadata, queryNames):
+		self.predicates = predicates
+		self.metadata = metadata
+		self.same = [p.attribute for p in predicates if p.kind == 'same']
+		self.blocks = {} # values of the same-attributes to the query names having them, in order
+		for name in queryNames:
+			attributes = metadata.get(name)
+			if attributes is None or not all([p.admits(attributes) for p in predicates if p.kind == 'query']):
+				continue
+			key = tuple([attributes.get(a, '') for a in self.same])
+			if '' not in key:
+				self.blocks.setdefault(key, []).append(name)
+		self.differ = [p for p in predicates if p.kind == 'differ']
+
+	# Label of the selection
+	def get_label(self):
+		return ', '.join([p.get_label() for p in self.predicates])
+
+	# Get the names of the queries a target is paired with
+	def select(self, targetName):
+		attributes = self.metadata.get(targetName)
+		if attributes is None or not all([p.admits(attributes) for p in self.predicates if p.kind == 'target']):
+			return []
+		block = self.blocks.get(tuple([attributes.get(a, '') for a in self.same]), [])
+		if len(self.differ) == 0:
+			return list(block)
+		return [name for name in block if all([p.test(attributes, self.metadata[name]) for p in self.differ])]
@@ -0,0 +1,88 @@
+import numpy
+import TreeSeqGlobalAlign
+
+# Pre-flight validation of the sequences of a run, before any worker starts: all sequences are
+# concatenated into one array of code points and checked with array operations. Each residue must be
+# a node type (parse_nodetypes) and have a gap cost in the substitution matrix. The depth of the tree
+# (+1 at an A-node, -1 at a T-node) must fall to -1 at the last node, closing the root, and not before:
+# a T-node closing no subtree pops an empty stack in create_ta_dictionary, and an A-node left open or a
+# node after the root's T is silently mis-paired. Only the sequences found at fault are visited one by one.
+# Empty sequences are counted but not at fault, as they align as gaps throughout
+
+# Node types of the residue pairs which are scored: matches of the same type, and an A-node against a
+# C-node when the A's subtree is gapped
+SCORED_TYPES = (('A', 'A'), ('C', 'C'), ('T', 'T'), ('A', 'C'), ('C', 'A'))
+
+# Code points of the residues of the given node types
+def node_codes(nodeTypes, types):
+	return numpy.array([ord(residue) for nodeType in types for residue in nodeTypes.get(nodeType, '')], dtype=numpy.uint32)
+
+# Scan of a list of sequence records: their lengths and maximum depths, their residues, the names of
+# the empty ones and the problems found, as (name, description)
+class Preflight():
+	def __init__(self, records, nodeTypes, gapResidues):
+		self.names = [record.name for record in records]
+		sequences = [str(record.seq) for record in records]
+		self.lengths = numpy.array([len(seq) for seq in sequences], dtype=numpy.int64)
+		codes = numpy.frombuffer(''.join(sequences).encode('utf-32-le'), dtype=numpy.uint32)
+		self.residues = set([chr(code) for code in numpy.unique(codes)])
+		self.maxDepth = numpy.zeros(len(records), dtype=numpy.int64)
+		self.problems = []
+		self.empty = [self.names[k] for k in numpy.flatnonzero(self.lengths == 0)]
+		faults = numpy.zeros(len(records), dtype=bool)
+		nonempty = numpy.flatnonzero(self.lengths > 0)
+		if len(nonempty) > 0:
+			starts = (numpy.cumsum(self.lengths) - self.lengths)[nonempty]
+			ends = starts + self.lengths[nonempty]
+			steps = numpy.isin(codes, node_codes(nodeTypes, 'A')).astype(numpy.int64) - numpy.isin(codes, node_codes(nodeTypes, 'T'))
+			depth = numpy.cumsum(steps)
+			depth -= numpy.repeat(depth[starts] - steps[starts], self.lengths[nonempty]) # from 0 before each sequence
+			self.maxDepth[nonempty] = numpy.maximum.reduceat(depth, starts)
+			beforeEnd = depth.copy()
+			beforeEnd[ends - 1] = 0
+			unknown = ~numpy.isin(codes, node_codes(nodeTypes, 'ACT'))
+			gapless = ~numpy.isin(codes, numpy.array([ord(residue) for residue in gapResidues], dtype=numpy.uint32))
+			faults[nonempty] = (numpy.minimum.reduceat(beforeEnd, starts) < 0) | (depth[ends - 1] != -1) | \
+						numpy.logical_or.reduceat(unknown | gapless, starts)
+		for k in numpy.flatnonzero(faults):
+			self.problems += [(self.names[k], problem) for problem in describe(sequences[k], nodeTypes, gapResidues)]
+
+	# Summary of the lengths and depths
+	def summarize(self):
+		if len(self.lengths) == 0:
+			return 'no sequences'
+		return ('lengths '+str(self.lengths.min())+'-'+str(self.lengths.max())+' (median '+str(int(numpy.median(self.lengths)))+
+			', mean '+str(round(self.lengths.mean(), 1))+'), depth up to '+str(self.maxDepth.max())+' (median '+
+			str(int(numpy.median(self.maxDepth)))+')')
+
+# The problems of one sequence, found at fault by the scan
+def describe(seq, nodeTypes, gapResidues):
+	problems = []
+	types = set(''.join([nodeTypes.get(nodeType, '') for nodeType in 'ACT']))
+	unknown = sorted(set([residue for residue in seq if residue not in types]))
+	if len(unknown) > 0:
+		problems.append('residues of no node type: '+', '.join(unknown))
+	gapless = sorted(set([residue for residue in seq if residue not in gapResidues and residue in types]))
+	if len(gapless) > 0:
+		problems.append('residues with no gap cost in the matrix: '+', '.join(gapless))
+	depth = 0
+	for position, residue in enumerate(seq):
+		if residue in nodeTypes.get('A', ''):
+			depth += 1
+		elif residue in nodeTypes.get('T', ''):
+			depth -= 1
+		if depth < -1:
+			problems.append('T node at position '+str(position + 1)+' closes no subtree')
+			return problems
+		if depth == -1 and position < len(seq) - 1:
+			problems.append('the root is closed at position '+str(position + 1)+', before the last node')
+			return problems
+	if depth >= 0:
+		problems.append('subtrees left open, with no closing T node: '+str(depth + 1))
+	return problems
+
+# Residue pairs of the two sets which are scored (SCORED_TYPES) but have no score in the substitution matrix
+def missing_pairs(residues1, residues2, nodeTypes, submat):
+	residueTypes = TreeSeqGlobalAlign.create_node_types(nodeTypes)
+	return [(r1, r2) for r1 in sorted(residues1) for r2 in sorted(residues2) if r1 in residueTypes and r2 in residueTypes and
+		(residueTypes[r1], residueTypes[r2]) in SCORED_TYPES and (r1, r2) not in submat]
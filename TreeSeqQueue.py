@@ -0,0 +1,151 @@
+import os, pickle, sqlite3, threading, time
+
+# A job queue of a contraster run in an SQLite file: the run's settings and sequences, and its chunks,
+# each a target and some of its queries. Workers of any number of processes, on this host or on others
+# sharing the file, claim a chunk under a lease, renew the lease while they align it, and commit its
+# results. A lease which expires (its worker was killed, or its host reclaimed) is reissued to the next
+# worker to claim; a worker whose lease was reissued can't commit. The results stay in the file until
+# the run's driver has written them, so a killed run resumes from the chunks completed. The queue uses
+# SQLite's rollback journal, which works wherever the filesystem's locks do
+
+POLL_INTERVAL = 1.0 # seconds between the checks of workers waiting for leases, and of the driver
+
+# Remove a queue file and its journal
+def remove_queue(fname):
+	for name in (fname, fname + '-journal'):
+		if os.path.exists(name):
+			os.remove(name)
+
+class JobQueue():
+	def __init__(self, fname, create=False):
+		if not create and not os.path.isfile(fname):
+			raise IOError('Job queue '+fname+' not found')
+		self.fname = fname
+		self.lock = threading.Lock() # used by the lease renewal thread as well as the worker's
+		self.connection = sqlite3.connect(fname, timeout=60, check_same_thread=False, isolation_level=None)
+		self.connection.executescript('CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value BLOB); '+
+			'CREATE TABLE IF NOT EXISTS sequences (axis TEXT, name TEXT, seq TEXT, PRIMARY KEY (axis, name)); '+
+			'CREATE TABLE IF NOT EXISTS chunks (id INTEGER PRIMARY KEY, target TEXT, queries BLOB, cells INTEGER, '+
+			'state TEXT, worker TEXT, expires REAL, attempts INTEGER, result BLOB); '+
+			'CREATE INDEX IF NOT EXISTS chunkStates ON chunks (state)')
+
+	# Create the run, given its key, settings (a dictionary), targets and queries (name, sequence) and
+	# chunks (target name, query names, cells), unless the queue already holds it. Returns whether it
+	# was created; a queue holding another run (key) can't be reused
+	def initialize(self, key, settings, targets, queries, chunks):
+		with self.lock:
+			self.connection.execute('BEGIN IMMEDIATE')
+			try:
+				row = self.connection.execute("SELECT value FROM settings WHERE name = 'key'").fetchone()
+				if row is not None and row[0] != key:
+					raise IOError('Job queue '+self.fname+' holds another run (other sequences or settings); remove it or give another')
+				if row is None:
+					self.connection.execute("INSERT INTO settings VALUES ('key', ?)", (key,))
+					self.connection.execute("INSERT INTO settings VALUES ('settings', ?)", (pickle.dumps(settings),))
+					self.connection.executemany("INSERT INTO sequences VALUES ('target', ?, ?)", targets)
+					self.connection.executemany("INSERT OR IGNORE INTO sequences VALUES ('query', ?, ?)", queries)
+					self.connection.executemany("INSERT INTO chunks (target, queries, cells, state, attempts) VALUES (?, ?, ?, 'pending', 0)",
+									[(target, pickle.dumps(names), cells) for target, names, cells in chunks])
+			except sqlite3.IntegrityError: # nothing of a run which failed to be created is kept
+				self.connection.execute('ROLLBACK')
+				raise IOError('Job queue '+self.fname+' can\'t hold the run: its targets\' names are not unique')
+			except BaseException:
+				self.connection.execute('ROLLBACK')
+				raise
+			self.connection.execute('COMMIT')
+			return row is None
+
+	# Get the settings of the run
+	def get_settings(self):
+		with self.lock:
+			row = self.connection.execute("SELECT value FROM settings WHERE name = 'settings'").fetchone()
+		if row is None:
+			raise IOError('Job queue '+self.fname+' holds no run')
+		return pickle.loads(row[0])
+
+	# Get the sequences of an axis (target or query), as a dictionary of name to sequence
+	def get_sequences(self, axis):
+		with self.lock:
+			return dict(self.connection.execute('SELECT name, seq FROM sequences WHERE axis = ?', (axis,)).fetchall())
+
+	# Claim the first chunk which is pending or whose lease has expired, for lease seconds. Returns its
+	# id, target and query names, or None if every chunk is done or leased
+	def claim(self, worker, lease):
+		with self.lock:
+			self.connection.execute('BEGIN IMMEDIATE')
+			try:
+				now = time.time()
+				row = self.connection.execute("SELECT id, target, queries FROM chunks WHERE state = 'pending' OR "+
+								"(state = 'leased' AND expires < ?) ORDER BY id LIMIT 1", (now,)).fetchone()
+				if row is not None:
+					self.connection.execute("UPDATE chunks SET state = 'leased', worker = ?, expires = ?, attempts = attempts + 1 "+
+								'WHERE id = ?', (worker, now + lease, row[0]))
+			except BaseException:
+				self.connection.execute('ROLLBACK')
+				raise
+			self.connection.execute('COMMIT')
+			if row is None:
+				return None
+			return row[0], row[1], pickle.loads(row[2])
+
+	# Extend the lease of a chunk held by the worker; False if it has been reissued
+	def renew(self, chunk, worker, lease):
+		with self.lock:
+			return self.connection.execute("UPDATE chunks SET expires = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+							(time.time() + lease, chunk, worker)).rowcount > 0
+
+	# Commit the result of a chunk held by the worker; False (and the result dropped) if it was reissued
+	def complete(self, chunk, worker, result):
+		with self.lock:
+			return self.connection.execute("UPDATE chunks SET state = 'done', result = ? WHERE id = ? AND worker = ? AND "+
+							"state = 'leased'", (pickle.dumps(result), chunk, worker)).rowcount > 0
+
+	# Give up a chunk held by the worker, so it is claimed again at once
+	def release(self, chunk, worker):
+		with self.lock:
+			self.connection.execute("UPDATE chunks SET state = 'pending', worker = NULL, expires = NULL WHERE id = ? AND "+
+						"worker = ? AND state = 'leased'", (chunk, worker))
+
+	# Number of chunks not done
+	def remaining(self):
+		with self.lock:
+			return self.connection.execute("SELECT COUNT(*) FROM chunks WHERE state != 'done'").fetchone()[0]
+
+	# Names of the targets whose chunks are all done
+	def completed_targets(self):
+		with self.lock:
+			return [row[0] for row in self.connection.execute("SELECT target FROM chunks GROUP BY target "+
+										"HAVING SUM(state != 'done') = 0").fetchall()]
+
+	# Get the results of the chunks of a target, in order
+	def get_results(self, target):
+		with self.lock:
+			rows = self.connection.execute('SELECT result FROM chunks WHERE target = ? ORDER BY id', (target,)).fetchall()
+		return [pickle.loads(row[0]) for row in rows]
+
+	# Counts of the chunks, those done, those which were reissued, and the workers which completed them
+	def get_counters(self):
+		with self.lock:
+			row = self.connection.execute("SELECT COUNT(*), SUM(state = 'done'), SUM(attempts > 1), "+
+							"COUNT(DISTINCT CASE WHEN state = 'done' THEN worker END) FROM chunks").fetchone()
+		return {'chunks': row[0], 'done': row[1] or 0, 'reissued': row[2] or 0, 'workers': row[3]}
+
+	def close(self):
+		with self.lock:
+			self.connection.close()
+
+# Renews a worker's lease on a chunk every third of the lease, until stopped
+class LeaseRenewal():
+	def __init__(self, queue, chunk, worker, lease):
+		self.stopped = threading.Event()
+		self.thread = threading.Thread(target=self._run, args=(queue, chunk, worker, lease), daemon=True)
+		self.thread.start()
+
+	def _run(self, queue, chunk, worker, lease):
+		while not self.stopped.wait(lease / 3.0):
+			if not queue.renew(chunk, worker, lease):
+				return
+
+	def stop(self):
+		self.stopped.set()
+		self.thread.join()
@@ -0,0 +1,233 @@
+import json, os
+import numpy
+import TreeSeqGlobalAlign
+
+# Seed-and-extend search for subtrees over a database of tree sequences.
+# A tree sequence is a preorder traversal in which A-nodes have two children, C-nodes one and T-nodes
+# none, so the subtree of a node is the span from it to the first position where the count of open
+# children returns to its level (the (A, T] spans of create_ta_dictionary are the first children of
+# each A). The index holds a hash of every subtree, for exact matches, and the tree-valid k-mers: the
+# windows of k nodes which lie within the subtree of their first node. Queries look their k-mers up
+# in the sorted tables, group the hits by sequence and diagonal, and align the query only against the
+# database subtrees starting near the best-supported diagonals
+
+HASH_BASE = 1000003 # multiplier of the polynomial subtree hash, modulo 2**64
+HASH_MASK = (1 << 64) - 1
+
+# Change in the number of open children at each node of the given types
+def child_deltas(seq, nodeTypes):
+	deltas = numpy.zeros(len(seq), dtype=numpy.int64)
+	for index, c in enumerate(seq):
+		if c in nodeTypes['A']:
+			deltas[index] = 1
+		elif c in nodeTypes['T']:
+			deltas[index] = -1
+	return deltas
+
+# Index of the last node of each node's subtree, or -1 if the sequence ends before the subtree does
+def subtree_ends(seq, nodeTypes):
+	depth = numpy.cumsum(child_deltas(seq, nodeTypes)).tolist()
+	ends = [-1] * len(seq)
+	nextPos = {} # K => depth, V => next position at that depth
+	for index in range(len(seq) - 1, -1, -1):
+		nextPos[depth[index]] = index
+		prior = depth[index-1] if index > 0 else 0
+		ends[index] = nextPos.get(prior - 1, -1)
+	return numpy.array(ends, dtype=numpy.int64)
+
+# Prefix hashes of a sequence of codes: prefix[i] hashes codes[:i]
+def prefix_hashes(codes):
+	prefix = [0]
+	for code in codes:
+		prefix.append((prefix[-1] * HASH_BASE + int(code) + 1) & HASH_MASK)
+	return numpy.array(prefix, dtype=numpy.uint64)
+
+# Hashes of the spans [starts, ends] (inclusive) of a sequence, given its prefix hashes
+def span_hashes(prefix, starts, ends):
+	powers = numpy.ones(len(prefix), dtype=numpy.uint64)
+	for index in range(1, len(prefix)):
+		powers[index] = (int(powers[index-1]) * HASH_BASE) & HASH_MASK
+	with numpy.errstate(over='ignore'):
+		return prefix[ends+1] - prefix[starts] * powers[ends+1-starts]
+
+# Integer keys of the tree-valid k-mers of a sequence, with their positions
+def kmer_keys(codes, ends, k, base):
+	if len(codes) < k:
+		return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64)
+	windows = numpy.lib.stride_tricks.sliding_window_view(codes, k)
+	powers = base ** numpy.arange(k - 1, -1, -1, dtype=numpy.int64)
+	positions = numpy.arange(len(windows))
+	valid = (ends[:len(windows)] >= positions + k - 1) & numpy.all(windows >= 0, axis=1)
+	return (windows[valid] @ powers), positions[valid]
+
+# Persistent index of a sequence database; stored as a directory of arrays which are memory-mapped
+# when loaded, so opening an index doesn't read it
+class SubtreeIndex():
+	def __init__(self, meta, arrays):
+		self.k = meta['k']
+		self.alphabet = {c: index for index, c in enumerate(meta['alphabet'])}
+		self.nodeTypes = meta['nodeTypes']
+		self.names = meta['names']
+		self.offsets = arrays['offsets'] # start of each sequence in text; one extra for the end
+		self.text = arrays['text'] # all sequences, concatenated, as bytes
+		self.ends = arrays['ends'] # per node, global index of the last node of its subtree (-1 if none)
+		self.kmerKeys = arrays['kmer_keys'] # sorted
+		self.kmerPos = arrays['kmer_pos'] # global position of each k-mer
+		self.treeHashes = arrays['tree_hashes'] # sorted
+		self.treePos = arrays['tree_pos'] # global position of each subtree's root
+
+	# Build an index of the given records
+	@staticmethod
+	def build(records, k, nodeTypes):
+		alphabet = sorted(set(''.join([str(record.seq) for record in records])))
+		if len(alphabet) ** k >= 2 ** 63:
+			raise IOError('k-mers of length '+str(k)+' over '+str(len(alphabet))+' residues exceed 63 bits')
+		codeOf = {c: index for index, c in enumerate(alphabet)}
+		offsets, texts, allEnds, keys, keyPos, hashes, hashPos = [0], [], [], [], [], [], []
+		for record in records:
+			seq = str(record.seq)
+			start = offsets[-1]
+			codes = numpy.array([codeOf[c] for c in seq], dtype=numpy.int64)
+			ends = subtree_ends(seq, nodeTypes)
+			roots = numpy.nonzero(ends >= 0)[0]
+			hashes.append(span_hashes(prefix_hashes(codes), roots, ends[roots]))
+			hashPos.append(roots + start)
+			kmers, positions = kmer_keys(codes, ends, k, len(alphabet))
+			keys.append(kmers)
+			keyPos.append(positions + start)
+			allEnds.append(numpy.where(ends >= 0, ends + start, -1))
+			texts.append(seq)
+			offsets.append(start + len(seq))
+		keys, keyPos = numpy.concatenate(keys + [numpy.zeros(0, numpy.int64)]), numpy.concatenate(keyPos + [numpy.zeros(0, numpy.int64)])
+		hashes, hashPos = numpy.concatenate(hashes + [numpy.zeros(0, numpy.uint64)]), numpy.concatenate(hashPos + [numpy.zeros(0, numpy.int64)])
+		keyOrder, hashOrder = numpy.argsort(keys, kind='stable'), numpy.argsort(hashes, kind='stable')
+		meta = {'k': k, 'alphabet': alphabet, 'nodeTypes': nodeTypes, 'names': [record.name for record in records]}
+		arrays = {'offsets': numpy.array(offsets, dtype=numpy.int64),
+			'text': numpy.frombuffer(''.join(texts).encode(), dtype=numpy.uint8),
+			'ends': numpy.concatenate(allEnds + [numpy.zeros(0, numpy.int64)]),
+			'kmer_keys': keys[keyOrder], 'kmer_pos': keyPos[keyOrder],
+			'tree_hashes': hashes[hashOrder], 'tree_pos': hashPos[hashOrder]}
+		return SubtreeIndex(meta, arrays)
+
+	# Write the index to a directory
+	def save(self, dirname):
+		if not os.path.isdir(dirname):
+			os.makedirs(dirname)
+		meta = {'k': self.k, 'alphabet': sorted(self.alphabet, key=self.alphabet.get),
+			'nodeTypes': self.nodeTypes, 'names': self.names}
+		with open(os.path.join(dirname, 'meta.json'), 'w') as handle:
+			json.dump(meta, handle)
+		for name, array in (('offsets', self.offsets), ('text', self.text), ('ends', self.ends),
+				('kmer_keys', self.kmerKeys), ('kmer_pos', self.kmerPos),
+				('tree_hashes', self.treeHashes), ('tree_pos', self.treePos)):
+			numpy.save(os.path.join(dirname, name + '.npy'), array)
+
+	# Open an index written by save
+	@staticmethod
+	def load(dirname):
+		if not os.path.isfile(os.path.join(dirname, 'meta.json')):
+			raise IOError('No subtree index found in '+dirname)
+		with open(os.path.join(dirname, 'meta.json')) as handle:
+			meta = json.load(handle)
+		arrays = {}
+		for name in ('offsets', 'text', 'ends', 'kmer_keys', 'kmer_pos', 'tree_hashes', 'tree_pos'):
+			arrays[name] = numpy.load(os.path.join(dirname, name + '.npy'), mmap_mode='r')
+		return SubtreeIndex(meta, arrays)
+
+	# Number of sequences and nodes indexed
+	def size(self):
+		return len(self.names), int(self.offsets[-1])
+
+	# Get the sequence (or the span [start, end] of it) at global positions
+	def get_span(self, start, end):
+		return self.text[start:end+1].tobytes().decode()
+
+	# Get the sequence index of a global position
+	def sequence_of(self, position):
+		return int(numpy.searchsorted(self.offsets, position, side='right')) - 1
+
+	# Encode a query, with -1 for residues not in the database
+	def encode(self, seq):
+		return numpy.array([self.alphabet.get(c, -1) for c in seq], dtype=numpy.int64)
+
+	# Global positions of the database subtrees identical to the query
+	def exact_hits(self, seq):
+		codes = self.encode(seq)
+		if len(seq) == 0 or numpy.any(codes < 0):
+			return []
+		target = span_hashes(prefix_hashes(codes), numpy.array([0]), numpy.array([len(seq) - 1]))[0]
+		lo = numpy.searchsorted(self.treeHashes, target, side='left')
+		hi = numpy.searchsorted(self.treeHashes, target, side='right')
+		hits = []
+		for position in self.treePos[lo:hi]: # verify, as hashes may collide
+			position = int(position)
+			end = int(self.ends[position])
+			if end - position + 1 == len(seq) and self.get_span(position, end) == seq:
+				hits.append(position)
+		return hits
+
+	# Look up the query's tree-valid k-mers. Returns the database positions and query offsets of all
+	# hits; k-mers occurring more than maxOccurrences times are skipped (low-complexity seeds)
+	def seed_hits(self, seq, maxOccurrences):
+		codes = self.encode(seq)
+		keys, offsets = kmer_keys(codes, subtree_ends(seq, self.nodeTypes), self.k, len(self.alphabet))
+		lo = numpy.searchsorted(self.kmerKeys, keys, side='left')
+		hi = numpy.searchsorted(self.kmerKeys, keys, side='right')
+		keep = (hi > lo) & (hi - lo <= maxOccurrences)
+		lo, hi, offsets = lo[keep], hi[keep], offsets[keep]
+		counts = hi - lo
+		if counts.sum() == 0:
+			return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64)
+		# expand the [lo, hi) ranges into one entry per hit
+		starts = numpy.repeat(lo - numpy.concatenate(([0], numpy.cumsum(counts)[:-1])), counts)
+		rows = starts + numpy.arange(counts.sum())
+		return numpy.asarray(self.kmerPos[rows], dtype=numpy.int64), numpy.repeat(offsets, counts)
+
+	# Candidate regions: the (sequence, diagonal) pairs, the diagonal being the database position of the
+	# query's first node, supported by at least minSeeds distinct seeds; best supported first
+	def candidate_diagonals(self, positions, offsets, minSeeds, maxCandidates):
+		if len(positions) == 0:
+			return []
+		seqIndices = numpy.searchsorted(self.offsets, positions, side='right') - 1
+		seeds = numpy.unique(numpy.stack([seqIndices, positions - offsets, offsets], axis=1), axis=0)
+		values, counts = numpy.unique(seeds[:, :2], axis=0, return_counts=True) # distinct seeds per diagonal
+		order = numpy.argsort(-counts, kind='stable')
+		return [(int(values[index, 0]), int(values[index, 1]), int(counts[index])) for index in order[:maxCandidates]
+				if counts[index] >= minSeeds]
+
+	# Search the database for subtrees resembling the query. Each candidate diagonal is extended by a
+	# semi-global alignment: the query is aligned (NeedlemanWunsch) against each database subtree
+	# rooted within band nodes of the diagonal and within a factor lengthRatio of the query's length.
+	# Subtrees identical to the query are always candidates. Returns the best subtree per database
+	# sequence as (sequence name, start, end, score, seeds, exact), with start and end relative to the
+	# sequence, best scoring first; and the number of alignments made
+	def search(self, query, costs, submat, band=4, minSeeds=3, maxOccurrences=5000, maxCandidates=50,
+			lengthRatio=2.0, top=10, workspace=None):
+		seq = str(query.seq)
+		exact = self.exact_hits(seq)
+		positions, offsets = self.seed_hits(seq, maxOccurrences)
+		candidates = [(self.sequence_of(position), position, 0) for position in exact]
+		candidates += self.candidate_diagonals(positions, offsets, minSeeds, maxCandidates)
+		support = {(seqIndex, diagonal): seeds for seqIndex, diagonal, seeds in candidates}
+		best = {} # K => sequence index, V => result
+		aligned = set()
+		for seqIndex, diagonal, seeds in candidates:
+			start = int(self.offsets[seqIndex])
+			lo = max(diagonal - band, start)
+			hi = min(diagonal + band, int(self.offsets[seqIndex+1]) - 1)
+			for root in range(lo, hi + 1):
+				end = int(self.ends[root])
+				length = end - root + 1
+				if end < 0 or root in aligned or length * lengthRatio < len(seq) or length > len(seq) * lengthRatio:
+					continue
+				aligned.add(root)
+				subject = TreeSeqGlobalAlign.TreeSequence(self.names[seqIndex], self.get_span(root, end))
+				NW = TreeSeqGlobalAlign.NeedlemanWunsch(query, subject, costs, submat, self.nodeTypes, workspace)
+				score = float(NW.get_top_score())
+				del NW
+				result = (self.names[seqIndex], root - start, end - start, score,
+						support.get((seqIndex, diagonal), seeds), root in exact)
+				if seqIndex not in best or score > best[seqIndex][3]:
+					best[seqIndex] = result
+		results = sorted(best.values(), key=lambda r: (-r[3], r[0]))
+		return results[:top], len(aligned)
@@ -0,0 +1,57 @@
+import hashlib, sqlite3, threading
+import TreeSeqDataset
+
+# A persistent, sparse store of alignment scores (SQLite): one row per aligned (target, query) pair,
+# keyed by the content hashes of the two sequences and by the settings which determine the score, so
+# that cells computed by one run (or interactively, TreeSeqLibrary.ScoreMatrix) are reused by any
+# later one with the same settings, whatever the names or order of the sequences
+
+# Content hash of a sequence record, as the contrasters' manifests record it
+def sequence_hash(record):
+	return hashlib.sha1(str(record.seq).encode()).hexdigest()
+
+# Key of the settings a score depends on: the costs, the completed substitution matrix and the node
+# types. Numbers are keyed as floats, as an integer matrix scores the same as its float form
+def params_key(costs, submat, nodeTypes):
+	completed = TreeSeqDataset.completed_matrix(submat, costs['gap'])
+	completed = sorted([(pair, float(score)) for pair, score in completed.items()])
+	return hashlib.sha1((repr(float(costs['gap'])) + '/' + repr(float(costs['gapopen'])) + '/' + repr(completed) +
+				'/' + repr(sorted(nodeTypes.items()))).encode()).hexdigest()
+
+class ScoreStore():
+	def __init__(self, fname, params):
+		self.fname = fname
+		self.params = params # settings key (params_key) of the scores read and added
+		self.lock = threading.Lock() # used from the contraster's writer thread as well as the main one
+		self.connection = sqlite3.connect(fname, check_same_thread=False)
+		self.connection.execute('PRAGMA journal_mode=WAL')
+		self.connection.execute('PRAGMA synchronous=NORMAL')
+		self.connection.execute('CREATE TABLE IF NOT EXISTS scores (params TEXT, target TEXT, query TEXT, score REAL, '+
+					'PRIMARY KEY (params, target, query)) WITHOUT ROWID')
+		self.connection.commit()
+		self.counters = {'read': 0, 'added': 0}
+
+	# Get the stored scores of a target, as a dictionary of query hash to score
+	def get_row(self, target):
+		with self.lock:
+			rows = self.connection.execute('SELECT query, score FROM scores WHERE params = ? AND target = ?',
+							(self.params, target)).fetchall()
+		self.counters['read'] += len(rows)
+		return dict(rows)
+
+	# Add scores, given as (target hash, query hash, score)
+	def add(self, cells):
+		cells = [(self.params, target, query, float(score)) for target, query, score in cells]
+		with self.lock:
+			self.connection.executemany('INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)', cells)
+			self.connection.commit()
+		self.counters['added'] += len(cells)
+
+	# Number of scores stored under the settings
+	def __len__(self):
+		with self.lock:
+			return self.connection.execute('SELECT COUNT(*) FROM scores WHERE params = ?', (self.params,)).fetchone()[0]
+
+	def close(self):
+		with self.lock:
+			self.connection.close()
@@ -0,0 +1,212 @@
+import numpy, hashlib
+import TreeSeqGlobalAlign
+
+# A grid of cost settings (gap, gapopen and substitution matrix per setting), stored as dense tables
+# so that a single dynamic programming pass can evaluate every setting at once
+class SweepGrid():
+	def __init__(self, settings, nodeTypes):
+		self.settings = settings # list of dictionaries with 'gap', 'gapopen' and 'submat' keys
+		self.nodeTypes = nodeTypes
+		self.size = len(settings) # number of settings, i.e. length of the parameter axis
+		for setting in settings: # complete each substitution matrix exactly as NeedlemanWunsch would
+			TreeSeqGlobalAlign.create_residue_specific_gapcost(setting['submat'], setting['gap'])
+		self.create_alphabet()
+		self.create_tables()
+		self.key = self.create_key()
+
+	# Assign an index to each residue found in any of the substitution matrices or node types
+	def create_alphabet(self):
+		residues = set()
+		for setting in self.settings:
+			for pair in setting['submat'].keys():
+				residues.update(pair)
+		for nodeType in self.nodeTypes.keys():
+			residues.update(self.nodeTypes[nodeType])
+		residues.discard('-')
+		self.alphabet = {residue: index for index, residue in enumerate(sorted(residues))}
+
+	# Build the (setting, residue, residue) substitution table and the (setting, residue) gap table
+	# Missing entries are NaN
+	def create_tables(self):
+		n = len(self.alphabet)
+		self.sub = numpy.full((self.size, n, n), numpy.nan)
+		self.gap = numpy.full((self.size, n), numpy.nan)
+		for p, setting in enumerate(self.settings):
+			for (a, b), score in setting['submat'].items():
+				if a in self.alphabet and b in self.alphabet:
+					self.sub[p, self.alphabet[a], self.alphabet[b]] = score
+				elif a in self.alphabet and b == '-':
+					self.gap[p, self.alphabet[a]] = score
+		self.gapext = numpy.array([setting['gap'] for setting in self.settings], dtype=numpy.float64)
+		self.gapopen = numpy.array([setting['gapopen'] for setting in self.settings], dtype=numpy.float64)
+
+	# Create a key identifying this grid, used to share prepared sequences between jobs of a worker
+	def create_key(self):
+		h = hashlib.sha1()
+		h.update(repr(sorted(self.alphabet.items())).encode())
+		for array in (self.sub, self.gap, self.gapext, self.gapopen):
+			h.update(numpy.ascontiguousarray(array).tobytes())
+		return h.hexdigest()
+
+	# Get a per-sequence preprocessed form, shared by every pair (and setting) it takes part in
+	def prepare(self, record):
+		key = (self.key, record.name, str(record.seq))
+		if key not in _preparedCache:
+			_preparedCache[key] = SweepSequence(record, self)
+		return _preparedCache[key]
+
+# Prepared sequences, per worker process
+_preparedCache = {}
+
+# Per-sequence data which does not depend on the pair: residue indices, node types, and for each T-node
+# the paired A-node index and the subtree gap cost under every setting
+class SweepSequence():
+	def __init__(self, record, grid):
+		self.name = record.name
+		self.seq = str(record.seq)
+		nodeTypes = TreeSeqGlobalAlign.create_node_types(grid.nodeTypes)
+		self.codes = [grid.alphabet[c] for c in self.seq]
+		self.types = [nodeTypes[c] for c in self.seq]
+		self.create_ta_costs(grid)
+
+	# Mirrors create_ta_dictionary, but accumulates the gap cost registers as vectors over the
+	# parameter axis (in the same order, so the sums are identical to the single-setting ones)
+	def create_ta_costs(self, grid):
+		self.partners = [-2] * len(self.seq) # -2 for non T-nodes, -1 for the last T
+		self.major = numpy.zeros((len(self.seq), grid.size))
+		AStack = [-1]
+		CostStack = [numpy.zeros(grid.size)]
+		for index in range(0, len(self.seq)):
+			CostStack[-1] = CostStack[-1] + grid.gap[:, self.codes[index]]
+			if self.types[index] == 'A':
+				AStack.append(index)
+				CostStack.append(numpy.zeros(grid.size))
+			elif self.types[index] == 'T':
+				self.partners[index] = AStack.pop()
+				currCost = CostStack.pop()
+				self.major[index] = currCost
+				if len(CostStack) > 0:
+					CostStack[-1] = CostStack[-1] + currCost
+
+# Global tree-sequence alignment of one pair under every setting of a SweepGrid
+# The recurrence is that of TreeSeqGlobalAlign.NeedlemanWunsch, evaluated with each cell holding
+# a vector over the settings; only the scores are kept (no traceback)
+class NeedlemanWunschSweep():
+	def __init__(self, s1, s2, grid):
+		self.grid = grid
+		self.seq1 = grid.prepare(s1)
+		self.seq2 = grid.prepare(s2)
+		self.scoreMat = None # (l1+1, l2+1, settings) score matrix
+		self.leftMat = None # gap scores over sequence 1, NaN where no gap is possible
+		self.upMat = None # gap scores over sequence 2, NaN where no gap is possible
+		self._aligner()
+
+	# return the top alignment score of each setting
+	def get_top_scores(self):
+		return self.scoreMat[-1, -1].tolist()
+
+	# Create parser-friendly output given a sweep alignment
+	def prettify(self):
+		return [ self.get_top_scores(), None, self.seq2.name ]
+
+	# Vectorized form of NeedlemanWunsch.determine_open_extend; gaps whose prior position can't gap
+	# (NaN) and ties between opening and extending are both opened
+	def determine_open_extend(self, priorScore, priorGapScore, currentGapCost):
+		openGapScore = priorScore + currentGapCost + self.grid.gapopen
+		extendGapScore = priorGapScore + currentGapCost
+		return numpy.where(extendGapScore > openGapScore, extendGapScore, openGapScore)
+
+	# Vectorized form of NeedlemanWunsch.calculate_gap; returns None if the node can't be gapped
+	def calculate_gap(self, i, j, seq1, seq2, m, dirScoreM):
+		nodeType = seq1.types[i-1]
+		if nodeType == 'C':
+			return self.determine_open_extend(m[i-1, j], dirScoreM[i-1, j], self.grid.gap[:, seq1.codes[i-1]])
+		elif nodeType == 'T':
+			gapPosi = seq1.partners[i-1]
+			if gapPosi == -1: # last T, the whole sequence is gapped
+				gapPosi = 0
+			gapCostMajor = seq1.major[i-1]
+			gapCostStart = self.grid.gap[:, seq1.codes[gapPosi]]
+			gapScore = self.determine_open_extend(m[gapPosi, j], dirScoreM[gapPosi, j], gapCostMajor + gapCostStart)
+			if seq2.types[j-1] == 'C' and seq1.partners[i-1] != -1:
+				ACScore = self.grid.sub[:, seq1.codes[gapPosi], seq2.codes[j-1]]
+				gapScoreACFinish = m[gapPosi, j-1] + gapCostMajor + ACScore + self.grid.gapopen
+				gapScore = numpy.where(gapScoreACFinish >= gapScore, gapScoreACFinish, gapScore)
+			return gapScore
+		else: # AType, no gapping allowed
+			return None
+
+	# Execute alignment
+	def _aligner(self):
+		l1, l2, size = len(self.seq1.seq), len(self.seq2.seq), self.grid.size
+		self.scoreMat = numpy.zeros((l1+1, l2+1, size))
+		# Gap scores are held at the same precision as NeedlemanWunsch's 'f16' gap matrices
+		self.leftMat = numpy.full((l1+1, l2+1, size), numpy.nan, dtype=numpy.longdouble)
+		self.upMat = numpy.full((l1+1, l2+1, size), numpy.nan, dtype=numpy.longdouble)
+		self.leftMat[0, 0] = 0
+		self.upMat[0, 0] = 0
+		for i in range(1, l1 + 1):
+			self.scoreMat[i, 0] = self.grid.gapext * i + self.grid.gapopen
+		for j in range(1, l2 + 1):
+			self.scoreMat[0, j] = self.grid.gapext * j + self.grid.gapopen
+		scoreT, upT = self.scoreMat.transpose(1, 0, 2), self.upMat.transpose(1, 0, 2)
+		for i in range(1, l1 + 1):
+			type1 = self.seq1.types[i-1]
+			for j in range(1, l2 + 1):
+				type2 = self.seq2.types[j-1]
+				if (type1 == 'C' and type2 == 'A') or (type1 == 'A' and type2 == 'C'):
+					score = None # no match if one is a C type and the other is an A type
+				elif (type1 == 'T') ^ (type2 == 'T'):
+					score = None # no match if one is a T type and the other is not
+				else:
+					score = self.scoreMat[i-1, j-1] + self.grid.sub[:, self.seq1.codes[i-1], self.seq2.codes[j-1]]
+				left = self.calculate_gap(i, j, self.seq1, self.seq2, self.scoreMat, self.leftMat)
+				up = self.calculate_gap(j, i, self.seq2, self.seq1, scoreT, upT)
+
+				# Same preference as NeedlemanWunsch: match, then left, then up
+				if left is None:
+					best = up
+				elif up is None:
+					best = left
+				else:
+					best = numpy.where(left >= up, left, up)
+				if score is not None:
+					if best is None:
+						best = score
+					else:
+						isMatch = numpy.ones(size, dtype=bool)
+						if left is not None:
+							isMatch &= score >= left
+						if up is not None:
+							isMatch &= score >= up
+						best = numpy.where(isMatch, score, best)
+				self.scoreMat[i, j] = best
+				if left is not None:
+					self.leftMat[i, j] = left
+				if up is not None:
+					self.upMat[i, j] = up
+
+# Predicted peak memory (bytes) of a sweep alignment of sequences of the given lengths; per cell and
+# setting, the score matrix takes 8 bytes and the two gap matrices 16 each
+def predict_memory(l1, l2, size):
+	return (l1+1) * (l2+1) * size * 40
+
+# Reads a sweep grid file, one setting per line: <gap> <gapopen> [<custom matrix file>], tab-delimited
+# Settings without a matrix use the given default substitution matrix
+def parse_sweep(fname, defaultSubmat, parseMatrix):
+	settings = []
+	for line in open(fname):
+		line = line.strip()
+		if len(line) == 0 or line.startswith('#'):
+			continue
+		vals = line.split('\t')
+		if len(vals) < 2:
+			raise IndexError('Sweep grid must have at least 2 tab-separated columns (gap, gapopen)')
+		if len(vals) > 2 and len(vals[2]) > 0:
+			submat, matrixName = parseMatrix(vals[2]), vals[2]
+		else:
+			submat, matrixName = dict(defaultSubmat), None
+		settings.append({'gap': int(vals[0]), 'gapopen': int(vals[1]), 'submat': submat, 'matrix': matrixName})
+	if len(settings) == 0:
+		raise IOError('Sweep grid '+fname+' contains no settings')
+	return settings
@@ -0,0 +1,160 @@
+import json, os, platform, random, time
+import numpy
+import TreeSeqGlobalAlign, TreeSeqStore, TreeSeqSweepAlign
+
+# A cost model of the execution strategies of a pair alignment, calibrated on the machine, from which
+# each pair is routed to the strategy predicted fastest. Every strategy gives NeedlemanWunsch's scores:
+#	plain	NeedlemanWunsch
+#	workspace	NeedlemanWunsch sharing the worker's buffers and setup (AlignmentWorkspace)
+#	compact	CompactNeedlemanWunsch, with integer costs
+#	compactWorkspace	CompactNeedlemanWunsch sharing the worker's setup
+#	runs	RunNeedlemanWunsch, with integer costs and no gap open cost
+#	scoreOnly	NeedlemanWunschSweep of the one setting, without a traceback; only when nothing but the
+#		alignment score is written
+# The time of a strategy is fitted as a + b*cells + c*(l1+l2) over synthetic pairs of a grid of lengths
+
+STRATEGIES = ('plain', 'workspace', 'compact', 'compactWorkspace', 'runs', 'scoreOnly')
+MODEL_VERSION = 1
+CALIBRATION_LENGTHS = (8, 24, 64, 128, 256)
+CALIBRATION_LIMIT = 0.25 # seconds; longer pairs of a strategy aren't timed once one is predicted to exceed it
+
+# The strategies giving exact scores under the costs and matrix; scoreOnly if only scores are written
+def exact_strategies(costs, submat, scoreOnly=False):
+	strategies = ['plain', 'workspace']
+	if TreeSeqGlobalAlign.compact_layout(1, 1, costs, submat) is not None:
+		strategies += ['compact', 'compactWorkspace']
+	if TreeSeqGlobalAlign.runs_apply(costs, submat):
+		strategies.append('runs')
+	if scoreOnly:
+		strategies.append('scoreOnly')
+	return strategies
+
+# Identity of the machine a model is calibrated on
+def machine_key():
+	return {'node': platform.node(), 'machine': platform.machine(), 'python': platform.python_version(),
+		'cpus': os.cpu_count()}
+
+# Sweep grids of the one setting aligned by scoreOnly, per process
+_grids = {}
+
+def get_grid(costs, submat, nodeTypes):
+	key = TreeSeqStore.params_key(costs, submat, nodeTypes)
+	if key not in _grids:
+		setting = {'gap': costs['gap'], 'gapopen': costs['gapopen'], 'submat': dict(submat)}
+		_grids[key] = TreeSeqSweepAlign.SweepGrid([setting], nodeTypes)
+	return _grids[key]
+
+# The score of a pair aligned by scoreOnly, prettified as the aligners are but with no alignment
+class ScoreOnlyAlignment():
+	def __init__(self, s1, s2, costs, submat, nodeTypes):
+		self.sweep = TreeSeqSweepAlign.NeedlemanWunschSweep(s1, s2, get_grid(costs, submat, nodeTypes))
+
+	def prettify(self):
+		return [self.sweep.get_top_scores()[0], None, self.sweep.seq2.name]
+
+# Align a pair by a strategy, returning the aligner
+def create_aligner(strategy, s1, s2, costs, submat, nodeTypes):
+	if strategy == 'scoreOnly':
+		return ScoreOnlyAlignment(s1, s2, costs, submat, nodeTypes)
+	workspace = None
+	if strategy in ('workspace', 'compactWorkspace'):
+		workspace = TreeSeqGlobalAlign.get_workspace()
+	if strategy in ('compact', 'compactWorkspace'):
+		return TreeSeqGlobalAlign.CompactNeedlemanWunsch(s1, s2, costs, submat, nodeTypes, workspace)
+	if strategy == 'runs':
+		return TreeSeqGlobalAlign.RunNeedlemanWunsch(s1, s2, costs, submat, nodeTypes)
+	return TreeSeqGlobalAlign.NeedlemanWunsch(s1, s2, costs, submat, nodeTypes, workspace)
+
+# A random tree sequence of the given number of nodes: runs of up to 3 C-nodes, each ending in a
+# bifurcation (A-node, then both subtrees) or a tip (T-node)
+def synthetic_sequence(size, nodeTypes, rng):
+	a, c, t = nodeTypes['A'][0], nodeTypes['C'][0], nodeTypes['T'][0]
+	seq = []
+	pending = [size] # sizes of the subtrees still to write, the next last
+	while len(pending) > 0:
+		size = pending.pop()
+		run = min(size - 1, rng.randint(0, 3))
+		seq.append(c * run)
+		if size - run <= 2:
+			seq.append(c * (size - run - 1) + t)
+		else:
+			remaining = size - run - 1
+			left = rng.randint(1, remaining - 1)
+			seq.append(a)
+			pending += [remaining - left, left]
+	return ''.join(seq)
+
+# Fitted times of the strategies on a machine, under a setting (TreeSeqStore.params_key). Routing
+# only considers the strategies enabled (by default all calibrated)
+class CostModel():
+	def __init__(self, coefficients, samples, machine, key):
+		self.coefficients = coefficients # strategy to [a, b, c]
+		self.samples = samples # strategy to the [l1, l2, seconds] timed
+		self.machine = machine
+		self.key = key
+		self.enabled = sorted(coefficients)
+
+	# Route pairs to the given strategies only, of those calibrated
+	def enable(self, strategies):
+		self.enabled = [s for s in strategies if s in self.coefficients]
+
+	# Predicted seconds of a pair by a strategy; at least a microsecond, as a fit may go below 0
+	def predict(self, strategy, l1, l2):
+		a, b, c = self.coefficients[strategy]
+		return max(a + b * l1 * l2 + c * (l1 + l2), 1e-6)
+
+	# The enabled strategy predicted fastest for a pair
+	def choose(self, l1, l2):
+		return min(self.enabled, key=lambda strategy: self.predict(strategy, l1, l2))
+
+	def save(self, fname):
+		with open(fname, 'w') as handle:
+			json.dump({'version': MODEL_VERSION, 'machine': self.machine, 'key': self.key,
+				'coefficients': self.coefficients, 'samples': self.samples}, handle, indent=1)
+
+# Read a cost model file, or None if it isn't one of this version
+def read_model(fname):
+	with open(fname) as handle:
+		model = json.load(handle)
+	if model.get('version') != MODEL_VERSION:
+		return None
+	return CostModel(model['coefficients'], model['samples'], model['machine'], model['key'])
+
+# Time each strategy over synthetic pairs of the grid of lengths, shortest first, and fit its cost
+def calibrate(costs, submat, nodeTypes, strategies, lengths=CALIBRATION_LENGTHS, limit=CALIBRATION_LIMIT):
+	rng = random.Random(0)
+	shapes = sorted([(l1, l2) for l1 in lengths for l2 in lengths if l1 <= l2], key=lambda shape: shape[0] * shape[1])
+	pairs = [(TreeSeqGlobalAlign.TreeSequence('s1', synthetic_sequence(l1, nodeTypes, rng)),
+		TreeSeqGlobalAlign.TreeSequence('s2', synthetic_sequence(l2, nodeTypes, rng))) for l1, l2 in shapes]
+	coefficients, samples = {}, {}
+	for strategy in strategies:
+		create_aligner(strategy, pairs[0][0], pairs[0][1], costs, dict(submat), nodeTypes) # warm up
+		timed = []
+		for s1, s2 in pairs:
+			l1, l2 = len(s1.seq), len(s2.seq)
+			if len(timed) >= 4 and timed[-1][2] * l1 * l2 / float(timed[-1][0] * timed[-1][1]) > limit:
+				break
+			started = time.perf_counter()
+			create_aligner(strategy, s1, s2, costs, dict(submat), nodeTypes).prettify()
+			timed.append([l1, l2, time.perf_counter() - started])
+		features = numpy.array([[1.0, l1 * l2, l1 + l2] for l1, l2, seconds in timed])
+		fitted = numpy.linalg.lstsq(features, numpy.array([seconds for l1, l2, seconds in timed]), rcond=None)[0]
+		coefficients[strategy] = fitted.tolist()
+		samples[strategy] = timed
+	return CostModel(coefficients, samples, machine_key(), TreeSeqStore.params_key(costs, submat, nodeTypes))
+
+# Get the cost model of a file if it was calibrated on this machine, under the setting and for the
+# strategies; else calibrate one (for every exact strategy) and write it to the file. The model routes
+# to the given strategies. Returns it and whether it was calibrated
+def load_model(fname, costs, submat, nodeTypes, strategies):
+	key = TreeSeqStore.params_key(costs, submat, nodeTypes)
+	if os.path.isfile(fname):
+		model = read_model(fname)
+		if model is not None and model.machine == machine_key() and model.key == key and \
+				all([strategy in model.coefficients for strategy in strategies]):
+			model.enable(strategies)
+			return model, False
+	model = calibrate(costs, submat, nodeTypes, exact_strategies(costs, submat, True))
+	model.save(fname)
+	model.enable(strategies)
+	return model, True
@@ -3,6 +3,7 @@ import argparse, platform
 from Bio.SubsMat import MatrixInfo
 from Bio import SeqIO
 import concurrent.futures, numpy, sys
+import AffineGlobalAlign
 import os.path
 
 # Validates user-provided command-line arguments
@@ -31,7 +32,7 @@ class ParameterValidator():
 	# Checks user-provided arguments are valid
 	def check_args(self):
 		return all([self.test_num_workers(), self.test_mutual_matrices(),
-				self.test_valid_matrix()])
+				self.test_valid_matrix(), self.test_gap_open()])
 
 	# Test either a custom matrix or in-built matrix is selected
 	def test_mutual_matrices(self):
@@ -50,6 +51,13 @@ class ParameterValidator():
 			'http://biopython.org/DIST/docs/api/Bio.SubsMat.MatrixInfo-module.html'
 			raise IOError(err)
 
+	# Test the gap open penalty is not a bonus
+	def test_gap_open(self):
+		if self.args['gapopen'] <= 0:
+			return True
+		else:
+			raise IOError('Gap open penalty must be <= 0')
+
 	# Test a valid number of workers are provided
 	def test_num_workers(self):
 		if self.args['n'] >= 1:
@@ -76,62 +84,12 @@ def parse_fasta(fname):
 	out(str(len(queries)) + ' queries parsed [OK]')
 	return queries # return set of fasta entries
 
-# Maps the aligned two bases against a user-selected substitution matrix
-def get_score(cA, cB, submatrix):
-	if (cA, cB) in submatrix:
-		return submatrix[(cA, cB)]
-	else:
-		return submatrix[(cB, cA)] # returns score
-
-# Performs Needleman-Wunsch alignment given two sequences, s1 and s2	
-def needle(seq1, seq2, gap, submat):
-	l1, l2 = len(seq1.seq), len(seq2.seq)	
-	m = numpy.zeros((l1+1, l2+1)) # create matrix for storing counts
-	for i in range(0, l1 + 1): # set each row by the desired gap
-		m[i][0] = gap * i
-	for j in range(0, l2 + 1): # set each column by the desired gap
-		m[0][j] = gap * j
-	for i in range(1, l1 + 1): # per base-pair in sequence 1 ...
-		for j in range(1, l2 + 1): # per base-pair in sequence 2, align them
-			score = m[i - 1][j - 1] + get_score(seq1.seq[i-1], seq2.seq[j-1], submat)
-			left = m[i - 1][j] + gap # upwards
-			up = m[i][j - 1] + gap # left score
-			m[i][j] = max(score, left, up) # get max of all three scores
-
-	a1, a2 = '', '' # when complete, identify both aligned sequences
-	i,j = l1,l2
-	while i > 0 and j > 0: # walk-back to the index [0][0] of the m
-		score_current = m[i][j]
-		score_diag = m[i-1][j-1]
-		score_up = m[i][j-1]
-		score_left = m[i-1][j]
-
-		# if the score is a match, walk-back one index in both i and j
-		if score_current == score_diag + get_score(seq1.seq[i-1], seq2.seq[j-1], submat):
-			a1 += seq1.seq[i-1]
-			a2 += seq2.seq[j-1]
-			i -= 1
-			j -= 1
-		# if score is a gap in sequence 2, only walk back on i
-		elif score_current == score_left + gap:
-			a1 += seq1.seq[i-1]
-			a2 += '-'
-			i -= 1
-		# if score is a gap in sequence 1, only walk back on j
-		elif score_current == score_up + gap:
-			a1 += '-'
-			a2 += seq2.seq[j-1]
-			j -= 1
-	# walk-back to index 0 for both i and j; either could be reached first
-	while i > 0:
-		a1 += seq1.seq[i-1]
-		a2 += '-'
-		i -= 1
-	while j > 0:
-		a1 += '-'
-		a2 += seq2.seq[j-1]
-		j -= 1
-	return [ m[-1][-1], a1+'\l2'+a2, seq2.description ]
+# Performs Needleman-Wunsch alignment given two sequences, s1 and s2, with affine gaps; see
+# AffineGlobalAlign.align. A gap open penalty of 0 gives the linear gap penalty
+def needle(seq1, seq2, gap, submat, gapopen=0):
+	profile = AffineGlobalAlign.TargetProfile(seq1.seq, submat)
+	score, alignment = AffineGlobalAlign.align(profile, seq2.seq, gap, gapopen, traceback=True)
+	return [ score, alignment[0]+'\l2'+alignment[1], seq2.description ]
 
 # Function to parse custom scoring matrix.
 def parse_custom_matrix(fname):
@@ -178,9 +136,10 @@ def parse_output(fname):
 # Concurrent alignment given a sequence, query, and a set of sequences, baseline
 def run_factory(target, queries, params):
 	results = [] # K => target, V => aligned queries 
-	for query in queries:
-		out = needle(target, query, params['gap'], params['submat'])
-		results.append(out)
+	profile = AffineGlobalAlign.TargetProfile(target.seq, params['submat']) # shared by all queries
+	for query in queries: # only scores are written, so no traceback
+		score, alignment = AffineGlobalAlign.align(profile, query.seq, params['gap'], params['gapopen'])
+		results.append([ score, alignment, query.description ])
 	return target, results
 
 # Performs the high-level functions which drive concurrent execution
@@ -199,7 +158,7 @@ def initializer(queries, args):
 
 	executor = concurrent.futures.ThreadPoolExecutor(max_workers=args['n'])
 	futures = [] # create collection to store all concurrent jobs in
-	params = {'gap': args['gap'], 'submat': submat} # alignment parameters
+	params = {'gap': args['gap'], 'gapopen': args['gapopen'], 'submat': submat} # alignment parameters
 	for target in queries: # per fasta entry, create a concurrent job for it
 		if not target.name in alreadyRun:
 			futures.append(executor.submit(run_factory, target, queries, params))
@@ -240,7 +199,9 @@ if __name__ == '__main__':
 
 	# Specify optional arguments
 	param_opts.add_argument('--gap', metavar='INT', default=-8, type=int,
-				help='Gap open and extension penalty [-8]')
+				help='Gap extension penalty; also the open penalty [-8]')
+	param_opts.add_argument('--gapopen', metavar='INT', default=0, type=int,
+				help='Additional penalty when opening a gap (affine gaps) [0]')
 
 	param_opts.add_argument('-custom', metavar='FILE', default=None,
 				help='Custom substitution matrix [na]')
@@ -0,0 +1,151 @@
+import argparse, random, sys, time
+import TreeSeqGlobalAlign, TreeSeqSweepAlign, TreeSeqTuner
+from treesequence_pairwise_contrasterV2 import out
+
+# The alternate aligners, each checked against NeedlemanWunsch on the same pair and setting
+ENGINES = ('workspace', 'instrument', 'compact', 'tiled', 'runs', 'threshold', 'sweep')
+
+# Helper-class to parse input arguments
+class CheckCommandLineParser():
+	def __init__(self):
+		desc = 'Script to check the alternate aligners (compact, tiled, run-length, threshold, sweep, ...) score as ' +\
+			'NeedlemanWunsch does, on random trees under random settings'
+		u='%(prog)s [options]' # command-line usage
+		self.parser = argparse.ArgumentParser(description=desc, add_help=False, usage=u)
+		self._init_params()
+
+	# Create parameters to be used throughout the application
+	def _init_params(self):
+		param_opts = self.parser.add_argument_group('Optional Parameters')
+		param_opts.add_argument('-pairs', metavar='INT', default=300, type=int,
+					help='Number of random pairs, each under its own random setting [300]')
+		param_opts.add_argument('-maxlen', metavar='INT', default=40, type=int,
+					help='Maximum number of nodes of a random tree [40]')
+		param_opts.add_argument('-seed', metavar='INT', default=0, type=int,
+					help='Random seed [0]')
+		param_opts.add_argument('-tiles', metavar='INT', default=2, type=int,
+					help='Processes of the tiled compact fill, every pair being tiled; 1 skips it [2]')
+		param_opts.add_argument('-o', metavar='FILE', default='check.tab',
+					help='Table of the mismatches found, if any [check.tab]')
+		param_opts.add_argument('-h','--help', action='help',
+					help='Show this help screen and exit')
+
+	# Get the arguments for each parameter
+	def parse_args(self):
+		return vars(self.parser.parse_args()) # parse arguments
+
+# Validates user-provided command-line arguments
+class CheckArgumentValidator():
+	def __init__(self, args):
+		self.args = args
+		self.check_args()
+
+	def check_args(self):
+		if self.args['pairs'] < 1 or self.args['maxlen'] < 1 or self.args['tiles'] < 1:
+			raise IOError('The pairs, maximum length and tiling processes must be >= 1')
+		return True
+
+# A random setting: gap costs and a substitution matrix over the default node types. A quarter have a
+# gap open cost, which run-length alignment doesn't apply to, and a quarter non-integer costs, which
+# the compact layout aligns in floating point
+def random_setting(rng):
+	costs = {'gap': rng.randint(-8, 0), 'gapopen': 0}
+	submat = {('A','A'): rng.randint(-2, 4), ('A','C'): rng.randint(-3, 2), ('C','C'): rng.randint(-2, 3),
+		('T','T'): rng.randint(-2, 3), ('A','-'): rng.randint(-8, 0), ('C','-'): rng.randint(-8, 0), ('T','-'): rng.randint(-8, 0)}
+	if rng.random() < 0.25:
+		costs['gapopen'] = rng.randint(-4, -1)
+	if rng.random() < 0.25:
+		costs['gap'] -= 0.5
+		submat[('C','C')] += 0.25
+	return costs, submat
+
+# A score (numpy.float64) or tuple of them, as plain values for the table of mismatches
+def plain(value):
+	if isinstance(value, tuple):
+		return tuple([plain(v) for v in value])
+	if value is None or isinstance(value, bool):
+		return value
+	return float(value)
+
+# Aligns random pairs with NeedlemanWunsch and every alternate aligner, recording where they differ
+class AlignerCheck():
+	def __init__(self, args):
+		self.pairs = args['pairs']
+		self.maxLength = args['maxlen']
+		self.random = random.Random(args['seed'])
+		self.tiles = args['tiles']
+		self.fname = args['o']
+		self.nodeTypes = TreeSeqGlobalAlign.default_nodetypes()
+		self.workspace = TreeSeqGlobalAlign.AlignmentWorkspace()
+		self.checked = {engine: 0 for engine in ENGINES}
+		self.mismatches = [] # (engine, setting, seq1, seq2, expected, found)
+
+	def start(self):
+		started = time.time()
+		if self.tiles > 1:
+			TreeSeqGlobalAlign.set_tiling(self.tiles, 1, 8) # every pair, in tiles of 8 x 8 cells
+		try:
+			for k in range(self.pairs):
+				s1 = TreeSeqGlobalAlign.TreeSequence('s1', TreeSeqTuner.synthetic_sequence(self.random.randint(1, self.maxLength), self.nodeTypes, self.random))
+				s2 = TreeSeqGlobalAlign.TreeSequence('s2', TreeSeqTuner.synthetic_sequence(self.random.randint(1, self.maxLength), self.nodeTypes, self.random))
+				self.check_pair(s1, s2, *random_setting(self.random))
+		finally:
+			TreeSeqGlobalAlign.set_tiling(1)
+			TreeSeqGlobalAlign.close_tile_pool()
+		for engine in ENGINES:
+			found = len([m for m in self.mismatches if m[0] == engine])
+			out(engine+': '+str(self.checked[engine])+' pairs, '+('[OK]' if found == 0 else str(found)+' mismatches'))
+		if len(self.mismatches) > 0:
+			outhandle = open(self.fname, 'w')
+			outhandle.write('Aligner\tSetting\tSeq1\tSeq2\tExpected\tFound\n')
+			for mismatch in self.mismatches:
+				outhandle.write('\t'.join([str(v) for v in mismatch]) + '\n')
+			outhandle.close()
+			out(str(len(self.mismatches))+' mismatches in '+str(round(time.time() - started, 1))+'s -> '+self.fname)
+			return False
+		out('All aligners agree with NeedlemanWunsch in '+str(round(time.time() - started, 1))+'s')
+		return True
+
+	# Compare a result with the exact score
+	def compare(self, engine, costs, submat, s1, s2, expected, found):
+		self.checked[engine] += 1
+		if found != expected:
+			self.mismatches.append((engine, repr((costs, sorted(submat.items()))), s1.seq, s2.seq, plain(expected), plain(found)))
+
+	def check_pair(self, s1, s2, costs, submat):
+		align = lambda cls, *args, **kwargs: cls(s1, s2, dict(costs), dict(submat), self.nodeTypes, *args, **kwargs)
+		exact = align(TreeSeqGlobalAlign.NeedlemanWunsch).get_top_score()
+		self.compare('workspace', costs, submat, s1, s2, exact, align(TreeSeqGlobalAlign.NeedlemanWunsch, self.workspace).get_top_score())
+		self.compare('instrument', costs, submat, s1, s2, exact, align(TreeSeqGlobalAlign.InstrumentedNeedlemanWunsch).get_top_score())
+		TreeSeqGlobalAlign.set_tiling(1)
+		self.compare('compact', costs, submat, s1, s2, exact, align(TreeSeqGlobalAlign.CompactNeedlemanWunsch).get_top_score())
+		if self.tiles > 1:
+			TreeSeqGlobalAlign.set_tiling(self.tiles, 1, 8)
+			NW = align(TreeSeqGlobalAlign.CompactNeedlemanWunsch)
+			if NW.tiled:
+				self.compare('tiled', costs, submat, s1, s2, exact, NW.get_top_score())
+			TreeSeqGlobalAlign.set_tiling(1)
+		if TreeSeqGlobalAlign.runs_apply(costs, submat):
+			self.compare('runs', costs, submat, s1, s2, exact, align(TreeSeqGlobalAlign.RunNeedlemanWunsch).get_top_score())
+		# a threshold of the exact score keeps the pair, with that score; the bounds taken must hold
+		NW = align(TreeSeqGlobalAlign.ThresholdNeedlemanWunsch, threshold=exact)
+		self.compare('threshold', costs, submat, s1, s2, (exact, True), (None if NW.abandoned else NW.get_top_score(), NW.is_sound()))
+		NW = align(TreeSeqGlobalAlign.ThresholdNeedlemanWunsch, threshold=exact + 1)
+		self.compare('threshold', costs, submat, s1, s2, exact, exact if NW.abandoned else NW.get_top_score())
+		# the setting as one channel of a sweep, between two others
+		settings = [random_setting(self.random), (costs, submat), random_setting(self.random)]
+		grid = TreeSeqSweepAlign.SweepGrid([{'gap': c['gap'], 'gapopen': c['gapopen'], 'submat': dict(m)} for c, m in settings], self.nodeTypes)
+		scores = TreeSeqSweepAlign.NeedlemanWunschSweep(s1, s2, grid).get_top_scores()
+		for (channelCosts, channelSubmat), score in zip(settings, scores):
+			expected = TreeSeqGlobalAlign.NeedlemanWunsch(s1, s2, dict(channelCosts), dict(channelSubmat), self.nodeTypes).get_top_score()
+			self.compare('sweep', channelCosts, channelSubmat, s1, s2, expected, score)
+
+if __name__ == '__main__':
+	try:
+		args = CheckCommandLineParser().parse_args()
+		CheckArgumentValidator(args) # test all arguments are correct
+		if not AlignerCheck(args).start():
+			sys.exit(1)
+
+	except (IOError, KeyboardInterrupt, IndexError) as e:
+		out(str(e)+'\n')
@@ -0,0 +1,241 @@
+import concurrent.futures, math, random, statistics
+import TreeSeqDataset, TreeSeqGlobalAlign, TreeSeqLibrary, TreeSeqMetadata
+from treesequence_pairwise_contrasterV2 import ArgumentValidator, CommandLineParser, InputWrapperState, get_pool_context, out, \
+	chunk_list
+
+# Helper-class to parse input arguments; the contraster's parameters plus those of the sampling
+class ContrastCommandLineParser(CommandLineParser):
+	runModes = False # the contraster's run modes (CommandLineParser.runModes) are rejected
+
+	def __init__(self):
+		CommandLineParser.__init__(self)
+		self.parser.description = 'Script to estimate within- and between-group mean alignment scores ' +\
+			'of class comparisons from stratified samples of pairs'
+
+	# Create parameters to be used throughout the application
+	def _init_params(self):
+		CommandLineParser._init_params(self)
+		param_con = self.parser.add_argument_group('Class Contrasts')
+		param_con.add_argument('-comparisons', metavar='FILE', required=True,
+					help='Class comparisons, e.g. demo/ClassComparisonTypes.txt [na]')
+		param_con.add_argument('-meta', metavar='FILE', default=None,
+					help='Neurite metadata table, e.g. demo/NeuriteMetaData.csv [that compiled into the dataset -f]')
+		param_con.add_argument('-ciwidth', metavar='FLOAT', default=2.0, type=float,
+					help='Sampling stops once the confidence interval of each mean is this wide [2]')
+		param_con.add_argument('-conf', metavar='FLOAT', default=0.95, type=float,
+					help='Confidence level [0.95]')
+		param_con.add_argument('-batch', metavar='INT', default=30, type=int,
+					help='Pairs added to each unresolved cell per round [30]')
+		param_con.add_argument('-maxpairs', metavar='INT', default=2000, type=int,
+					help='Maximum pairs sampled per cell [2000]')
+		param_con.add_argument('-seed', metavar='INT', default=0, type=int,
+					help='Random seed [0]')
+
+# Validates user-provided command-line arguments
+class ContrastArgumentValidator(ArgumentValidator):
+	def check_args(self):
+		return ArgumentValidator.check_args(self) and self.test_contrast()
+
+	# Test the sampling parameters
+	def test_contrast(self):
+		if self.args['f2'] is not None or self.args['sweep'] or self.args['a'] or self.args['s'] != 'alignment':
+			raise IOError('Contrasts are sampled from one fasta file (no -f2, -sweep, -a or -s)')
+		if self.args['meta'] is None and not TreeSeqDataset.is_dataset(self.args['f']):
+			raise IOError('The metadata table (-meta) is required unless -f is a dataset compiled with it')
+		if self.args['ciwidth'] <= 0 or not 0 < self.args['conf'] < 1:
+			raise IOError('The CI width must be > 0 and the confidence level within (0, 1)')
+		if self.args['batch'] < 2 or self.args['maxpairs'] < 2:
+			raise IOError('The batch and maximum pairs per cell must be >= 2')
+		return True
+
+# A cell of a comparison: the pairs within a group, or between two groups, and the scores sampled
+class ContrastCell():
+	def __init__(self, groupA, groupB):
+		self.groupA = groupA
+		self.groupB = groupB # None for a within-group cell
+		if groupB is None:
+			self.population = len(groupA) * (len(groupA) - 1) // 2
+		else:
+			self.population = len(groupA) * len(groupB)
+		self.members = (set(groupA), None if groupB is None else set(groupB))
+		self.pairs = set() # sampled pairs (sorted name tuples)
+		self.scores = []
+
+	# Test whether a pair of names belongs to the cell
+	def contains(self, pair):
+		a, b = pair
+		if self.groupB is None:
+			return a in self.members[0] and b in self.members[0]
+		return (a in self.members[0] and b in self.members[1]) or (a in self.members[1] and b in self.members[0])
+
+	# Draw a random pair of the cell which hasn't been sampled yet
+	def draw(self, rng):
+		while True:
+			if self.groupB is None:
+				a, b = rng.sample(self.groupA, 2)
+			else:
+				a, b = rng.choice(self.groupA), rng.choice(self.groupB)
+			pair = (min(a, b), max(a, b))
+			if pair not in self.pairs:
+				return pair
+
+	# Mean score and the half-width of its confidence interval; the finite population correction
+	# makes the interval of an exhausted cell 0
+	def estimate(self, z):
+		n = len(self.scores)
+		mean = statistics.fmean(self.scores) if n > 0 else float('nan')
+		if n < 2:
+			return mean, 0.0 if n >= self.population else float('inf')
+		correction = math.sqrt(max(self.population - n, 0) / (self.population - 1.0))
+		return mean, z * statistics.stdev(self.scores) / math.sqrt(n) * correction
+
+	# Test whether the cell needs more pairs
+	def unresolved(self, z, ciwidth, maxPairs):
+		if len(self.scores) >= min(self.population, maxPairs):
+			return False
+		return 2 * self.estimate(z)[1] > ciwidth
+
+# Samples the cells of every comparison adaptively: each round, every unresolved cell gets a batch of
+# pairs; pairs are scored once and shared between all the cells (of any comparison) they belong to
+class ContrastDriver():
+	def __init__(self, sequences, comparisons, metadata, input_state):
+		args = input_state.get_args()
+		self.sequences = {s.name: s for s in sequences}
+		self.costs = input_state.get_penalties()
+		self.submat = input_state.get_submatrix()
+		if args['nodeTypes'] is None:
+			self.nodeTypes = TreeSeqGlobalAlign.default_nodetypes()
+		else:
+			self.nodeTypes = TreeSeqGlobalAlign.parse_nodetypes(args['nodeTypes'])
+		self.num_workers = args['n']
+		self.startMethod = args['start']
+		self.useWorkspace = args['workspace']
+		self.fname = args['o']
+		self.ciwidth = args['ciwidth']
+		self.z = statistics.NormalDist().inv_cdf(0.5 + args['conf'] / 2.0)
+		self.batch = args['batch']
+		self.maxPairs = args['maxpairs']
+		self.random = random.Random(args['seed'])
+		self.scored = {} # K => pair, V => score
+		self.create_cells(comparisons, metadata)
+
+	# Create the cells of each comparison, skipping comparisons with fewer than two usable groups
+	def create_cells(self, comparisons, metadata):
+		names = sorted(self.sequences)
+		missing = len([name for name in metadata if name not in self.sequences])
+		if missing > 0:
+			out(str(missing)+' neurites of the metadata have no sequence')
+		self.comparisons = []
+		for comparison in comparisons:
+			groups = comparison.select(metadata, names)
+			labels = comparison.get_group_labels()
+			usable = [(label, group) for label, group in zip(labels, groups) if len(group) >= 2]
+			if len(usable) < 2:
+				out('Skipping '+comparison.get_label()+': fewer than 2 groups of >= 2 neurites')
+				continue
+			cells = []
+			for k, (label, group) in enumerate(usable):
+				cells.append(('within', label, label, ContrastCell(group, None)))
+				for label2, group2 in usable[k+1:]:
+					cells.append(('between', label, label2, ContrastCell(group, group2)))
+			self.comparisons.append((comparison, usable, cells))
+		self.cells = [cell for comparison, usable, cells in self.comparisons for kind, a, b, cell in cells]
+		self.total = sum([len(set([n for label, group in usable for n in group])) ** 2
+					for comparison, usable, cells in self.comparisons])
+
+	# Sample until every cell is resolved, then write the estimates
+	def start(self):
+		executor = concurrent.futures.ProcessPoolExecutor(self.num_workers, mp_context=get_pool_context(self.startMethod))
+		try:
+			rounds = 0
+			while True:
+				unresolved = [cell for cell in self.cells if cell.unresolved(self.z, self.ciwidth, self.maxPairs)]
+				if len(unresolved) == 0:
+					break
+				rounds += 1
+				self.sample_round(executor, unresolved)
+				out(' --> round '+str(rounds)+': '+str(len(unresolved))+' cells unresolved, '+
+					str(len(self.scored))+' pairs aligned')
+			executor.shutdown()
+		except KeyboardInterrupt:
+			executor.shutdown()
+			raise
+		self.write_estimates()
+		out(str(len(self.scored))+' alignments instead of '+str(self.total)+' for the full matrices')
+		out('** Analysis Complete **')
+
+	# Give each unresolved cell a batch of new pairs, each drawn uniformly from the cell's unsampled pairs
+	# so its estimate stays unbiased. Cells overlap (a comparison narrows another's base filter), so a pair
+	# drawn for one cell may already be scored for another, or drawn this round: it is aligned once only
+	def sample_round(self, executor, unresolved):
+		wanted = {} # K => cell, V => pairs to add
+		toAlign = set()
+		for cell in unresolved:
+			count = min(self.batch, min(cell.population, self.maxPairs) - len(cell.scores))
+			if cell.population - len(cell.pairs) <= count: # exhaust small cells
+				pairs = self.all_pairs(cell) - cell.pairs
+			else:
+				pairs = set()
+				while len(pairs) < count:
+					pairs.add(cell.draw(self.random))
+			wanted[cell] = pairs
+			toAlign.update([pair for pair in pairs if pair not in self.scored])
+		toAlign = sorted(toAlign)
+		jobs = [[(self.sequences[a], self.sequences[b]) for a, b in chunk]
+			for chunk in chunk_list(toAlign, len(toAlign) / (self.num_workers * 4.0))]
+		futures = [executor.submit(TreeSeqLibrary.align_pairs, job, self.costs, self.submat, self.nodeTypes, self.useWorkspace)
+				for job in jobs]
+		scores = [score for future in futures for score in future.result()]
+		for pair, score in zip(toAlign, scores):
+			self.scored[pair] = float(score)
+		for cell, pairs in wanted.items():
+			for pair in pairs:
+				cell.pairs.add(pair)
+				cell.scores.append(self.scored[pair])
+
+	# All pairs of a cell
+	def all_pairs(self, cell):
+		if cell.groupB is None:
+			group = sorted(cell.groupA)
+			return set([(a, b) for k, a in enumerate(group) for b in group[k+1:]])
+		return set([(min(a, b), max(a, b)) for a in cell.groupA for b in cell.groupB])
+
+	# Write the estimate of each cell, and the within - between contrast of each comparison
+	def write_estimates(self):
+		outhandle = open(self.fname, 'w')
+		outhandle.write('Comparison\tType\tGroupA\tGroupB\tSizeA\tSizeB\tPairs\tPopulation\tMean\tCILow\tCIHigh\n')
+		for comparison, usable, cells in self.comparisons:
+			label = comparison.get_label()
+			for kind, a, b, cell in cells:
+				mean, half = cell.estimate(self.z)
+				sizeB = len(cell.groupA) if cell.groupB is None else len(cell.groupB)
+				outhandle.write('\t'.join([label, kind, a, b, str(len(cell.groupA)), str(sizeB), str(len(cell.scores)),
+							str(cell.population), str(mean), str(mean - half), str(mean + half)]) + '\n')
+			# equal weight per cell; the variances of the cell means add
+			within = [cell.estimate(self.z) for kind, a, b, cell in cells if kind == 'within']
+			between = [cell.estimate(self.z) for kind, a, b, cell in cells if kind == 'between']
+			mean = statistics.fmean([m for m, h in within]) - statistics.fmean([m for m, h in between])
+			half = math.sqrt(sum([h ** 2 for m, h in within]) / len(within) ** 2 +
+					sum([h ** 2 for m, h in between]) / len(between) ** 2)
+			pairs = sum([len(cell.scores) for kind, a, b, cell in cells])
+			outhandle.write('\t'.join([label, 'contrast', 'within', 'between', '', '', str(pairs), '',
+						str(mean), str(mean - half), str(mean + half)]) + '\n')
+		outhandle.close()
+
+if __name__ == '__main__':
+	try:
+		args = ContrastCommandLineParser().parse_args()
+		ContrastArgumentValidator(args) # test all arguments are correct
+
+		input_state = InputWrapperState(args)
+		input_state.assign_matrix() # parse in-built or custom matrix
+		sequences = input_state.parse_fasta(input_state.fname)
+		metadata = input_state.get_metadata()
+		if metadata is None:
+			raise IOError('The dataset '+input_state.fname+' was compiled without metadata; give it with -meta')
+		comparisons = TreeSeqMetadata.parse_comparisons(args['comparisons'])
+		driver = ContrastDriver(sequences, comparisons, metadata, input_state)
+		driver.start()
+
+	except (IOError, KeyboardInterrupt, IndexError) as e:
+		out(str(e)+'\n')
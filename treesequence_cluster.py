@@ -0,0 +1,149 @@
+import argparse, os, time
+import numpy
+import TreeSeqCluster, TreeSeqDataset
+from treesequence_pairwise_contrasterV2 import out
+
+# Helper-class to parse input arguments
+class ClusterCommandLineParser():
+	def __init__(self):
+		desc = 'Script to convert a score matrix to distances and cluster it hierarchically, out of core'
+		u='%(prog)s [options]' # command-line usage
+		self.parser = argparse.ArgumentParser(description=desc, add_help=False, usage=u)
+		self._init_params()
+
+	# Create parameters to be used throughout the application
+	def _init_params(self):
+		param_reqd = self.parser.add_argument_group('Required Parameters')
+		param_opts = self.parser.add_argument_group('Optional Parameters')
+		param_reqd.add_argument('-i', metavar='FILE', required=True,
+					help='Score matrix: a contraster\'s output, or a memory-mapped square matrix (.npy) [na]')
+		param_opts.add_argument('-names', metavar='FILE', default=None,
+					help='Sequence names of a .npy matrix, one per line [<matrix>.names.txt]')
+		param_opts.add_argument('-f', metavar='FILE', default=None,
+					help='Fasta file (or compiled dataset) of the sequences, for the sequence lengths of the short/long normalizations [na]')
+		param_opts.add_argument('-norm', metavar='STR', default='none',
+					help='Score normalization before conversion to distances [none]\n\tnone,short,long')
+		param_opts.add_argument('-linkage', metavar='STR', default='average',
+					help='Linkage [average]\n\taverage,complete')
+		param_opts.add_argument('-block', metavar='INT', default=256, type=int,
+					help='Rows of the matrix read at a time [256]')
+		param_opts.add_argument('-o', metavar='FILE', default='linkage.tab',
+					help='Linkage table; the condensed distances (.dist.npy), linkage matrix (.linkage.npy) and '+
+					'sequence order (.names.txt) are written next to it [linkage.tab]')
+		param_opts.add_argument('--keep', action='store_const', const=True, default=False,
+					help='Keep the memory-mapped scores of a text matrix (.scores.npy), to cluster again without parsing')
+		param_opts.add_argument('-h','--help', action='help',
+					help='Show this help screen and exit')
+
+	# Get the arguments for each parameter
+	def parse_args(self):
+		return vars(self.parser.parse_args()) # parse arguments
+
+# Validates user-provided command-line arguments
+class ClusterArgumentValidator():
+	def __init__(self, args):
+		self.args = args
+		self.check_args()
+
+	def check_args(self):
+		return all([self.test_input(), self.test_options()])
+
+	# Test the matrix exists, and the names and lengths it needs are given
+	def test_input(self):
+		if not os.path.isfile(self.args['i']):
+			raise IOError('Score matrix '+self.args['i']+' not found')
+		if self.args['norm'] != 'none' and self.args['f'] is None:
+			raise IOError('The '+self.args['norm']+' normalization needs the sequence lengths (-f)')
+		return True
+
+	def test_options(self):
+		if self.args['norm'] not in TreeSeqCluster.NORMALIZATIONS:
+			raise IOError('-norm must be one of '+', '.join(TreeSeqCluster.NORMALIZATIONS))
+		if self.args['linkage'] not in TreeSeqCluster.LINKAGES:
+			raise IOError('-linkage must be one of '+', '.join(TreeSeqCluster.LINKAGES))
+		if self.args['block'] < 1:
+			raise IOError('The block must be >= 1 rows')
+		return True
+
+# Streams the score matrix into a memory-mapped one (unless it is one), converts it to distances and
+# clusters them
+class ClusterDriver():
+	def __init__(self, args):
+		self.matrix = args['i']
+		self.namesFile = args['names']
+		self.fasta = args['f']
+		self.normalization = args['norm']
+		self.method = args['linkage']
+		self.blockRows = args['block']
+		self.keep = args['keep']
+		self.fname = args['o']
+		self.root = os.path.splitext(args['o'])[0]
+
+	def start(self):
+		started = time.time()
+		temporary = []
+		try:
+			if self.matrix.endswith('.npy'):
+				scores = numpy.load(self.matrix, mmap_mode='r')
+				names = TreeSeqCluster.read_names(self.get_names_file())
+				if len(names) != scores.shape[0]:
+					raise IOError(str(len(names))+' names for a matrix of '+str(scores.shape[0])+' rows')
+			else:
+				scoresFile = self.root + '.scores.npy'
+				if not self.keep:
+					temporary.append(scoresFile)
+				names = TreeSeqCluster.stream_score_matrix(self.matrix, scoresFile, self.blockRows)
+				scores = numpy.load(scoresFile, mmap_mode='r')
+				out('Read '+str(len(names))+' x '+str(len(names))+' scores in '+str(round(time.time() - started, 2))+'s')
+			TreeSeqCluster.write_names(self.root + '.names.txt', names)
+
+			converted = time.time()
+			temporary.append(self.root + '.work.npy')
+			condensed, work = TreeSeqCluster.write_distances(scores, self.root + '.dist.npy', self.root + '.work.npy',
+									self.get_lengths(names), self.normalization, self.blockRows)
+			out('Distances ('+self.normalization+' normalization) written to '+self.root+'.dist.npy in '+
+				str(round(time.time() - converted, 2))+'s')
+
+			clustered = time.time()
+			Z = TreeSeqCluster.linkage(work, self.method)
+			del work
+			numpy.save(self.root + '.linkage.npy', Z)
+			TreeSeqCluster.write_linkage(self.fname, Z, names)
+			out(self.method.capitalize()+' linkage of '+str(len(names))+' sequences in '+
+				str(round(time.time() - clustered, 2))+'s -> '+self.fname+', '+self.root+'.linkage.npy')
+		finally:
+			for fname in temporary:
+				if os.path.exists(fname):
+					os.remove(fname)
+		out('** Analysis Complete **')
+
+	# The names of a memory-mapped matrix, by default those written next to it
+	def get_names_file(self):
+		if self.namesFile is not None:
+			return self.namesFile
+		return TreeSeqCluster.default_names_file(self.matrix)
+
+	# Sequence lengths in the order of the matrix, if normalizing
+	def get_lengths(self, names):
+		if self.normalization == 'none':
+			return None
+		if TreeSeqDataset.is_dataset(self.fasta):
+			records = TreeSeqDataset.Dataset(self.fasta).get_records()
+		else:
+			from Bio import SeqIO # only imported for fasta files
+			records = SeqIO.parse(self.fasta, 'fasta')
+		lengths = {record.name: len(record.seq) for record in records}
+		missing = [name for name in names if name not in lengths]
+		if len(missing) > 0:
+			raise IOError(str(len(missing))+' sequences of the matrix are not in '+self.fasta+', e.g. '+missing[0])
+		return numpy.array([lengths[name] for name in names], dtype=numpy.float64)
+
+if __name__ == '__main__':
+	try:
+		args = ClusterCommandLineParser().parse_args()
+		ClusterArgumentValidator(args) # test all arguments are correct
+		driver = ClusterDriver(args)
+		driver.start()
+
+	except (IOError, KeyboardInterrupt, IndexError) as e:
+		out(str(e)+'\n')
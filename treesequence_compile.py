@@ -0,0 +1,105 @@
+import argparse, os, time
+import TreeSeqDataset, TreeSeqGlobalAlign, TreeSeqMetadata
+from treesequence_pairwise_contrasterV2 import ArgumentValidator, InputWrapperState, out
+
+# Helper-class to parse input arguments
+class CompileCommandLineParser():
+	def __init__(self):
+		desc = 'Script to compile a fasta file into a dataset which the contrasters load in its place (-f)'
+		u='%(prog)s [options]' # command-line usage
+		self.parser = argparse.ArgumentParser(description=desc, add_help=False, usage=u)
+		self._init_params()
+
+	# Create parameters to be used throughout the application
+	def _init_params(self):
+		param_reqd = self.parser.add_argument_group('Required Parameters')
+		param_opts = self.parser.add_argument_group('Optional Parameters')
+		param_reqd.add_argument('-f', metavar='FILE', required=True,
+					help='Input fasta file [na]')
+		param_opts.add_argument('--gap', metavar='INT', default=-8, type=int,
+					help='Gap extension penalty of the runs using the dataset [-8]')
+		param_opts.add_argument('-custom', metavar='FILE', default=None,
+					help='Custom substitution matrix [na]')
+		param_opts.add_argument('-nodeTypes', metavar='FILE', default=None,
+					help='Node Type Specifications [na]')
+		param_opts.add_argument('-matrix', metavar='STR', default=None,
+					help='Matrix name; see Biopython MatrixInfo for all matrices [na]')
+		param_opts.add_argument('-meta', metavar='FILE', default=None,
+					help='Neurite metadata table to join, e.g. demo/NeuriteMetaData.csv [na]')
+		param_opts.add_argument('-o', metavar='FILE', default=None,
+					help='Dataset file [<fasta>.tsd]')
+		param_opts.add_argument('-h','--help', action='help',
+					help='Show this help screen and exit')
+		self.parser.set_defaults(f2=None, s='alignment', sweep=None, gapopen=0)
+
+	# Get the arguments for each parameter
+	def parse_args(self):
+		return vars(self.parser.parse_args()) # parse arguments
+
+# Validates user-provided command-line arguments
+class CompileArgumentValidator(ArgumentValidator):
+	def check_args(self):
+		return all([self.test_mutual_matrices(), self.test_valid_matrix(), self.test_input()])
+
+	# Test the fasta file exists and isn't already a dataset
+	def test_input(self):
+		if not os.path.isfile(self.args['f']):
+			raise IOError('Fasta file '+self.args['f']+' not found')
+		if TreeSeqDataset.is_dataset(self.args['f']):
+			raise IOError(self.args['f']+' is already a compiled dataset')
+		return True
+
+# Parses the fasta file, creates the T-A dictionaries of its sequences under the matrix and node
+# types, and writes them (with the metadata, if given) to the dataset
+class CompileDriver():
+	def __init__(self, input_state):
+		args = input_state.get_args()
+		self.input_state = input_state
+		self.fasta = args['f']
+		self.metaFile = args['meta']
+		self.fname = args['o']
+		if self.fname is None:
+			self.fname = os.path.splitext(self.fasta)[0] + '.tsd'
+
+	def start(self):
+		started = time.time()
+		records = self.input_state.parse_fasta(self.fasta)
+		nodeTypes = self.input_state.get_nodetypes()
+		submat = TreeSeqDataset.completed_matrix(self.input_state.get_submatrix(), self.input_state.get_penalties()['gap'])
+		taDicts = []
+		for record in records:
+			try:
+				taDicts.append(TreeSeqGlobalAlign.create_ta_dictionary(str(record.seq), nodeTypes, submat, None))
+			except KeyError as e:
+				raise IOError('Sequence '+record.name+' has residue '+str(e)+' which the matrix has no gap cost for')
+			except IndexError:
+				raise IOError('Sequence '+record.name+' has a T node closing no subtree')
+		metadata = None
+		if self.metaFile is not None:
+			metadata = TreeSeqMetadata.parse_metadata(self.metaFile)
+			joined = len([record for record in records if record.name in metadata])
+			out(str(joined)+' of '+str(len(records))+' sequences joined with the metadata')
+		contentHash = TreeSeqDataset.write_dataset(self.fname, records, taDicts, TreeSeqDataset.ta_key(nodeTypes, submat),
+								metadata, os.path.basename(self.fasta))
+		loaded = time.perf_counter()
+		dataset = TreeSeqDataset.Dataset(self.fname)
+		count = len(dataset.get_records())
+		loaded = time.perf_counter() - loaded
+		if not dataset.verify() or count != len(records):
+			raise IOError('The dataset written to '+self.fname+' does not read back; is the disk full?')
+		out('Dataset '+self.fname+' ('+str(os.path.getsize(self.fname))+' bytes, sha256 '+contentHash+') compiled in '+
+			str(round(time.time() - started, 2))+'s; it loads in '+str(round(loaded * 1000, 1))+' ms')
+		out('** Analysis Complete **')
+
+if __name__ == '__main__':
+	try:
+		args = CompileCommandLineParser().parse_args()
+		CompileArgumentValidator(args) # test all arguments are correct
+
+		input_state = InputWrapperState(args)
+		input_state.assign_matrix() # parse in-built or custom matrix
+		driver = CompileDriver(input_state)
+		driver.start()
+
+	except (IOError, KeyboardInterrupt, IndexError) as e:
+		out(str(e)+'\n')
@@ -0,0 +1,164 @@
+import concurrent.futures, os, sys
+import TreeSeqGlobalAlign
+from treesequence_pairwise_contrasterV2 import ArgumentValidator, CommandLineParser, InputWrapperState, get_pool_context, mapper, out, \
+	mapper_settings, parse_output, manifest_filename, manifest_params, parse_manifest, write_manifest, sequence_hash
+
+# Helper-class to parse input arguments; the contraster's parameters plus the previous result
+class IncrementalCommandLineParser(CommandLineParser):
+	runModes = False # the contraster's run modes (CommandLineParser.runModes) are rejected
+
+	def __init__(self):
+		CommandLineParser.__init__(self)
+		self.parser.description = 'Script to update a score matrix after sequences are added, changed or removed'
+
+	# Create parameters to be used throughout the application
+	def _init_params(self):
+		CommandLineParser._init_params(self)
+		param_inc = self.parser.add_argument_group('Incremental Update')
+		param_inc.add_argument('-prev', metavar='FILE', required=True,
+					help='Previous score matrix [na]')
+		param_inc.add_argument('-prevf', metavar='FILE', default=None,
+					help='Fasta file of the previous matrix, if it has no manifest [na]')
+		param_inc.add_argument('-prevf2', metavar='FILE', default=None,
+					help='Second fasta file of the previous matrix, if it has no manifest [None]')
+
+# Validates user-provided command-line arguments
+class IncrementalArgumentValidator(ArgumentValidator):
+	def check_args(self):
+		return ArgumentValidator.check_args(self) and self.test_incremental()
+
+	# Test the previous matrix exists and the options are supported
+	def test_incremental(self):
+		if not os.path.isfile(self.args['prev']):
+			raise IOError('Previous score matrix '+self.args['prev']+' not found')
+		if self.args['sweep'] or self.args['a'] or self.args['s'] != 'alignment':
+			raise IOError('Incremental updates only apply to alignment scores (-s alignment, no -a or -sweep)')
+		if not os.path.isfile(manifest_filename(self.args['prev'])) and self.args['prevf'] is None:
+			raise IOError('The previous matrix has no manifest; its fasta file must be given (-prevf)')
+		return True
+
+# Updates a previous score matrix to a new set of sequences. Sequences are matched by name and content
+# hash; only the rows of new (or changed) targets and, for unchanged targets, the columns of new (or
+# changed) queries are aligned. Everything else is copied from the previous matrix
+class IncrementalDriver():
+	def __init__(self, targets, queries, input_state):
+		args = input_state.get_args()
+		self.targets = targets
+		self.queries = queries
+		self.costs = input_state.get_penalties()
+		self.submat = input_state.get_submatrix()
+		if args['nodeTypes'] is None:
+			self.nodeTypes = TreeSeqGlobalAlign.default_nodetypes()
+		else:
+			self.nodeTypes = TreeSeqGlobalAlign.parse_nodetypes(args['nodeTypes'])
+		self.num_workers = args['n']
+		self.startMethod = args['start']
+		self.useWorkspace = args['workspace']
+		self.prev = args['prev']
+		self.fname = args['o']
+		self.params = manifest_params(self.costs, self.submat, self.nodeTypes)
+		self.diff(self.load_previous(input_state, args))
+
+	# Get the rows and columns (name to content hash) of the previous matrix
+	def load_previous(self, input_state, args):
+		if os.path.isfile(manifest_filename(self.prev)):
+			manifest = parse_manifest(manifest_filename(self.prev))
+			for k in self.params:
+				if k == 'pairs' and manifest['param'].get(k, 'all') != 'all':
+					raise IOError('The previous matrix only scored the pairs meeting '+manifest['param'][k]+'; it can\'t be updated')
+				if k in manifest['param'] and manifest['param'][k] != self.params[k]:
+					raise IOError('The previous matrix was computed with a different '+k)
+		else: # derive the hashes from the previous fasta files
+			prevTargets = input_state.parse_fasta(args['prevf'])
+			if args['prevf2'] is None:
+				prevQueries = prevTargets
+			else:
+				prevQueries = input_state.parse_fasta(args['prevf2'])
+			manifest = {'row': {t.name: sequence_hash(t) for t in prevTargets},
+				'col': {q.name: sequence_hash(q) for q in prevQueries}}
+		# Only rows actually written to the previous matrix can be kept
+		written = set(parse_output(self.prev))
+		manifest['row'] = {name: h for name, h in manifest['row'].items() if name in written}
+		return manifest
+
+	# Determine the kept, new and removed rows and columns
+	def diff(self, manifest):
+		self.keptRows = set([t.name for t in self.targets if manifest['row'].get(t.name) == sequence_hash(t)])
+		self.keptCols = set([q.name for q in self.queries if manifest['col'].get(q.name) == sequence_hash(q)])
+		self.newTargets = [t for t in self.targets if t.name not in self.keptRows]
+		self.newQueries = [q for q in self.queries if q.name not in self.keptCols]
+		removedRows = len(manifest['row']) - len(self.keptRows)
+		removedCols = len(manifest['col']) - len(self.keptCols)
+		pairs = len(self.newTargets) * len(self.queries) + len(self.keptRows) * len(self.newQueries)
+		out('Rows: '+str(len(self.keptRows))+' kept, '+str(len(self.newTargets))+' new or changed, '+
+			str(removedRows)+' removed or changed')
+		out('Columns: '+str(len(self.keptCols))+' kept, '+str(len(self.newQueries))+' new or changed, '+
+			str(removedCols)+' removed or changed')
+		out(str(pairs)+' of '+str(len(self.targets)*len(self.queries))+' pairs to align')
+
+	# Align the new rows and columns, then rewrite the matrix
+	def start(self):
+		self.computed = {} # K => target, V => {query: score}
+		executor = concurrent.futures.ProcessPoolExecutor(self.num_workers, mp_context=get_pool_context(self.startMethod))
+		settings = mapper_settings(self.costs, self.submat, self.nodeTypes, useWorkspace=self.useWorkspace)
+		try:
+			futures = []
+			for target in self.newTargets: # whole rows
+				futures.append(executor.submit(mapper, target, self.queries, settings, []))
+			if len(self.newQueries) > 0:
+				for target in self.targets: # new columns of kept rows
+					if target.name in self.keptRows:
+						futures.append(executor.submit(mapper, target, self.newQueries, settings, []))
+			for future in concurrent.futures.as_completed(futures):
+				res = future.result()
+				self.computed[res[0]] = {r[-1]: r[0] for r in res[1]}
+				out(' --> ' + res[0] + ' [OK] '+str(len(self.computed))+' of '+str(len(futures)))
+			executor.shutdown()
+		except KeyboardInterrupt:
+			executor.shutdown()
+			raise
+		self.rewrite()
+		write_manifest(manifest_filename(self.fname), self.targets, self.queries, self.params)
+		out('** Update Complete **')
+
+	# Stream the previous matrix into the new one: kept rows are copied, dropping removed columns and
+	# adding new ones, then the new rows are appended
+	def rewrite(self):
+		columns = sorted([q.name for q in self.queries]) # as ordered by the contraster
+		tmpname = self.fname + '.tmp'
+		outhandle = open(tmpname, 'w')
+		outhandle.write('\t' + '\t'.join(columns) + '\n')
+		inhandle = open(self.prev)
+		prevColumns = inhandle.readline().rstrip('\n').split('\t')[1:]
+		prevIndex = {name: index for index, name in enumerate(prevColumns)}
+		for line in inhandle:
+			vals = line.rstrip('\n').split('\t')
+			if vals[0] not in self.keptRows:
+				continue
+			computed = self.computed.get(vals[0], {})
+			row = [vals[1+prevIndex[c]] if c in self.keptCols else str(computed[c]) for c in columns]
+			outhandle.write(vals[0] + '\t' + '\t'.join(row) + '\n')
+		inhandle.close()
+		for target in self.newTargets:
+			computed = self.computed[target.name]
+			outhandle.write(target.name + '\t' + '\t'.join([str(computed[c]) for c in columns]) + '\n')
+		outhandle.close()
+		os.replace(tmpname, self.fname)
+
+if __name__ == '__main__':
+	try:
+		args = IncrementalCommandLineParser().parse_args()
+		IncrementalArgumentValidator(args) # test all arguments are correct
+
+		input_state = InputWrapperState(args)
+		input_state.assign_matrix() # parse in-built or custom matrix
+		targets = input_state.parse_fasta(input_state.fname) # next, parse fasta file
+		if input_state.fname2 is None:
+			queries = targets
+		else:
+			queries = input_state.parse_fasta(input_state.fname2)
+		driver = IncrementalDriver(targets, queries, input_state)
+		driver.start()
+
+	except (IOError, KeyboardInterrupt, IndexError) as e:
+		out(str(e)+'\n')
@@ -0,0 +1,188 @@
+import argparse, concurrent.futures, os, time
+import numpy
+import TreeSeqCluster, TreeSeqMantel
+from treesequence_pairwise_contrasterV2 import default_start_method, get_pool_context, out
+
+# Helper-class to parse input arguments
+class MantelCommandLineParser():
+	def __init__(self):
+		desc = 'Script to correlate two score matrices of the same sequences and Mantel-test the correlation'
+		u='%(prog)s [options]' # command-line usage
+		self.parser = argparse.ArgumentParser(description=desc, add_help=False, usage=u)
+		self._init_params()
+
+	# Create parameters to be used throughout the application
+	def _init_params(self):
+		param_reqd = self.parser.add_argument_group('Required Parameters')
+		param_opts = self.parser.add_argument_group('Optional Parameters')
+		param_reqd.add_argument('-i', metavar='FILE', required=True,
+					help='First score matrix: a contraster\'s output, or a memory-mapped square matrix (.npy) with its <root>.names.txt [na]')
+		param_reqd.add_argument('-j', metavar='FILE', required=True,
+					help='Second score matrix, as the first; its rows and columns are matched to the first\'s by name [na]')
+		param_opts.add_argument('-method', metavar='STR', default='pearson',
+					help='Correlation tested by permutation [pearson]\n\tpearson,spearman')
+		param_opts.add_argument('-perm', metavar='INT', default=999, type=int,
+					help='Number of permutations; 0 for the correlations alone [999]')
+		param_opts.add_argument('-seed', metavar='INT', default=0, type=int,
+					help='Random seed of the permutations [0]')
+		param_opts.add_argument('-n', metavar='INT', default=2, type=int,
+					help='Number of worker processes [2]')
+		param_opts.add_argument('-start', metavar='STR', default=default_start_method(),
+					help='How worker processes are started ['+default_start_method()+']\n\tforkserver,spawn,fork')
+		param_opts.add_argument('-block', metavar='INT', default=256, type=int,
+					help='Rows of the matrices read at a time [256]')
+		param_opts.add_argument('-o', metavar='FILE', default='mantel.tab',
+					help='Table of the correlations and test; the correlations of the permutations are written '+
+					'next to it (.null.npy) [mantel.tab]')
+		param_opts.add_argument('-h','--help', action='help',
+					help='Show this help screen and exit')
+
+	# Get the arguments for each parameter
+	def parse_args(self):
+		return vars(self.parser.parse_args()) # parse arguments
+
+# Validates user-provided command-line arguments
+class MantelArgumentValidator():
+	def __init__(self, args):
+		self.args = args
+		self.check_args()
+
+	def check_args(self):
+		return all([self.test_input(), self.test_options()])
+
+	# Test the matrices and the names of memory-mapped ones exist
+	def test_input(self):
+		for fname in (self.args['i'], self.args['j']):
+			if not os.path.isfile(fname):
+				raise IOError('Score matrix '+fname+' not found')
+			if fname.endswith('.npy') and not os.path.isfile(TreeSeqCluster.default_names_file(fname)):
+				raise IOError('Names of '+fname+' ('+TreeSeqCluster.default_names_file(fname)+') not found')
+		return True
+
+	def test_options(self):
+		if self.args['method'] not in TreeSeqMantel.CORRELATIONS:
+			raise IOError('-method must be one of '+', '.join(TreeSeqMantel.CORRELATIONS))
+		if self.args['perm'] < 0:
+			raise IOError('The number of permutations must be >= 0')
+		if self.args['n'] < 1:
+			raise IOError('>= 1 worker processes are needed')
+		if self.args['start'] not in ('forkserver', 'spawn', 'fork'):
+			raise IOError('-start must be one of forkserver, spawn, fork')
+		if self.args['block'] < 1:
+			raise IOError('The block must be >= 1 rows')
+		return True
+
+# Reads both matrices (streaming text ones into memory-mapped ones), aligns them on the sequences they
+# share, correlates their upper triangles and runs the permutations of the Mantel test over the pool
+class MantelDriver():
+	def __init__(self, args):
+		self.matrices = [args['i'], args['j']]
+		self.method = args['method']
+		self.permutations = args['perm']
+		self.seed = args['seed']
+		self.num_workers = args['n']
+		self.startMethod = args['start']
+		self.blockRows = args['block']
+		self.fname = args['o']
+		self.root = os.path.splitext(args['o'])[0]
+		self.temporary = []
+
+	# Name of a temporary memory-mapped matrix, removed at the end
+	def temporary_file(self, suffix):
+		fname = self.root + '.' + suffix + '.npy'
+		self.temporary.append(fname)
+		return fname
+
+	def start(self):
+		try:
+			self.run()
+		finally:
+			for fname in self.temporary:
+				if os.path.exists(fname):
+					os.remove(fname)
+		out('** Analysis Complete **')
+
+	def run(self):
+		started = time.time()
+		scores, names = [], []
+		for k, fname in enumerate(self.matrices):
+			if fname.endswith('.npy'):
+				matrix = numpy.load(fname, mmap_mode='r')
+				matrixNames = TreeSeqCluster.read_names(TreeSeqCluster.default_names_file(fname))
+				if len(matrixNames) != matrix.shape[0] or matrix.ndim != 2 or matrix.shape[1] != matrix.shape[0]:
+					raise IOError(fname+' is not a square matrix of its '+str(len(matrixNames))+' names')
+			else:
+				scoresFile = self.temporary_file('scores' + str(k + 1))
+				matrixNames = TreeSeqCluster.stream_score_matrix(fname, scoresFile, self.blockRows)
+				matrix = numpy.load(scoresFile, mmap_mode='r')
+			scores.append(matrix)
+			names.append(matrixNames)
+		common, index1, index2 = TreeSeqMantel.common_names(names[0], names[1])
+		n = len(common)
+		if n < 3:
+			raise IOError('The matrices share '+str(n)+' sequences; a correlation needs >= 3')
+		out('Read '+str(len(names[0]))+' and '+str(len(names[1]))+' sequences, '+str(n)+' in both, in '+
+			str(round(time.time() - started, 2))+'s')
+
+		correlated = time.time()
+		centered, squares, ranks = [], [], []
+		for k, index in enumerate((index1, index2)):
+			aligned = TreeSeqMantel.write_aligned(scores[k], index, self.temporary_file('aligned' + str(k + 1)), self.blockRows)
+			matrix, ss = TreeSeqMantel.write_centered(aligned, self.temporary_file('centered' + str(k + 1)), self.blockRows)
+			centered.append(matrix)
+			squares.append(ss)
+			ranks.append(TreeSeqMantel.average_ranks(TreeSeqMantel.condensed_values(aligned, self.blockRows)))
+			del aligned
+		pearson = TreeSeqMantel.centered_correlation(centered[0], centered[1], squares[0], squares[1], self.blockRows)
+		spearman = TreeSeqMantel.rank_correlation(ranks[0], ranks[1])
+		out('Pearson r = '+str(round(pearson, 6))+', Spearman rho = '+str(round(spearman, 6))+' over '+
+			str(n * (n - 1) // 2)+' pairs in '+str(round(time.time() - correlated, 2))+'s')
+
+		rows = [('Sequences', n), ('Pairs', n * (n - 1) // 2), ('Pearson', pearson), ('Spearman', spearman)]
+		if self.permutations > 0:
+			tested = time.time()
+			if self.method == 'spearman': # permute the centered ranks instead
+				centered, squares = [], []
+				for k in range(2):
+					ranked = TreeSeqMantel.write_ranks(ranks[k], n, self.temporary_file('ranks' + str(k + 1)), self.blockRows)
+					matrix, ss = TreeSeqMantel.write_centered(ranked, self.temporary_file('centeredRanks' + str(k + 1)), self.blockRows)
+					centered.append(matrix)
+					squares.append(ss)
+			del ranks
+			observed = TreeSeqMantel.triangle_products(centered[0], centered[1], self.blockRows)
+			null = self.permute(centered[0].filename, centered[1].filename) / numpy.sqrt(squares[0] * squares[1])
+			p = TreeSeqMantel.mantel_p(observed / numpy.sqrt(squares[0] * squares[1]), null)
+			numpy.save(self.root + '.null.npy', null)
+			out('Mantel test ('+self.method+', '+str(self.permutations)+' permutations): p = '+str(round(p, 6))+
+				' in '+str(round(time.time() - tested, 2))+'s; null correlations -> '+self.root+'.null.npy')
+			rows += [('Method', self.method), ('Permutations', self.permutations), ('Seed', self.seed), ('p', p)]
+
+		outhandle = open(self.fname, 'w')
+		outhandle.write('Statistic\tValue\n')
+		for statistic, value in rows:
+			outhandle.write(statistic+'\t'+str(value)+'\n')
+		outhandle.close()
+		out('Written to '+self.fname)
+
+	# Sums of products of the permutations, split over the workers
+	def permute(self, centeredName1, centeredName2):
+		seeds = TreeSeqMantel.permutation_seeds(self.seed, self.permutations)
+		chunks = [list(chunk) for chunk in numpy.array_split(numpy.array(seeds, dtype=object), self.num_workers) if len(chunk) > 0]
+		executor = concurrent.futures.ProcessPoolExecutor(self.num_workers, mp_context=get_pool_context(self.startMethod))
+		try:
+			futures = [executor.submit(TreeSeqMantel.permuted_products, centeredName1, centeredName2, chunk, self.blockRows)
+					for chunk in chunks]
+			sums = numpy.concatenate([future.result() for future in futures])
+		finally:
+			executor.shutdown()
+		return sums
+
+if __name__ == '__main__':
+	try:
+		args = MantelCommandLineParser().parse_args()
+		MantelArgumentValidator(args) # test all arguments are correct
+		driver = MantelDriver(args)
+		driver.start()
+
+	except (IOError, KeyboardInterrupt, IndexError) as e:
+		out(str(e)+'\n')
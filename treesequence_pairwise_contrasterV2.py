@@ -1,9 +1,11 @@
 
+import time
+STARTED = time.time() # start of the script, for the startup report
 import argparse, platform
-from Bio.SubsMat import MatrixInfo
-from Bio import SeqIO
-import concurrent.futures, numpy, sys, re, os, TreeSeqGlobalAlign
+import concurrent.futures, multiprocessing, threading, queue, hashlib, numpy, sys, re, os, socket, TreeSeqGlobalAlign, TreeSeqSweepAlign, TreeSeqDataset, TreeSeqMatrices, TreeSeqMetadata, TreeSeqStore, TreeSeqTuner, TreeSeqQueue, TreeSeqPreflight
+from TreeSeqStore import sequence_hash
 from datetime import datetime
+IMPORTED = time.time()
 
 # Validates user-provided command-line arguments
 class ArgumentValidator():
@@ -20,8 +22,11 @@ class ArgumentValidator():
 		else:
 			raise RuntimeError('Python 3.2+ recommended')
 
-	# BioPython must be installed
+	# BioPython must be installed to parse fasta files (not for compiled datasets or the in-built matrices)
 	def check_biopython(self):
+		inputs = [self.args[k] for k in ('f', 'f2') if self.args.get(k) is not None]
+		if all([TreeSeqDataset.is_dataset(fname) for fname in inputs]):
+			return True
 		try:
 			import Bio
 			out('BioPython v.' + Bio.__version__ + ' found [OK]')
@@ -31,7 +36,10 @@ class ArgumentValidator():
 	# Checks user-provided arguments are valid
 	def check_args(self):
 		return all([self.test_num_workers(), self.test_mutual_matrices(),
-				self.test_valid_matrix()])
+				self.test_valid_matrix(), self.test_sweep(), self.test_memory_budget(), self.test_instrument(),
+				self.test_compact(), self.test_runs(), self.test_threshold(), self.test_pairs(), self.test_tune(),
+				self.test_writer(), self.test_queue(),
+				self.test_tiles(), self.test_start(), self.test_store()])
 
 	# Test either a custom matrix or in-built matrix is selected
 	def test_mutual_matrices(self):
@@ -42,7 +50,7 @@ class ArgumentValidator():
 
 	# Test a valid substitution matrix is selected
 	def test_valid_matrix(self):
-		all_matrices = set(MatrixInfo.available_matrices) # al sub. matrices
+		all_matrices = TreeSeqMatrices.available_matrices() # al sub. matrices
 		if self.args['matrix'] in all_matrices or self.args['custom']:
 			return True
 		else:
@@ -50,6 +58,101 @@ class ArgumentValidator():
 			'http://biopython.org/DIST/docs/api/Bio.SubsMat.MatrixInfo-module.html'
 			raise IOError(err)
 
+	# Test a sweep only asks for outputs it produces (alignment scores, one file per setting)
+	def test_sweep(self):
+		if self.args['sweep'] and (self.args['a'] or self.args['s'] != 'alignment'):
+			raise IOError('A sweep only writes alignment scores (-s alignment, no -a)')
+		else:
+			return True
+
+	# Test instrumentation is only requested of the tree-sequence aligner
+	def test_instrument(self):
+		if self.args['sweep'] and (self.args['instrument'] or self.args['profile']):
+			raise IOError('Sweeps are not instrumented (no --instrument or -profile)')
+		else:
+			return True
+
+	# Test the compact layout is only requested of the (uninstrumented) tree-sequence aligner
+	def test_compact(self):
+		if self.args['compact'] and (self.args['sweep'] or self.args['instrument']):
+			raise IOError('The compact layout is not available to sweeps or --instrument')
+		else:
+			return True
+
+	# Test run-length alignment is only requested of the (uninstrumented) tree-sequence aligner, and
+	# not with the compact layout, which is a different fill
+	def test_runs(self):
+		if self.args['runs'] and (self.args['sweep'] or self.args['instrument'] or self.args['compact']):
+			raise IOError('Run-length alignment is not available to sweeps, --instrument or --compact')
+		else:
+			return True
+
+	# Test the pair conditions parse, and have metadata to test: a table, or a dataset compiled with one
+	def test_pairs(self):
+		if self.args['pairs'] is None:
+			return True
+		for text in self.args['pairs']:
+			TreeSeqMetadata.parse_pair_predicate(text)
+		if self.args['sweep']:
+			raise IOError('Pair conditions (-pairs) are not available to sweeps')
+		if self.args['meta'] is None and not TreeSeqDataset.is_dataset(self.args['f']):
+			raise IOError('Pair conditions need the metadata table (-meta) unless -f is a dataset compiled with it')
+		return True
+
+	# Test the strategies are left to the cost model when it routes the pairs
+	def test_tune(self):
+		if self.args['tune'] is not None and (self.args['sweep'] or self.args['instrument'] or self.args['compact'] or
+				self.args['runs'] or self.args['threshold'] is not None):
+			raise IOError('The cost model (-tune) chooses the strategy; no -sweep, --instrument, --compact, --runs or -threshold')
+		else:
+			return True
+
+	# Test a threshold is only set on alignment scores of the (uninstrumented) compact aligner
+	def test_threshold(self):
+		if self.args['threshold'] is not None and (self.args['sweep'] or self.args['s'] != 'alignment' or
+				self.args['instrument'] or self.args['runs']):
+			raise IOError('A threshold applies to alignment scores (-s alignment), without -sweep, --instrument or --runs')
+		else:
+			return True
+
+	# Test a job queue only runs the aligners its workers rebuild from the queue, with a valid lease and chunking
+	def test_queue(self):
+		if self.args['queue'] is not None and (self.args['sweep'] or self.args['instrument'] or self.args['threshold'] is not None or
+				self.args['tune'] is not None or self.args['store'] is not None or self.args['mem'] is not None or self.args['profile'] is not None):
+			raise IOError('A job queue runs without -sweep, --instrument, -threshold, -tune, -store, -mem or -profile')
+		if self.args['lease'] <= 0 or self.args['chunkcells'] < 1:
+			raise IOError('The lease must be > 0 seconds and the chunk cells >= 1')
+		else:
+			return True
+
+	# Test the tiling of large pairs
+	def test_tiles(self):
+		if self.args['tiles'] < 0 or self.args['tilecells'] < 1:
+			raise IOError('The tiling processes must be >= 0 and the tiled cells >= 1')
+		else:
+			return True
+
+	# Test the writer's queue and sync interval
+	def test_writer(self):
+		if self.args['writequeue'] < 0 or self.args['sync'] < 0:
+			raise IOError('The writer queue and sync interval must be >= 0')
+		else:
+			return True
+
+	# Test a score store is only used for the alignment scores it holds
+	def test_store(self):
+		if self.args['store'] and (self.args['sweep'] or self.args['a'] or self.args['s'] != 'alignment'):
+			raise IOError('A score store only holds alignment scores (-s alignment, no -a or -sweep)')
+		else:
+			return True
+
+	# Test the workers' start method is available on this platform
+	def test_start(self):
+		if self.args['start'] in multiprocessing.get_all_start_methods():
+			return True
+		else:
+			raise IOError('The start method must be one of '+', '.join(multiprocessing.get_all_start_methods()))
+
 	# Test a valid number of workers are provided
 	def test_num_workers(self):
 		if self.args['n'] >= 1:
@@ -57,13 +160,70 @@ class ArgumentValidator():
 		else:
 			raise IOError('>= 1 worker processes must be provided')
 
+	# Test the memory budget, if any, is positive
+	def test_memory_budget(self):
+		if self.args['mem'] is None or self.args['mem'] > 0:
+			return True
+		else:
+			raise IOError('The memory budget must be > 0 MB')
+
+# Add the parameters of the contraster's run modes (the aligner, pair selection, output and scheduling
+# of its runs) to a parser
+def add_run_params(parser):
+	param_run = parser.add_argument_group('Run Modes')
+	param_run.add_argument('-threshold', metavar='FLOAT', default=None, type=float,
+				help='Only keep pairs scoring at least this, abandoning the others early; writes an edge list (target, query, score) [na]')
+	param_run.add_argument('-tune', metavar='FILE', default=None,
+				help='Cost model of the aligner strategies, calibrated on this machine if missing or stale; each pair is aligned by the strategy predicted fastest [na]')
+	param_run.add_argument('-meta', metavar='FILE', default=None,
+				help='Neurite metadata table, e.g. demo/NeuriteMetaData.csv [that compiled into the dataset -f]')
+	param_run.add_argument('-pairs', metavar='STR', default=None, action='append',
+				help='Only align the pairs meeting this condition on their metadata; repeat to require several\n\t'+
+				'same:ATTR,differ:ATTR,target:ATTR=V[&V],query:ATTR=V[&V] [all pairs]')
+	param_run.add_argument('--dryrun', action='store_const', const=True, default=False,
+				help='Report the pairs selected and their cells (cost) without aligning them')
+	param_run.add_argument('-tiles', metavar='INT', default=0, type=int,
+				help='Most processes aligning a pair of at least -tilecells cells, tile by tile. They share the -n CPUs '+
+				'with the workers, a large pair taking those of idle workers; 1 never tiles, nor does --instrument [0, -n]')
+	param_run.add_argument('-tilecells', metavar='INT', default=4000000, type=int,
+				help='Cells (product of the lengths) of a pair above which it is tiled [4000000]')
+	param_run.add_argument('-mem', metavar='MB', default=None, type=float,
+				help='Memory budget for alignments in flight; jobs are admitted by predicted peak memory [none]')
+	param_run.add_argument('-writequeue', metavar='INT', default=0, type=int,
+				help='Completed targets held for the writer before submission waits for it [4 x workers]')
+	param_run.add_argument('-sync', metavar='SECONDS', default=10.0, type=float,
+				help='Interval between durable syncs (fsync) of the output files; 0 syncs at the end only [10]')
+	param_run.add_argument('-queue', metavar='FILE', default=None,
+				help='Job queue (SQLite) of the run\'s chunks, claimed under leases; workers (treesequence_worker.py) may join and leave while it runs, and a killed run resumes from the chunks completed [na]')
+	param_run.add_argument('-lease', metavar='SECONDS', default=300.0, type=float,
+				help='Lease of a queued chunk, renewed while it is aligned; a chunk whose worker dies is reissued after it [300]')
+	param_run.add_argument('-chunkcells', metavar='INT', default=20000000, type=int,
+				help='Cells (sum of the products of the lengths) of the pairs of a queued chunk, of one target [20000000]')
+	param_run.add_argument('-sweep', metavar='FILE', default=None,
+				help='Grid of cost settings to align under in one pass; one setting per line, tab-separated: '+
+				'gap, gapopen[, custom matrix] [na]')
+	param_run.add_argument('--instrument', action='store_const', const=True, default=False,
+				help='Count the branches taken by the aligner and time its phases; reported in <output>.dpstats.tab')
+	param_run.add_argument('-store', metavar='FILE', default=None,
+				help='Persistent store of scores (SQLite); pairs found there are not aligned again, and those aligned are added [na]')
+	param_run.add_argument('-profile', metavar='DIR', default=None,
+				help='Profile each worker (cProfile), writing its statistics to DIR [na]')
+
 # Helper-class to parse input arguments
 class CommandLineParser():
+	runModes = True # whether the contraster's run modes are parameters; other scripts take their defaults
+
 	def __init__(self):
 		desc = 'Script to execute exhaustive brute-force pairwise alignment'
 		u='%(prog)s [options]' # command-line usage
 		self.parser = argparse.ArgumentParser(description=desc, add_help=False, usage=u)
+		if not self.runModes: # rejected as unrecognized, but set, as the validator and input state read them
+			defaults = argparse.ArgumentParser(add_help=False)
+			add_run_params(defaults)
+			self.parser.set_defaults(**vars(defaults.parse_args([])))
 		self._init_params()
+		if self.runModes:
+			add_run_params(self.parser)
 
 	# Create parameters to be used throughout the application
 	def _init_params(self):
@@ -90,6 +250,8 @@ class CommandLineParser():
 					help='Matrix name; see Biopython MatrixInfo for all matrices [na]')
 		param_opts.add_argument('-n', metavar='INT', default=2, type=int,
 					help='Number of worker processes [2]')
+		param_opts.add_argument('-start', metavar='STR', default=default_start_method(),
+					help='How worker processes are started ['+default_start_method()+']\n\tforkserver,spawn,fork')
 		param_opts.add_argument('-o', metavar='FILE', default='scores.tab', 
 					help='File to write/append output [scores.tab]')
 		param_opts.add_argument('-a', metavar='FILE', default='', 
@@ -97,6 +259,12 @@ class CommandLineParser():
 		param_opts.add_argument('-s', metavar='STR', default='alignment', 
 					help='Type of score to write to output file [alignment]\n\talignment,gaps,excess_gaps,short_normalized,long_normalized')
 		param_opts.add_argument('--forceQuery', action='store_const', const=True, default=False)
+		param_opts.add_argument('--workspace', action='store_const', const=True, default=False,
+					help='Reuse matrix buffers and per-sequence setup between the alignments of each worker')
+		param_opts.add_argument('--compact', action='store_const', const=True, default=False,
+					help='Store integer scores and packed flags (5-9 bytes per cell); non-integer costs are aligned in floating point')
+		param_opts.add_argument('--runs', action='store_const', const=True, default=False,
+					help='Fill the DP over runs of C-nodes in closed form; only with integer costs and no gap open cost')
 		param_opts.add_argument('-h','--help', action='help',
 					help='Show this help screen and exit')
 
@@ -113,6 +281,7 @@ class InputWrapperState():
 		self.fname = args['f'] # input filename
 		self.fname2 = args['f2'] # input filename
 		self.score_type = args['s']
+		self.datasets = {} # K => file name, V => compiled dataset
 
 	# Get arguments
 	def get_args(self):
@@ -127,16 +296,63 @@ class InputWrapperState():
 	def get_submatrix(self):
 		return self.subsmat
 
+	# Get the settings of a parameter sweep, or None if no sweep was requested
+	def get_sweep_settings(self):
+		if self.args['sweep'] is None:
+			return None
+		return TreeSeqSweepAlign.parse_sweep(self.args['sweep'], self.subsmat, self.__parse_custom_matrix)
+
 	# Get the type of score to be used in the output file
 	def get_scoretype(self):
 		return self.score_type
 		
-	# Trivial function to parse a fasta file
+	# Trivial function to parse a fasta file, or to load a dataset compiled from one (treesequence_compile.py)
 	def parse_fasta(self,fname):
+		if TreeSeqDataset.is_dataset(fname):
+			return self.load_dataset(fname)
+		from Bio import SeqIO # only imported for fasta files
 		queries = list(SeqIO.parse(fname, 'fasta')) # easy indexing
 		out(str(len(queries)) + ' queries parsed [OK]')
 		return queries # return set of fasta entries
 
+	# Load a compiled dataset; its records carry their T-A dictionaries if it was compiled under the
+	# substitution matrix and node types of this run
+	def load_dataset(self, fname):
+		started = time.perf_counter()
+		dataset = self.get_dataset(fname)
+		key = None
+		if self.subsmat is not None and self.args.get('sweep') is None:
+			key = TreeSeqDataset.ta_key(self.get_nodetypes(), TreeSeqDataset.completed_matrix(self.subsmat, self.args['gap']))
+		queries = dataset.get_records(key)
+		out(str(len(queries)) + ' queries loaded from dataset ' + dataset.get_hash()[:12] + ' in ' +
+			str(round((time.perf_counter() - started) * 1000, 1)) + ' ms [OK]')
+		if key is not None and not dataset.has_ta_data(key):
+			out('The dataset was compiled under another matrix or node types; T-A dictionaries are created per pair')
+		return queries
+
+	# Get a compiled dataset, memory-mapped once per file
+	def get_dataset(self, fname):
+		if fname not in self.datasets:
+			self.datasets[fname] = TreeSeqDataset.Dataset(fname)
+		return self.datasets[fname]
+
+	# Get the neurites' metadata: the table given (-meta), else that compiled into the datasets (-f, -f2),
+	# or None
+	def get_metadata(self):
+		if self.args.get('meta') is not None:
+			return TreeSeqMetadata.parse_metadata(self.args['meta'])
+		metadata = None
+		for fname in (self.fname, self.fname2):
+			if fname is not None and TreeSeqDataset.is_dataset(fname) and self.get_dataset(fname).get_metadata() is not None:
+				metadata = dict(metadata or {}, **self.get_dataset(fname).get_metadata())
+		return metadata
+
+	# Get the node types of the run
+	def get_nodetypes(self):
+		if self.args.get('nodeTypes') is None:
+			return TreeSeqGlobalAlign.default_nodetypes()
+		return TreeSeqGlobalAlign.parse_nodetypes(self.args['nodeTypes'])
+
 	# Trivial function to write parameter arguments to a file 
 	def write_args(self):
 		outhandle = open('param_args.tab', 'w')
@@ -157,10 +373,10 @@ class InputWrapperState():
 
 	# Get the user-provided in-built matrix
 	def __parse_inbuilt_matrix(self):
-		return getattr(MatrixInfo, args['matrix']) # get substitution matrix
+		return TreeSeqMatrices.get_matrix(self.args['matrix']) # get substitution matrix
 
 	# Function to parse custom scoring matrix.
-	def __parse_custom_matrix(self):
+	def __parse_custom_matrix(self, fname=None):
 		""" 
 		A schema is organized such that you have 3 columns: A, B, C.
 		Columns A and B represents the query and target base, respectively.
@@ -175,8 +391,10 @@ class InputWrapperState():
 		... 
 		etc. 
 		"""
+		if fname is None:
+			fname = self.args['custom']
 		submat = {} # the substitution matrix
-		for line in open(self.args['custom']): # parse custom matrix file
+		for line in open(fname): # parse custom matrix file
 			line = line.strip()
 			if len(line) == 0: # if an empty line, terminate analysis
 				break
@@ -202,11 +420,43 @@ def parse_output(fname):
 			if len(line) == 0:
 				break
 			else:
-				sequenceName = line.split('\t',1)[0]
+				sequenceName = line.rstrip('\n').split('\t',1)[0] # a target list (-threshold) has no tab
 				if len(sequenceName) > 0:
 					alreadyDone.append(sequenceName)
 	return alreadyDone
 
+# Get the manifest file which records the sequences and parameters a score file is computed from
+def manifest_filename(fname):
+	return os.path.splitext(fname)[0] + '.manifest.tab'
+
+# Get the parameters which determine the scores, in the form recorded by a manifest; pairs are the
+# conditions (-pairs) selecting the pairs scored, the others having no score
+def manifest_params(costs, submat, nodeTypes, pairs=None):
+	return {'gap': str(costs['gap']), 'gapopen': str(costs['gapopen']),
+		'submat': hashlib.sha1(repr(sorted(submat.items())).encode()).hexdigest(),
+		'nodeTypes': repr(sorted(nodeTypes.items())), 'pairs': 'all' if pairs is None else ' & '.join(pairs)}
+
+# Write a manifest: the parameters, then the name and content hash of each row (target) and column (query)
+def write_manifest(fname, targets, queries, params):
+	outhandle = open(fname, 'w')
+	outhandle.write('Axis\tName\tValue\n')
+	for k in sorted(params):
+		outhandle.write('param\t'+k+'\t'+params[k]+'\n')
+	for target in targets:
+		outhandle.write('row\t'+target.name+'\t'+sequence_hash(target)+'\n')
+	for query in queries:
+		outhandle.write('col\t'+query.name+'\t'+sequence_hash(query)+'\n')
+	outhandle.close()
+
+# Parse a manifest into dictionaries (name to value) of its parameters, rows and columns
+def parse_manifest(fname):
+	manifest = {'param': {}, 'row': {}, 'col': {}}
+	for line in open(fname):
+		vals = line.rstrip('\n').split('\t')
+		if len(vals) == 3 and vals[0] in manifest:
+			manifest[vals[0]][vals[1]] = vals[2]
+	return manifest
+
 # Executes the pairwise application
 class FactoryDriver():
 	def __init__(self, targets, queries, input_state):
@@ -218,7 +468,7 @@ class FactoryDriver():
 		self.forceQuery = input_state.get_args()['forceQuery']
 
 		# Get sequences already completed and remove from queries
-		self.priorCompletions = parse_output(input_state.get_args()['o'])
+		self.priorCompletions = parse_output(self.get_output_filename(input_state.get_args()))
 		self.num_complete = len(self.priorCompletions) # for how many sequences have been aligned
 		out(str(self.num_complete)+" complete of "+str(len(targets)))
 
@@ -227,36 +477,267 @@ class FactoryDriver():
 			openMode = 'a'
 		else:
 			openMode = 'w'
-			
-		self.scorehandle = open(input_state.get_args()['o'], openMode) # output file
-		self.alignhandle = None
-		if input_state.get_args()['a'] is not '':
-			self.alignhandle = open(input_state.get_args()['a'], openMode) # alignments file
+		self.open_output_buffers(input_state.get_args(), openMode)
 			
 		self.num_workers = input_state.get_args()['n']
+		self.startMethod = input_state.get_args()['start']
+		self.useWorkspace = input_state.get_args()['workspace']
+		self.instrument = input_state.get_args()['instrument']
+		self.compact = input_state.get_args()['compact']
+		self.runs = input_state.get_args()['runs']
+		self.threshold = input_state.get_args()['threshold']
+		self.selected = select_pairs(self.targets, self.queries, input_state) # target name to the query names to align
+		self.tiling = None # (processes, minimum cells) of tiled pairs
+		tiles = input_state.get_args()['tiles']
+		if tiles == 0:
+			tiles = self.num_workers
+		if tiles > 1 and self.instrument:
+			if input_state.get_args()['tiles'] > 1: # asked for, rather than the default
+				out('WARNING: --instrument counts the cells of the untiled aligner; -tiles is ignored')
+		elif tiles > 1:
+			self.tiling = (tiles, input_state.get_args()['tilecells'])
+		self.profileDir = input_state.get_args()['profile']
+		if self.profileDir is not None and not os.path.isdir(self.profileDir):
+			os.makedirs(self.profileDir)
+		self.reportRoot = os.path.splitext(input_state.get_args()['o'])[0]
+		self.writeQueue = input_state.get_args()['writequeue']
+		if self.writeQueue == 0:
+			self.writeQueue = 4 * self.num_workers
+		self.syncInterval = input_state.get_args()['sync']
+		self.writer = None
+		self.jobStats = {} # statistics reported by the jobs, summed over jobs
+		self.governor = None
+		if input_state.get_args()['mem'] is not None: # admit jobs against a memory budget
+			budget = int(input_state.get_args()['mem'] * 1024 * 1024)
+			report = os.path.splitext(input_state.get_args()['o'])[0] + '.memory.tab'
+			self.governor = MemoryGovernor(budget, self.num_workers, report)
 		# Get node type lists
 		if input_state.get_args()['nodeTypes'] is None:
 			self.nodeTypes = TreeSeqGlobalAlign.default_nodetypes()
 		else:
 			self.nodeTypes = TreeSeqGlobalAlign.parse_nodetypes(input_state.get_args()['nodeTypes'])
+		self.tuner = None # cost model routing each pair to a strategy
+		if input_state.get_args()['tune'] is not None:
+			self.tuner = self.load_tuner(input_state.get_args())
+		self.write_manifest(input_state.get_args())
+		self.store = None # scores of earlier runs, by sequence content
+		if input_state.get_args().get('store') is not None:
+			self.store = TreeSeqStore.ScoreStore(input_state.get_args()['store'],
+							TreeSeqStore.params_key(self.costs, self.submat, self.nodeTypes))
+			self.targetHashes = {target.name: sequence_hash(target) for target in self.targets}
+			self.queryHashes = {query.name: sequence_hash(query) for query in self.queries}
+
+	# Record the sequences and parameters the score file is computed from, for incremental updates
+	def write_manifest(self, args):
+		params = manifest_params(self.costs, self.submat, self.nodeTypes, args['pairs'])
+		write_manifest(manifest_filename(args['o']), self.targets, self.queries, params)
+
+	# Get the score file whose rows record the targets already completed
+	def get_output_filename(self, args):
+		return args['o']
+
+	# Open the score file and, if requested, the alignment file
+	def open_output_buffers(self, args, openMode):
+		self.scorehandle = open(args['o'], openMode, buffering=WRITE_BUFFER) # output file
+		self.alignhandle = None
+		if args['a'] != '':
+			self.alignhandle = open(args['a'], openMode, buffering=WRITE_BUFFER) # alignments file
+
+	# Get the open output files, which the writer flushes and syncs
+	def get_output_handles(self):
+		if self.alignhandle is None:
+			return [self.scorehandle]
+		return [self.scorehandle, self.alignhandle]
+
+	# Get the function and arguments of the job aligning a target against the queries
+	def create_job(self, target, queryCompletions):
+		return mapper, (target, self.queries, self.get_mapper_settings(), queryCompletions, self.get_stored_scores(target),
+				self.get_selected(target))
+
+	# Get the settings the jobs align with (mapper_settings)
+	def get_mapper_settings(self):
+		return mapper_settings(self.costs, self.submat, self.nodeTypes, useWorkspace=self.useWorkspace, instrument=self.instrument,
+				profileDir=self.profileDir, compact=self.compact, tiling=self.tiling, runs=self.runs, threshold=self.threshold,
+				tuner=self.tuner)
+
+	# Get the cost model, calibrating it if needed; scores alone (scoreOnly) are only routed to if
+	# nothing else is written or stored
+	def load_tuner(self, args):
+		scoreOnly = self.score_type == 'alignment' and args['a'] == '' and args['store'] is None
+		strategies = TreeSeqTuner.exact_strategies(self.costs, self.submat, scoreOnly)
+		started = time.time()
+		model, calibrated = TreeSeqTuner.load_model(args['tune'], self.costs, self.submat, self.nodeTypes, strategies)
+		if calibrated:
+			out('Cost model calibrated in '+str(round(time.time() - started, 1))+'s -> '+args['tune'])
+		else:
+			out('Cost model read from '+args['tune'])
+		out('Strategies: '+', '.join(model.enabled))
+		return model
+
+	# Get the names of the queries selected for a target (-pairs), or None if all are
+	def get_selected(self, target):
+		if self.selected is None:
+			return None
+		return self.selected[target.name]
+
+	# Get the scores of a target which are in the store, as a dictionary of query name to score
+	def get_stored_scores(self, target):
+		if self.store is None:
+			return None
+		row = self.store.get_row(self.targetHashes[target.name])
+		return {query.name: row[self.queryHashes[query.name]] for query in self.queries if self.queryHashes[query.name] in row}
+
+	# Predict the peak memory (bytes) of a job, i.e. of its largest pair
+	def predict_job_memory(self, target, queryCompletions):
+		selected = self.get_selected(target)
+		lengths = [len(q.seq) for q in self.queries if q.name not in queryCompletions and (selected is None or q.name in selected)]
+		if len(lengths) == 0:
+			return 0
+		layout = None
+		tiled = self.tiling is not None and (len(target.seq)+1) * (max(lengths)+1) >= self.tiling[1]
+		if self.compact or tiled:
+			layout = TreeSeqGlobalAlign.compact_layout(len(target.seq), max(lengths), self.costs, self.submat)
+		return TreeSeqGlobalAlign.predict_memory(len(target.seq), max(lengths), self.useWorkspace, layout, tiled)
 
 	# Initialize the factory given query sequences and input arguments
 	def start(self):
-		executor = concurrent.futures.ProcessPoolExecutor(self.num_workers)
+		ready = time.time()
+		context = get_pool_context(self.startMethod)
+		initializer, initargs = None, ()
+		if self.tiling is not None: # the workers and their tile processes share the -n CPUs
+			initializer, initargs = TreeSeqGlobalAlign.set_cpu_budget, (context.Value('i', 0), self.num_workers)
+		executor = concurrent.futures.ProcessPoolExecutor(self.num_workers, mp_context=context, initializer=initializer,
+				initargs=initargs)
+		report_startup(self.startMethod, ready, start_workers(executor, self.num_workers))
 		if self.forceQuery:
 			queryCompletions = []
 		else:
 			queryCompletions = self.priorCompletions
+		# Completed targets are written by the writer thread; a job is only submitted once the writer has
+		# room for its result, so submission waits while the writer falls behind
+		self.writer = ResultWriter(self.write_result, self.get_output_handles(), self.num_workers + self.writeQueue,
+					self.syncInterval, self.reportRoot + '.writer.tab')
 		try:
-			for target in self.targets: # per fasta, create a concurrent job, f.
+			jobs = [] # per fasta, create a concurrent job
+			for target in self.targets:
 				if target.name not in self.priorCompletions:
-					f = executor.submit(mapper, target, queries, self.costs, self.submat, self.nodeTypes, queryCompletions)
+					jobs.append((target,) + self.create_job(target, queryCompletions))
+			if self.useWorkspace: # longest first, so workspaces reach full size on their first job
+				jobs.sort(key=lambda job: len(job[0].seq), reverse=True)
+			if self.governor is None:
+				for target, fn, fargs in jobs:
+					self.writer.reserve()
+					f = executor.submit(fn, *fargs)
 					f.add_done_callback(self._callback)
+			else:
+				predictions = [self.predict_job_memory(target, queryCompletions) for target, fn, fargs in jobs]
+				self.governor.run(executor, jobs, predictions, self.writer)
 			executor.shutdown()
+			self.writer.close()
 			self.close_output_buffers()
+			self.writer.report()
+			if self.governor is not None:
+				self.governor.report()
+			self.report_job_stats()
+			self.close_store()
 			out('** Analysis Complete **')
 		except KeyboardInterrupt:
 			executor.shutdown()
+			self.writer.close() # keep the targets completed so far
+			self.close_output_buffers()
+			self.close_store()
+
+	# Report the scores read from and added to the store, and close it
+	def close_store(self):
+		if self.store is None:
+			return
+		out('Store: '+str(self.store.counters['read'])+' scores reused, '+str(self.store.counters['added'])+' added -> '+
+			self.store.fname+' ('+str(len(self.store))+' scores)')
+		self.store.close()
+
+	# Add the statistics reported by a job to those of the run
+	def add_job_stats(self, stats):
+		for group in stats:
+			totals = self.jobStats.setdefault(group, {})
+			for k in stats[group]:
+				totals[k] = totals.get(k, 0) + stats[group][k]
+
+	# Print the statistics reported by the jobs
+	def report_job_stats(self):
+		if 'workspace' in self.jobStats:
+			counters = self.jobStats['workspace']
+			out('Workspace: '+', '.join([k+' '+str(counters[k]) for k in sorted(counters)]))
+		if 'dp' in self.jobStats:
+			self.report_dp_stats(self.jobStats['dp'])
+		if 'runs' in self.jobStats:
+			counters = self.jobStats['runs']
+			out('Runs: '+str(counters['runPairs'])+' of '+str(counters['pairs'])+' pairs run-length aligned, '+
+				str(counters['blocks'])+' blocks for '+str(counters['cells'])+' cells ('+
+				str(round(counters['cells'] / float(max(counters['blocks'], 1)), 2))+'x)')
+		if 'tuner' in self.jobStats:
+			self.report_tuner_stats(self.jobStats['tuner'])
+		if 'threshold' in self.jobStats:
+			counters = self.jobStats['threshold']
+			out('Threshold: '+str(counters['abandoned'])+' of '+str(counters['pairs'])+' pairs abandoned, '+
+				str(counters['cellsFilled'])+' of '+str(counters['cells'])+' cells filled ('+
+				str(round(100.0 * counters['cellsFilled'] / max(counters['cells'], 1), 1))+'%)')
+			if counters.get('unsound', 0) > 0:
+				out('WARNING: '+str(counters['unsound'])+' pairs aligned in full scored above a bound taken while filling them; '+
+					'pairs at the threshold may have been abandoned wrongly')
+		if self.profileDir is not None:
+			self.report_profiles()
+
+	# Write the aligner's counters and timings, with the shares derived from them
+	def report_dp_stats(self, counters):
+		derived = {}
+		cells = max(counters['cells'], 1)
+		for k in ('cellsMatch', 'cellsLeft', 'cellsUp'):
+			derived[k+'Share'] = counters[k] / float(cells)
+		derived['gapExtendShare'] = counters['gapExtends'] / float(max(counters['gapOpens'] + counters['gapExtends'], 1))
+		derived['meanSubtreeJump'] = counters['subtreeJumpNodes'] / float(max(counters['subtreeJumps'], 1))
+		derived['acMatchShare'] = counters['acMatches'] / float(max(counters['acEvaluations'], 1))
+		phases = counters['setupTime'] + counters['fillTime'] + counters['tracebackTime']
+		for k in ('setupTime', 'fillTime', 'tracebackTime'):
+			derived[k+'Share'] = counters[k] / max(phases, 1e-12)
+		derived['fillMicrosecondsPerCell'] = counters['fillTime'] * 1e6 / cells
+		outhandle = open(self.reportRoot + '.dpstats.tab', 'w')
+		outhandle.write('Statistic\tValue\n')
+		for k in TreeSeqGlobalAlign.DP_COUNTERS:
+			outhandle.write(k+'\t'+str(counters[k])+'\n')
+		for k in sorted(derived):
+			outhandle.write(k+'\t'+str(round(derived[k], 6))+'\n')
+		outhandle.close()
+		out('DP: '+str(counters['alignments'])+' alignments, '+str(counters['cells'])+' cells; fill '+
+			str(round(100 * derived['fillTimeShare'], 1))+'%, traceback '+str(round(100 * derived['tracebackTimeShare'], 1))+
+			'%, setup '+str(round(100 * derived['setupTimeShare'], 1))+'% of '+str(round(phases, 3))+'s')
+
+	# Write the pairs routed to each strategy with their predicted and observed times, and the speedup
+	# over plain NeedlemanWunsch predicted and observed (against plain's predicted time)
+	def report_tuner_stats(self, counters):
+		outhandle = open(self.reportRoot + '.tuner.tab', 'w')
+		outhandle.write('Strategy\tPairs\tPredicted\tObserved\n')
+		for strategy in TreeSeqTuner.STRATEGIES:
+			if counters.get(strategy+'.pairs', 0) > 0:
+				outhandle.write('\t'.join([strategy, str(counters[strategy+'.pairs']), str(round(counters[strategy+'.predicted'], 6)),
+							str(round(counters[strategy+'.observed'], 6))]) + '\n')
+		outhandle.close()
+		predicted = max(sum([counters[k] for k in counters if k.endswith('.predicted')]), 1e-12)
+		observed = max(sum([counters[k] for k in counters if k.endswith('.observed')]), 1e-12)
+		out('Tuner: predicted speedup '+str(round(counters['baseline'] / predicted, 2))+'x, observed '+
+			str(round(counters['baseline'] / observed, 2))+'x over plain ('+str(round(predicted, 3))+'s predicted, '+
+			str(round(observed, 3))+'s observed) -> '+self.reportRoot+'.tuner.tab')
+
+	# Merge the workers' profiles into one summary, sorted by cumulative time
+	def report_profiles(self):
+		files = [os.path.join(self.profileDir, f) for f in sorted(os.listdir(self.profileDir)) if f.startswith('worker-')]
+		if len(files) == 0:
+			return
+		import pstats # only imported when profiling
+		outhandle = open(os.path.join(self.profileDir, 'summary.txt'), 'w')
+		stats = pstats.Stats(*files, stream=outhandle)
+		stats.sort_stats('cumulative').print_stats(40)
+		outhandle.close()
+		out('Profiles of '+str(len(files))+' workers merged into '+os.path.join(self.profileDir, 'summary.txt'))
 
 	# Close all I/O buffers such as file handles
 	def close_output_buffers(self):
@@ -268,7 +749,6 @@ class FactoryDriver():
 	def _create_header(self, results):
 		h = '\t' +'\t'.join([h[-1] for h in results])
 		self.scorehandle.write(h + '\n')
-		self.scorehandle.flush()
 
 	# Determines which score to use and call the appropriate function
 	def calc_score(self, result):
@@ -313,10 +793,21 @@ class FactoryDriver():
 		seq2Len = len(al2)-result[1][1].count('-')
 		return result[0]/max(seq1Len,seq2Len)
 		
-	# Callback function once a thread is complete
+	# Callback function once a thread is complete; hands the result to the writer, or gives back its room
+	# if the job failed
 	def _callback(self, return_val):
-		res = return_val.result() # get result once thread is complete
-		target, results = res
+		try:
+			res = return_val.result() # get result once thread is complete
+		except Exception as e:
+			self.writer.discard(e)
+			return
+		self.writer.put(res)
+
+	# Write the scores (and alignments) of a completed target; run by the writer, which flushes
+	def write_result(self, res):
+		target, results = res[0], res[1]
+		if len(res) > 2: # statistics of the job
+			self.add_job_stats(res[2])
 		results = sorted(results, key=lambda x: x[-1]) # sort by query (last item)
 		if self.num_complete == 0: # for the first result, write headers
 			self._create_header(results)
@@ -324,7 +815,8 @@ class FactoryDriver():
 		# save scores to the alignment matrix
 		scores = '\t'.join([str(self.calc_score(s)) for s in results])
 		self.scorehandle.write(target + '\t' + scores + '\n')
-		self.scorehandle.flush()
+		if self.store is not None: # the scores aligned (rather than read from the store)
+			self.store.add([(self.targetHashes[target], self.queryHashes[r[-1]], r[0]) for r in results if r[1] is not None])
 
 		# also save actual alignment string
 		if self.alignhandle is not None:
@@ -333,28 +825,757 @@ class FactoryDriver():
 					align_target, align_query = r[1]
 					out_str = target + '\t' + r[-1] +'\t'+ align_target +'\t'+ align_query
 					self.alignhandle.write(out_str + '\n')
-					self.alignhandle.flush()
 		self.num_complete += 1
-		out(' --> ' + target + ' [OK] '+str(self.num_complete)+' of '+len(self.targets)+' at '+datetime.time(datetime.now())) # print-out progress
+		out(' --> ' + target + ' [OK] '+str(self.num_complete)+' of '+str(len(self.targets))+' at '+str(datetime.time(datetime.now()))) # print-out progress
+
+# Admits jobs to a process pool so that the predicted peak memory of the jobs in flight stays within
+# a budget. Jobs that don't fit are deferred while smaller ones run; a job larger than the whole
+# budget is run on its own (serialized)
+class MemoryGovernor():
+	def __init__(self, budget, numWorkers, reportFile):
+		self.budget = budget # bytes
+		self.num_workers = numWorkers
+		self.reportFile = reportFile
+		self.inUse = 0 # predicted bytes of the jobs in flight
+		self.running = 0 # number of jobs in flight
+		self.condition = threading.Condition()
+		self.observations = [] # (target, predicted, observed) per job
+
+	# Test whether a job of the given prediction can start now
+	def fits(self, predicted):
+		if self.running >= self.num_workers:
+			return False
+		if self.running == 0: # always let a job start on an idle pool, however large
+			return True
+		return self.inUse + predicted <= self.budget
+
+	# Submit every job, deferring those which don't currently fit; the result of each job is handed to
+	# the writer once complete. The writer has room for more results than there are workers, so a job in
+	# flight (whose callback needs the condition) never holds the last of its room
+	def run(self, executor, jobs, predictions, writer):
+		pending = list(zip(jobs, predictions))
+		with self.condition:
+			while len(pending) > 0:
+				deferred = []
+				for (target, fn, fargs), predicted in pending:
+					if self.fits(predicted):
+						writer.reserve()
+						self.inUse += predicted
+						self.running += 1
+						f = executor.submit(measured_job, fn, fargs)
+						f.add_done_callback(self._create_callback(target.name, predicted, writer))
+					else:
+						deferred.append(((target, fn, fargs), predicted))
+				if len(deferred) > 0:
+					self.condition.wait() # until a job completes and releases its budget
+				pending = deferred
+
+	# Create the callback of a job, which releases its budget and records observed memory
+	def _create_callback(self, target, predicted, writer):
+		def callback(return_val):
+			try:
+				res, observed = return_val.result()
+			except Exception as e:
+				writer.discard(e, target)
+			else:
+				with self.condition:
+					self.observations.append((target, predicted, observed))
+				writer.put(res)
+			finally:
+				with self.condition:
+					self.inUse -= predicted
+					self.running -= 1
+					self.condition.notify_all()
+		return callback
+
+	# Write predicted versus observed peak memory per job, and summarize it
+	def report(self):
+		outhandle = open(self.reportFile, 'w')
+		outhandle.write('Target\tPredictedMB\tObservedMB\n')
+		for target, predicted, observed in self.observations:
+			outhandle.write(target+'\t'+str(round(predicted/1048576.0, 3))+'\t'+str(round(observed/1048576.0, 3))+'\n')
+		outhandle.close()
+		if len(self.observations) > 0:
+			predicted = max([o[1] for o in self.observations]) / 1048576.0
+			observed = max([o[2] for o in self.observations]) / 1048576.0
+			out('Peak job memory: predicted '+str(round(predicted, 1))+' MB, observed '+str(round(observed, 1))+
+				' MB (budget '+str(round(self.budget/1048576.0, 1))+' MB) -> '+self.reportFile)
+
+# Buffer size (bytes) of the output files; the writer flushes them once per batch of results
+WRITE_BUFFER = 1 << 20
 
-# Maps each query sequence against a set of targets (itself)
-def mapper(target, queries, costs, submat, nodeTypes, priorCompletions):
+# Writes completed targets on a thread of its own, so that the pool's callbacks only queue results.
+# Results queued meanwhile are written as one batch, then the files are flushed; they are synced to
+# disk (fsync) at most every syncInterval seconds, and at the end. Submission reserves room for a
+# result first (reserve), so at most `capacity` results are in flight or waiting to be written.
+# The lag of each result (completion to written), the queue depth and the time submission waited
+# are reported in reportFile
+class ResultWriter():
+	def __init__(self, writeResult, handles, capacity, syncInterval, reportFile):
+		self.writeResult = writeResult
+		self.handles = handles
+		self.syncInterval = syncInterval
+		self.reportFile = reportFile
+		self.queue = queue.Queue()
+		self.room = threading.Semaphore(capacity)
+		self.capacity = capacity
+		self.error = None # the first error writing a result; re-raised by close
+		self.lags = [] # seconds, per result
+		self.stats = {'results': 0, 'failed': 0, 'batches': 0, 'flushes': 0, 'syncs': 0, 'maxBatch': 0, 'maxQueued': 0,
+				'submitWaits': 0, 'submitWaitTime': 0.0, 'writeTime': 0.0, 'syncTime': 0.0}
+		self.lastSync = time.time()
+		self.thread = threading.Thread(target=self._run, name='ResultWriter', daemon=True)
+		self.thread.start()
+
+	# Wait for room for one more result; called before submitting its job
+	def reserve(self):
+		if not self.room.acquire(blocking=False):
+			started = time.time()
+			self.room.acquire()
+			self.stats['submitWaits'] += 1
+			self.stats['submitWaitTime'] += time.time() - started
+
+	# Queue a completed result (never blocks)
+	def put(self, res):
+		self.queue.put((time.time(), res))
+
+	# Give back the room of a job which failed, so submission can't wait on it
+	def discard(self, error, target=None):
+		out(' --> '+('' if target is None else target+' ')+'[FAILED] '+type(error).__name__+': '+str(error))
+		self.stats['failed'] += 1
+		self.room.release()
+
+	# Write everything queued, then stop the thread and sync the files
+	def close(self):
+		self.queue.put(None)
+		self.thread.join()
+		self._sync()
+		if self.error is not None:
+			raise self.error
+
+	def _run(self):
+		while True:
+			batch = [self.queue.get()]
+			self.stats['maxQueued'] = max(self.stats['maxQueued'], self.queue.qsize() + 1)
+			while True:
+				try:
+					batch.append(self.queue.get_nowait())
+				except queue.Empty:
+					break
+			stopping = batch[-1] is None
+			batch = [item for item in batch if item is not None]
+			if len(batch) > 0:
+				self._write(batch)
+			if stopping:
+				return
+
+	def _write(self, batch):
+		started = time.time()
+		for queued, res in batch:
+			try:
+				if self.error is None:
+					self.writeResult(res)
+			except Exception as e: # keep releasing room, so that submission can't hang on the writer
+				self.error = e
+		try:
+			for handle in self.handles:
+				handle.flush()
+			self.stats['flushes'] += 1
+			if self.syncInterval > 0 and time.time() - self.lastSync >= self.syncInterval:
+				self._sync()
+		except (IOError, OSError) as e:
+			if self.error is None:
+				self.error = e
+		now = time.time()
+		self.stats['writeTime'] += now - started
+		self.stats['results'] += len(batch)
+		self.stats['batches'] += 1
+		self.stats['maxBatch'] = max(self.stats['maxBatch'], len(batch))
+		for queued, res in batch:
+			self.lags.append(now - queued)
+			self.room.release()
+
+	# Flush and sync the files to disk
+	def _sync(self):
+		started = time.time()
+		for handle in self.handles:
+			if not handle.closed:
+				handle.flush()
+				os.fsync(handle.fileno())
+		self.lastSync = time.time()
+		self.stats['syncs'] += 1
+		self.stats['syncTime'] += self.lastSync - started
+
+	# Write the writer's statistics, with percentiles of the lag (seconds), and summarize them
+	def report(self):
+		stats = dict(self.stats)
+		stats['capacity'] = self.capacity
+		if len(self.lags) > 0:
+			lags = numpy.array(self.lags)
+			for p in (50, 90, 99):
+				stats['lagP'+str(p)] = float(numpy.percentile(lags, p))
+			stats['lagMax'] = float(numpy.max(lags))
+			stats['lagMean'] = float(numpy.mean(lags))
+		outhandle = open(self.reportFile, 'w')
+		outhandle.write('Statistic\tValue\n')
+		for k in sorted(stats):
+			outhandle.write(k+'\t'+str(round(stats[k], 6))+'\n')
+		outhandle.close()
+		if len(self.lags) > 0:
+			out('Writer: '+str(stats['results'])+' results in '+str(stats['batches'])+' batches, lag p99 '+
+				str(round(stats['lagP99'] * 1000, 1))+' ms, submission waited '+str(round(stats['submitWaitTime'], 2))+
+				's -> '+self.reportFile)
+		if stats['failed'] > 0:
+			out('WARNING: '+str(stats['failed'])+' jobs failed; their targets are missing from the output')
+
+# The default start method of the workers: a forkserver where the platform has one
+def default_start_method():
+	if 'forkserver' in multiprocessing.get_all_start_methods():
+		return 'forkserver'
+	return 'spawn'
+
+# Multiprocessing context of the worker pools. With forkserver, workers are forked from a server
+# process which has imported the aligner and the script once, rather than each importing them again
+# (spawn) or copying the parent's threads and buffers (fork)
+def get_pool_context(method):
+	context = multiprocessing.get_context(method)
+	if method == 'forkserver':
+		context.set_forkserver_preload(['__main__', 'numpy', 'TreeSeqGlobalAlign'])
+	return context
+
+# Start the workers of a pool by giving each an empty job; returns the time (s) each job took to return
+def start_workers(executor, numWorkers):
+	started = time.time()
+	return [future.result() - started for future in [executor.submit(time.time) for k in range(numWorkers)]]
+
+# Report the time taken to import the modules, to read the input and to start the workers
+def report_startup(method, ready, workerTimes):
+	ms = lambda seconds: str(int(round(seconds * 1000))) + ' ms'
+	out('Startup: imports '+ms(IMPORTED - STARTED)+', input '+ms(ready - IMPORTED)+', '+str(len(workerTimes))+' workers ('+
+		method+') ready in '+ms(max(workerTimes))+', '+ms(sum(workerTimes) / len(workerTimes))+' each on average')
+
+# Runs a job in a worker and measures its peak resident memory above the worker's resident memory
+# at the start of the job (bytes)
+def measured_job(fn, fargs):
+	start = read_memory_status('VmRSS')
+	if reset_peak_memory():
+		res = fn(*fargs)
+		observed = read_memory_status('VmHWM') - start
+	else: # no per-job peak; fall back to the worker's lifetime peak
+		import resource
+		res = fn(*fargs)
+		observed = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		if platform.system() != 'Darwin': # reported in kilobytes except on macOS
+			observed *= 1024
+		observed -= start
+	return res, max(observed, 0)
+
+# Reset the peak resident memory (VmHWM) of this process; only possible on Linux
+def reset_peak_memory():
+	try:
+		with open('/proc/self/clear_refs', 'w') as handle:
+			handle.write('5')
+		return True
+	except (IOError, OSError):
+		return False
+
+# Read a memory field (in bytes) from the status of this process, 0 if not available
+def read_memory_status(field):
+	try:
+		for line in open('/proc/self/status'):
+			if line.startswith(field+':'):
+				return int(line.split()[1]) * 1024
+	except (IOError, OSError):
+		pass
+	return 0
+
+# Executes a parameter sweep, writing one score file (channel) per setting
+class SweepFactoryDriver(FactoryDriver):
+	def __init__(self, targets, queries, input_state, settings):
+		self.settings = settings
+		self.settingsFile, self.channelFiles = sweep_filenames(input_state.get_args()['o'], len(settings))
+		FactoryDriver.__init__(self, targets, queries, input_state)
+		self.grid = TreeSeqSweepAlign.SweepGrid(settings, self.nodeTypes)
+		self.write_settings()
+
+	# Sweep channels have no manifest, as they don't share one set of parameters
+	def write_manifest(self, args):
+		pass
+
+	# Completed targets are read from the first channel
+	def get_output_filename(self, args):
+		return self.channelFiles[0]
+
+	# Open one score file per setting
+	def open_output_buffers(self, args, openMode):
+		self.scorehandles = [open(fname, openMode, buffering=WRITE_BUFFER) for fname in self.channelFiles]
+		self.scorehandle = self.scorehandles[0]
+		self.alignhandle = None
+
+	# Write a table relating each channel (output file) to its setting
+	def write_settings(self):
+		outhandle = open(self.settingsFile, 'w')
+		outhandle.write('Channel\tgap\tgapopen\tmatrix\tfile\n')
+		for channel, setting in enumerate(self.settings):
+			outhandle.write('\t'.join([str(channel), str(setting['gap']), str(setting['gapopen']),
+						str(setting['matrix']), self.channelFiles[channel]]) + '\n')
+		outhandle.close()
+
+	# Get the function and arguments of the job aligning a target against the queries
+	def create_job(self, target, queryCompletions):
+		return sweep_mapper, (target, self.queries, self.grid, queryCompletions)
+
+	# Predict the peak memory (bytes) of a job, i.e. of its largest pair
+	def predict_job_memory(self, target, queryCompletions):
+		lengths = [len(q.seq) for q in self.queries if q.name not in queryCompletions]
+		if len(lengths) == 0:
+			return 0
+		return TreeSeqSweepAlign.predict_memory(len(target.seq), max(lengths), self.grid.size)
+
+	def get_output_handles(self):
+		return self.scorehandles
+
+	# Close all I/O buffers such as file handles
+	def close_output_buffers(self):
+		for handle in self.scorehandles:
+			handle.close()
+
+	# Write one row per channel for a completed target
+	def write_result(self, res):
+		target, results = res
+		results = sorted(results, key=lambda x: x[-1]) # sort by query (last item)
+		for channel, handle in enumerate(self.scorehandles):
+			if self.num_complete == 0: # for the first result, write headers
+				handle.write('\t' + '\t'.join([r[-1] for r in results]) + '\n')
+			scores = '\t'.join([str(None if r[0] is None else r[0][channel]) for r in results])
+			handle.write(target + '\t' + scores + '\n')
+		self.num_complete += 1
+		out(' --> ' + target + ' [OK] '+str(self.num_complete)+' of '+str(len(self.targets))) # print-out progress
+
+# Writes the pairs scoring at least a threshold as an edge list (target, query and score per line) rather
+# than a matrix; pairs which can't reach it are abandoned by the aligner. The targets completed are
+# recorded in <output>.targets.tab, as a target may have no edges
+class EdgeFactoryDriver(FactoryDriver):
+	# An edge list has no manifest, as it isn't a score matrix to update
+	def write_manifest(self, args):
+		pass
+
+	def get_output_filename(self, args):
+		return os.path.splitext(args['o'])[0] + '.targets.tab'
+
+	# Open the edge list, the list of targets completed and, if requested, the alignment file
+	def open_output_buffers(self, args, openMode):
+		FactoryDriver.open_output_buffers(self, args, openMode)
+		self.targethandle = open(self.get_output_filename(args), openMode, buffering=WRITE_BUFFER)
+
+	def get_output_handles(self):
+		return FactoryDriver.get_output_handles(self) + [self.targethandle]
+
+	def close_output_buffers(self):
+		FactoryDriver.close_output_buffers(self)
+		self.targethandle.close()
+
+	# Write the edges (and their alignments) of a completed target
+	def write_result(self, res):
+		target, results = res[0], res[1]
+		if len(res) > 2: # statistics of the job
+			self.add_job_stats(res[2])
+		results = sorted(results, key=lambda x: x[-1]) # sort by query (last item)
+		if self.num_complete == 0: # for the first result, write headers
+			self.scorehandle.write('Target\tQuery\tScore\n')
+		edges = [r for r in results if r[0] is not None and r[0] >= self.threshold]
+		for r in edges:
+			self.scorehandle.write(target + '\t' + r[-1] + '\t' + str(r[0]) + '\n')
+		if self.store is not None: # the scores aligned in full (rather than read from the store or abandoned)
+			self.store.add([(self.targetHashes[target], self.queryHashes[r[-1]], r[0]) for r in results if r[1] is not None])
+		if self.alignhandle is not None:
+			for r in edges:
+				if r[1] is not None:
+					self.alignhandle.write(target + '\t' + r[-1] + '\t' + r[1][0] + '\t' + r[1][1] + '\n')
+		self.targethandle.write(target + '\n')
+		self.num_complete += 1
+		out(' --> ' + target + ' [OK] '+str(len(edges))+' edges, '+str(self.num_complete)+' of '+str(len(self.targets))+
+			' at '+str(datetime.time(datetime.now()))) # print-out progress
+
+# Runs the jobs through a job queue (TreeSeqQueue) instead of a fixed pool: each target's queries are
+# split into chunks which the workers, the driver's own and any started on the queue later
+# (treesequence_worker.py), claim under leases. The driver writes each target once its chunks are done
+class QueueFactoryDriver(FactoryDriver):
+	def __init__(self, targets, queries, input_state):
+		FactoryDriver.__init__(self, targets, queries, input_state)
+		args = input_state.get_args()
+		self.queueFile = args['queue']
+		self.lease = args['lease']
+		self.chunkCells = args['chunkcells']
+
+	# Split the queries each target is aligned with into chunks of about chunkCells cells; a target with
+	# none to align has one empty chunk, so that its row is written
+	def create_chunks(self, queryCompletions):
+		chunks = []
+		for target in self.targets:
+			if target.name in self.priorCompletions:
+				continue
+			selected = self.get_selected(target)
+			names, cells = [], 0
+			for query in self.queries:
+				if query.name in queryCompletions or (selected is not None and query.name not in selected):
+					continue
+				names.append(query.name)
+				cells += len(target.seq) * len(query.seq)
+				if cells >= self.chunkCells:
+					chunks.append((target.name, names, cells))
+					names, cells = [], 0
+			if len(names) > 0 or len(chunks) == 0 or chunks[-1][0] != target.name:
+				chunks.append((target.name, names, cells))
+		return chunks
+
+	# Key of the run a queue holds: the settings, the sequences, whether queries are forced and the pairs selected
+	def queue_key(self):
+		sequences = [(s.name, sequence_hash(s)) for s in self.targets] + [None] + [(s.name, sequence_hash(s)) for s in self.queries]
+		selected = None
+		if self.selected is not None:
+			selected = sorted([(target, sorted(names)) for target, names in self.selected.items()])
+		options = [self.useWorkspace, self.compact, self.runs, self.forceQuery]
+		return hashlib.sha1((TreeSeqStore.params_key(self.costs, self.submat, self.nodeTypes) + repr(options) +
+					repr(sequences) + repr(selected)).encode()).hexdigest()
+
+	# Settings the workers align with
+	def queue_settings(self):
+		return {'costs': self.costs, 'submat': self.submat, 'nodeTypes': self.nodeTypes, 'useWorkspace': self.useWorkspace,
+			'compact': self.compact, 'runs': self.runs, 'lease': self.lease}
+
+	def start(self):
+		if self.forceQuery:
+			queryCompletions = []
+		else:
+			queryCompletions = self.priorCompletions
+		jobQueue = TreeSeqQueue.JobQueue(self.queueFile, create=True)
+		if jobQueue.initialize(self.queue_key(), self.queue_settings(), [(s.name, str(s.seq)) for s in self.targets],
+					[(s.name, str(s.seq)) for s in self.queries], self.create_chunks(queryCompletions)):
+			out('Queue '+self.queueFile+': '+str(jobQueue.get_counters()['chunks'])+' chunks')
+		else:
+			counters = jobQueue.get_counters()
+			out('Queue '+self.queueFile+' resumed: '+str(counters['done'])+' of '+str(counters['chunks'])+' chunks done')
+		ready = time.time()
+		executor = concurrent.futures.ProcessPoolExecutor(self.num_workers, mp_context=get_pool_context(self.startMethod))
+		report_startup(self.startMethod, ready, start_workers(executor, self.num_workers))
+		self.writer = ResultWriter(self.write_result, self.get_output_handles(), self.num_workers + self.writeQueue,
+					self.syncInterval, self.reportRoot + '.writer.tab')
+		try:
+			futures = [executor.submit(queue_worker, self.queueFile) for k in range(self.num_workers)]
+			pending = set([target.name for target in self.targets if target.name not in self.priorCompletions])
+			failed = set() # workers whose failure was reported
+			while len(pending) > 0:
+				running = [future for future in futures if not future.done()] # checked before the targets, so none is missed
+				for target in jobQueue.completed_targets():
+					if target in pending:
+						self.collect(jobQueue, target)
+						pending.remove(target)
+				for future in futures:
+					if future.done() and future not in failed and future.exception() is not None:
+						failed.add(future)
+						out('WARNING: a worker failed ('+type(future.exception()).__name__+': '+str(future.exception())+'); '+
+							str(len([f for f in futures if not f.done()]))+' of '+str(len(futures))+' left')
+				if len(pending) > 0 and len(running) == 0:
+					error = 'the queue\'s chunks are not all done' if len(failed) == 0 else str(list(failed)[0].exception())
+					raise IOError('No worker of this run is left, with '+str(len(pending))+' targets to complete ('+error+
+						'); the queue keeps the chunks done, run again (or join workers with treesequence_worker.py) to resume')
+				if len(pending) > 0:
+					time.sleep(TreeSeqQueue.POLL_INTERVAL)
+			chunks = sum([future.result() for future in futures])
+			executor.shutdown()
+			self.writer.close()
+			self.close_output_buffers()
+			self.writer.report()
+			self.report_job_stats()
+			counters = jobQueue.get_counters()
+			out('Queue: '+str(counters['chunks'])+' chunks by '+str(counters['workers'])+' workers ('+str(chunks)+' by this run\'s), '+
+				str(counters['reissued'])+' reissued after their lease expired')
+			jobQueue.close()
+			TreeSeqQueue.remove_queue(self.queueFile)
+			out('** Analysis Complete **')
+		except (KeyboardInterrupt, IOError) as e:
+			executor.shutdown()
+			self.writer.close() # keep the targets completed so far; the queue keeps the chunks
+			self.close_output_buffers()
+			jobQueue.close()
+			if isinstance(e, IOError):
+				raise
+
+	# Hand the results of a target's chunks to the writer as one row; queries which weren't aligned
+	# (completed as targets, or not selected) have no score
+	def collect(self, jobQueue, target):
+		results = []
+		for name, chunkResults, stats in jobQueue.get_results(target):
+			results += chunkResults
+			self.add_job_stats(stats)
+		aligned = set([r[-1] for r in results])
+		results += [[None,None,query.name] for query in self.queries if query.name not in aligned]
+		self.writer.reserve()
+		self.writer.put((target, results))
+
+# Claim chunks of a job queue and align them until every chunk is done, renewing the lease of the one
+# being aligned; run by the contraster's workers and by those joining the queue. Returns the chunks
+# this worker completed; a chunk interrupted is released, to be claimed again at once
+def queue_worker(fname):
+	jobQueue = TreeSeqQueue.JobQueue(fname)
+	settings = jobQueue.get_settings()
+	alignSettings = mapper_settings(settings['costs'], settings['submat'], settings['nodeTypes'], useWorkspace=settings['useWorkspace'],
+				compact=settings['compact'], runs=settings['runs'])
+	targets = {name: TreeSeqGlobalAlign.TreeSequence(name, seq) for name, seq in jobQueue.get_sequences('target').items()}
+	queries = {name: TreeSeqGlobalAlign.TreeSequence(name, seq) for name, seq in jobQueue.get_sequences('query').items()}
+	worker = socket.gethostname() + ':' + str(os.getpid())
+	completed = 0
+	try:
+		while True:
+			claimed = jobQueue.claim(worker, settings['lease'])
+			if claimed is None:
+				if jobQueue.remaining() == 0:
+					break
+				time.sleep(TreeSeqQueue.POLL_INTERVAL) # the chunks left are leased; one may expire
+				continue
+			chunk, target, names = claimed
+			renewal = TreeSeqQueue.LeaseRenewal(jobQueue, chunk, worker, settings['lease'])
+			try:
+				result = mapper(targets[target], [queries[name] for name in names], alignSettings, [])
+			except BaseException:
+				renewal.stop()
+				jobQueue.release(chunk, worker)
+				raise
+			renewal.stop()
+			if jobQueue.complete(chunk, worker, result):
+				completed += 1
+	finally:
+		jobQueue.close()
+	return completed
+
+# Get the settings table and the score file of each sweep channel for a given output file,
+# e.g. scores.tab -> scores.sweep.tab and scores.sweep0.tab, scores.sweep1.tab, ...
+def sweep_filenames(fname, numChannels):
+	root, ext = os.path.splitext(fname)
+	return root + '.sweep' + ext, [root + '.sweep' + str(channel) + ext for channel in range(numChannels)]
+
+# Maps each query sequence against a target under every setting of a sweep grid
+def sweep_mapper(target, queries, grid, priorCompletions):
+	results = []
+	for query in queries:
+		if query.name not in priorCompletions:
+			results.append(TreeSeqSweepAlign.NeedlemanWunschSweep(target, query, grid).prettify())
+		else:
+			results.append([None,None,query.name])
+	return target.name, results
+
+# The settings of mapper shared by the jobs of a run, as a dictionary; those not given are those of a
+# plain run:
+# If useWorkspace, the alignments share the worker's workspace, and queries are aligned in order of
+# length so that the buffers stay hot in cache
+# If instrument, the pairs are aligned by InstrumentedNeedlemanWunsch, counting their cells
+# If profileDir, the jobs are profiled, the statistics written there
+# If compact, the pairs are aligned in the compact layout (CompactNeedlemanWunsch)
+# If tiling, (processes, minimum cells), pairs of at least the minimum cells are aligned in the compact
+# layout tile by tile over up to that many processes, as many as the CPU budget of the pool allows; the
+# job holds a CPU of it meanwhile
+# If runs, the pairs are aligned over runs of C-nodes (RunNeedlemanWunsch)
+# If threshold, pairs whose score can't reach it are abandoned (ThresholdNeedlemanWunsch), their result
+# having no score
+# If tuner, a TreeSeqTuner.CostModel, each pair is aligned by the strategy it predicts fastest
+def mapper_settings(costs, submat, nodeTypes, **options):
+	settings = {'costs': costs, 'submat': submat, 'nodeTypes': nodeTypes, 'useWorkspace': False, 'instrument': False,
+		'profileDir': None, 'compact': False, 'tiling': None, 'runs': False, 'threshold': None, 'tuner': None}
+	for k in options:
+		if k not in settings:
+			raise TypeError('Unknown mapper setting: '+k)
+	settings.update(options)
+	return settings
+
+# Choose the aligner of a pair of the given lengths under mapper settings. The first which applies is
+# taken: tiling (of a pair of at least its minimum cells), threshold, tuner, instrument, runs, compact,
+# and the plain aligner otherwise. Returns its name, the tuner's strategy (None unless the tuner chose),
+# and a function creating it from the target, query and workspace
+def choose_aligner(settings, l1, l2):
+	costs, submat, nodeTypes = settings['costs'], settings['submat'], settings['nodeTypes']
+	tiling, tuner = settings['tiling'], settings['tuner']
+	if tiling is not None and (l1+1) * (l2+1) >= tiling[1]:
+		return 'tiled', None, lambda target, query, workspace: \
+			TreeSeqGlobalAlign.CompactNeedlemanWunsch(target, query, costs, submat, nodeTypes, workspace)
+	if settings['threshold'] is not None:
+		return 'threshold', None, lambda target, query, workspace: \
+			TreeSeqGlobalAlign.ThresholdNeedlemanWunsch(target, query, costs, submat, nodeTypes, workspace, settings['threshold'])
+	if tuner is not None:
+		strategy = tuner.choose(l1, l2)
+		return 'tuner', strategy, lambda target, query, workspace: \
+			TreeSeqTuner.create_aligner(strategy, target, query, costs, submat, nodeTypes)
+	aligner = ('plain', TreeSeqGlobalAlign.NeedlemanWunsch)
+	if settings['instrument']:
+		aligner = ('instrument', TreeSeqGlobalAlign.InstrumentedNeedlemanWunsch)
+	elif settings['runs']:
+		aligner = ('runs', TreeSeqGlobalAlign.RunNeedlemanWunsch)
+	elif settings['compact']:
+		aligner = ('compact', TreeSeqGlobalAlign.CompactNeedlemanWunsch)
+	return aligner[0], None, lambda target, query, workspace: aligner[1](target, query, costs, submat, nodeTypes, workspace)
+
+# Maps each query sequence against a set of targets (itself), under mapper settings (mapper_settings),
+# each pair by the aligner choose_aligner picks
+# If known, the scores of queries stored by an earlier run, which aren't aligned again
+# If selected, the names of the queries to align; the others have no score, as if completed
+def mapper(target, queries, settings, priorCompletions, known=None, selected=None):
 	results = [] # K => target, V => aligned queries 
+	stats = {}
+	tiling, threshold, tuner = settings['tiling'], settings['threshold'], settings['tuner']
+	if settings['runs']:
+		stats['runs'] = {'pairs': 0, 'runPairs': 0, 'cells': 0, 'blocks': 0}
+	if threshold is not None:
+		stats['threshold'] = {'pairs': 0, 'abandoned': 0, 'cells': 0, 'cellsFilled': 0, 'unsound': 0}
+	if tuner is not None:
+		stats['tuner'] = {'baseline': 0.0}
+	if settings['instrument']:
+		TreeSeqGlobalAlign.get_dp_stats(reset=True)
+	if tiling is not None:
+		TreeSeqGlobalAlign.set_tiling(tiling[0], tiling[1])
+		TreeSeqGlobalAlign.claim_cpus(1, 1)
+	if settings['profileDir'] is not None:
+		start_profiler()
+	workspace = None
+	if settings['useWorkspace']:
+		workspace = TreeSeqGlobalAlign.get_workspace()
+		startCounters = dict(workspace.counters)
+		queries = sorted(queries, key=lambda q: len(q.seq))
 	# get the gap and substitution matrix
 	for query in queries:
 		# Doesn't run the current query if it has already been run as a target (avoid duplicating effort)
-		if query.name not in priorCompletions:
-			NW = TreeSeqGlobalAlign.NeedlemanWunsch(target, query, costs, submat, nodeTypes)
+		if selected is not None and query.name not in selected: # not a pair asked for
+			results.append([None,None,query.name])
+		elif known is not None and query.name in known: # stored by an earlier run
+			results.append([known[query.name],None,query.name])
+		elif query.name not in priorCompletions:
+			l1, l2 = len(target.seq), len(query.seq)
+			name, strategy, create = choose_aligner(settings, l1, l2)
+			started = time.perf_counter()
+			NW = create(target, query, workspace)
+			if strategy is not None:
+				counters = stats['tuner']
+				for k, v in (('.pairs', 1), ('.predicted', tuner.predict(strategy, l1, l2)),
+						('.observed', time.perf_counter() - started)):
+					counters[strategy+k] = counters.get(strategy+k, 0) + v
+				counters['baseline'] += tuner.predict('plain', l1, l2)
 			#out(str(NW.scoreMat))
 			#out(str(NW.leftMat))
 			#out(str(NW.directionMat))
 			#out(str(NW.submat))
 			output = NW.prettify()
 			results.append(output)
+			if settings['runs'] and isinstance(NW, TreeSeqGlobalAlign.RunNeedlemanWunsch):
+				for k, v in (('pairs', 1), ('runPairs', int(NW.runs)), ('cells', NW.cells), ('blocks', NW.blocks)):
+					stats['runs'][k] += v
+			if threshold is not None:
+				filled, unsound = l2 * l1, 0
+				if isinstance(NW, TreeSeqGlobalAlign.ThresholdNeedlemanWunsch):
+					filled, unsound = l2 * NW.filledRows, int(not NW.is_sound())
+				for k, v in (('pairs', 1), ('abandoned', int(output[0] is None)), ('cells', l2 * l1),
+						('cellsFilled', filled), ('unsound', unsound)):
+					stats['threshold'][k] += v
+			del NW # free the matrices before the next pair is allocated
 		else:
 			#print(query.name+' already completed')
 			results.append([None,None,query.name])
-	return target.name, results
+	if workspace is not None:
+		stats['workspace'] = {k: workspace.counters[k] - startCounters.get(k, 0) for k in workspace.counters}
+	if settings['instrument']:
+		stats['dp'] = TreeSeqGlobalAlign.get_dp_stats(reset=True)
+	if tiling is not None:
+		TreeSeqGlobalAlign.close_tile_pool()
+		TreeSeqGlobalAlign.release_cpus(1)
+	if settings['profileDir'] is not None:
+		stop_profiler(settings['profileDir'])
+	return target.name, results, stats
+
+# Profiler of this worker process, enabled during its jobs only; its statistics accumulate over them
+_profiler = None
+
+def start_profiler():
+	global _profiler
+	if _profiler is None:
+		import cProfile # only imported when profiling
+		_profiler = cProfile.Profile()
+	_profiler.enable()
+
+# Stop profiling, writing the worker's statistics so far
+def stop_profiler(profileDir):
+	_profiler.disable()
+	_profiler.dump_stats(os.path.join(profileDir, 'worker-'+str(os.getpid())+'.pstats'))
+
+# Select the pairs meeting the conditions of the run (-pairs), as a dictionary of target name to the set
+# of query names it is aligned with; None if all pairs are
+def select_pairs(targets, queries, input_state):
+	if input_state.get_args().get('pairs') is None:
+		return None
+	predicates = [TreeSeqMetadata.parse_pair_predicate(text) for text in input_state.get_args()['pairs']]
+	metadata = input_state.get_metadata()
+	if metadata is None:
+		raise IOError('The dataset '+input_state.fname+' was compiled without metadata; give it with -meta')
+	unknown = len(set([s.name for s in targets + queries if s.name not in metadata]))
+	if unknown > 0:
+		out(str(unknown)+' sequences have no metadata; they are in no pair')
+	selection = TreeSeqMetadata.PairSelection(predicates, metadata, [query.name for query in queries])
+	return {target.name: set(selection.select(target.name)) for target in targets}
+
+# Check the sequences before any worker starts (TreeSeqPreflight): their residues against the node types
+# and the matrices of the run, and their trees. Reports their lengths, depths and the DP cells of all
+# pairs; if any sequence is at fault, they are listed in <output>.preflight.tab and the run is refused
+def preflight(targets, queries, input_state, settings=None):
+	nodeTypes = input_state.get_nodetypes()
+	if settings is None:
+		matrices = [TreeSeqDataset.completed_matrix(input_state.get_submatrix(), input_state.get_args()['gap'])]
+	else:
+		matrices = [TreeSeqDataset.completed_matrix(setting['submat'], setting['gap']) for setting in settings]
+	gapResidues = set.intersection(*[set([pair[0] for pair in submat if pair[1] == '-']) for submat in matrices])
+	scans = [('Targets', TreeSeqPreflight.Preflight(targets, nodeTypes, gapResidues))]
+	if queries is not targets:
+		scans.append(('Queries', TreeSeqPreflight.Preflight(queries, nodeTypes, gapResidues)))
+	for label, scan in scans:
+		out(label+': '+str(len(scan.names))+' sequences, '+scan.summarize())
+		if len(scan.empty) > 0:
+			out('  '+str(len(scan.empty))+' empty, aligned as gaps throughout: '+', '.join(scan.empty[:5]))
+	out('Pre-flight: '+str(int(scans[0][1].lengths.sum()) * int(scans[-1][1].lengths.sum()))+' DP cells in all pairs')
+	problems = [problem for label, scan in scans for problem in scan.problems]
+	for submat in matrices:
+		for r1, r2 in TreeSeqPreflight.missing_pairs(scans[0][1].residues, scans[-1][1].residues, nodeTypes, submat):
+			problems.append(('(matrix)', 'no substitution score for '+r1+' against '+r2))
+	if len(problems) == 0:
+		return
+	fname = os.path.splitext(input_state.get_args()['o'])[0] + '.preflight.tab'
+	outhandle = open(fname, 'w')
+	outhandle.write('Record\tProblem\n')
+	for name, problem in problems:
+		outhandle.write(name+'\t'+problem+'\n')
+	outhandle.close()
+	for name, problem in problems[:10]:
+		out('  '+name+': '+problem)
+	raise IOError('Pre-flight found '+str(len(problems))+' problems in '+str(len(set([p[0] for p in problems])))+
+		' records; nothing was aligned. All are listed in '+fname)
+
+# Report the pairs the run would align and their cells, the cost of aligning them, without aligning
+def dry_run(targets, queries, input_state):
+	selected = select_pairs(targets, queries, input_state)
+	lengths = {query.name: len(query.seq) for query in queries}
+	allCells = sum([len(target.seq) for target in targets]) * sum(lengths.values())
+	pairs, cells, largest = 0, 0, (0, 0, 0) # the cells and lengths of the largest pair
+	for target in targets:
+		names = lengths.keys() if selected is None else selected[target.name]
+		targetCells = [(len(target.seq) * lengths[name], len(target.seq), lengths[name]) for name in names]
+		pairs += len(targetCells)
+		cells += sum([c[0] for c in targetCells])
+		largest = max([largest] + targetCells)
+	allPairs = len(targets) * len(queries)
+	out('Dry run: '+str(pairs)+' of '+str(allPairs)+' pairs selected ('+str(round(100.0 * pairs / max(allPairs, 1), 1))+
+		'%), '+str(cells)+' of '+str(allCells)+' cells ('+str(round(100.0 * cells / max(allCells, 1), 1))+'%)')
+	out('Largest pair: '+str(largest[0])+' cells, predicted peak '+
+		str(round(TreeSeqGlobalAlign.predict_memory(largest[1], largest[2]) / 1048576.0, 1))+' MB')
+
+# Split a list of jobs into chunks of about the given size
+def chunk_list(items, size):
+	size = max(1, int(size))
+	return [items[k:k+size] for k in range(0, len(items), size)]
 
 if __name__ == '__main__':
 	try:
@@ -368,8 +1589,20 @@ if __name__ == '__main__':
 			queries = targets
 		else:
 			queries = input_state.parse_fasta(input_state.fname2)
-		driver = FactoryDriver(targets, queries, input_state)
-		driver.start() # start the factory
+		settings = input_state.get_sweep_settings()
+		preflight(targets, queries, input_state, settings)
+		if args['dryrun']:
+			dry_run(targets, queries, input_state)
+		elif settings is None and args['threshold'] is not None:
+			driver = EdgeFactoryDriver(targets, queries, input_state)
+		elif settings is None and args['queue'] is not None:
+			driver = QueueFactoryDriver(targets, queries, input_state)
+		elif settings is None:
+			driver = FactoryDriver(targets, queries, input_state)
+		else:
+			driver = SweepFactoryDriver(targets, queries, input_state, settings)
+		if not args['dryrun']:
+			driver.start() # start the factory
 
 	except (IOError, KeyboardInterrupt, IndexError) as e:
 		out(str(e)+'\n')
\ No newline at end of file
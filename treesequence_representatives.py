@@ -0,0 +1,205 @@
+import concurrent.futures, random, os
+import numpy
+import TreeSeqGlobalAlign, TreeSeqLibrary
+from treesequence_pairwise_contrasterV2 import ArgumentValidator, CommandLineParser, InputWrapperState, get_pool_context, out, \
+	chunk_list
+
+# Helper-class to parse input arguments; the contraster's parameters plus those of the reduction
+class RepresentativeCommandLineParser(CommandLineParser):
+	runModes = False # the contraster's run modes (CommandLineParser.runModes) are rejected
+
+	def __init__(self):
+		CommandLineParser.__init__(self)
+		self.parser.description = 'Script to align every sequence against k representative sequences'
+
+	# Create parameters to be used throughout the application
+	def _init_params(self):
+		CommandLineParser._init_params(self)
+		param_rep = self.parser.add_argument_group('Representative Reduction')
+		param_rep.add_argument('-k', metavar='INT', default=10, type=int,
+					help='Number of representatives [10]')
+		param_rep.add_argument('-first', metavar='STR', default=None,
+					help='Name of the first representative [random]')
+		param_rep.add_argument('-sample', metavar='INT', default=1000, type=int,
+					help='Number of random pairs aligned exhaustively to measure the estimation error [1000]')
+		param_rep.add_argument('-seed', metavar='INT', default=0, type=int,
+					help='Random seed [0]')
+		param_rep.add_argument('--estimate', action='store_const', const=True, default=False,
+					help='Also write the estimated N x N score matrix')
+
+# Validates user-provided command-line arguments
+class RepresentativeArgumentValidator(ArgumentValidator):
+	def check_args(self):
+		return ArgumentValidator.check_args(self) and self.test_representatives()
+
+	# Test the reduction parameters
+	def test_representatives(self):
+		if self.args['k'] < 1:
+			raise IOError('>= 1 representatives must be selected')
+		if self.args['sample'] < 0:
+			raise IOError('The error sample must be >= 0 pairs')
+		if self.args['f2'] is not None or self.args['sweep'] or self.args['a']:
+			raise IOError('A reduction runs over one fasta file (no -f2, -sweep or -a)')
+		return True
+
+# Reduces an all-vs-all comparison to N x k alignments. Representatives are picked by farthest-point
+# selection: each next one is the sequence farthest from all those already picked, using the distance
+# d(i,j) = (S(i,i) + S(j,j))/2 - S(i,j) over NeedlemanWunsch scores S. The N x k distances then bound
+# every other distance by the triangle inequality, which gives the estimated scores, and each sequence
+# is assigned to the cluster of its nearest representative
+class RepresentativeDriver():
+	def __init__(self, sequences, input_state):
+		args = input_state.get_args()
+		self.sequences = sequences
+		self.names = [s.name for s in sequences]
+		self.costs = input_state.get_penalties()
+		self.submat = input_state.get_submatrix()
+		if args['nodeTypes'] is None:
+			self.nodeTypes = TreeSeqGlobalAlign.default_nodetypes()
+		else:
+			self.nodeTypes = TreeSeqGlobalAlign.parse_nodetypes(args['nodeTypes'])
+		self.num_workers = args['n']
+		self.startMethod = args['start']
+		self.useWorkspace = args['workspace']
+		self.k = min(args['k'], len(sequences))
+		self.first = args['first']
+		self.sample = args['sample']
+		self.random = random.Random(args['seed'])
+		self.writeEstimate = args['estimate']
+		self.fname = args['o']
+		self.base = os.path.splitext(args['o'])[0]
+		self.num_aligned = 0
+
+	# Align a list of (target, query) pairs over the pool, returning the scores in order
+	def align_pairs(self, pairs):
+		chunks = chunk_list(pairs, len(pairs) / (self.num_workers * 4.0))
+		futures = [self.executor.submit(TreeSeqLibrary.align_pairs, chunk, self.costs, self.submat, self.nodeTypes,
+							self.useWorkspace) for chunk in chunks]
+		scores = []
+		for future in futures:
+			scores.extend(future.result())
+		self.num_aligned += len(pairs)
+		return numpy.array(scores, dtype=numpy.float64)
+
+	# Run the reduction and write its outputs
+	def start(self):
+		self.executor = concurrent.futures.ProcessPoolExecutor(self.num_workers, mp_context=get_pool_context(self.startMethod))
+		try:
+			self.select_representatives()
+			self.assign_clusters()
+			self.write_matrix()
+			self.write_clusters()
+			if self.writeEstimate:
+				self.write_estimate()
+			if self.sample > 0:
+				self.report_error()
+			self.executor.shutdown()
+		except KeyboardInterrupt:
+			self.executor.shutdown()
+			raise
+		n = len(self.sequences)
+		out(str(self.num_aligned)+' alignments instead of '+str(n*n)+' ('+
+			str(round(100.0*self.num_aligned/(n*n), 2))+'%)')
+		out('** Analysis Complete **')
+
+	# Farthest-point selection of the representatives, aligning every sequence against each as it's picked
+	def select_representatives(self):
+		n = len(self.sequences)
+		self.selfScores = self.align_pairs([(s, s) for s in self.sequences])
+		if self.first is None:
+			current = self.random.randrange(n)
+		elif self.first in self.names:
+			current = self.names.index(self.first)
+		else:
+			raise IOError('First representative '+self.first+' not found')
+		self.representatives = []
+		self.scores = numpy.zeros((n, self.k)) # S(sequence, representative)
+		self.distances = numpy.zeros((n, self.k))
+		minDistance = numpy.full(n, numpy.inf)
+		for r in range(self.k):
+			self.representatives.append(current)
+			rep = self.sequences[current]
+			self.scores[:, r] = self.align_pairs([(s, rep) for s in self.sequences])
+			self.distances[:, r] = (self.selfScores + self.selfScores[current]) / 2.0 - self.scores[:, r]
+			minDistance = numpy.minimum(minDistance, self.distances[:, r])
+			minDistance[self.representatives] = -numpy.inf
+			out(' --> representative '+str(r+1)+' of '+str(self.k)+': '+rep.name+
+				' (farthest remaining at '+str(round(float(numpy.max(minDistance)), 3))+')')
+			current = int(numpy.argmax(minDistance))
+
+	# Assign each sequence to its nearest representative
+	def assign_clusters(self):
+		self.clusters = numpy.argmin(self.distances, axis=1)
+
+	# Estimated distances of rows i against all sequences: the midpoint of the triangle-inequality bounds
+	def estimate_distances(self, i):
+		lower = numpy.max(numpy.abs(self.distances[i] - self.distances), axis=1)
+		upper = numpy.min(self.distances[i] + self.distances, axis=1)
+		return (lower + upper) / 2.0
+
+	# Estimated scores of row i against all sequences
+	def estimate_scores(self, i):
+		estimate = (self.selfScores[i] + self.selfScores) / 2.0 - self.estimate_distances(i)
+		estimate[i] = self.selfScores[i]
+		return estimate
+
+	# Write the N x k score matrix, in the contraster's format
+	def write_matrix(self):
+		outhandle = open(self.fname, 'w')
+		outhandle.write('\t' + '\t'.join([self.names[r] for r in self.representatives]) + '\n')
+		for i, name in enumerate(self.names):
+			outhandle.write(name + '\t' + '\t'.join([str(v) for v in self.scores[i]]) + '\n')
+		outhandle.close()
+
+	# Write the cluster (nearest representative) of each sequence
+	def write_clusters(self):
+		outhandle = open(self.base + '.clusters.tab', 'w')
+		outhandle.write('Sequence\tRepresentative\tDistance\tSelfScore\n')
+		for i, name in enumerate(self.names):
+			r = self.clusters[i]
+			outhandle.write(name+'\t'+self.names[self.representatives[r]]+'\t'+str(self.distances[i, r])+'\t'+
+					str(self.selfScores[i])+'\n')
+		outhandle.close()
+
+	# Write the estimated N x N score matrix, one row at a time
+	def write_estimate(self):
+		outhandle = open(self.base + '.estimated.tab', 'w')
+		order = numpy.argsort(self.names) # columns sorted by name, as by the contraster
+		outhandle.write('\t' + '\t'.join([self.names[j] for j in order]) + '\n')
+		for i, name in enumerate(self.names):
+			outhandle.write(name + '\t' + '\t'.join([str(v) for v in self.estimate_scores(i)[order]]) + '\n')
+		outhandle.close()
+
+	# Align a random sample of pairs exhaustively and report the error of the estimated scores
+	def report_error(self):
+		n = len(self.sequences)
+		pairs = []
+		for s in range(self.sample):
+			i, j = self.random.randrange(n), self.random.randrange(n)
+			pairs.append((i, j))
+		exact = self.align_pairs([(self.sequences[i], self.sequences[j]) for i, j in pairs])
+		estimate = numpy.array([self.estimate_scores(i)[j] for i, j in pairs])
+		outhandle = open(self.base + '.error.tab', 'w')
+		outhandle.write('Target\tQuery\tExact\tEstimate\n')
+		for (i, j), e, g in zip(pairs, exact, estimate):
+			outhandle.write(self.names[i]+'\t'+self.names[j]+'\t'+str(e)+'\t'+str(g)+'\n')
+		outhandle.close()
+		error = estimate - exact
+		out('Estimation error over '+str(len(pairs))+' sampled pairs: mean absolute '+
+			str(round(float(numpy.mean(numpy.abs(error))), 4))+', RMS '+
+			str(round(float(numpy.sqrt(numpy.mean(error ** 2))), 4))+', correlation '+
+			str(round(float(numpy.corrcoef(exact, estimate)[0, 1]), 4)))
+
+if __name__ == '__main__':
+	try:
+		args = RepresentativeCommandLineParser().parse_args()
+		RepresentativeArgumentValidator(args) # test all arguments are correct
+
+		input_state = InputWrapperState(args)
+		input_state.assign_matrix() # parse in-built or custom matrix
+		sequences = input_state.parse_fasta(input_state.fname)
+		driver = RepresentativeDriver(sequences, input_state)
+		driver.start()
+
+	except (IOError, KeyboardInterrupt, IndexError) as e:
+		out(str(e)+'\n')
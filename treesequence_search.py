@@ -0,0 +1,91 @@
+import time
+import TreeSeqGlobalAlign, TreeSeqSearch
+from treesequence_pairwise_contrasterV2 import ArgumentValidator, CommandLineParser, InputWrapperState, out
+
+# Helper-class to parse input arguments; the contraster's parameters plus those of the search
+class SearchCommandLineParser(CommandLineParser):
+	runModes = False # the contraster's run modes (CommandLineParser.runModes) are rejected
+
+	def __init__(self):
+		CommandLineParser.__init__(self)
+		self.parser.description = 'Script to index a sequence database (--build, -f database) or to search ' +\
+			'it for the subtrees best matching each query (-f queries)'
+
+	# Create parameters to be used throughout the application
+	def _init_params(self):
+		CommandLineParser._init_params(self)
+		param_search = self.parser.add_argument_group('Subtree Search')
+		param_search.add_argument('-index', metavar='DIR', required=True,
+					help='Subtree index directory [na]')
+		param_search.add_argument('--build', action='store_const', const=True, default=False,
+					help='Build the index from the fasta file, rather than searching it')
+		param_search.add_argument('-k', metavar='INT', default=12, type=int,
+					help='Seed (k-mer) length, when building [12]')
+		param_search.add_argument('-band', metavar='INT', default=4, type=int,
+					help='Subtrees rooted within this many nodes of a seed diagonal are aligned [4]')
+		param_search.add_argument('-minseeds', metavar='INT', default=3, type=int,
+					help='Seeds required on a diagonal to align around it [3]')
+		param_search.add_argument('-maxocc', metavar='INT', default=5000, type=int,
+					help='Seeds occurring more often in the database are skipped [5000]')
+		param_search.add_argument('-candidates', metavar='INT', default=50, type=int,
+					help='Maximum number of diagonals aligned around per query [50]')
+		param_search.add_argument('-ratio', metavar='FLOAT', default=2.0, type=float,
+					help='Maximum length ratio between the query and an aligned subtree [2]')
+		param_search.add_argument('-top', metavar='INT', default=10, type=int,
+					help='Number of sequences reported per query [10]')
+
+# Validates user-provided command-line arguments
+class SearchArgumentValidator(ArgumentValidator):
+	def check_args(self):
+		return ArgumentValidator.check_args(self) and self.test_search()
+
+	# Test the search parameters
+	def test_search(self):
+		if self.args['f2'] is not None or self.args['sweep'] or self.args['a'] or self.args['s'] != 'alignment':
+			raise IOError('A search takes one fasta file and reports alignment scores (no -f2, -sweep, -a or -s)')
+		if min(self.args['k'], self.args['minseeds'], self.args['candidates'], self.args['top']) < 1:
+			raise IOError('-k, -minseeds, -candidates and -top must be >= 1')
+		if self.args['band'] < 0 or self.args['ratio'] < 1:
+			raise IOError('The band must be >= 0 and the length ratio >= 1')
+		return True
+
+if __name__ == '__main__':
+	try:
+		args = SearchCommandLineParser().parse_args()
+		SearchArgumentValidator(args) # test all arguments are correct
+
+		input_state = InputWrapperState(args)
+		input_state.assign_matrix() # parse in-built or custom matrix
+		records = input_state.parse_fasta(input_state.fname)
+		if args['nodeTypes'] is None:
+			nodeTypes = TreeSeqGlobalAlign.default_nodetypes()
+		else:
+			nodeTypes = TreeSeqGlobalAlign.parse_nodetypes(args['nodeTypes'])
+
+		if args['build']:
+			started = time.time()
+			index = TreeSeqSearch.SubtreeIndex.build(records, args['k'], nodeTypes)
+			index.save(args['index'])
+			out('Indexed '+str(len(index.kmerKeys))+' seeds and '+str(len(index.treeHashes))+' subtrees of '+
+				str(len(records))+' sequences in '+str(round(time.time() - started, 2))+'s')
+		else:
+			index = TreeSeqSearch.SubtreeIndex.load(args['index'])
+			costs, submat = input_state.get_penalties(), input_state.get_submatrix()
+			workspace = TreeSeqGlobalAlign.get_workspace()
+			outhandle = open(args['o'], 'w')
+			outhandle.write('Query\tSubject\tStart\tEnd\tScore\tSeeds\tExact\n')
+			for query in records:
+				started = time.time()
+				results, aligned = index.search(query, costs, submat, args['band'], args['minseeds'], args['maxocc'],
+								args['candidates'], args['ratio'], args['top'], workspace)
+				for name, start, end, score, seeds, exact in results:
+					outhandle.write('\t'.join([query.name, name, str(start), str(end), str(score), str(seeds),
+								str(exact)]) + '\n')
+				outhandle.flush()
+				out(' --> ' + query.name + ' [OK] '+str(len(results))+' hits, '+str(aligned)+' alignments in '+
+					str(round(time.time() - started, 3))+'s')
+			outhandle.close()
+			out('** Search Complete **')
+
+	except (IOError, KeyboardInterrupt, IndexError) as e:
+		out(str(e)+'\n')
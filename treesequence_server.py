@@ -0,0 +1,315 @@
+import asyncio, concurrent.futures, json, os, signal, socket, time
+import numpy
+import TreeSeqDataset, TreeSeqGlobalAlign, TreeSeqLibrary, TreeSeqPreflight
+from treesequence_pairwise_contrasterV2 import ArgumentValidator, CommandLineParser, InputWrapperState, get_pool_context, \
+	report_startup, out
+
+# Helper-class to parse input arguments; the contraster's parameters plus those of the server
+class ServerCommandLineParser(CommandLineParser):
+	runModes = False # the contraster's run modes (CommandLineParser.runModes) are rejected
+
+	def __init__(self):
+		CommandLineParser.__init__(self)
+		self.parser.description = 'Server scoring query sequences against a database (-f) on demand'
+
+	# Create parameters to be used throughout the application
+	def _init_params(self):
+		CommandLineParser._init_params(self)
+		param_srv = self.parser.add_argument_group('Server')
+		param_srv.add_argument('-socket', metavar='FILE', default=None,
+					help='Unix socket to listen on [na]')
+		param_srv.add_argument('-port', metavar='INT', default=None, type=int,
+					help='Localhost TCP port to listen on, if no socket [na]')
+		param_srv.add_argument('-batch', metavar='INT', default=16, type=int,
+					help='Maximum number of requests coalesced into one batch [16]')
+		param_srv.add_argument('-window', metavar='MS', default=5.0, type=float,
+					help='Time to wait for more requests to coalesce with the first of a batch [5]')
+		param_srv.add_argument('-chunk', metavar='INT', default=0, type=int,
+					help='Database sequences per job, and per streamed reply [database / (4 x workers)]')
+
+# Validates user-provided command-line arguments
+class ServerArgumentValidator(ArgumentValidator):
+	def check_args(self):
+		return ArgumentValidator.check_args(self) and self.test_server()
+
+	# Test the server has one address and only computes what it serves
+	def test_server(self):
+		if (self.args['socket'] is None) == (self.args['port'] is None):
+			raise IOError('Either a Unix socket (-socket) or a localhost port (-port) must be given')
+		if self.args['f2'] is not None or self.args['sweep'] or self.args['a'] or self.args['s'] != 'alignment':
+			raise IOError('The server only scores alignments against one database (no -f2, -sweep, -a or -s)')
+		if self.args['batch'] < 1 or self.args['window'] < 0 or self.args['chunk'] < 0:
+			raise IOError('The batch size must be >= 1, the window and chunk >= 0')
+		return True
+
+# The database and costs, per worker process; loaded once, when the worker starts
+_database = None
+
+# Worker initializer: keep the database and prepare its sequences in the worker's workspace, so that
+# requests only pay for the alignments themselves
+def load_database(sequences, costs, submat, nodeTypes):
+	global _database
+	signal.signal(signal.SIGINT, signal.SIG_IGN) # the server shuts the pool down on an interrupt
+	_database = {'sequences': sequences, 'costs': costs, 'submat': submat, 'nodeTypes': nodeTypes}
+	workspace = TreeSeqGlobalAlign.get_workspace()
+	completed = workspace.get_submatrix(submat, costs['gap'])
+	for record in sequences:
+		workspace.get_sequence(record)
+		workspace.get_ta_dictionary(record.seq, nodeTypes, completed, costs['gap'])
+
+# Align each query of a batch against the database sequences [start, stop), one row of scores per
+# query; the row of a query which fails to align is its error, so the others are still scored
+def score_block(queries, start, stop):
+	workspace = TreeSeqGlobalAlign.get_workspace()
+	rows = []
+	for query in queries:
+		scores = []
+		try:
+			for record in _database['sequences'][start:stop]:
+				NW = TreeSeqGlobalAlign.NeedlemanWunsch(query, record, _database['costs'], _database['submat'],
+									_database['nodeTypes'], workspace)
+				scores.append(float(NW.get_top_score()))
+				del NW
+		except Exception as e:
+			scores = type(e).__name__+': '+str(e)
+		rows.append(scores)
+	return rows
+
+# A request in flight: its query, and the queue its replies are streamed through
+class Request():
+	def __init__(self, rid, query):
+		self.rid = rid
+		self.query = query
+		self.replies = asyncio.Queue()
+		self.received = time.time()
+
+# Serves newline-delimited JSON requests, {"id": .., "name": .., "seq": ..}, each answered by lines of
+# {"id": .., "scores": [[database name, score], ...]} as the database chunks complete, then
+# {"id": .., "done": true, "latency": seconds, "batch": requests in the batch}. {"cmd": "stats"} is
+# answered with latency percentiles. Concurrent requests are coalesced into batches, so each job
+# aligns several queries against one chunk of the database
+class AlignmentServer():
+	def __init__(self, sequences, input_state):
+		args = input_state.get_args()
+		self.sequences = TreeSeqLibrary.as_sequences(sequences)
+		self.costs = input_state.get_penalties()
+		self.submat = input_state.get_submatrix()
+		if args['nodeTypes'] is None:
+			self.nodeTypes = TreeSeqGlobalAlign.default_nodetypes()
+		else:
+			self.nodeTypes = TreeSeqGlobalAlign.parse_nodetypes(args['nodeTypes'])
+		self.alphabet = set([c for pair in self.submat.keys() for c in pair])
+		self.completed = TreeSeqDataset.completed_matrix(self.submat, self.costs['gap']) # with flipped and gap scores
+		self.gapResidues = set([pair[0] for pair in self.completed if pair[1] == '-'])
+		self.residues = set([residue for record in self.sequences for residue in record.seq]) # of the database
+		self.num_workers = args['n']
+		self.startMethod = args['start']
+		self.socket = args['socket']
+		self.port = args['port']
+		self.batchSize = args['batch']
+		self.window = args['window'] / 1000.0
+		chunk = args['chunk']
+		if chunk == 0:
+			chunk = -(-len(self.sequences) // (self.num_workers * 4))
+		self.chunks = [(start, min(start + chunk, len(self.sequences))) for start in range(0, len(self.sequences), chunk)]
+		self.latencies = [] # seconds, per completed request
+		self.batches = 0
+		self.executor = None
+
+	# Start the warm pool, then serve until interrupted
+	def start(self):
+		started = time.time()
+		self.executor = concurrent.futures.ProcessPoolExecutor(self.num_workers, mp_context=get_pool_context(self.startMethod),
+								initializer=load_database, initargs=(self.sequences, self.costs, self.submat, self.nodeTypes))
+		workerTimes = []
+		for future in [self.executor.submit(score_block, [], 0, 0) for k in range(self.num_workers)]:
+			future.result() # wait for the workers to load the database
+			workerTimes.append(time.time() - started)
+		report_startup(self.startMethod, started, workerTimes)
+		try:
+			asyncio.run(self.serve())
+		except KeyboardInterrupt:
+			pass
+		finally:
+			self.executor.shutdown()
+			if self.socket is not None and os.path.exists(self.socket):
+				os.remove(self.socket)
+			out(self.format_stats(self.get_stats()))
+
+	async def serve(self):
+		self.pending = asyncio.Queue()
+		if self.socket is not None:
+			server = await asyncio.start_unix_server(self.handle_client, path=self.socket)
+			out('Listening on '+self.socket)
+		else:
+			server = await asyncio.start_server(self.handle_client, '127.0.0.1', self.port)
+			out('Listening on 127.0.0.1:'+str(self.port))
+		batcher = asyncio.ensure_future(self.batcher())
+		try:
+			async with server:
+				await server.serve_forever()
+		finally:
+			batcher.cancel()
+
+	# Read the requests of a connection, one per line, streaming the replies of each before the next
+	async def handle_client(self, reader, writer):
+		try:
+			while True:
+				line = await reader.readline()
+				if len(line) == 0:
+					break
+				try:
+					message = json.loads(line)
+				except ValueError:
+					await self.reply(writer, {'error': 'Invalid JSON'})
+					continue
+				if not isinstance(message, dict):
+					await self.reply(writer, {'error': 'A request must be a JSON object'})
+					continue
+				if message.get('cmd') == 'stats':
+					await self.reply(writer, self.get_stats())
+					continue
+				request, error = self.create_request(message)
+				if request is None:
+					await self.reply(writer, {'id': message.get('id'), 'error': error})
+					continue
+				self.pending.put_nowait(request)
+				while True:
+					reply = await request.replies.get()
+					await self.reply(writer, reply)
+					if 'done' in reply:
+						break
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			writer.close()
+
+	async def reply(self, writer, message):
+		writer.write((json.dumps(message) + '\n').encode())
+		await writer.drain()
+
+	# Check a request's query can be aligned with the loaded matrix and database, as the contraster's
+	# pre-flight checks its sequences: a tree of known node types, and a score against every residue
+	def create_request(self, message):
+		if not isinstance(message.get('seq'), str) or len(message['seq']) == 0:
+			return None, 'A request needs a sequence (seq)'
+		unknown = set(message['seq']) - self.alphabet
+		if len(unknown) > 0:
+			return None, 'Residues not in the substitution matrix: '+''.join(sorted(unknown))
+		rid = message.get('id')
+		query = TreeSeqGlobalAlign.TreeSequence(str(message.get('name', rid)), message['seq'])
+		scan = TreeSeqPreflight.Preflight([query], self.nodeTypes, self.gapResidues)
+		problems = [problem for name, problem in scan.problems]
+		problems += ['no substitution score for '+r1+' against '+r2 for r1, r2 in
+				TreeSeqPreflight.missing_pairs(scan.residues, self.residues, self.nodeTypes, self.completed)]
+		if len(problems) > 0:
+			return None, 'Invalid sequence: '+'; '.join(problems)
+		return Request(rid, query), None
+
+	# Coalesce pending requests: the first waits up to the window for others to join its batch
+	async def batcher(self):
+		loop = asyncio.get_running_loop()
+		while True:
+			batch = [await self.pending.get()]
+			deadline = loop.time() + self.window
+			while len(batch) < self.batchSize:
+				try:
+					batch.append(self.pending.get_nowait())
+					continue
+				except asyncio.QueueEmpty:
+					pass
+				timeout = deadline - loop.time()
+				if timeout <= 0:
+					break
+				try:
+					batch.append(await asyncio.wait_for(self.pending.get(), timeout))
+				except asyncio.TimeoutError:
+					break
+			asyncio.ensure_future(self.run_batch(batch))
+
+	# Submit one job per database chunk for the whole batch, streaming each chunk's scores to every
+	# request as it completes. A request whose query fails is answered with its error at once; the
+	# others carry on
+	async def run_batch(self, batch):
+		loop = asyncio.get_running_loop()
+		self.batches += 1
+		queries = [request.query for request in batch]
+
+		async def job(start, stop):
+			rows = await loop.run_in_executor(self.executor, score_block, queries, start, stop)
+			return start, stop, rows
+
+		failed = set() # requests answered with an error
+		try:
+			for future in asyncio.as_completed([job(start, stop) for start, stop in self.chunks]):
+				start, stop, rows = await future
+				names = [record.name for record in self.sequences[start:stop]]
+				for request, row in zip(batch, rows):
+					if request in failed:
+						continue
+					if isinstance(row, str):
+						failed.add(request)
+						request.replies.put_nowait({'id': request.rid, 'error': row, 'done': True})
+					else:
+						request.replies.put_nowait({'id': request.rid, 'scores': list(zip(names, row))})
+		except Exception as e:
+			for request in batch:
+				if request not in failed:
+					request.replies.put_nowait({'id': request.rid, 'error': str(e), 'done': True})
+			return
+		now = time.time()
+		for request in [request for request in batch if request not in failed]:
+			latency = now - request.received
+			self.latencies.append(latency)
+			request.replies.put_nowait({'id': request.rid, 'done': True, 'latency': round(latency, 6),
+							'batch': len(batch)})
+
+	# Latency percentiles (ms) of the requests served so far
+	def get_stats(self):
+		stats = {'requests': len(self.latencies), 'batches': self.batches}
+		if len(self.latencies) > 0:
+			latencies = numpy.array(self.latencies) * 1000.0
+			for p in (50, 90, 99):
+				stats['p'+str(p)] = round(float(numpy.percentile(latencies, p)), 3)
+			stats['max'] = round(float(numpy.max(latencies)), 3)
+		return stats
+
+	def format_stats(self, stats):
+		return 'Served '+', '.join([k+' '+str(stats[k]) for k in sorted(stats)])+' (latencies in ms)'
+
+# Minimal client: score a sequence against the server's database, returning a dictionary of database
+# name to score
+def query_server(seq, name='query', socketFile=None, port=None):
+	if socketFile is not None:
+		connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		connection.connect(socketFile)
+	else:
+		connection = socket.create_connection(('127.0.0.1', port))
+	handle = connection.makefile('rw')
+	handle.write(json.dumps({'id': name, 'name': name, 'seq': seq}) + '\n')
+	handle.flush()
+	scores = {}
+	for line in handle:
+		reply = json.loads(line)
+		if 'error' in reply:
+			connection.close()
+			raise IOError(reply['error'])
+		scores.update(dict(reply.get('scores', [])))
+		if reply.get('done'):
+			break
+	connection.close()
+	return scores
+
+if __name__ == '__main__':
+	try:
+		args = ServerCommandLineParser().parse_args()
+		ServerArgumentValidator(args) # test all arguments are correct
+
+		input_state = InputWrapperState(args)
+		input_state.assign_matrix() # parse in-built or custom matrix
+		sequences = input_state.parse_fasta(input_state.fname)
+		server = AlignmentServer(sequences, input_state)
+		server.start()
+
+	except (IOError, KeyboardInterrupt, IndexError) as e:
+		out(str(e)+'\n')
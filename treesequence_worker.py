@@ -0,0 +1,61 @@
+import argparse, concurrent.futures, os, time
+import TreeSeqQueue
+from treesequence_pairwise_contrasterV2 import default_start_method, get_pool_context, out, queue_worker
+
+# Helper-class to parse input arguments
+class WorkerCommandLineParser():
+	def __init__(self):
+		desc = 'Script to join the workers of a queued contraster run (-queue), until its chunks are all done'
+		u='%(prog)s [options]' # command-line usage
+		self.parser = argparse.ArgumentParser(description=desc, add_help=False, usage=u)
+		self._init_params()
+
+	# Create parameters to be used throughout the application
+	def _init_params(self):
+		param_reqd = self.parser.add_argument_group('Required Parameters')
+		param_opts = self.parser.add_argument_group('Optional Parameters')
+		param_reqd.add_argument('-queue', metavar='FILE', required=True,
+					help='Job queue of the run [na]')
+		param_opts.add_argument('-n', metavar='INT', default=1, type=int,
+					help='Number of worker processes [1]')
+		param_opts.add_argument('-start', metavar='STR', default=default_start_method(),
+					help='How worker processes are started ['+default_start_method()+']\n\tforkserver,spawn,fork')
+		param_opts.add_argument('-h','--help', action='help',
+					help='Show this help screen and exit')
+
+	# Get the arguments for each parameter
+	def parse_args(self):
+		return vars(self.parser.parse_args()) # parse arguments
+
+# Validates user-provided command-line arguments
+class WorkerArgumentValidator():
+	def __init__(self, args):
+		self.args = args
+		self.check_args()
+
+	def check_args(self):
+		if not os.path.isfile(self.args['queue']):
+			raise IOError('Job queue '+self.args['queue']+' not found (is the run complete?)')
+		if self.args['n'] < 1:
+			raise IOError('>= 1 worker processes must be provided')
+		return True
+
+if __name__ == '__main__':
+	try:
+		args = WorkerCommandLineParser().parse_args()
+		WorkerArgumentValidator(args) # test all arguments are correct
+		started = time.time()
+		jobQueue = TreeSeqQueue.JobQueue(args['queue'])
+		jobQueue.get_settings() # test it holds a run before starting the workers
+		jobQueue.close()
+		executor = concurrent.futures.ProcessPoolExecutor(args['n'], mp_context=get_pool_context(args['start']))
+		try:
+			futures = [executor.submit(queue_worker, args['queue']) for k in range(args['n'])]
+			completed = sum([future.result() for future in futures])
+		finally:
+			executor.shutdown()
+		out(str(completed)+' chunks of '+args['queue']+' completed by '+str(args['n'])+' workers in '+
+			str(round(time.time() - started, 1))+'s')
+
+	except (IOError, KeyboardInterrupt, IndexError) as e:
+		out(str(e)+'\n')